@@ -0,0 +1,214 @@
+"""
+割当行列
+ロット×検査員枠（MAX_INSPECTORS_PER_LOT）の検査員IDを int32 行列で保持し、
+検査時間・分割検査時間・検査員人数・ロット日付を並列配列で持つ構造体配列表現。
+割当ループ中は DataFrame への .at 書き込みを行わず、表示用の列（スキル表記付き氏名）は materialize で一括生成する。
+
+第1次割当（ウォームスタートの引き継ぎを含む）の作業用表現で、materialize の後は結果DataFrameが正となる。
+全体最適化・違反是正のフェーズは結果DataFrameと割当台帳（履歴の差分更新）で動作し、割当行列は参照しない。
+"""
+
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from app.assignment.inspector_ids import inspector_id_column
+
+# 空き枠を表すID
+EMPTY_SLOT = -1
+
+
+class AssignmentMatrix:
+    """
+    構造体配列形式の割当表
+
+    - inspector_ids: ロット×枠の検査員ID（codes上の位置、空き枠は EMPTY_SLOT）
+    - label_ids: ロット×枠の表示名ID（labels上の位置、スキル表記込みの氏名）
+    - inspection_time / divided_time / inspector_count / lot_dates: ロット単位の並列配列
+    - 行の並びは構築元DataFrameの行位置と一致する（materialize まで並べ替えないこと）
+    """
+
+    def __init__(
+        self,
+        index: Sequence[Any],
+        max_slots: int,
+        inspection_time: np.ndarray,
+        lot_dates: np.ndarray,
+    ) -> None:
+        self.index = list(index)
+        self.position: Dict[Any, int] = {idx: pos for pos, idx in enumerate(self.index)}
+        n = len(self.index)
+        self.max_slots = max_slots
+        self.inspector_ids = np.full((n, max_slots), EMPTY_SLOT, dtype=np.int32)
+        self.label_ids = np.full((n, max_slots), EMPTY_SLOT, dtype=np.int32)
+        self.inspection_time = inspection_time
+        self.divided_time = np.zeros(n, dtype=np.float64)
+        self.inspector_count = np.zeros(n, dtype=np.int64)
+        self.lot_dates = lot_dates
+
+        self.codes: List[str] = []
+        self.code_to_id: Dict[str, int] = {}
+        self.labels: List[str] = []
+        self.label_to_id: Dict[str, int] = {}
+        # 割当行列側で書き換えたロット（materialize の対象）
+        self._dirty = np.zeros(n, dtype=bool)
+
+    @classmethod
+    def from_frame(
+        cls,
+        result_df: pd.DataFrame,
+        max_slots: int,
+        resolve_lot_date: Callable[[Any], date],
+        resolve_code: Optional[Callable[[str], Optional[str]]] = None,
+    ) -> "AssignmentMatrix":
+        """
+        結果DataFrameから割当行列を構築する
+
+        Args:
+            result_df: 結果DataFrame（検査員1〜N列・検査員人数・分割検査時間を持つ）
+            max_slots: 検査員枠の数
+            resolve_lot_date: 出荷予定日 → 勤務日の変換関数
+            resolve_code: 既存の表示名 → 検査員コードの変換関数（省略時は既存の割当を読み込まない）
+        """
+        n = len(result_df)
+        if '検査時間' in result_df.columns:
+            inspection_time = pd.to_numeric(result_df['検査時間'], errors='coerce').fillna(0.0).to_numpy(dtype=np.float64)
+        else:
+            inspection_time = np.zeros(n, dtype=np.float64)
+        if '出荷予定日' in result_df.columns:
+            lot_dates = np.array(
+                [resolve_lot_date(value) for value in result_df['出荷予定日'].tolist()],
+                dtype='datetime64[D]',
+            )
+        else:
+            lot_dates = np.full(n, np.datetime64('NaT'), dtype='datetime64[D]')
+        matrix = cls(result_df.index, max_slots, inspection_time, lot_dates)
+
+        if '分割検査時間' in result_df.columns:
+            matrix.divided_time[:] = pd.to_numeric(result_df['分割検査時間'], errors='coerce').fillna(0.0).to_numpy()
+        if '検査員人数' in result_df.columns:
+            matrix.inspector_count[:] = pd.to_numeric(result_df['検査員人数'], errors='coerce').fillna(0).to_numpy(dtype=np.int64)
+        if resolve_code is not None:
+            for slot in range(max_slots):
+                col = f'検査員{slot + 1}'
+                if col not in result_df.columns:
+                    continue
+                for pos, value in enumerate(result_df[col].tolist()):
+                    if value is None or pd.isna(value) or str(value).strip() == '':
+                        continue
+                    label = str(value).strip()
+                    code = resolve_code(label.split('(')[0].strip())
+                    if code:
+                        matrix.inspector_ids[pos, slot] = matrix.intern_code(code)
+                    matrix.label_ids[pos, slot] = matrix.intern_label(label)
+        return matrix
+
+    # ------------------------------------------------------------------
+    # ID管理
+    # ------------------------------------------------------------------
+    def intern_code(self, code: str) -> int:
+        """検査員コードのIDを返す（未登録の場合は追加）"""
+        inspector_id = self.code_to_id.get(code)
+        if inspector_id is None:
+            inspector_id = len(self.codes)
+            self.code_to_id[code] = inspector_id
+            self.codes.append(code)
+        return inspector_id
+
+    def intern_label(self, label: str) -> int:
+        """表示名のIDを返す（未登録の場合は追加）"""
+        label_id = self.label_to_id.get(label)
+        if label_id is None:
+            label_id = len(self.labels)
+            self.label_to_id[label] = label_id
+            self.labels.append(label)
+        return label_id
+
+    # ------------------------------------------------------------------
+    # 更新
+    # ------------------------------------------------------------------
+    def clear(self, pos: int) -> None:
+        """ロットの割当をすべて解除（検査員人数・分割検査時間も0にする）"""
+        self.inspector_ids[pos, :] = EMPTY_SLOT
+        self.label_ids[pos, :] = EMPTY_SLOT
+        self.inspector_count[pos] = 0
+        self.divided_time[pos] = 0.0
+        self._dirty[pos] = True
+
+    def set_slot(self, pos: int, slot: int, code: str, label: str) -> None:
+        """検査員枠（0始まり）に検査員を設定"""
+        self.inspector_ids[pos, slot] = self.intern_code(code) if code else EMPTY_SLOT
+        self.label_ids[pos, slot] = self.intern_label(label)
+        self._dirty[pos] = True
+
+    def set_inspector_count(self, pos: int, count: int) -> None:
+        self.inspector_count[pos] = count
+        self._dirty[pos] = True
+
+    def set_divided_time(self, pos: int, divided_time: float) -> None:
+        self.divided_time[pos] = divided_time
+        self._dirty[pos] = True
+
+    # ------------------------------------------------------------------
+    # 参照
+    # ------------------------------------------------------------------
+    def lot_date(self, pos: int) -> Optional[date]:
+        """ロットの勤務日（未設定の場合はNone）"""
+        value = self.lot_dates[pos]
+        if np.isnat(value):
+            return None
+        return value.astype(date)
+
+    def positions_with_inspector(self, code: str) -> np.ndarray:
+        """検査員が割り当てられているロットの行位置（昇順）"""
+        inspector_id = self.code_to_id.get(code)
+        if inspector_id is None:
+            return np.empty(0, dtype=np.int64)
+        return np.flatnonzero((self.inspector_ids == inspector_id).any(axis=1))
+
+    # ------------------------------------------------------------------
+    # 表示用DataFrameへの反映
+    # ------------------------------------------------------------------
+    def materialize(self, result_df: pd.DataFrame, code_ids: Optional[Callable[[str], int]] = None) -> None:
+        """
+        書き換えたロットの検査員列・検査員人数・分割検査時間を結果DataFrameへ一括反映する
+        （行の並びは構築時と同じであること）
+
+        Args:
+            code_ids: 検査員コード → 結果DataFrameのID列（inspector_id_1〜N）に書く値（省略時はID列を更新しない）
+        """
+        if len(result_df) != len(self.index):
+            raise ValueError("割当行列と結果DataFrameの行数が一致しません")
+        dirty = self._dirty
+        if not dirty.any():
+            return
+        label_table = np.array(self.labels + [''], dtype=object)
+        for slot in range(self.max_slots):
+            col = f'検査員{slot + 1}'
+            if col not in result_df.columns:
+                continue
+            values = result_df[col].to_numpy(dtype=object).copy()
+            # EMPTY_SLOT(-1) は末尾の空文字を参照する
+            values[dirty] = label_table[self.label_ids[dirty, slot]]
+            result_df[col] = values
+        if code_ids is not None:
+            # 行列内のID → ID列の値（EMPTY_SLOT(-1) は末尾の空き枠を参照する）
+            id_table = np.array([code_ids(code) for code in self.codes] + [EMPTY_SLOT], dtype=np.int64)
+            for slot in range(self.max_slots):
+                col = inspector_id_column(slot + 1)
+                if col not in result_df.columns:
+                    continue
+                values = pd.to_numeric(result_df[col], errors='coerce').fillna(EMPTY_SLOT).to_numpy(dtype=np.int64).copy()
+                values[dirty] = id_table[self.inspector_ids[dirty, slot]]
+                result_df[col] = values
+        if '検査員人数' in result_df.columns:
+            counts = result_df['検査員人数'].to_numpy().copy()
+            counts[dirty] = self.inspector_count[dirty]
+            result_df['検査員人数'] = counts
+        if '分割検査時間' in result_df.columns:
+            divided = result_df['分割検査時間'].to_numpy(dtype=np.float64).copy()
+            divided[dirty] = self.divided_time[dirty]
+            result_df['分割検査時間'] = divided
+        self._dirty[:] = False
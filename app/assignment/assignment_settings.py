@@ -0,0 +1,97 @@
+"""
+割当エンジンの設定
+休日カレンダー・混入防止グループのファイルパス、割当ソルバー、マルチスタート、ウォームスタート、時間予算、
+メトリクス・プロファイルの設定を環境変数から読み込む。
+
+InspectorAssignmentManager の生成時に読み込むため、DatabaseConfig が読み込んだ config.env の値も反映される
+（モジュールの読み込み時点では config.env がまだ読み込まれていない場合がある）。
+"""
+
+import os
+from typing import Mapping, NamedTuple, Optional
+
+from app.utils.path_resolver import resolve_resource_path
+
+_TRUE_VALUES = {"1", "true", "on", "yes"}
+_FALSE_VALUES = {"0", "false", "off", "no"}
+
+SOLVER_MODES = ("greedy", "flow")
+
+
+def resolve_settings_path(path: str) -> str:
+    """設定のファイルパスを解決する（NAS上のUNCパスはそのまま、それ以外はexe化対応で解決）"""
+    if path.startswith('\\\\'):
+        return path
+    return resolve_resource_path(path)
+
+
+def _env_str(environ: Mapping[str, str], name: str, default: str = "") -> str:
+    return str(environ.get(name, default) or "").strip()
+
+
+def _env_int(
+    environ: Mapping[str, str], name: str, default: int, low: Optional[int] = None, high: Optional[int] = None
+) -> int:
+    """整数の設定値（不正な値は既定値、範囲外は low 〜 high に制限）"""
+    try:
+        value = int(_env_str(environ, name) or default)
+    except ValueError:
+        value = default
+    if low is not None:
+        value = max(low, value)
+    return min(value, high) if high is not None else value
+
+
+def _env_float(environ: Mapping[str, str], name: str, default: float, low: float, high: float) -> float:
+    """小数の設定値（不正な値は既定値、範囲外は low 〜 high に制限）"""
+    try:
+        value = float(_env_str(environ, name) or default)
+    except ValueError:
+        value = default
+    return max(low, min(value, high))
+
+
+def _env_flag(environ: Mapping[str, str], name: str, default: bool) -> bool:
+    """有効/無効の設定値（既定が有効なら 0/false/off/no で無効、既定が無効なら 1/true/on/yes で有効）"""
+    value = _env_str(environ, name).lower()
+    if default:
+        return value not in _FALSE_VALUES
+    return value in _TRUE_VALUES
+
+
+class AssignmentSettings(NamedTuple):
+    """割当エンジンの設定（環境変数名は README の設定一覧を参照）"""
+
+    holiday_calendar_path: str = ""  # HOLIDAY_CALENDAR_PATH（未設定の場合は土日のみ休日）
+    mix_prevention_groups_path: str = ""  # MIX_PREVENTION_GROUPS_PATH（未設定の場合は既定のグループ）
+    solver_mode: str = "greedy"  # INSPECTOR_ASSIGNMENT_SOLVER_MODE
+    multi_start: int = 1  # INSPECTOR_ASSIGNMENT_MULTI_START（1 = 無効、最大16）
+    multi_start_budget_sec: float = 120.0  # INSPECTOR_ASSIGNMENT_MULTI_START_BUDGET_SEC（1秒以上1時間以下）
+    multi_start_seed: int = 0  # INSPECTOR_ASSIGNMENT_MULTI_START_SEED
+    warm_start: bool = False  # INSPECTOR_ASSIGNMENT_WARM_START
+    warm_start_path: str = ""  # INSPECTOR_ASSIGNMENT_WARM_START_PATH（未設定の場合は LOCALAPPDATA 配下）
+    time_budget_sec: float = 0.0  # INSPECTOR_ASSIGNMENT_TIME_BUDGET_SEC（0 = 無制限、1時間以下）
+    metrics_history_size: int = 100  # INSPECTOR_ASSIGNMENT_METRICS_HISTORY_SIZE（10以上10000以下）
+    logged_warnings_max: int = 20000  # INSPECTOR_ASSIGNMENT_LOGGED_WARNINGS_MAX（1000以上100万以下）
+    profile_report: bool = True  # INSPECTOR_ASSIGNMENT_PROFILE_REPORT
+
+    @classmethod
+    def from_env(cls, environ: Optional[Mapping[str, str]] = None) -> "AssignmentSettings":
+        """環境変数（省略時は os.environ）から設定を読み込む"""
+        if environ is None:
+            environ = os.environ
+        solver_mode = _env_str(environ, "INSPECTOR_ASSIGNMENT_SOLVER_MODE", "greedy").lower()
+        return cls(
+            holiday_calendar_path=_env_str(environ, "HOLIDAY_CALENDAR_PATH"),
+            mix_prevention_groups_path=_env_str(environ, "MIX_PREVENTION_GROUPS_PATH"),
+            solver_mode=solver_mode if solver_mode in SOLVER_MODES else "greedy",
+            multi_start=_env_int(environ, "INSPECTOR_ASSIGNMENT_MULTI_START", 1, 1, 16),
+            multi_start_budget_sec=_env_float(environ, "INSPECTOR_ASSIGNMENT_MULTI_START_BUDGET_SEC", 120.0, 1.0, 3600.0),
+            multi_start_seed=_env_int(environ, "INSPECTOR_ASSIGNMENT_MULTI_START_SEED", 0),
+            warm_start=_env_flag(environ, "INSPECTOR_ASSIGNMENT_WARM_START", False),
+            warm_start_path=_env_str(environ, "INSPECTOR_ASSIGNMENT_WARM_START_PATH"),
+            time_budget_sec=_env_float(environ, "INSPECTOR_ASSIGNMENT_TIME_BUDGET_SEC", 0.0, 0.0, 3600.0),
+            metrics_history_size=_env_int(environ, "INSPECTOR_ASSIGNMENT_METRICS_HISTORY_SIZE", 100, 10, 10000),
+            logged_warnings_max=_env_int(environ, "INSPECTOR_ASSIGNMENT_LOGGED_WARNINGS_MAX", 20000, 1000, 1000000),
+            profile_report=_env_flag(environ, "INSPECTOR_ASSIGNMENT_PROFILE_REPORT", True),
+        )
@@ -0,0 +1,130 @@
+"""
+メモリ上限付きのメトリクス
+UIセッション中に同じマネージャーで割当を繰り返しても、効果測定メトリクスの履歴・警告の重複判定用セットが
+増え続けないよう、件数の上限を持つコンテナを提供する。
+
+- ReservoirHistory: 詳細履歴（リザーバサンプリングで全件から一様に保持、総件数は別に集計）
+- RunningStats: 数値の系列（件数・合計・最大値のみ保持）
+- BoundedKeySet: 重複判定用のキー集合（上限を超えたら古いキーから破棄するリングバッファ）
+"""
+
+import random
+from collections import OrderedDict
+from typing import Any, Hashable, Iterator, List, Tuple
+
+
+class ReservoirHistory:
+    """
+    リザーバサンプリングで最大 size 件を保持する履歴
+
+    list と同様に append / len / イテレーション / スライスで参照できる（保持分を追加順に返す）。
+    追加された総件数は total で参照する。
+    """
+
+    def __init__(self, size: int = 100, seed: int = 0) -> None:
+        self.size = max(1, int(size))
+        self.total = 0
+        self._entries: List[Tuple[int, Any]] = []
+        # 割当結果に影響しないよう専用の乱数生成器を使用（シード固定で再現可能）
+        self._rng = random.Random(seed)
+
+    def append(self, item: Any) -> None:
+        sequence = self.total
+        self.total += 1
+        if len(self._entries) < self.size:
+            self._entries.append((sequence, item))
+            return
+        slot = self._rng.randrange(self.total)
+        if slot < self.size:
+            self._entries[slot] = (sequence, item)
+
+    def items(self) -> List[Any]:
+        """保持している履歴（追加順）"""
+        return [item for _, item in sorted(self._entries, key=lambda entry: entry[0])]
+
+    def clear(self) -> None:
+        self.total = 0
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.items())
+
+    def __getitem__(self, key: Any) -> Any:
+        return self.items()[key]
+
+    def __bool__(self) -> bool:
+        return bool(self._entries)
+
+    def __repr__(self) -> str:
+        return f"ReservoirHistory(size={self.size}, total={self.total}, kept={len(self._entries)})"
+
+
+class RunningStats:
+    """数値系列の集計値（件数・合計・最大値）のみを保持する"""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def append(self, value: float) -> None:
+        value = float(value)
+        if self.count == 0 or value > self.maximum:
+            self.maximum = value
+        self.count += 1
+        self.total += value
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def clear(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __bool__(self) -> bool:
+        return self.count > 0
+
+    def __repr__(self) -> str:
+        return f"RunningStats(count={self.count}, mean={self.mean:.3f}, max={self.maximum:.3f})"
+
+
+class BoundedKeySet:
+    """
+    最大 maxlen 件のキーを保持する集合（set と同様に in / add / discard / clear / len が使える）
+
+    上限を超えた場合は最も古く追加されたキーから破棄する（破棄されたキーは再度「未出力」として扱われる）。
+    """
+
+    def __init__(self, maxlen: int = 10000) -> None:
+        self.maxlen = max(1, int(maxlen))
+        self._keys: "OrderedDict[Hashable, None]" = OrderedDict()
+
+    def add(self, key: Hashable) -> None:
+        if key in self._keys:
+            return
+        self._keys[key] = None
+        if len(self._keys) > self.maxlen:
+            self._keys.popitem(last=False)
+
+    def discard(self, key: Hashable) -> None:
+        self._keys.pop(key, None)
+
+    def clear(self) -> None:
+        self._keys.clear()
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._keys)
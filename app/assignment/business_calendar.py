@@ -0,0 +1,85 @@
+"""
+営業日カレンダー
+土日と休日カレンダーファイル（工場休日など）を除いた営業日を numpy の busday 演算で扱う
+"""
+
+from datetime import date
+from pathlib import Path
+from typing import Any, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+# 月〜金を営業日とする
+DEFAULT_WEEKMASK = '1111100'
+
+
+class BusinessCalendar:
+    """
+    営業日計算用のカレンダー
+
+    - holidays: 休日（datetime64[D]、昇順・重複なし）
+    - 営業日の加算は np.busday_offset で行う（休日・週末起点の場合は直前の営業日から数える）
+    """
+
+    def __init__(self, holidays: Iterable[Any] = (), weekmask: str = DEFAULT_WEEKMASK) -> None:
+        parsed: List[np.datetime64] = []
+        for value in holidays:
+            day = _parse_day(value)
+            if day is not None:
+                parsed.append(day)
+        self.holidays = np.unique(np.array(parsed, dtype='datetime64[D]'))
+        self.weekmask = weekmask
+        self._calendar = np.busdaycalendar(weekmask=weekmask, holidays=self.holidays)
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path], weekmask: str = DEFAULT_WEEKMASK) -> "BusinessCalendar":
+        """
+        休日カレンダーファイルを読み込む
+
+        CSV/テキスト: 各行の先頭列を日付として解釈（空行・#で始まる行・日付として解釈できない行は無視）
+        Excel(.xlsx/.xls): 先頭シートの先頭列を同様に解釈
+        """
+        file_path = Path(path)
+        if file_path.suffix.lower() in ('.xlsx', '.xls'):
+            values = pd.read_excel(file_path, header=None, usecols=[0]).iloc[:, 0].tolist()
+        else:
+            values = []
+            with open(file_path, 'r', encoding='utf-8-sig') as f:
+                for line in f:
+                    text = line.strip()
+                    if not text or text.startswith('#'):
+                        continue
+                    values.append(text.split(',')[0].strip())
+        return cls(values, weekmask=weekmask)
+
+    def add_business_days(self, start: date, business_days: int) -> date:
+        """start から business_days 営業日後の日付（start が休日の場合は直前の営業日を起点とする）"""
+        result = np.busday_offset(
+            np.datetime64(start, 'D'), business_days, roll='backward', busdaycal=self._calendar
+        )
+        return result.astype(date)
+
+    def is_business_day(self, day: date) -> bool:
+        return bool(np.is_busday(np.datetime64(day, 'D'), busdaycal=self._calendar))
+
+    def __len__(self) -> int:
+        return len(self.holidays)
+
+    def __reduce__(self):
+        # np.busdaycalendar はpickle不可のため、休日と週マスクから作り直す（プロセス間での受け渡し用）
+        return (self.__class__, ([str(day) for day in self.holidays], self.weekmask))
+
+
+def _parse_day(value: Any) -> Optional[np.datetime64]:
+    if value is None:
+        return None
+    try:
+        if pd.isna(value):
+            return None
+    except (TypeError, ValueError):
+        pass
+    parsed = pd.to_datetime(value, errors='coerce')
+    if pd.isna(parsed):
+        return None
+    return np.datetime64(parsed.date(), 'D')
@@ -0,0 +1,69 @@
+"""
+候補検査員キャッシュ
+get_available_inspectors の結果のうち、ロットの出荷予定日に依存しない部分（スキルマスタの該当行・工程番号の推定・
+休暇による除外・新製品チームフラグ・固定検査員の優先配置）を (品番, 工程番号, 工程名, ロット種別) ごとに保持する。
+マネージャーの状態バージョン（休暇情報の設定・割当実行の開始などで加算）が変わったら全件破棄する。
+"""
+
+from typing import Any, Callable, Dict, Hashable, NamedTuple, Optional, Tuple
+
+# 静的候補の状態
+STATIC_CANDIDATES_OK = 'ok'
+STATIC_CANDIDATES_PRODUCT_MISSING = 'product_missing'  # 品番がスキルマスタにない
+STATIC_CANDIDATES_PROCESS_MISSING = 'process_missing'  # 工程番号に一致するスキル行がない
+
+
+class StaticCandidates(NamedTuple):
+    """出荷予定日に依存しない候補（候補辞書は共有のため、返す際は呼び出し側でコピーする）"""
+
+    status: str
+    candidates: Tuple[Dict[str, Any], ...]
+
+
+class CandidateCache:
+    """状態バージョン付きの静的候補キャッシュ"""
+
+    def __init__(self) -> None:
+        self._entries: Dict[Hashable, StaticCandidates] = {}
+        self._version: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(
+        self,
+        key: Optional[Hashable],
+        version: int,
+        build: Callable[[], StaticCandidates],
+    ) -> StaticCandidates:
+        """キャッシュ済みの候補を返す（未登録・バージョン不一致の場合は build() で作成して登録）"""
+        if self._version != version:
+            self._entries.clear()
+            self._version = version
+        if key is None:
+            # ハッシュ不可のキーはキャッシュしない
+            self.misses += 1
+            return build()
+        cached = self._entries.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+        cached = build()
+        self._entries[key] = cached
+        return cached
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._version = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def make_cache_key(*parts: Any) -> Optional[Hashable]:
+    """キャッシュキーを作成する（ハッシュ不可の値を含む場合はNone）"""
+    try:
+        hash(parts)
+    except TypeError:
+        return None
+    return parts
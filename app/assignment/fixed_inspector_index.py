@@ -0,0 +1,205 @@
+"""
+固定検査員インデックス
+登録済み品番の固定検査員設定（fixed_inspectors_by_product）と先行検査品の検査割当て人数
+（preinspection_assignment_targets）を設定時に1回だけコンパイルし、(品番, 工程名) → 固定検査員・割当人数 の参照表にする。
+工程名フィルタ（/ 区切りのキーワードと現在工程名の部分一致）は (品番, 正規化した工程名) ごとに1回だけ評価して保持する。
+"""
+
+import re
+import unicodedata
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# 工程名フィルターの区切り文字
+_PROCESS_KEYWORD_SEPARATOR = re.compile(r"[／/]")
+
+
+def split_process_keywords(process_filter: Any) -> Tuple[str, ...]:
+    """工程名フィルターを / や ／ で分割してキーワードのタプルを作成"""
+    if not process_filter:
+        return ()
+    return tuple(keyword.strip() for keyword in _PROCESS_KEYWORD_SEPARATOR.split(str(process_filter)) if keyword.strip())
+
+
+def normalize_process_name(process_name: Any) -> str:
+    """照合用の工程名（前後の空白を除去、未設定は空文字）"""
+    return str(process_name or "").strip()
+
+
+def normalize_person_name(name: Any) -> str:
+    """照合用の氏名（括弧書きを除去し、NFKC正規化・空白除去）"""
+    if not name or pd.isna(name):
+        return ''
+    text = str(name).strip()
+    if '(' in text:
+        text = text.split('(')[0].strip()
+    text = unicodedata.normalize("NFKC", text)
+    return text.replace(" ", "").replace("　", "")
+
+
+class ProcessRule(NamedTuple):
+    """工程名フィルター付きの設定1件分"""
+
+    process_filter: str  # 登録時の工程名フィルター（空は全工程）
+    keywords: Tuple[str, ...]  # フィルターを分割したキーワード（フィルターがあってキーワードが空の場合は一致しない）
+    value: Any  # 固定検査員名のタプル、または検査割当て人数
+
+    def matches(self, process_key: str) -> bool:
+        """工程名フィルターが現在工程名（正規化済み）に一致するか（フィルターなしは一致扱い）"""
+        if not self.process_filter:
+            return True
+        if not process_key:
+            return False
+        return any(keyword in process_key for keyword in self.keywords)
+
+
+class FixedInspectors(NamedTuple):
+    """(品番, 工程名) に一致する固定検査員"""
+
+    names: Tuple[str, ...]  # 固定検査員名（登録順、重複除去）
+    name_set: FrozenSet[str]  # names の集合
+    normalized: FrozenSet[str]  # 照合用に正規化した氏名の集合
+
+
+NO_FIXED_INSPECTORS = FixedInspectors((), frozenset(), frozenset())
+
+
+class FixedInspectorIndex:
+    """
+    コンパイル済みの固定検査員・先行検査割当人数設定
+
+    - fixed_rules: {品番: [ProcessRule(value=固定検査員名のタプル), ...]}（登録順を維持）
+    - headcount_rules: {品番: [ProcessRule(value=検査割当て人数), ...]}（人数が正の設定のみ）
+    """
+
+    def __init__(
+        self,
+        fixed_rules: Dict[str, List[ProcessRule]],
+        headcount_rules: Dict[str, List[ProcessRule]],
+        source_ids: Tuple[int, int],
+    ) -> None:
+        self.fixed_rules = fixed_rules
+        self.headcount_rules = headcount_rules
+        self._source_ids = source_ids
+        self._fixed_cache: Dict[Tuple[str, str], FixedInspectors] = {}
+        self._headcount_cache: Dict[Tuple[str, str], Optional[Tuple[int, str]]] = {}
+
+    @classmethod
+    def build(
+        cls,
+        fixed_inspectors_by_product: Optional[Dict[str, List[Dict[str, Any]]]],
+        preinspection_assignment_targets: Optional[Dict[str, List[Dict[str, Any]]]],
+    ) -> "FixedInspectorIndex":
+        """固定検査員設定と検査割当て人数設定をコンパイルする"""
+        fixed_rules: Dict[str, List[ProcessRule]] = {}
+        for product_number, entries in (fixed_inspectors_by_product or {}).items():
+            product_key = str(product_number).strip()
+            for entry in entries or []:
+                process_filter = str(entry.get('process', '') or '').strip()
+                names = tuple(str(name).strip() for name in entry.get('inspectors', []) if name and str(name).strip())
+                if not names:
+                    continue
+                fixed_rules.setdefault(product_key, []).append(
+                    ProcessRule(process_filter, split_process_keywords(process_filter), names)
+                )
+
+        headcount_rules: Dict[str, List[ProcessRule]] = {}
+        for product_number, entries in (preinspection_assignment_targets or {}).items():
+            product_key = str(product_number).strip()
+            for entry in entries or []:
+                headcount_raw = str(entry.get('headcount', '') or '').strip()
+                if not headcount_raw:
+                    continue
+                try:
+                    headcount_value = int(headcount_raw)
+                except ValueError:
+                    continue
+                if headcount_value <= 0:
+                    continue
+                process_filter = str(entry.get('process', '') or '').strip()
+                headcount_rules.setdefault(product_key, []).append(
+                    ProcessRule(process_filter, split_process_keywords(process_filter), headcount_value)
+                )
+
+        return cls(fixed_rules, headcount_rules, (id(fixed_inspectors_by_product), id(preinspection_assignment_targets)))
+
+    def is_built_from(self, fixed_inspectors_by_product: Any, preinspection_assignment_targets: Any) -> bool:
+        """指定の設定から構築されたインデックスか"""
+        return (id(fixed_inspectors_by_product), id(preinspection_assignment_targets)) == self._source_ids
+
+    def has_fixed_product(self, product_number: Any) -> bool:
+        """品番に固定検査員設定があるか（工程名は問わない）"""
+        return str(product_number).strip() in self.fixed_rules
+
+    def lookup(self, product_number: Any, process_name: Any) -> FixedInspectors:
+        """品番・工程名に一致する固定検査員"""
+        product_key = str(product_number).strip()
+        rules = self.fixed_rules.get(product_key)
+        if not rules:
+            return NO_FIXED_INSPECTORS
+        process_key = normalize_process_name(process_name)
+        cache_key = (product_key, process_key)
+        cached = self._fixed_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        names: Dict[str, None] = {}
+        for rule in rules:
+            if rule.matches(process_key):
+                names.update(dict.fromkeys(rule.value))
+        if names:
+            name_tuple = tuple(names)
+            normalized = frozenset(n for n in (normalize_person_name(name) for name in name_tuple) if n)
+            cached = FixedInspectors(name_tuple, frozenset(name_tuple), normalized)
+        else:
+            cached = NO_FIXED_INSPECTORS
+        self._fixed_cache[cache_key] = cached
+        return cached
+
+    def fixed_names(self, product_number: Any, process_name: Any) -> Tuple[str, ...]:
+        """品番・工程名に一致する固定検査員名（登録順、重複除去）"""
+        return self.lookup(product_number, process_name).names
+
+    def is_fixed(self, product_number: Any, process_name: Any, inspector_name: Any) -> bool:
+        """検査員が品番・工程名の固定検査員か（氏名は正規化して照合、休暇は考慮しない）"""
+        normalized = self.lookup(product_number, process_name).normalized
+        return bool(normalized) and normalize_person_name(inspector_name) in normalized
+
+    def fixed_mask(self, product_number: Any, process_name: Any, inspector_names: Sequence[Any]) -> np.ndarray:
+        """検査員名の並びに対し、品番・工程名の固定検査員かどうかのブール配列（休暇は考慮しない）"""
+        normalized = self.lookup(product_number, process_name).normalized
+        if not normalized:
+            return np.zeros(len(inspector_names), dtype=bool)
+        return np.fromiter(
+            (normalize_person_name(name) in normalized for name in inspector_names),
+            dtype=bool,
+            count=len(inspector_names),
+        )
+
+    def preinspection_target(self, product_number: Any, process_name: Any) -> Optional[Tuple[int, str]]:
+        """
+        先行検査品の検査割当て人数（工程名フィルターが一致する設定を優先）
+
+        Returns:
+            (人数, 工程名フィルター)。一致する設定がない場合は工程名フィルターなしの最初の設定、それもなければNone
+        """
+        product_key = str(product_number).strip()
+        rules = self.headcount_rules.get(product_key)
+        if not rules:
+            return None
+        process_key = normalize_process_name(process_name)
+        cache_key = (product_key, process_key)
+        if cache_key in self._headcount_cache:
+            return self._headcount_cache[cache_key]
+        result: Optional[Tuple[int, str]] = None
+        for rule in rules:
+            if rule.process_filter:
+                if rule.matches(process_key):
+                    result = (rule.value, rule.process_filter)
+                    break
+                continue
+            if result is None:
+                result = (rule.value, rule.process_filter)
+        self._headcount_cache[cache_key] = result
+        return result
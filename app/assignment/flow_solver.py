@@ -0,0 +1,255 @@
+"""
+最小費用流ソルバー
+ロット・検査員・勤務時間を最小費用流ネットワークとしてモデル化し、検査時間（0.1h単位）の流し方を一括で求める。
+貪欲法＋是正フェーズの代替（INSPECTOR_ASSIGNMENT_SOLVER_MODE=flow）として使用し、
+整数化（ロット単位の顔ぶれ決定）と副制約（当日洗浄・混入防止・休暇など）の確認は呼び出し側の修復ステップで行う。
+
+ネットワーク構成:
+    source → ロット             容量: 検査時間               費用: FIFO順位
+    ロット → (検査員, 品番)     容量: 分割検査時間           費用: スキル + ロット数ペナルティ
+    (検査員, 品番) → 検査員     容量: 同一品番時間上限(4h)   費用: 品番種類数ペナルティ
+    検査員 → sink               容量: 勤務時間上限           費用: 1時間ごとに逓増（負荷の平準化）
+"""
+
+import heapq
+import math
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+# フローの単位（時間）
+FLOW_QUANTUM_HOURS = 0.1
+# 費用を整数化する際の倍率（1時間あたり費用1.0 → 単位フローあたり COST_SCALE * FLOW_QUANTUM_HOURS）
+COST_SCALE = 1000
+
+
+class FlowLot(NamedTuple):
+    """ソルバーに渡すロット1件分"""
+
+    key: Any  # 呼び出し側のロット識別子（行位置など）
+    product_number: str
+    inspection_time: float
+    required_inspectors: int
+    rank: int  # FIFO順位（0が最優先）
+    candidates: Tuple[Tuple[str, int], ...]  # (検査員コード, スキル順位 0:スキル1〜3:新製品チーム)
+
+
+class FlowCostWeights(NamedTuple):
+    """費用の重み（いずれも作業1時間あたりの時間換算）"""
+
+    skill_step: float = 1.0  # スキル順位1段階あたり
+    fifo_step: float = 4.0  # FIFO順位1つあたり（スキル差より優先させる）
+    lot_count_alpha: float = 0.0  # ロット1件の割当あたり（分割検査時間で按分）
+    variety_beta: float = 0.0  # 品番1種類あたり（同一品番時間上限で按分）
+    balance_factor: float = 0.0  # 検査員のk時間目に k * balance_factor / 8 を加算
+
+
+class FlowSolution(NamedTuple):
+    """ソルバーの結果"""
+
+    hours: Dict[Any, Dict[str, float]]  # ロット識別子 → {検査員コード: 流した時間}
+    served_hours: Dict[Any, float]  # ロット識別子 → 流れた時間の合計
+    total_hours: float
+    total_cost: float
+    iterations: int  # 最短路計算（増加路）の回数
+
+
+class MinCostFlow:
+    """
+    逐次最短路法（ポテンシャル付きDijkstra）による最小費用流
+
+    辺は順辺・逆辺を 2k, 2k+1 の組で保持し、容量・費用は整数で扱う。
+    """
+
+    def __init__(self, node_count: int) -> None:
+        self.node_count = node_count
+        self._adjacency: List[List[int]] = [[] for _ in range(node_count)]
+        self._to: List[int] = []
+        self._capacity: List[int] = []
+        self._cost: List[int] = []
+        self._original_capacity: List[int] = []
+        self.iterations = 0
+
+    def add_node(self) -> int:
+        self._adjacency.append([])
+        self.node_count += 1
+        return self.node_count - 1
+
+    def add_edge(self, source: int, target: int, capacity: int, cost: int) -> int:
+        """辺を追加し、辺番号を返す（容量・費用は非負の整数）"""
+        edge_id = len(self._to)
+        self._to.extend((target, source))
+        self._capacity.extend((capacity, 0))
+        self._cost.extend((cost, -cost))
+        self._original_capacity.append(capacity)
+        self._adjacency[source].append(edge_id)
+        self._adjacency[target].append(edge_id + 1)
+        return edge_id
+
+    def edge_flow(self, edge_id: int) -> int:
+        return self._capacity[edge_id + 1]
+
+    def flow(self, source: int, sink: int, flow_limit: Optional[int] = None) -> Tuple[int, int]:
+        """
+        source から sink へ最小費用で流せるだけ流す
+
+        Returns:
+            (流量, 費用)
+        """
+        n = self.node_count
+        adjacency = self._adjacency
+        to = self._to
+        capacity = self._capacity
+        cost = self._cost
+        dual = [0] * n
+        inf = float('inf')
+        total_flow = 0
+        total_cost = 0
+        while flow_limit is None or total_flow < flow_limit:
+            dist: List[Any] = [inf] * n
+            prev_edge = [-1] * n
+            visited = [False] * n
+            dist[source] = 0
+            heap = [(0, source)]
+            while heap:
+                d, v = heapq.heappop(heap)
+                if visited[v]:
+                    continue
+                visited[v] = True
+                if v == sink:
+                    break
+                dual_v = dual[v]
+                for e in adjacency[v]:
+                    if capacity[e] == 0:
+                        continue
+                    w = to[e]
+                    if visited[w]:
+                        continue
+                    # 縮約費用（ポテンシャルにより非負）
+                    nd = d + cost[e] - dual[w] + dual_v
+                    if nd < dist[w]:
+                        dist[w] = nd
+                        prev_edge[w] = e
+                        heapq.heappush(heap, (nd, w))
+            if not visited[sink]:
+                break
+            dist_sink = dist[sink]
+            for v in range(n):
+                if visited[v]:
+                    dual[v] -= dist_sink - dist[v]
+
+            # 増加路のボトルネック容量と費用
+            bottleneck = inf if flow_limit is None else flow_limit - total_flow
+            path_cost = 0
+            v = sink
+            while v != source:
+                e = prev_edge[v]
+                if capacity[e] < bottleneck:
+                    bottleneck = capacity[e]
+                path_cost += cost[e]
+                v = to[e ^ 1]
+            v = sink
+            while v != source:
+                e = prev_edge[v]
+                capacity[e] -= bottleneck
+                capacity[e ^ 1] += bottleneck
+                v = to[e ^ 1]
+            total_flow += int(bottleneck)
+            total_cost += int(bottleneck) * path_cost
+            self.iterations += 1
+        return total_flow, total_cost
+
+
+def _to_quanta(hours: float) -> int:
+    return max(0, int(math.floor(hours / FLOW_QUANTUM_HOURS + 1e-9)))
+
+
+def _unit_cost(cost_per_hour: float) -> int:
+    return max(0, int(round(cost_per_hour * FLOW_QUANTUM_HOURS * COST_SCALE)))
+
+
+def solve_assignment_flow(
+    lots: List[FlowLot],
+    capacities: Dict[str, float],
+    product_hours_limit: float,
+    weights: FlowCostWeights = FlowCostWeights(),
+    balance_step_hours: float = 1.0,
+) -> FlowSolution:
+    """
+    ロットへの検査時間の配分を最小費用流で求める
+
+    Args:
+        lots: 割当対象ロット（FIFO順位・候補検査員付き）
+        capacities: 検査員コード → 割当可能な時間（勤務時間上限）
+        product_hours_limit: 同一品番の累計時間上限（4時間ルール）
+        weights: 費用の重み
+        balance_step_hours: 検査員→sink の辺を分割する幅（時間）
+    """
+    network = MinCostFlow(2)
+    source, sink = 0, 1
+
+    inspector_nodes: Dict[str, int] = {}
+    for code, hours in capacities.items():
+        quanta = _to_quanta(hours)
+        if quanta <= 0:
+            continue
+        node = network.add_node()
+        inspector_nodes[code] = node
+        # 1時間ごとに費用を逓増させた区分線形（凸）費用で平準化する
+        step_quanta = max(1, _to_quanta(balance_step_hours))
+        remaining = quanta
+        piece = 0
+        while remaining > 0:
+            piece_quanta = min(step_quanta, remaining)
+            piece_cost = _unit_cost(piece * balance_step_hours * weights.balance_factor / 8.0)
+            network.add_edge(node, sink, piece_quanta, piece_cost)
+            remaining -= piece_quanta
+            piece += 1
+
+    product_cap_quanta = _to_quanta(product_hours_limit)
+    variety_cost = _unit_cost(weights.variety_beta / product_hours_limit) if product_hours_limit > 0 else 0
+    pair_nodes: Dict[Tuple[str, str], int] = {}
+    # (ロット識別子, 検査員コード, 辺番号)
+    lot_edges: List[Tuple[Any, str, int]] = []
+    source_edges: List[Tuple[Any, int]] = []
+    for lot in lots:
+        demand = int(round(lot.inspection_time / FLOW_QUANTUM_HOURS))
+        if demand <= 0:
+            continue
+        required = max(1, lot.required_inspectors)
+        share_quanta = max(1, int(math.ceil(demand / required)))
+        divided_time = max(lot.inspection_time / required, FLOW_QUANTUM_HOURS)
+        lot_node = network.add_node()
+        source_edges.append((lot.key, network.add_edge(source, lot_node, demand, _unit_cost(lot.rank * weights.fifo_step))))
+        for code, skill_rank in lot.candidates:
+            inspector_node = inspector_nodes.get(code)
+            if inspector_node is None:
+                continue
+            pair_key = (code, lot.product_number)
+            pair_node = pair_nodes.get(pair_key)
+            if pair_node is None:
+                pair_node = network.add_node()
+                pair_nodes[pair_key] = pair_node
+                network.add_edge(pair_node, inspector_node, product_cap_quanta, variety_cost)
+            edge_cost = _unit_cost(skill_rank * weights.skill_step + weights.lot_count_alpha / divided_time)
+            lot_edges.append((lot.key, code, network.add_edge(lot_node, pair_node, share_quanta, edge_cost)))
+
+    total_quanta, total_cost = network.flow(source, sink)
+
+    hours: Dict[Any, Dict[str, float]] = {}
+    for key, code, edge_id in lot_edges:
+        quanta = network.edge_flow(edge_id)
+        if quanta > 0:
+            hours.setdefault(key, {})[code] = quanta * FLOW_QUANTUM_HOURS
+    served_quanta = np.array([network.edge_flow(edge_id) for _, edge_id in source_edges], dtype=np.int64)
+    served_hours = {
+        key: float(quanta) * FLOW_QUANTUM_HOURS
+        for (key, _), quanta in zip(source_edges, served_quanta.tolist())
+    }
+    return FlowSolution(
+        hours=hours,
+        served_hours=served_hours,
+        total_hours=float(total_quanta) * FLOW_QUANTUM_HOURS,
+        total_cost=float(total_cost) / COST_SCALE,
+        iterations=network.iterations,
+    )
@@ -3,7 +3,7 @@
 検査員の割当て、スキルマッチング、新製品チーム対応などの機能を提供
 """
 
-from typing import Optional, List, Dict, Any, Tuple, Callable, Set, Union
+from typing import Optional, List, Dict, Any, Tuple, Callable, Set, Union, Iterable, Sequence
 from collections import defaultdict
 from datetime import date, timedelta
 from time import perf_counter
@@ -15,13 +15,76 @@ import os
 import openpyxl
 from pathlib import Path
 import re
-import unicodedata
 from loguru import logger as loguru_logger
 
 from app.utils.perf import perf_timer
+from app.utils.phase_profiler import PhaseProfiler, write_report
+from app.assignment.inspector_ids import EMPTY_INSPECTOR_ID, InspectorIdTable, inspector_id_column
+from app.assignment.inspector_state_store import (
+    HISTORY_DAILY_HOURS,
+    HISTORY_PRODUCT_COUNTS,
+    HISTORY_PRODUCT_HOURS,
+    InspectorAvailability,
+    InspectorStateStore,
+    MirroredHistory,
+)
+from app.assignment.skill_index import SkillIndex
+from app.assignment.fixed_inspector_index import FixedInspectorIndex, normalize_person_name
+from app.assignment.mix_prevention import DEFAULT_MIX_PREVENTION_GROUPS, MixPreventionIndex
+from app.assignment.process_master import ProcessMaster, load_process_master as load_shared_process_master
+from app.assignment.assignment_matrix import AssignmentMatrix
+from app.assignment.assignment_settings import AssignmentSettings, resolve_settings_path
+from app.assignment.bounded_metrics import BoundedKeySet, ReservoirHistory, RunningStats
+from app.assignment.candidate_cache import (
+    STATIC_CANDIDATES_OK,
+    STATIC_CANDIDATES_PROCESS_MISSING,
+    STATIC_CANDIDATES_PRODUCT_MISSING,
+    CandidateCache,
+    StaticCandidates,
+    make_cache_key,
+)
+from app.assignment.business_calendar import BusinessCalendar
+from app.assignment.shipping_date_index import (
+    LOT_KIND_COLUMN,
+    LOT_KIND_SAME_DAY_CLEANING,
+    PARSED_DATE_COLUMN,
+    ShippingDateIndex,
+    ShippingDateInfo,
+)
+from app.assignment.flow_solver import FlowCostWeights, FlowLot, solve_assignment_flow
+from app.assignment.multi_start import run_multi_start, score_assignment, tie_break_rank
+from app.assignment.optimization_budget import STOP_REASON_CANCELLED, OptimizationBudget
+from app.assignment.manual_edit import (
+    VIOLATION_DUPLICATE,
+    VIOLATION_PRODUCT_LIMIT,
+    VIOLATION_WORK_HOURS,
+    EditViolation,
+    ManualEditResult,
+    SwapSuggestion,
+    rank_swap_candidates,
+)
+from app.assignment.violation_queue import LotMember, ViolationQueue
+from app.assignment.warm_start import (
+    WARM_START_CLAIM,
+    WARM_START_REUSE,
+    WARM_START_SKIP,
+    WarmStartEntry,
+    default_warm_start_path,
+    load_warm_start,
+    lot_signature,
+    save_warm_start,
+)
 
 logger = logging.getLogger(__name__)
 
+# 【高速化】ログ整形用の事前コンパイル済みパターン
+# 異体字セレクタ・ZWJ・文字化けしやすい絵文字/記号ブロック（U+1F300〜U+1FAFF, U+2600〜U+27BF）を除去
+_LOG_SANITIZE_PATTERN = re.compile("[\uFE0F\u200D\U0001F300-\U0001FAFF\u2600-\u27BF]")
+_LOG_SPACES_PATTERN = re.compile(r"[ \t]{2,}")
+_RELAX_ASSIGN_PRODUCT_PATTERN = re.compile(r"品番:\s*([^,)\s]+)")
+# 【高速化】pd.Timestamp.min は属性参照のたびに生成コストがかかるため、候補優先度の既定値として1度だけ取得する
+_TIMESTAMP_MIN = pd.Timestamp.min
+
 # 定数定義
 # 4時間上限ルールの2段階化
 PRODUCT_LIMIT_DRAFT_THRESHOLD = 4.5  # ドラフトフェーズでの許容上限（4.5h未満まで許容）
@@ -60,10 +123,8 @@ HIGH_PRIORITY_RESERVED_CAPACITY_HOURS = 3.5  # 優先ロットの間、各検査
 HIGH_PRIORITY_SHIPPING_THRESHOLD = 2        # この番付以下（当日・当日洗浄）を優先ロットとする
 SAME_DAY_FORCE_SECOND_INSPECTOR_HOURS = 3.0  # 当日洗浄上がり品で最低2人以上とする検査時間の境界（h）
 SAME_DAY_RELAXATION_THRESHOLD_HOURS = 3.0    # 当日洗浄上がり品の制約緩和を始める検査時間の境界（h）
-# 類似製品の混入防止（同一検査員への重複割当禁止）
-MIX_PREVENTION_PRODUCT_PAIRS = (
-    frozenset({"08131-00810", "08131-01010"}),
-)
+# 終日休暇として候補から除外する休暇コード（AM/PM/早/遅は勤務可能）
+FULL_DAY_VACATION_CODES = frozenset({"休", "出", "当"})
 
 # 品番切替ペナルティ係数
 PENALTY_LOT_COUNT_ALPHA = 2.0 / 60.0  # 割当ロット数に対するペナルティ（2分相当を時間に変換）
@@ -132,7 +193,8 @@ class InspectorAssignmentManager:
         log_callback: Optional[Callable[[str], None]] = None,
         debug_mode: bool = False,
         product_limit_hard_threshold: Optional[float] = None,
-        required_inspectors_threshold: Optional[float] = None
+        required_inspectors_threshold: Optional[float] = None,
+        settings: Optional[AssignmentSettings] = None
     ) -> None:
         """
         初期化
@@ -142,9 +204,12 @@ class InspectorAssignmentManager:
             debug_mode: デバッグモード（Trueの場合、詳細なデバッグログを出力）
             product_limit_hard_threshold: 同一品番の4時間上限（Noneの場合はデフォルト値4.0を使用）
             required_inspectors_threshold: 必要人数計算の3時間基準（Noneの場合はデフォルト値3.0を使用）
+            settings: 割当エンジンの設定（Noneの場合は環境変数から読み込む）
         """
         self.log_callback = log_callback
         self.debug_mode = debug_mode
+        # 【追加】割当エンジンの設定（生成時に読み込むため config.env の値も反映される）
+        self.settings = settings if settings is not None else AssignmentSettings.from_env()
         
         # 設定値の適用（Noneの場合はデフォルト値を使用）
         self.product_limit_hard_threshold = (
@@ -161,6 +226,9 @@ class InspectorAssignmentManager:
         self.same_day_force_second_inspector_threshold = SAME_DAY_FORCE_SECOND_INSPECTOR_HOURS
         # FIFO最優先で未割当を許容する運用（後処理での埋め戻しを抑制）
         self.fifo_priority_allow_unassigned = True
+        # 【高速化】検査員状態の配列ストア（検査員×品番の時間行列・検査員×日付の勤務時間行列・最大勤務時間キャッシュ）
+        # 品番別時間・品番別割当回数・日別勤務時間の履歴辞書は状態ストアに接続され、書き込みがその場で配列へ反映される
+        self.state_store = InspectorStateStore()
         # 検査員の割り当て履歴を追跡（公平な割り当てのため）
         self.inspector_assignment_count = {}
         self.inspector_last_assignment = {}
@@ -179,8 +247,8 @@ class InspectorAssignmentManager:
         # 形式: { inspector_code: set(product_numbers) }
         self.inspector_product_variety = {}
         # 警告の重複出力を防ぐためのセット
-        # 形式: {(警告タイプ, キー)} - 同じ警告を1回だけ出力
-        self.logged_warnings = set()
+        # 形式: {(警告タイプ, キー)} - 同じ警告を1回だけ出力（件数上限付き）
+        self.logged_warnings = BoundedKeySet(self.settings.logged_warnings_max)
         # 新製品チーム列の確認ログを1回だけ出力するためのフラグ
         self.new_product_team_logged = False
         # 新製品チームメンバー数のログを1回だけ出力するためのフラグ
@@ -204,15 +272,66 @@ class InspectorAssignmentManager:
         # 形式: {品名: set(検査員コード)} - 各品名ごとに割り当てられた検査員のセット
         # 例: "3D025-G4960"と"3D025-M006A"は別品番だが品名が"ｷﾞﾔB"で同じ場合、同じ検査員を割り当てない
         self.same_day_cleaning_inspectors_by_product_name = {}
+        # 【高速化】割当台帳: 当日洗浄上がり品セットの参照カウント（差分更新で解除時にセットから外す判定に使用）
+        # 形式: {(品番, 検査員コード): ロット数}, {(品名, 検査員コード): ロット数}
+        self._ledger_same_day_counts: Dict[Tuple[str, str], int] = {}
+        self._ledger_same_day_name_counts: Dict[Tuple[str, str], int] = {}
         # 当日洗浄品の同一品名制約を緩和した回数を追跡（製品/品名単位）
         self.same_day_same_name_relaxation_attempts = {}
         # 品番ごとの割当回数を追跡
         # 形式: {検査員コード: {品番: 回数}}
         self.inspector_product_assignment_counts = {}
+        # 類似製品の混入防止クラス（set_mix_prevention_groups で設定ファイルの内容に差し替え、状態ストアがクラス別時間を保持）
+        self.mix_prevention_index = MixPreventionIndex.build(DEFAULT_MIX_PREVENTION_GROUPS)
+        self.state_store.set_conflict_classes(self.mix_prevention_index.product_classes, len(self.mix_prevention_index.classes))
+        # 【高速化】検査員コード ↔ 整数ID（結果DataFrameの非表示ID列 inspector_id_1〜N で使用）
+        self.inspector_id_table = InspectorIdTable()
+        # 【高速化】コンパイル済みスキルマスタ（割当実行ごとに1回構築し全フェーズで共有）
+        self._skill_index: Optional[SkillIndex] = None
+        # 【高速化】ベース候補の共有テーブル（(品番, 工程番号) ごとに1回だけ抽出し、ロットはグループIDで参照）
+        # _candidate_pool: 候補辞書（読み取り専用） / _candidate_groups: グループID → _candidate_pool の位置配列
+        self._candidate_pool: List[Dict[str, Any]] = []
+        self._candidate_groups: List[np.ndarray] = []
+        # 【追加】営業日カレンダー（初回使用時に HOLIDAY_CALENDAR_PATH から読み込む）
+        self._business_calendar: Optional[BusinessCalendar] = None
+        # 【高速化】出荷予定日の解析結果キャッシュ（ラベル判定・日付解析・FIFOキーを値ごとに1回だけ計算）
+        self._shipping_date_index = ShippingDateIndex()
+        # 【高速化】get_available_inspectors の静的候補キャッシュ（状態バージョンが変わると破棄）
+        self._candidate_cache = CandidateCache()
+        self._candidate_state_version = 0
+        # 【追加】割当ソルバーのモード（'greedy' または 'flow'）
+        self.solver_mode = self.settings.solver_mode
+        # 【追加】マルチスタート設定（スタート数・待ち時間の上限（秒）・ベースシード）
+        self.multi_start_count = self.settings.multi_start
+        self.multi_start_time_budget = self.settings.multi_start_budget_sec
+        self.multi_start_seed = self.settings.multi_start_seed
+        self._multi_start_active = False
+        # 【追加】ウォームスタート設定（保存先がNoneの場合は保存・読込しない）
+        self.warm_start_enabled = self.settings.warm_start
+        self.warm_start_path: Optional[Path] = (
+            Path(self.settings.warm_start_path) if self.settings.warm_start_path else default_warm_start_path()
+        )
+        # 今回実行のロットシグネチャ（生産ロットID → シグネチャ、最終割当の保存時に使用）
+        self._warm_start_signatures: Dict[str, Tuple[str, ...]] = {}
+        # 直近の実行で前回割当を引き継いだロット数
+        self.warm_start_reused_lots = 0
+        # 前回割当を引き継いだロットの生産ロットID（最適化フェーズでは動かさない）
+        self._warm_start_locked_lot_ids: Set[str] = set()
+        # 【追加】全体最適化の時間予算・中止要求（request_cancel_optimization でUIスレッドから中止できる）
+        self._optimization_budget = OptimizationBudget(self.settings.time_budget_sec)
+        # 同点ブレーカーのシード（Noneの場合は検査員コード昇順・元の行順で固定）
+        self.tie_break_seed: Optional[int] = None
+        # 【高速化】同点ブレーカーの検査員コード比較キーのキャッシュ（(シード, コード) → キー）
+        self._priority_code_key_cache: Dict[Tuple[Optional[int], Any], Tuple[int, Any]] = {}
+        # 【追加】フェーズ別プロファイラ（レポートの出力先はUI側でログファイルに合わせて設定）
+        self.phase_profiler = PhaseProfiler(self._profile_counters)
+        self.profile_report_path: Optional[Path] = None
+        self.last_profile_report: Dict[str, Any] = {}
         # 【追加】休暇情報を保持
         self.vacation_data = {}  # {検査員名: 休暇情報辞書}
         self.vacation_date = None  # 休暇情報の対象日付
         self.inspector_name_to_vacation = {}  # {検査員名: 休暇情報辞書} - 名前マッピング用
+        self.full_day_vacation_names: Set[str] = set()  # 終日休暇の検査員名（休暇情報設定時に作成）
         self.logged_vacation_messages = set()  # (inspector_name, code, interpretation, date)
         # 【追加】swap実施率追跡用
         self.swap_count = 0  # swapが実行された回数
@@ -221,7 +340,7 @@ class InspectorAssignmentManager:
         self.buffer_usage_metrics = {
             'total_checks': 0,  # バッファチェックの総回数
             'buffer_exceeded_count': 0,  # バッファを超えた回数
-            'buffer_exceeded_by': [],  # バッファ超過量のリスト
+            'buffer_exceeded_by': RunningStats(),  # バッファ超過量の集計（件数・合計・最大）
             'dynamic_buffer_adjustments': 0,  # 動的バッファ調整の回数
         }
         # 【追加】タブーリストの効果測定メトリクス
@@ -237,13 +356,13 @@ class InspectorAssignmentManager:
             'constraint_violations': 0,  # 制約違反の回数（通常制約）
             'relaxed_assignments': 0,  # 緩和条件が適用された割当回数
             'max_assignments_reached': {},  # 最大割当回数に達した検査員・品番の組み合わせ {inspector_code: {product_number: count}}
-            'relaxation_reasons': [],  # 緩和理由のリスト（デバッグ用）
+            'relaxation_reasons': ReservoirHistory(self.settings.metrics_history_size),  # 緩和理由の履歴（デバッグ用）
         }
         # 【追加】当日洗浄上がり品の制約緩和条件の効果測定メトリクス
         self.same_day_relaxation_metrics = {
             'total_relaxations': 0,  # 制約緩和が適用された総回数
             'relaxation_by_reason': {},  # 緩和理由別の回数 {reason: count}
-            'relaxation_history': [],  # 緩和履歴のリスト [{lot_index, product_number, reason, inspection_time, ...}]
+            'relaxation_history': ReservoirHistory(self.settings.metrics_history_size),  # 緩和履歴 [{lot_index, product_number, reason, inspection_time, ...}]
             'constraints_relaxed': {
                 'product_name_constraint': 0,  # 品名単位の重複禁止制約を緩和した回数
                 'product_number_constraint': 0,  # 品番単位の重複禁止制約を緩和した回数
@@ -258,7 +377,7 @@ class InspectorAssignmentManager:
             'total_protections': 0,  # 保護が適用された総回数
             'protection_by_violation_type': {},  # 違反タイプ別の保護回数 {violation_type: count}
             'protection_by_phase': {},  # フェーズ別の保護回数 {phase: count}
-            'protection_history': [],  # 保護履歴のリスト [{lot_index, product_number, violation_type, phase, ...}]
+            'protection_history': ReservoirHistory(self.settings.metrics_history_size),  # 保護履歴 [{lot_index, product_number, violation_type, phase, ...}]
             'protected_lots': set(),  # 保護されたロットのインデックス集合
             'protection_enabled': NEW_PRODUCT_PROTECTION_ENABLED,  # 保護が有効かどうか
             'protection_days': NEW_PRODUCT_PROTECTION_DAYS,  # 保護期間（日数）
@@ -268,7 +387,7 @@ class InspectorAssignmentManager:
             'total_protections': 0,  # 保護が適用された総回数
             'protection_by_phase': {},  # フェーズ別の保護回数 {phase: count}
             'protection_by_reason': {},  # 保護理由別の回数 {reason: count}
-            'protection_history': [],  # 保護履歴のリスト [{lot_index, product_number, inspector_name, phase, reason, ...}]
+            'protection_history': ReservoirHistory(self.settings.metrics_history_size),  # 保護履歴 [{lot_index, product_number, inspector_name, phase, reason, ...}]
             'protected_lots': set(),  # 保護されたロットのインデックス集合
             'protected_inspectors': set(),  # 保護された検査員名の集合
         }
@@ -280,6 +399,11 @@ class InspectorAssignmentManager:
         # 先行検査品の検査割当て人数（品番ごとの人数設定）
         # {品番: [ {'process': '工程名', 'headcount': 3}, ... ]}
         self.preinspection_assignment_targets: Dict[str, List[Dict[str, Any]]] = {}
+        # 【高速化】固定検査員・検査割当て人数のコンパイル済みインデックス（set_fixed_inspector_rules で再構築）
+        self.fixed_inspector_index = FixedInspectorIndex.build(
+            self.fixed_inspectors_by_product,
+            self.preinspection_assignment_targets,
+        )
         # 先行検査品の割当プール状態（1回の割当実行ごとに初期化）
         self._preinspection_assignment_state: Dict[Tuple[str, str], Dict[str, Any]] = {}
         # 同日洗浄品の制約緩和フラグ（品番: ロットインデックス）
@@ -291,9 +415,7 @@ class InspectorAssignmentManager:
         self.inspector_id_to_row = {}  # ID→行データのマッピング
         self._inspector_master_df_hash = None  # マスタのハッシュ（変更検知用）
         # 【高速化】工程マスタのキャッシュ
-        self._process_master_cache = None
-        self._process_master_cache_path = None
-        self._process_master_cache_mtime = None
+        self._process_master_cache: Optional[ProcessMaster] = None
         # 【高速化】ログ出力のバッチ化（オプション）
         self.log_batch_enabled = False  # デフォルトは無効（既存動作を維持）
         self.log_buffer = []  # ログをバッファリング
@@ -311,10 +433,64 @@ class InspectorAssignmentManager:
         # ログ削減: 频出メッセージを集計して最終だけ出す（通常運用のログ量を減らす）
         self._suppressed_relax_assign_total = 0
         self._suppressed_relax_assign_by_product = defaultdict(int)
+        # 【追加】debug=True で出力しなかったログの件数（種別ごと、メッセージ本文は保持しない）
+        self._suppressed_log_counts: Dict[str, int] = defaultdict(int)
+
+    # ------------------------------------------------------------------
+    # 【高速化】状態ストアに接続する履歴辞書（代入時に接続し直し、以降の書き込みは差分で配列へ反映）
+    # ------------------------------------------------------------------
+    def _attach_history(self, attr: str, kind: str, histories: Dict[str, Dict[Any, Any]]) -> None:
+        previous = self.__dict__.get(attr)
+        if histories is previous:
+            return
+        if isinstance(previous, MirroredHistory):
+            previous.detach()
+        self.__dict__[attr] = self.state_store.attach_history(kind, histories)
+
+    @property
+    def inspector_product_hours(self) -> Dict[str, Dict[str, float]]:
+        return self._inspector_product_hours
+
+    @inspector_product_hours.setter
+    def inspector_product_hours(self, histories: Dict[str, Dict[str, float]]) -> None:
+        self._attach_history('_inspector_product_hours', HISTORY_PRODUCT_HOURS, histories)
+
+    @property
+    def inspector_product_assignment_counts(self) -> Dict[str, Dict[str, int]]:
+        return self._inspector_product_assignment_counts
+
+    @inspector_product_assignment_counts.setter
+    def inspector_product_assignment_counts(self, histories: Dict[str, Dict[str, int]]) -> None:
+        self._attach_history('_inspector_product_assignment_counts', HISTORY_PRODUCT_COUNTS, histories)
+
+    @property
+    def inspector_daily_assignments(self) -> Dict[str, Dict[date, float]]:
+        return self._inspector_daily_assignments
+
+    @inspector_daily_assignments.setter
+    def inspector_daily_assignments(self, histories: Dict[str, Dict[date, float]]) -> None:
+        self._attach_history('_inspector_daily_assignments', HISTORY_DAILY_HOURS, histories)
+
+    def _load_state_store(self) -> None:
+        """履歴辞書から状態ストアの配列を作り直し、履歴を接続し直す（実行開始時・検査員インデックス再構築時のみ）"""
+        for attr in ('_inspector_product_hours', '_inspector_product_assignment_counts', '_inspector_daily_assignments'):
+            previous = self.__dict__.get(attr)
+            if isinstance(previous, MirroredHistory):
+                previous.detach()
+        (
+            self._inspector_product_hours,
+            self._inspector_product_assignment_counts,
+            self._inspector_daily_assignments,
+        ) = self.state_store.load_histories(
+            self.__dict__.get('_inspector_product_hours', {}),
+            self.__dict__.get('_inspector_product_assignment_counts', {}),
+            self.__dict__.get('_inspector_daily_assignments', {}),
+        )
     
     def log_message(
         self,
-        message: str,
+        message: Union[str, Callable[[], str]],
+        *args: Any,
         debug: bool = False,
         level: str = 'info'
     ) -> None:
@@ -323,19 +499,33 @@ class InspectorAssignmentManager:
         
         Args:
             message: ログメッセージ
+                args を指定した場合は %-形式の書式文字列、呼び出し可能オブジェクトの場合はメッセージを返す関数
+                （いずれも出力する場合のみ整形する）
+            *args: 書式文字列の引数
             debug: Trueの場合、debug_modeがTrueの時のみ出力
             level: ログレベル ('info', 'warning', 'error')
         """
         if debug and not self.debug_mode:
+            # 【高速化】出力しないメッセージは整形せず、種別（書式文字列・関数名）ごとの件数のみ集計
+            self._suppressed_log_counts[self._log_category(message, args)] += 1
             return
 
+        # 【追加】遅延評価のメッセージは出力する場合のみ整形
+        if args:
+            try:
+                message = message % args
+            except (TypeError, ValueError):
+                message = f"{message} {args!r}"
+        elif callable(message):
+            message = message()
+
         # 通常運用ではログが増えすぎるため、特定の頻出メッセージは集計して最後にまとめて出す
         try:
             if not self.debug_mode:
                 msg_str = str(message or "")
                 if msg_str.startswith("制約を一部緩和して割り当て:"):
                     self._suppressed_relax_assign_total += 1
-                    m = re.search(r"品番:\s*([^,)\s]+)", msg_str)
+                    m = _RELAX_ASSIGN_PRODUCT_PATTERN.search(msg_str)
                     if m:
                         self._suppressed_relax_assign_by_product[m.group(1)] += 1
                     return
@@ -369,28 +559,29 @@ class InspectorAssignmentManager:
             else:
                 loguru_logger_bound.info(message)
 
+    @staticmethod
+    def _log_category(message: Any, args: Tuple[Any, ...]) -> str:
+        """抑制したログの種別（書式文字列または関数名、即時整形済みの文字列は一括）"""
+        if args:
+            return str(message)
+        if callable(message):
+            return getattr(message, '__qualname__', 'callable')
+        return 'eager'
+
     @staticmethod
     def _sanitize_log_message(message: str) -> str:
         if message is None:
             return ""
         s = str(message)
 
-        # remove variation selectors / ZWJ
-        s = s.replace("\uFE0F", "").replace("\u200D", "")
-
-        # remove emoji/symbol blocks that often cause mojibake
-        cleaned = []
-        for ch in s:
-            o = ord(ch)
-            if 0x1F300 <= o <= 0x1FAFF:
-                continue
-            if 0x2600 <= o <= 0x27BF:
-                continue
-            cleaned.append(ch)
-        s = "".join(cleaned)
+        # remove variation selectors / ZWJ / emoji/symbol blocks that often cause mojibake
+        # 【高速化】1文字ずつのループではなく事前コンパイル済みの文字クラスで一括除去（ASCIIのみの場合は省略）
+        if not s.isascii():
+            s = _LOG_SANITIZE_PATTERN.sub("", s)
 
         # normalize consecutive spaces (keep newlines)
-        s = re.sub(r"[ \t]{2,}", " ", s)
+        if "  " in s or "\t" in s:
+            s = _LOG_SPACES_PATTERN.sub(" ", s)
         return s.strip()
 
     def _flush_log_buffer(self) -> None:
@@ -431,29 +622,17 @@ class InspectorAssignmentManager:
         # バッファをクリア
         self.log_buffer.clear()
 
-    def _normalize_shipping_date_string(self, shipping_date: Any) -> str:
-        """出荷予定日を文字列化して空白をトリム"""
-        if pd.isna(shipping_date):
-            return ''
-        return str(shipping_date).strip()
+    def _shipping_date_info(self, shipping_date: Any) -> ShippingDateInfo:
+        """出荷予定日の解析結果（種別・解析済み日付・FIFOキー）を取得（値ごとにキャッシュ）"""
+        return self._shipping_date_index.info(shipping_date)
 
     def _is_same_day_cleaning_label(self, shipping_date: Any) -> bool:
         """出荷予定日が当日洗浄・先行検査系かどうか判定"""
-        shipping_date_str = self._normalize_shipping_date_string(shipping_date)
-        if not shipping_date_str:
-            return False
-        if shipping_date_str in {"当日洗浄上がり品", "当日洗浄品", "当日洗浄", "当日先行検査", "先行検査"}:
-            return True
-        if ("当日洗浄" in shipping_date_str) or ("当日洗流E" in shipping_date_str):
-            return True
-        return False
+        return self._shipping_date_info(shipping_date).is_same_day_label
 
     def _is_preinspection_label(self, shipping_date: Any) -> bool:
         """出荷予定日が先行検査系かどうか判定（登録済み品番の先行検査ロット判定に使用）"""
-        shipping_date_str = self._normalize_shipping_date_string(shipping_date)
-        if not shipping_date_str:
-            return False
-        return "先行検査" in shipping_date_str
+        return self._shipping_date_info(shipping_date).is_preinspection_label
 
     def _is_locked_fixed_preinspection_lot(
         self,
@@ -463,12 +642,15 @@ class InspectorAssignmentManager:
     ) -> bool:
         """
         固定検査員が割り当て済みなら最適化で動かさない（固定維持）。
+        ウォームスタートで前回の検査員を引き継いだロットも同様に動かさない。
 
         restrict_to_preinspection=True の場合のみ、先行検査ラベルのロットに限定する。
         """
         try:
             if lot_index < 0 or lot_index >= len(result_df):
                 return False
+            if not restrict_to_preinspection and self._is_warm_start_locked_lot(result_df, lot_index):
+                return True
             shipping_date = result_df.at[lot_index, '出荷予定日'] if '出荷予定日' in result_df.columns else None
             if restrict_to_preinspection and not self._is_preinspection_label(shipping_date):
                 return False
@@ -486,17 +668,12 @@ class InspectorAssignmentManager:
             process_name = ''
             if '現在工程名' in result_df.columns:
                 process_name = str(result_df.at[lot_index, '現在工程名'] or '').strip()
-            fixed_names = self._collect_fixed_inspector_names(product_number, process_name)
-            if not fixed_names:
-                return False
-            for i in range(1, MAX_INSPECTORS_PER_LOT + 1):
-                col = f'検査員{i}'
-                if col not in result_df.columns:
-                    continue
-                current_name = str(result_df.at[lot_index, col] or '').strip()
-                if current_name and self._is_fixed_inspector_for_lot(product_number, process_name, current_name):
-                    return True
-            return False
+            current_names = [
+                result_df.at[lot_index, f'検査員{i}']
+                for i in range(1, MAX_INSPECTORS_PER_LOT + 1)
+                if f'検査員{i}' in result_df.columns
+            ]
+            return bool(self._fixed_inspector_mask(product_number, process_name, current_names).any())
         except Exception:
             return False
         return "当日洗浄" in shipping_date_str or "当日洗流" in shipping_date_str
@@ -528,6 +705,7 @@ class InspectorAssignmentManager:
         """
         result_df の割当結果から、勤務時間・品番時間などの履歴を再構築する。
         （割当解除/再割当を行った直後に使用）
+        ロット単位の差し替えは割当台帳（ledger_assign / ledger_unassign / ledger_move）で差分更新できる。
         """
         current_date = pd.Timestamp.now().date()
         self.inspector_daily_assignments = {}
@@ -540,6 +718,8 @@ class InspectorAssignmentManager:
         # 当日洗浄上がり品の追跡（品番/品名単位）も再構築
         self.same_day_cleaning_inspectors = {}
         self.same_day_cleaning_inspectors_by_product_name = {}
+        self._ledger_same_day_counts = {}
+        self._ledger_same_day_name_counts = {}
 
         if result_df is None or result_df.empty:
             return
@@ -550,76 +730,708 @@ class InspectorAssignmentManager:
 
         assignment_clock = pd.Timestamp.now()
         for row in result_df.itertuples(index=False):
-            product_number = row[cols['品番']]
-            if product_number is None or (isinstance(product_number, float) and pd.isna(product_number)):
-                continue
-            product_number_str = str(product_number).strip()
-            if not product_number_str:
+            contribution = self._ledger_lot_contribution(
+                lambda col, row=row: row[cols[col]] if col in cols else None,
+                current_date,
+                inspector_master_df,
+            )
+            if contribution is None:
                 continue
+            assignment_clock = self._ledger_apply_contribution(contribution, 1, assignment_clock)
+
+    # ------------------------------------------------------------------
+    # 割当台帳（履歴の差分更新）
+    # ------------------------------------------------------------------
+    def _get_inspector_id_by_name(self, inspector_name: Any, inspector_master_df: pd.DataFrame) -> Optional[str]:
+        """検査員名から#IDを取得（名前インデックス優先、見つからない場合はNone）"""
+        if not inspector_name or pd.isna(inspector_name):
+            return None
+        name_key = str(inspector_name).strip()
+        if '(' in name_key:
+            name_key = name_key.split('(')[0].strip()
+        inspector_row = self.inspector_name_to_row.get(name_key)
+        if inspector_row is None:
+            normalized_key = self._normalize_person_name(name_key)
+            if normalized_key:
+                inspector_row = self.inspector_name_to_row_normalized.get(normalized_key)
+        if inspector_row is not None:
+            return inspector_row['#ID']
+        inspector_info = self._get_inspector_by_name(name_key, inspector_master_df)
+        if inspector_info.empty:
+            return None
+        return inspector_info.iloc[0]['#ID']
+
+    def _set_inspector_slot(
+        self,
+        result_df: pd.DataFrame,
+        index: Any,
+        slot: int,
+        label: str,
+        inspector_code: Optional[str] = None,
+    ) -> None:
+        """検査員{slot}列に表示名を、対になるID列に検査員IDを設定する（コード省略時・空欄はID未設定）"""
+        result_df.at[index, f'検査員{slot}'] = label
+        id_col = inspector_id_column(slot)
+        if id_col in result_df.columns:
+            inspector_id = EMPTY_INSPECTOR_ID
+            if label and inspector_code:
+                inspector_id = self.inspector_id_table.intern(inspector_code)
+            result_df.at[index, id_col] = inspector_id
+
+    @staticmethod
+    def _inspector_slot_number(inspector_col: str) -> int:
+        """検査員列名（例: '検査員2'）から枠番号（1始まり）を求める"""
+        return int(str(inspector_col)[len('検査員'):])
+
+    @staticmethod
+    def _inspector_id_col_positions(result_df: pd.DataFrame) -> List[int]:
+        """ID列（inspector_id_1〜N）の列位置（itertuples用、列が無い枠は-1）"""
+        columns = result_df.columns
+        return [
+            columns.get_loc(inspector_id_column(i)) if inspector_id_column(i) in columns else -1
+            for i in range(1, MAX_INSPECTORS_PER_LOT + 1)
+        ]
+
+    def _slot_inspector(self, label: Any, inspector_id: Any) -> Optional[Tuple[Any, str]]:
+        """
+        ID列から検査員（コード, 氏名）を求める
+
+        Returns:
+            ID列が未設定、または表示名と食い違う場合はNone（呼び出し側で氏名から解決する）
+        """
+        resolved_id = self.inspector_id_table.resolve(inspector_id, label)
+        if resolved_id is None:
+            return None
+        return self.inspector_id_table.codes[resolved_id], self.inspector_id_table.names[resolved_id]
+
+    def _ledger_lot_contribution(
+        self,
+        get_value: Callable[[str], Any],
+        current_date: date,
+        inspector_master_df: pd.DataFrame,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        ロット1件が履歴に与える寄与を求める（_rebuild_assignment_histories と同じ規則）
+
+        Args:
+            get_value: 列名 → セル値（列が無い場合はNone）
+            current_date: 基準日
+            inspector_master_df: 検査員マスタ
+
+        Returns:
+            寄与がない（未割当・検査時間0など）場合はNone
+        """
+        product_number = get_value('品番')
+        if product_number is None or (isinstance(product_number, float) and pd.isna(product_number)):
+            return None
+        product_number_str = str(product_number).strip()
+        if not product_number_str:
+            return None
 
+        inspector_count_val = get_value('検査員人数')
+        try:
+            inspector_count = int(inspector_count_val) if inspector_count_val is not None and pd.notna(inspector_count_val) else 0
+        except Exception:
             inspector_count = 0
-            if '検査員人数' in cols:
-                inspector_count_val = row[cols['検査員人数']]
-                try:
-                    inspector_count = int(inspector_count_val) if pd.notna(inspector_count_val) else 0
-                except Exception:
-                    inspector_count = 0
-            if inspector_count <= 0:
+        if inspector_count <= 0:
+            return None
+
+        inspection_time_val = get_value('検査時間')
+        try:
+            inspection_time = float(inspection_time_val) if inspection_time_val is not None and pd.notna(inspection_time_val) else 0.0
+        except Exception:
+            inspection_time = 0.0
+        if inspection_time <= 0.0:
+            return None
+
+        shipping_date_raw = get_value('出荷予定日')
+        product_name_val = get_value('品名')
+        product_name_str = str(product_name_val).strip() if product_name_val is not None and pd.notna(product_name_val) else ''
+
+        codes: List[str] = []
+        for i in range(1, MAX_INSPECTORS_PER_LOT + 1):
+            inspector_name_raw = get_value(f'検査員{i}')
+            if inspector_name_raw is None or pd.isna(inspector_name_raw) or str(inspector_name_raw).strip() == '':
+                continue
+            # 【高速化】ID列が表示名と一致していれば氏名の分解・照合を省く
+            slot_inspector = self._slot_inspector(inspector_name_raw, get_value(inspector_id_column(i)))
+            if slot_inspector is not None:
+                codes.append(slot_inspector[0])
+                continue
+            inspector_name = str(inspector_name_raw).strip()
+            if '(' in inspector_name:
+                inspector_name = inspector_name.split('(')[0].strip()
+            if not inspector_name:
+                continue
+            inspector_code = self._get_inspector_id_by_name(inspector_name, inspector_master_df)
+            if inspector_code is None:
                 continue
+            codes.append(inspector_code)
+
+        return {
+            'product_number': product_number_str,
+            'product_name': product_name_str,
+            'divided_time': inspection_time / inspector_count,
+            'lot_date': self._resolve_lot_date(shipping_date_raw, current_date),
+            'is_same_day': self._should_force_assign_same_day(shipping_date_raw),
+            'codes': codes,
+        }
+
+    def _ledger_apply_contribution(
+        self,
+        contribution: Dict[str, Any],
+        sign: int,
+        assignment_clock: Optional[pd.Timestamp] = None,
+    ) -> Optional[pd.Timestamp]:
+        """
+        ロットの寄与を履歴へ加算（sign=1）または減算（sign=-1）する
 
+        Returns:
+            次の割当時刻（加算時のみ1秒ずつ進める）
+        """
+        product_number = contribution['product_number']
+        product_name = contribution['product_name']
+        lot_date = contribution['lot_date']
+        hours = contribution['divided_time'] * sign
+        is_same_day = contribution['is_same_day']
+
+        for inspector_code in contribution['codes']:
+            daily = self.inspector_daily_assignments.setdefault(inspector_code, {})
+            daily[lot_date] = daily.get(lot_date, 0.0) + hours
+            self.inspector_work_hours[inspector_code] = self.inspector_work_hours.get(inspector_code, 0.0) + hours
+            product_hours = self.inspector_product_hours.setdefault(inspector_code, {})
+            product_hours[product_number] = product_hours.get(product_number, 0.0) + hours
+            self.inspector_assignment_count[inspector_code] = self.inspector_assignment_count.get(inspector_code, 0) + sign
+            product_counts = self.inspector_product_assignment_counts.setdefault(inspector_code, {})
+            product_counts[product_number] = product_counts.get(product_number, 0) + sign
+
+            if sign > 0:
+                if assignment_clock is None:
+                    assignment_clock = pd.Timestamp.now()
+                self.inspector_last_assignment[inspector_code] = assignment_clock
+                assignment_clock += pd.Timedelta(seconds=1)
+            else:
+                # 再構築結果と揃えるため、担当がなくなった品番・検査員のキーは削除する
+                if product_counts.get(product_number, 0) <= 0:
+                    product_counts.pop(product_number, None)
+                    product_hours.pop(product_number, None)
+                if self.inspector_assignment_count.get(inspector_code, 0) <= 0:
+                    for history in (
+                        self.inspector_daily_assignments,
+                        self.inspector_work_hours,
+                        self.inspector_product_hours,
+                        self.inspector_assignment_count,
+                        self.inspector_last_assignment,
+                        self.inspector_product_assignment_counts,
+                    ):
+                        history.pop(inspector_code, None)
+
+            if is_same_day:
+                self._ledger_update_same_day(
+                    self.same_day_cleaning_inspectors, self._ledger_same_day_counts,
+                    product_number, inspector_code, sign,
+                )
+                if product_name:
+                    self._ledger_update_same_day(
+                        self.same_day_cleaning_inspectors_by_product_name, self._ledger_same_day_name_counts,
+                        product_name, inspector_code, sign,
+                    )
+        return assignment_clock
+
+    @staticmethod
+    def _ledger_update_same_day(
+        inspectors_by_key: Dict[str, Set[str]],
+        ref_counts: Dict[Tuple[str, str], int],
+        key: str,
+        inspector_code: str,
+        sign: int,
+    ) -> None:
+        """当日洗浄上がり品セットを参照カウント付きで更新"""
+        count = ref_counts.get((key, inspector_code), 0) + sign
+        if count > 0:
+            ref_counts[(key, inspector_code)] = count
+            inspectors_by_key.setdefault(key, set()).add(inspector_code)
+            return
+        ref_counts.pop((key, inspector_code), None)
+        members = inspectors_by_key.get(key)
+        if members is not None:
+            members.discard(inspector_code)
+            if not members:
+                inspectors_by_key.pop(key, None)
+
+    def _ledger_row_getter(self, result_df: pd.DataFrame, index: Any) -> Callable[[str], Any]:
+        """result_df の1行を列名で参照する関数を返す"""
+        columns = result_df.columns
+        return lambda col: result_df.at[index, col] if col in columns else None
+
+    def _ledger_release_lot(self, result_df: pd.DataFrame, index: Any, inspector_master_df: pd.DataFrame) -> None:
+        """ロットの現在の割当を履歴から差し引く（セル変更の直前に呼ぶ）"""
+        contribution = self._ledger_lot_contribution(
+            self._ledger_row_getter(result_df, index), pd.Timestamp.now().date(), inspector_master_df
+        )
+        if contribution is not None:
+            self._ledger_apply_contribution(contribution, -1)
+
+    def _ledger_register_lot(self, result_df: pd.DataFrame, index: Any, inspector_master_df: pd.DataFrame) -> None:
+        """ロットの現在の割当を履歴へ加算する（セル変更の直後に呼ぶ）"""
+        contribution = self._ledger_lot_contribution(
+            self._ledger_row_getter(result_df, index), pd.Timestamp.now().date(), inspector_master_df
+        )
+        if contribution is not None:
+            self._ledger_apply_contribution(contribution, 1)
+
+    def _ledger_set_inspector_count(self, result_df: pd.DataFrame, index: Any) -> int:
+        """検査員列の実人数で検査員人数・分割検査時間を更新し、人数を返す"""
+        assigned_count = 0
+        for i in range(1, MAX_INSPECTORS_PER_LOT + 1):
+            column_name = f'検査員{i}'
+            if column_name not in result_df.columns:
+                continue
+            value = result_df.at[index, column_name]
+            if pd.notna(value) and str(value).strip() != '':
+                assigned_count += 1
+        result_df.at[index, '検査員人数'] = assigned_count
+        inspection_time = result_df.at[index, '検査時間'] if '検査時間' in result_df.columns else 0.0
+        try:
+            inspection_time = float(inspection_time) if pd.notna(inspection_time) else 0.0
+        except Exception:
             inspection_time = 0.0
-            if '検査時間' in cols:
-                inspection_time_val = row[cols['検査時間']]
-                try:
-                    inspection_time = float(inspection_time_val) if pd.notna(inspection_time_val) else 0.0
-                except Exception:
-                    inspection_time = 0.0
-            if inspection_time <= 0.0:
+        if assigned_count > 0 and inspection_time > 0:
+            result_df.at[index, '分割検査時間'] = round(inspection_time / assigned_count, 1)
+        else:
+            result_df.at[index, '分割検査時間'] = 0.0
+        return assigned_count
+
+    def ledger_assign(
+        self,
+        result_df: pd.DataFrame,
+        index: Any,
+        display_names: List[str],
+        inspector_master_df: pd.DataFrame,
+        show_skill_values: bool = False,
+        inspector_codes: Optional[List[Any]] = None,
+    ) -> None:
+        """
+        ロットの検査員を指定の顔ぶれに置き換え、履歴へ差分を反映する
+
+        検査員人数・分割検査時間は実人数で再計算し、チーム情報も更新する。
+
+        Args:
+            inspector_codes: display_names と同じ順の検査員コード（指定時はID列も設定する）
+        """
+        self._ledger_release_lot(result_df, index, inspector_master_df)
+        for i in range(1, MAX_INSPECTORS_PER_LOT + 1):
+            if f'検査員{i}' in result_df.columns:
+                self._set_inspector_slot(result_df, index, i, '')
+        for i, display_name in enumerate(display_names, start=1):
+            column_name = f'検査員{i}'
+            if column_name in result_df.columns:
+                inspector_code = inspector_codes[i - 1] if inspector_codes is not None else None
+                self._set_inspector_slot(result_df, index, i, display_name, inspector_code)
+        self._ledger_set_inspector_count(result_df, index)
+        self._ledger_register_lot(result_df, index, inspector_master_df)
+        self.update_team_info(result_df, index, inspector_master_df, show_skill_values)
+
+    def ledger_unassign(
+        self,
+        result_df: pd.DataFrame,
+        index: Any,
+        inspector_col: Optional[str],
+        inspector_master_df: pd.DataFrame,
+        show_skill_values: bool = False,
+        unassigned_reason: Optional[str] = None,
+    ) -> int:
+        """
+        ロットから検査員を1名解除（inspector_col=Noneの場合はロット全体を未割当）し、履歴へ差分を反映する
+
+        Args:
+            unassigned_reason: 未割当になった場合にチーム情報へ設定する理由
+
+        Returns:
+            解除後の検査員人数
+        """
+        self._ledger_release_lot(result_df, index, inspector_master_df)
+        remaining_count = 0
+        if inspector_col is not None:
+            self._set_inspector_slot(result_df, index, self._inspector_slot_number(inspector_col), '')
+            remaining_count = self._ledger_set_inspector_count(result_df, index)
+        if remaining_count <= 0:
+            try:
+                pos = result_df.index.get_loc(index)
+            except Exception:
+                pos = int(index)
+            self.clear_assignment(result_df, pos)
+            if unassigned_reason and 'チーム情報' in result_df.columns:
+                result_df.at[index, 'チーム情報'] = unassigned_reason
+        else:
+            self._ledger_register_lot(result_df, index, inspector_master_df)
+            self.update_team_info(result_df, index, inspector_master_df, show_skill_values)
+        return remaining_count
+
+    def ledger_move(
+        self,
+        result_df: pd.DataFrame,
+        index: Any,
+        inspector_col: str,
+        display_name: str,
+        inspector_master_df: pd.DataFrame,
+        show_skill_values: bool = False,
+        recount: bool = False,
+        inspector_code: Optional[Any] = None,
+    ) -> None:
+        """
+        ロットの検査員列を別の検査員に差し替え、履歴へ差分を反映する
+
+        Args:
+            recount: Trueの場合、検査員人数・分割検査時間を実人数で再計算する
+            inspector_code: 差し替え後の検査員コード（指定時はID列も設定する）
+        """
+        self._ledger_release_lot(result_df, index, inspector_master_df)
+        self._set_inspector_slot(result_df, index, self._inspector_slot_number(inspector_col), display_name, inspector_code)
+        if recount:
+            self._ledger_set_inspector_count(result_df, index)
+        self._ledger_register_lot(result_df, index, inspector_master_df)
+        self.update_team_info(result_df, index, inspector_master_df, show_skill_values)
+
+    def apply_manual_edit(
+        self,
+        result_df: pd.DataFrame,
+        index: Any,
+        inspector_col: str,
+        new_display_name: Optional[str],
+        inspector_master_df: pd.DataFrame,
+        skill_master_df: Optional[pd.DataFrame] = None,
+        show_skill_values: bool = False,
+        max_suggestions: int = 3,
+    ) -> ManualEditResult:
+        """
+        手動修正1枠分を差分反映し、影響を受けた検査員だけを再検証する（全体最適化は再実行しない）
+
+        割当台帳で履歴を差分更新したうえで、編集前後のロット構成員について
+        当日勤務時間・同一品番累計時間・ロット内重複を確認し、違反があれば
+        編集したロットの該当枠を入れ替える候補を返す。
+
+        Args:
+            result_df: 割当結果（その場で更新する）
+            index: 編集したロットの行インデックス
+            inspector_col: 編集した検査員列（例: '検査員2'）
+            new_display_name: 新しい検査員名（空・Noneの場合はその枠を未割当にする）
+            inspector_master_df: 検査員マスタ
+            skill_master_df: スキルマスタ（指定時は差し替え候補を品番のスキル保有者に限定）
+            show_skill_values: チーム情報にスキル値を表示するか
+            max_suggestions: 違反1件あたりの差し替え候補の上限
+
+        Returns:
+            ManualEditResult
+        """
+        started = perf_counter()
+        before = self._ledger_lot_contribution(
+            self._ledger_row_getter(result_df, index), pd.Timestamp.now().date(), inspector_master_df
+        )
+
+        if new_display_name is None or str(new_display_name).strip() == '':
+            self.ledger_unassign(result_df, index, inspector_col, inspector_master_df, show_skill_values)
+        else:
+            self.ledger_move(
+                result_df, index, inspector_col, str(new_display_name).strip(), inspector_master_df,
+                show_skill_values, recount=True,
+            )
+        return self._validate_manual_edit(result_df, index, before, inspector_master_df, skill_master_df, max_suggestions, started)
+
+    def apply_manual_team_edit(
+        self,
+        result_df: pd.DataFrame,
+        index: Any,
+        display_names: List[str],
+        inspector_master_df: pd.DataFrame,
+        skill_master_df: Optional[pd.DataFrame] = None,
+        show_skill_values: bool = False,
+        inspector_codes: Optional[List[Any]] = None,
+        max_suggestions: int = 3,
+    ) -> ManualEditResult:
+        """
+        ロットの検査員をまとめて置き換え（検査員変更ダイアログの複数選択）、apply_manual_edit と同じく差分反映・再検証する
+
+        Args:
+            display_names: 新しい検査員名（検査員1列から順に設定、空の場合はロット全体を未割当にする）
+            inspector_codes: display_names と同じ順の検査員コード（指定時はID列も設定する）
+
+        Returns:
+            ManualEditResult
+        """
+        started = perf_counter()
+        before = self._ledger_lot_contribution(
+            self._ledger_row_getter(result_df, index), pd.Timestamp.now().date(), inspector_master_df
+        )
+        if display_names:
+            self.ledger_assign(
+                result_df, index, display_names, inspector_master_df, show_skill_values, inspector_codes=inspector_codes
+            )
+        else:
+            self.ledger_unassign(result_df, index, None, inspector_master_df, show_skill_values)
+        return self._validate_manual_edit(result_df, index, before, inspector_master_df, skill_master_df, max_suggestions, started)
+
+    def _validate_manual_edit(
+        self,
+        result_df: pd.DataFrame,
+        index: Any,
+        before: Optional[Dict[str, Any]],
+        inspector_master_df: pd.DataFrame,
+        skill_master_df: Optional[pd.DataFrame],
+        max_suggestions: int,
+        started: float,
+    ) -> ManualEditResult:
+        """手動修正の前後のロット構成員について違反を確認し、差し替え候補を求める（before は編集前の寄与）"""
+        current_date = pd.Timestamp.now().date()
+        row_getter = self._ledger_row_getter(result_df, index)
+        after = self._ledger_lot_contribution(row_getter, current_date, inspector_master_df)
+        affected: List[str] = []
+        for contribution in (before, after):
+            if contribution is None:
                 continue
+            for code in contribution['codes']:
+                if code not in affected:
+                    affected.append(code)
+
+        product_number = (after or before or {}).get('product_number', '')
+        lot_date = (after or before or {}).get('lot_date', current_date)
 
-            divided_time = inspection_time / inspector_count
+        def _name(code: str) -> str:
+            row = self.inspector_id_to_row.get(code)
+            return str(row['#氏名']) if row is not None else code
 
-            shipping_date_raw = row[cols.get('出荷予定日', -1)] if '出荷予定日' in cols else None
-            is_same_day = self._should_force_assign_same_day(shipping_date_raw)
-            lot_date_for_rebuild = self._resolve_lot_date(shipping_date_raw, current_date)
-            product_name_str = ''
-            if '品名' in cols:
-                product_name_val = row[cols['品名']]
-                product_name_str = str(product_name_val).strip() if pd.notna(product_name_val) else ''
+        def _daily_hours(code: str) -> float:
+            return self.inspector_daily_assignments.get(code, {}).get(lot_date, 0.0)
 
+        def _product_hours(code: str) -> float:
+            return self.inspector_product_hours.get(code, {}).get(product_number, 0.0)
+
+        def _allowed_hours(code: str) -> float:
+            return self._apply_work_hours_overrun(
+                self.get_inspector_max_hours(code, inspector_master_df)
+            ) - WORK_HOURS_BUFFER
+
+        violations: List[EditViolation] = []
+        for code in affected:
+            daily_hours = _daily_hours(code)
+            allowed_hours = _allowed_hours(code)
+            if daily_hours > allowed_hours + 1e-6:
+                violations.append(EditViolation(VIOLATION_WORK_HOURS, code, _name(code), daily_hours, allowed_hours))
+            product_hours = _product_hours(code)
+            if product_number and product_hours > PRODUCT_LIMIT_HARD_THRESHOLD + 1e-6:
+                violations.append(EditViolation(
+                    VIOLATION_PRODUCT_LIMIT, code, _name(code), product_hours, PRODUCT_LIMIT_HARD_THRESHOLD
+                ))
+        lot_codes = after['codes'] if after is not None else []
+        for code in sorted(set(lot_codes)):
+            duplicates = lot_codes.count(code)
+            if duplicates > 1:
+                violations.append(EditViolation(VIOLATION_DUPLICATE, code, _name(code), float(duplicates), 1.0))
+
+        suggestions: List[SwapSuggestion] = []
+        if violations and after is not None and max_suggestions > 0:
+            # 差し替え対象: 違反のあるロット構成員（列名は表示名から引き当てる）
+            column_by_code: Dict[str, str] = {}
             for i in range(1, MAX_INSPECTORS_PER_LOT + 1):
-                inspector_col = f'検査員{i}'
-                if inspector_col not in cols:
-                    continue
-                inspector_name_raw = row[cols[inspector_col]]
-                if pd.isna(inspector_name_raw) or str(inspector_name_raw).strip() == '':
-                    continue
-                inspector_name = str(inspector_name_raw).strip()
-                if '(' in inspector_name:
-                    inspector_name = inspector_name.split('(')[0].strip()
-                if not inspector_name:
+                column_name = f'検査員{i}'
+                code = self._get_inspector_id_by_name(row_getter(column_name), inspector_master_df)
+                if code is not None and code not in column_by_code:
+                    column_by_code[code] = column_name
+            divided_time = after['divided_time']
+            # 候補は割当エンジンと同じ候補抽出・実行可能性フィルタを通す（混入防止・当日洗浄・休暇・固定検査員）
+            pool = [
+                inspector['コード']
+                for inspector in self._manual_edit_candidates(
+                    row_getter, product_number, divided_time, lot_date, inspector_master_df, skill_master_df
+                )
+            ]
+            # 編集で外した検査員も候補にしない
+            excluded = set(lot_codes) | set(before['codes'] if before is not None else [])
+            suggested_out: Set[str] = set()
+            for violation in violations:
+                out_code = violation.code
+                if out_code in suggested_out or out_code not in column_by_code:
                     continue
+                suggested_out.add(out_code)
+                ranked = rank_swap_candidates(
+                    pool, excluded, divided_time, _daily_hours, _product_hours, _allowed_hours,
+                    PRODUCT_LIMIT_HARD_THRESHOLD,
+                    lambda code: self._priority_code_key({'コード': code}),
+                    max_suggestions,
+                )
+                for in_code, daily_after, product_after in ranked:
+                    suggestions.append(SwapSuggestion(
+                        column_by_code[out_code], out_code, in_code, _name(in_code), daily_after, product_after
+                    ))
+
+        return ManualEditResult(
+            index,
+            tuple(affected),
+            tuple(violations),
+            tuple(suggestions),
+            (perf_counter() - started) * 1000.0,
+        )
 
-                inspector_info = self._get_inspector_by_name(inspector_name, inspector_master_df)
-                if inspector_info.empty:
-                    continue
-                inspector_code = inspector_info.iloc[0]['#ID']
-
-                self.inspector_daily_assignments.setdefault(inspector_code, {}).setdefault(lot_date_for_rebuild, 0.0)
-                self.inspector_daily_assignments[inspector_code][lot_date_for_rebuild] += divided_time
-                self.inspector_work_hours[inspector_code] = self.inspector_work_hours.get(inspector_code, 0.0) + divided_time
-                self.inspector_product_hours.setdefault(inspector_code, {}).setdefault(product_number_str, 0.0)
-                self.inspector_product_hours[inspector_code][product_number_str] += divided_time
-                self.inspector_assignment_count[inspector_code] = self.inspector_assignment_count.get(inspector_code, 0) + 1
-                self.inspector_last_assignment[inspector_code] = assignment_clock
-                self.inspector_product_assignment_counts.setdefault(inspector_code, {}).setdefault(product_number_str, 0)
-                self.inspector_product_assignment_counts[inspector_code][product_number_str] += 1
-                assignment_clock += pd.Timedelta(seconds=1)
+    def _manual_edit_candidates(
+        self,
+        row_getter: Callable[[str], Any],
+        product_number: str,
+        divided_time: float,
+        lot_date: date,
+        inspector_master_df: pd.DataFrame,
+        skill_master_df: Optional[pd.DataFrame],
+    ) -> List[Dict[str, Any]]:
+        """
+        手動修正したロットに入れられる検査員（最小費用流の修復ステップと同じ判定）
 
-                if is_same_day:
-                    self.same_day_cleaning_inspectors.setdefault(product_number_str, set()).add(inspector_code)
-                    if product_name_str:
-                        self.same_day_cleaning_inspectors_by_product_name.setdefault(product_name_str, set()).add(inspector_code)
+        スキルマスタ指定時は get_available_inspectors（スキル・固定検査員・混入防止）、未指定時は全検査員を起点に、
+        filter_available_inspectors（休暇・勤務時間・品番上限・混入防止）と同一品番の厳格上限、
+        当日洗浄品の同一品番・同一品名の担当済み検査員の除外を適用する。
+        """
+        process_name = row_getter('現在工程名')
+        process_name_str = str(process_name).strip() if process_name is not None and pd.notna(process_name) else ''
+        shipping_date = row_getter('出荷予定日')
+        if skill_master_df is not None:
+            candidates = self.get_available_inspectors(
+                product_number,
+                row_getter('現在工程番号'),
+                skill_master_df,
+                inspector_master_df,
+                shipping_date=shipping_date,
+                process_name_context=process_name_str,
+            )
+        else:
+            candidates = [
+                {'コード': code, '氏名': str(row['#氏名'])} for code, row in self.inspector_id_to_row.items()
+            ]
+        feasible = self.filter_available_inspectors(
+            candidates,
+            divided_time,
+            inspector_master_df,
+            product_number,
+            process_name_context=process_name_str,
+            lot_date=lot_date,
+        )
+        feasible = [
+            inspector for inspector in feasible
+            if inspector.get('__projected_product_hours', 0.0) <= self.product_limit_hard_threshold + 1e-9
+        ]
+        if self._is_same_day_cleaning_label(shipping_date):
+            product_name = row_getter('品名')
+            product_name_str = str(product_name).strip() if product_name is not None and pd.notna(product_name) else ''
+            excluded_codes = set(self.same_day_cleaning_inspectors.get(product_number, set()))
+            if product_name_str:
+                excluded_codes |= self.same_day_cleaning_inspectors_by_product_name.get(product_name_str, set())
+            feasible = [inspector for inspector in feasible if inspector.get('コード') not in excluded_codes]
+        return feasible
+
+    def _snapshot_selection_histories(self, codes: List[str]) -> Dict[str, Dict[str, Any]]:
+        """select_inspectors_with_skill_combination が更新する履歴を検査員単位で退避"""
+        snapshot: Dict[str, Dict[str, Any]] = {}
+        for code in codes:
+            if not code or code in snapshot:
+                continue
+            saved: Dict[str, Any] = {}
+            for attr in ('inspector_assignment_count', 'inspector_last_assignment', 'inspector_work_hours', 'inspector_daily_assignments'):
+                history = getattr(self, attr)
+                if code in history:
+                    value = history[code]
+                    saved[attr] = dict(value) if isinstance(value, dict) else value
+            snapshot[code] = saved
+        return snapshot
+
+    def _restore_selection_histories(self, snapshot: Dict[str, Dict[str, Any]]) -> None:
+        """_snapshot_selection_histories で退避した履歴を戻す"""
+        for code, saved in snapshot.items():
+            for attr in ('inspector_assignment_count', 'inspector_last_assignment', 'inspector_work_hours', 'inspector_daily_assignments'):
+                history = getattr(self, attr)
+                if attr in saved:
+                    history[code] = saved[attr]
+                else:
+                    history.pop(code, None)
+
+    def _verify_ledger_consistency(
+        self,
+        result_df: pd.DataFrame,
+        inspector_master_df: pd.DataFrame,
+        context: str,
+    ) -> bool:
+        """
+        デバッグモード時のみ、差分更新した履歴と全件再構築の結果を比較する
+
+        不一致の場合は警告を出し、再構築結果を採用する（割当時刻は比較対象外）。
+        """
+        if not self.debug_mode:
+            return True
+
+        def _normalized_hours(history: Dict[str, Dict[Any, float]]) -> Dict[Tuple[str, Any], float]:
+            return {
+                (code, key): value
+                for code, values in history.items()
+                for key, value in values.items()
+                if abs(value) > 1e-6
+            }
+
+        def _diff_hours(left: Dict[Any, float], right: Dict[Any, float]) -> List[Any]:
+            return [
+                key for key in set(left) | set(right)
+                if abs(left.get(key, 0.0) - right.get(key, 0.0)) > 1e-6
+            ]
+
+        ledger_state = (
+            self.inspector_daily_assignments,
+            self.inspector_work_hours,
+            self.inspector_product_hours,
+            self.inspector_assignment_count,
+            self.inspector_last_assignment,
+            self.inspector_product_assignment_counts,
+            self.same_day_cleaning_inspectors,
+            self.same_day_cleaning_inspectors_by_product_name,
+            self._ledger_same_day_counts,
+            self._ledger_same_day_name_counts,
+        )
+        self._rebuild_assignment_histories(result_df, inspector_master_df)
+
+        mismatches: List[str] = []
+        for label, left, right in (
+            ('daily', _normalized_hours(ledger_state[0]), _normalized_hours(self.inspector_daily_assignments)),
+            ('work', {k: v for k, v in ledger_state[1].items() if abs(v) > 1e-6},
+             {k: v for k, v in self.inspector_work_hours.items() if abs(v) > 1e-6}),
+            ('product', _normalized_hours(ledger_state[2]), _normalized_hours(self.inspector_product_hours)),
+        ):
+            keys = _diff_hours(left, right)
+            if keys:
+                mismatches.append(f"{label}: {len(keys)}件 (例: {keys[:3]})")
+        if {k: v for k, v in ledger_state[3].items() if v} != self.inspector_assignment_count:
+            mismatches.append("assignment_count")
+        if {k: {p: c for p, c in v.items() if c} for k, v in ledger_state[5].items() if v} != \
+                {k: v for k, v in self.inspector_product_assignment_counts.items() if v}:
+            mismatches.append("product_assignment_counts")
+        if {k: v for k, v in ledger_state[6].items() if v} != self.same_day_cleaning_inspectors:
+            mismatches.append("same_day_cleaning_inspectors")
+        if {k: v for k, v in ledger_state[7].items() if v} != self.same_day_cleaning_inspectors_by_product_name:
+            mismatches.append("same_day_cleaning_inspectors_by_product_name")
+
+        if mismatches:
+            self.log_message(
+                f"割当台帳の整合性チェック({context}): 全件再構築と不一致 {mismatches}。再構築結果を採用します",
+                level='warning',
+            )
+            return False
+
+        (
+            self.inspector_daily_assignments,
+            self.inspector_work_hours,
+            self.inspector_product_hours,
+            self.inspector_assignment_count,
+            self.inspector_last_assignment,
+            self.inspector_product_assignment_counts,
+            self.same_day_cleaning_inspectors,
+            self.same_day_cleaning_inspectors_by_product_name,
+            self._ledger_same_day_counts,
+            self._ledger_same_day_name_counts,
+        ) = ledger_state
+        return True
 
     def _apply_work_hours_overrun(self, hours: float) -> float:
         """勤務時間上限に許容率を適用（超過許容なし）"""
@@ -887,26 +1699,50 @@ class InspectorAssignmentManager:
         if inspection_time is None or pd.isna(inspection_time):
             return False
         return inspection_time >= self.same_day_force_second_inspector_threshold
-    def _split_process_keywords(self, process_filter: str) -> List[str]:
-        """工程名フィルターを / や ／ で分割してキーワードリストを作成"""
-        if not process_filter:
-            return []
-        return [keyword.strip() for keyword in re.split(r"[／/]", process_filter) if keyword.strip()]
-
-    def _process_filter_matches(self, process_filter: str, actual_process_name: Optional[str]) -> bool:
-        """登録済み品番の工程フィルタが現在工程名に一致するか判定"""
-        if not process_filter:
-            return False
-        keywords = self._split_process_keywords(process_filter)
-        if not keywords:
-            return False
-        candidate = str(actual_process_name or "").strip()
-        if not candidate:
-            return False
-        for keyword in keywords:
-            if keyword in candidate:
-                return True
-        return False
+    def set_fixed_inspector_rules(
+        self,
+        fixed_inspectors_by_product: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+        preinspection_assignment_targets: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+    ) -> None:
+        """
+        固定検査員・検査割当て人数の設定を反映し、固定検査員インデックスを再構築する
+
+        Args:
+            fixed_inspectors_by_product: {品番: [{'process': 工程名, 'inspectors': [氏名, ...]}, ...]}（省略時は現在の設定）
+            preinspection_assignment_targets: {品番: [{'process': 工程名, 'headcount': 人数}, ...]}（省略時は現在の設定）
+        """
+        if fixed_inspectors_by_product is not None:
+            self.fixed_inspectors_by_product = fixed_inspectors_by_product
+        if preinspection_assignment_targets is not None:
+            self.preinspection_assignment_targets = preinspection_assignment_targets
+        self.fixed_inspector_index = FixedInspectorIndex.build(
+            self.fixed_inspectors_by_product,
+            self.preinspection_assignment_targets,
+        )
+        self.invalidate_candidate_cache()
+
+    def set_mix_prevention_groups(self, groups: Iterable[Sequence[str]]) -> None:
+        """
+        類似製品の混入防止グループを設定する（同じグループの別品番を担当済みの検査員には割り当てない）
+
+        Args:
+            groups: 品番グループの並び（各グループは2品番以上）
+        """
+        self.mix_prevention_index = MixPreventionIndex.build(groups)
+        self.state_store.set_conflict_classes(self.mix_prevention_index.product_classes, len(self.mix_prevention_index.classes))
+        self.invalidate_candidate_cache()
+
+    def _get_fixed_inspector_index(self) -> FixedInspectorIndex:
+        """固定検査員インデックスを取得（設定の辞書が直接差し替えられていた場合は再構築）"""
+        if not self.fixed_inspector_index.is_built_from(
+            self.fixed_inspectors_by_product,
+            self.preinspection_assignment_targets,
+        ):
+            self.fixed_inspector_index = FixedInspectorIndex.build(
+                self.fixed_inspectors_by_product,
+                self.preinspection_assignment_targets,
+            )
+        return self.fixed_inspector_index
 
     def _resolve_preinspection_assignment_target(
         self,
@@ -914,28 +1750,7 @@ class InspectorAssignmentManager:
         process_name: Optional[str]
     ) -> Optional[Tuple[int, str]]:
         """先行検査品の検査割当て人数を取得（工程名が一致する設定を優先）"""
-        entries = self.preinspection_assignment_targets.get(str(product_number).strip(), [])
-        if not entries:
-            return None
-        fallback: Optional[Tuple[int, str]] = None
-        for entry in entries:
-            headcount_raw = str(entry.get('headcount', '') or '').strip()
-            if not headcount_raw:
-                continue
-            try:
-                headcount_value = int(headcount_raw)
-            except ValueError:
-                continue
-            if headcount_value <= 0:
-                continue
-            process_filter = str(entry.get('process', '') or '').strip()
-            if process_filter:
-                if self._process_filter_matches(process_filter, process_name):
-                    return (headcount_value, process_filter)
-                continue
-            if fallback is None:
-                fallback = (headcount_value, process_filter)
-        return fallback
+        return self._get_fixed_inspector_index().preinspection_target(product_number, process_name)
 
     def _get_tuple_value(
         self,
@@ -959,27 +1774,9 @@ class InspectorAssignmentManager:
         process_name_context: Optional[str]
     ) -> List[str]:
         """
-        品番・工程名にマッチする固定検査員名のリストを取得（重複は除去）
+        品番・工程名にマッチする固定検査員名のリストを取得（重複は除去、固定検査員インデックス参照）
         """
-        entries = self.fixed_inspectors_by_product.get(product_number, [])
-        if not entries:
-            return []
-        result: List[str] = []
-        seen: Set[str] = set()
-        for entry in entries:
-            process_filter = entry.get('process', '').strip()
-            if process_filter:
-                if not self._process_filter_matches(process_filter, process_name_context):
-                    continue
-            for name in entry.get('inspectors', []):
-                if not name:
-                    continue
-                name_str = str(name).strip()
-                if not name_str or name_str in seen:
-                    continue
-                seen.add(name_str)
-                result.append(name_str)
-        return result
+        return list(self._get_fixed_inspector_index().fixed_names(product_number, process_name_context))
 
     def _is_fixed_inspector_for_lot(
         self,
@@ -1014,12 +1811,29 @@ class InspectorAssignmentManager:
         if self.is_inspector_on_vacation(inspector_name_str):
             return False
 
-        fixed_names = self._collect_fixed_inspector_names(product_number_str, process_name_context)
-        if not fixed_names:
-            return False
-        normalized_fixed = {self._normalize_person_name(n) for n in fixed_names if self._normalize_person_name(n)}
-        return self._normalize_person_name(inspector_name_str) in normalized_fixed
-    
+        return self._get_fixed_inspector_index().is_fixed(product_number_str, process_name_context, inspector_name_str)
+
+    def _fixed_inspector_mask(
+        self,
+        product_number: Any,
+        process_name_context: Optional[str],
+        inspector_names: Sequence[Any],
+    ) -> np.ndarray:
+        """
+        検査員名の並びのうち、対象ロットの固定検査員に当たるもののブール配列（_is_fixed_inspector_for_lot の一括版）
+        """
+        if not product_number or pd.isna(product_number):
+            return np.zeros(len(inspector_names), dtype=bool)
+        mask = self._get_fixed_inspector_index().fixed_mask(str(product_number).strip(), process_name_context, inspector_names)
+        if mask.any() and self.full_day_vacation_names:
+            for pos in np.flatnonzero(mask):
+                name = str(inspector_names[pos]).strip()
+                if '(' in name:
+                    name = name.split('(')[0].strip()
+                if self.is_inspector_on_vacation(name):
+                    mask[pos] = False
+        return mask
+
     def enable_log_batching(self, batch_size: int = 10) -> None:
         """
         ログ出力のバッチ化を有効化（高速化オプション）
@@ -1052,7 +1866,8 @@ class InspectorAssignmentManager:
         try:
             df_hash = hashlib.md5(pd.util.hash_pandas_object(inspector_master_df).values).hexdigest()
             if df_hash == self._inspector_master_df_hash:
-                # 変更がない場合は再構築をスキップ
+                # 変更がない場合は再構築をスキップ（内容が同一なので最大勤務時間キャッシュは引き継ぐ）
+                self.state_store.master_df_id = id(inspector_master_df)
                 return
             self._inspector_master_df_hash = df_hash
         except Exception:
@@ -1097,16 +1912,14 @@ class InspectorAssignmentManager:
                 if pd.notna(inspector_id) and str(inspector_id).strip():
                     id_key = str(inspector_id).strip()
                     self.inspector_id_to_row[id_key] = row
+                    self.inspector_id_table.intern(inspector_id, row_tuple[name_col_idx + 1] if name_col_idx >= 0 else None)
+
+        # 状態ストアの行インデックスを検査員IDで作り直し、履歴を配列へ載せ直す
+        self.state_store.bind_inspectors(self.inspector_id_to_row.keys(), inspector_master_df)
+        self._load_state_store()
 
     def _normalize_person_name(self, name: Any) -> str:
-        if not name or pd.isna(name):
-            return ''
-        text = str(name).strip()
-        if '(' in text:
-            text = text.split('(')[0].strip()
-        text = unicodedata.normalize("NFKC", text)
-        text = text.replace(" ", "").replace("\u3000", "")
-        return text
+        return normalize_person_name(name)
     
     def _get_inspector_by_name(
         self,
@@ -1213,6 +2026,46 @@ class InspectorAssignmentManager:
             self.inspector_id_to_row[id_key] = inspector_info.iloc[0]
         return inspector_info
 
+    def _get_inspector_row_by_id(
+        self,
+        inspector_id: Any,
+        inspector_master_df: pd.DataFrame
+    ) -> Optional[pd.Series]:
+        """検査員IDから検査員マスタの行(Series)を取得（DataFrameを生成しない版、見つからない場合はNone）"""
+        if not inspector_id or pd.isna(inspector_id):
+            return None
+        id_key = str(inspector_id).strip()
+        inspector_row = self.inspector_id_to_row.get(id_key)
+        if inspector_row is not None:
+            return inspector_row
+        inspector_info = self._get_inspector_by_id(id_key, inspector_master_df)
+        if inspector_info.empty:
+            return None
+        return inspector_info.iloc[0]
+
+    def invalidate_candidate_cache(self) -> None:
+        """
+        get_available_inspectors の静的候補キャッシュを無効化する（状態バージョンを進める）
+
+        固定検査員（fixed_inspectors_by_product）や休暇情報を割当実行の外で直接変更した場合に呼び出す。
+        """
+        self._candidate_state_version += 1
+
+    def _get_skill_index(self, skill_master_df: pd.DataFrame) -> SkillIndex:
+        """
+        コンパイル済みスキルインデックスを取得（別のスキルマスタが渡された場合は再構築）
+
+        Args:
+            skill_master_df: スキルマスタのDataFrame
+        """
+        if self._skill_index is None or not self._skill_index.is_built_from(skill_master_df):
+            self._skill_index = SkillIndex.build(skill_master_df)
+        return self._skill_index
+
+    def _is_registered_in_skill_master(self, product_number: Any, skill_master_df: pd.DataFrame) -> bool:
+        """品番がスキルマスタに登録されているか（完全一致、スキルインデックス参照）"""
+        return self._get_skill_index(skill_master_df).has_product(product_number)
+
     def _normalize_shipping_date(self, shipping_date: Any) -> pd.Timestamp:
         """
         出荷予定日の文字列表現などを一貫した Timestamp に変換する。
@@ -1224,34 +2077,7 @@ class InspectorAssignmentManager:
         Returns:
             pd.Timestamp: 正規化されたTimestamp
         """
-        try:
-            if shipping_date is None or (isinstance(shipping_date, float) and pd.isna(shipping_date)):
-                return pd.Timestamp.max
-
-            if isinstance(shipping_date, str):
-                shipping_date_str = shipping_date.strip()
-                if not shipping_date_str:
-                    return pd.Timestamp.max
-
-                # 当日洗浄・先行検査など文字列表現の優先案件
-                same_day_keywords = [
-                    "当日洗浄上がり品",
-                    "当日洗浄上がり",
-                    "当日洗浄あがり",
-                    "当日洗浄品",
-                    "当日洗浄",
-                    "当日先行検査",
-                    "先行検査",
-                ]
-                if any(keyword in shipping_date_str for keyword in same_day_keywords):
-                    return pd.Timestamp.min
-
-            normalized = pd.to_datetime(shipping_date, errors='coerce')
-            if pd.isna(normalized):
-                return pd.Timestamp.max
-            return normalized
-        except Exception:
-            return pd.Timestamp.max
+        return self._shipping_date_info(shipping_date).sort_key
 
     def _fifo_sort_key_from_index(self, result_df: pd.DataFrame, index: int) -> Tuple[pd.Timestamp, pd.Timestamp, int]:
         """
@@ -1290,9 +2116,11 @@ class InspectorAssignmentManager:
         if self._is_same_day_cleaning(val_str):
             return val_str
         
-        # その他の場合は日付型に変換
+        # その他の場合は日付型に変換（解析結果は値ごとにキャッシュ）
         try:
-            date_val = pd.to_datetime(val, errors='coerce')
+            date_val = self._shipping_date_info(val).parsed
+            if date_val is None:
+                return val
             if pd.notna(date_val):
                 # 異常な日付（例: 1677年など）をチェック
                 if date_val.year < 1900 or date_val.year > 2100:
@@ -1347,57 +2175,29 @@ class InspectorAssignmentManager:
         """
         candidates = []
         try:
-            skill_rows = skill_master_df[skill_master_df.iloc[:, 0] == product_number]
-
-            if skill_rows.empty:
+            skill_index = self._get_skill_index(skill_master_df)
+            if not skill_index.has_product(product_number):
                 # 新製品チームのみが候補
                 return self.get_new_product_team_inspectors(inspector_master_df)
 
-            filtered_skill_rows = []
             if process_number is None or str(process_number).strip() == '':
-                filtered_skill_rows = list(skill_rows.iterrows())
+                filtered_skill_rows = skill_index.product_rows(product_number)
             else:
-                # 工程番号列のインデックスを事前に取得（高速化：itertuples()を使用）
-                process_col_idx = 1  # iloc[1]に対応
-                for row_tuple in skill_rows.itertuples(index=True):
-                    row_idx = row_tuple[0]  # インデックス
-                    skill_process_number = row_tuple[process_col_idx + 1]  # itertuplesはインデックスを含むため+1
-                    if pd.isna(skill_process_number) or str(skill_process_number).strip() == '' or str(skill_process_number) == str(process_number):
-                        # Seriesとして扱うために元の行を取得
-                        skill_row = skill_rows.loc[row_idx]
-                        filtered_skill_rows.append((row_idx, skill_row))
+                filtered_skill_rows = skill_index.rows_for_process(product_number, process_number)
 
             if not filtered_skill_rows:
                 return self.get_new_product_team_inspectors(inspector_master_df)
 
-            skill_columns = skill_master_df.columns[2:]
-            seen_codes = set()
-
-            for _, skill_row in filtered_skill_rows:
-                for col_name in skill_columns:
-                    inspector_code = col_name
-                    if pd.isna(inspector_code) or str(inspector_code).strip() == '':
-                        continue
-                    inspector_code = str(inspector_code).strip()
-                    if inspector_code in seen_codes:
-                        continue
-                    skill_value = skill_row.get(col_name, None)
-                    if pd.notna(skill_value) and str(skill_value).strip() in {'1', '2', '3'}:
-                        inspector_info = inspector_master_df[inspector_master_df['#ID'] == inspector_code]
-                        if inspector_info.empty:
-                            continue
-                        inspector_name = inspector_info.iloc[0]['#氏名']
-                        try:
-                            numeric_skill = int(str(skill_value).strip())
-                        except ValueError:
-                            numeric_skill = 1
-                        candidates.append({
-                            '氏名': inspector_name,
-                            'コード': inspector_code,
-                            'スキル': numeric_skill,
-                            'is_new_team': False
-                        })
-                        seen_codes.add(inspector_code)
+            for inspector_code, numeric_skill in skill_index.unique_skilled(filtered_skill_rows):
+                inspector_row = self._get_inspector_row_by_id(inspector_code, inspector_master_df)
+                if inspector_row is None:
+                    continue
+                candidates.append({
+                    '氏名': inspector_row['#氏名'],
+                    'コード': inspector_code,
+                    'スキル': numeric_skill,
+                    'is_new_team': False
+                })
 
             if not candidates:
                 return self.get_new_product_team_inspectors(inspector_master_df)
@@ -1518,6 +2318,9 @@ class InspectorAssignmentManager:
         for i in range(1, MAX_INSPECTORS_PER_LOT + 1):
             result_df[f'検査員{i}'] = ''
         result_df['チーム情報'] = ''
+        # 検査員列と対になる非表示のID列（表示・出力では使わない）
+        for i in range(1, MAX_INSPECTORS_PER_LOT + 1):
+            result_df[inspector_id_column(i)] = EMPTY_INSPECTOR_ID
         # ボトルネック優先度・可視化用カラム
         result_df['feasible_inspector_count'] = 0
         result_df['available_capacity_hours'] = 0.0
@@ -1570,53 +2373,216 @@ class InspectorAssignmentManager:
         """
         事前にスキルベースの候補人数と割当可能性を算出
         
+        【高速化】候補抽出は (品番, 工程番号) ごとに1回だけ行い、ロットには候補グループIDのみを持たせる。
+        候補辞書は共有テーブル（_candidate_pool）に1回だけ格納し、グループは位置配列（int32）で参照する。
+        残り勤務時間の合計は検査員ごとの残時間配列から配列演算で算出する。
+        
         Args:
             result_df: 結果DataFrame
             skill_master_df: スキルマスタのDataFrame
             inspector_master_df: 検査員マスタのDataFrame
         
         Returns:
-            候補情報が追加されたDataFrame
+            候補情報（_candidate_group 列）が追加されたDataFrame
         """
-        base_candidate_cache: Dict[int, List[Dict[str, Any]]] = {}
-        feasible_counts: List[int] = []
-        assign_statuses: List[str] = []
-        capacity_list: List[float] = []
-        
-        # 列名のインデックスマップを作成（itertuples用）
-        result_cols = {col: idx for idx, col in enumerate(result_df.columns)}
-        ship_date_col_idx = result_cols.get('出荷予定日', -1)
+        n = len(result_df)
+        product_numbers = result_df['品番'].tolist()
+        if '現在工程番号' in result_df.columns:
+            process_numbers = ['' if value == -1 else value for value in result_df['現在工程番号'].tolist()]
+        else:
+            process_numbers = [''] * n
+
+        def _key_part(value: Any) -> Any:
+            # NaN同士を同一キーとして扱う（値そのものは抽出時にそのまま渡す）
+            if isinstance(value, float) and value != value:
+                return ('__nan__',)
+            return value
+
+        pool: List[Dict[str, Any]] = []
+        pool_position: Dict[int, int] = {}
+        groups: List[np.ndarray] = []
+        group_of_key: Dict[Tuple[Any, Any], int] = {}
+        lot_groups = np.empty(n, dtype=np.int32)
+        for pos in range(n):
+            product_number = product_numbers[pos]
+            process_number = process_numbers[pos]
+            key = (_key_part(product_number), _key_part(process_number))
+            try:
+                group_id = group_of_key.get(key)
+            except TypeError:
+                key = (str(product_number), str(process_number))
+                group_id = group_of_key.get(key)
+            if group_id is None:
+                _, candidates = self._calculate_feasible_inspector_count(
+                    product_number,
+                    process_number,
+                    skill_master_df,
+                    inspector_master_df
+                )
+                members = []
+                for candidate in candidates:
+                    member = pool_position.get(id(candidate))
+                    if member is None:
+                        member = len(pool)
+                        pool_position[id(candidate)] = member
+                        pool.append(candidate)
+                    members.append(member)
+                group_id = len(groups)
+                groups.append(np.array(members, dtype=np.int32))
+                group_of_key[key] = group_id
+            lot_groups[pos] = group_id
+
+        self._candidate_pool = pool
+        self._candidate_groups = groups
+
+        # 候補者ごとの残り勤務時間（同一検査員は1回だけ計算）
+        remaining_by_code: Dict[str, float] = {}
+        pool_remaining = np.empty(len(pool), dtype=np.float64)
+        for member, candidate in enumerate(pool):
+            code = candidate['コード']
+            remaining = remaining_by_code.get(code)
+            if remaining is None:
+                remaining = self._calculate_remaining_capacity(code, inspector_master_df)
+                remaining_by_code[code] = remaining
+            pool_remaining[member] = remaining
+        group_sizes = np.array([len(members) for members in groups], dtype=np.int64)
+        group_capacity = np.array(
+            [pool_remaining[members].sum() if len(members) else 0.0 for members in groups],
+            dtype=np.float64,
+        )
 
-        for row_idx, row in enumerate(result_df.itertuples(index=False)):
-            product_number = row[result_cols['品番']]
-            process_number = row[result_cols.get('現在工程番号', -1)] if '現在工程番号' in result_cols else ''
-            if process_number == -1:
-                process_number = ''
-            
-            # 行データを辞書形式に変換（_calculate_assignability_status用）
-            row_dict = {col: row[result_cols[col]] for col in result_df.columns}
-            
-            feasible_count, base_candidates = self._calculate_feasible_inspector_count(
-                product_number,
-                process_number,
-                skill_master_df,
-                inspector_master_df
-            )
-            base_candidate_cache[row_idx] = base_candidates
-            feasible_counts.append(feasible_count)
-            status, total_capacity = self._calculate_assignability_status(row_dict, base_candidates, inspector_master_df)
-            assign_statuses.append(status)
-            capacity_list.append(round(total_capacity, 2))
+        # 割当可能性（_calculate_assignability_status と同じ判定を配列で行う）
+        inspection_times = pd.to_numeric(result_df['検査時間'], errors='coerce').to_numpy(dtype=np.float64)
+        feasible_counts = group_sizes[lot_groups]
+        total_capacity = group_capacity[lot_groups]
+        no_work = inspection_times <= 0
+        skill_mismatch = ~no_work & (feasible_counts == 0)
+        capacity_shortage = ~no_work & ~skill_mismatch & (total_capacity + 1e-6 < inspection_times)
+        statuses = np.full(n, 'ready', dtype=object)
+        statuses[skill_mismatch] = 'skill_mismatch'
+        statuses[capacity_shortage] = 'capacity_shortage'
+        total_capacity = np.where(no_work | skill_mismatch, 0.0, total_capacity)
 
         result_df['feasible_inspector_count'] = feasible_counts
-        result_df['assignability_status'] = assign_statuses
-        result_df['available_capacity_hours'] = capacity_list
-        # 後続フェーズで利用するためにベース候補を保持
-        # 高速化: 参照で保持（必要に応じてassign_inspectors内でコピー）
-        result_df['_base_candidates'] = [base_candidate_cache[idx] for idx in result_df.index]
+        result_df['assignability_status'] = statuses
+        result_df['available_capacity_hours'] = np.round(total_capacity, 2)
+        # 後続フェーズで利用するために候補グループIDを保持（候補は _base_candidates_at で参照）
+        result_df['_candidate_group'] = lot_groups
         
+        self.log_message(
+            f"候補の事前計算: ロット {n}件 / 候補グループ {len(groups)}件 / 候補者 {len(remaining_by_code)}名",
+            debug=True,
+        )
         return result_df
+
+    def _base_candidates_at(self, result_df: pd.DataFrame, index: Any) -> List[Dict[str, Any]]:
+        """
+        ロットのベース候補（スキル適合・新製品チーム）を返す
+
+        候補辞書は同じ (品番, 工程番号) のロット間で共有しているため、変更する場合は呼び出し側でコピーすること。
+        """
+        if '_candidate_group' not in result_df.columns:
+            return []
+        group_id = result_df.at[index, '_candidate_group']
+        if pd.isna(group_id) or not (0 <= int(group_id) < len(self._candidate_groups)):
+            return []
+        pool = self._candidate_pool
+        return [pool[member] for member in self._candidate_groups[int(group_id)].tolist()]
     
+    def _get_business_calendar(self) -> BusinessCalendar:
+        """営業日カレンダーを取得（初回は HOLIDAY_CALENDAR_PATH から読み込み、未設定・失敗時は土日のみ）"""
+        if self._business_calendar is None:
+            calendar = BusinessCalendar()
+            if self.settings.holiday_calendar_path:
+                calendar_path = resolve_settings_path(self.settings.holiday_calendar_path)
+                try:
+                    calendar = BusinessCalendar.from_file(calendar_path)
+                    self.log_message(f"休日カレンダーを読み込みました: {len(calendar)}日 ({calendar_path})", debug=True)
+                except Exception as e:
+                    self.log_message(
+                        f"休日カレンダーの読み込みに失敗しました（土日のみで営業日を計算します）: {calendar_path}: {e}",
+                        level='warning'
+                    )
+            self._business_calendar = calendar
+        return self._business_calendar
+
+    def set_business_calendar(self, calendar: Optional[BusinessCalendar]) -> None:
+        """営業日カレンダーを差し替える（Noneの場合は次回使用時に HOLIDAY_CALENDAR_PATH から読み込み直す）"""
+        self._business_calendar = calendar
+
+    @staticmethod
+    def _map_by_value(series: pd.Series, func: Callable[[Any], Any]) -> List[Any]:
+        """列の値ごと（重複は1回）に func を評価し、行順のリストで返す"""
+        try:
+            codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        except TypeError:
+            return [func(value) for value in series.tolist()]
+        mapped = [func(value) for value in uniques]
+        na_value = func(None)
+        return [mapped[code] if code >= 0 else na_value for code in codes.tolist()]
+
+    def _parse_dates_by_value(self, series: pd.Series) -> pd.Series:
+        """日付列を値ごとに1回だけ解析する（解析できない値・欠損はNaT）"""
+
+        def _parse(value: Any) -> Any:
+            parsed = self._shipping_date_info(value).parsed
+            return parsed if parsed is not None else pd.NaT
+
+        return pd.Series(pd.to_datetime(self._map_by_value(series, _parse)), index=series.index)
+
+    def _classify_shipping_priority(self, shipping_dates: pd.Series, today: date) -> Dict[str, pd.Series]:
+        """
+        出荷予定日から並び順用の優先度列をまとめて算出する（営業日は休日カレンダーを考慮）
+
+        Returns:
+            {'_shipping_priority': 1=当日, 2=当日洗浄/先行検査, 3=3営業日以内, 4=その他,
+             '_within_two_business_days': 2営業日以内（過去日を含む）,
+             '_later_shipping_date': 翌営業日より後の出荷予定日（それ以外はNaT）,
+             '_is_same_day_cleaning': 当日洗浄・先行検査系ラベル}
+        """
+        calendar = self._get_business_calendar()
+        next_business_day = np.datetime64(calendar.add_business_days(today, 1), 'D')
+        two_business_days_ahead = np.datetime64(calendar.add_business_days(today, 2), 'D')
+        three_business_days_ahead = np.datetime64(calendar.add_business_days(today, 3), 'D')
+        today64 = np.datetime64(today, 'D')
+
+        def _label_priority(value: Any) -> int:
+            if value is None or (not isinstance(value, str) and pd.isna(value)):
+                return 0
+            text = str(value).strip()
+            # 当日洗浄ラベルは先行検査より優先して最優先扱い
+            if text == "当日" or "当日洗浄" in text:
+                return 1
+            if self._is_same_day_cleaning_label(value):
+                return 2
+            return 0
+
+        label_priority = np.array(self._map_by_value(shipping_dates, _label_priority), dtype=np.int64)
+        is_same_day_cleaning = np.array(
+            self._map_by_value(
+                shipping_dates,
+                self._is_same_day_cleaning_label,
+            ),
+            dtype=bool,
+        )
+        parsed = self._parse_dates_by_value(shipping_dates)
+        days = parsed.to_numpy(dtype='datetime64[D]')
+        valid = ~np.isnat(days)
+
+        priority = np.full(len(shipping_dates), 4, dtype=np.int64)
+        priority[valid & (days > today64) & (days <= three_business_days_ahead)] = 3
+        priority[label_priority == 2] = 2
+        priority[label_priority == 1] = 1
+        priority[valid & (days == today64)] = 1
+
+        index = shipping_dates.index
+        return {
+            '_shipping_priority': pd.Series(priority, index=index),
+            '_within_two_business_days': pd.Series(valid & (days <= two_business_days_ahead), index=index),
+            '_later_shipping_date': parsed.where(parsed > pd.Timestamp(next_business_day), pd.NaT),
+            '_is_same_day_cleaning': pd.Series(is_same_day_cleaning, index=index),
+        }
+
     def _sort_lots_by_priority(
         self,
         result_df: pd.DataFrame,
@@ -1634,67 +2600,18 @@ class InspectorAssignmentManager:
         """
         # 出荷予定日の優先順位を設定（高優先度判定用）
         # 優先度: 1=当日, 2=当日洗浄/先行検査, 3=3営業日以内, 4=その他
-        today = pd.Timestamp.now().normalize()
-        today_date = today.date()
-
-        def add_business_days(start: date, business_days: int) -> date:
-            result_date = start
-            added = 0
-            while added < business_days:
-                result_date += timedelta(days=1)
-                if result_date.weekday() < 5:
-                    added += 1
-            return result_date
-
-        three_business_days_ahead = add_business_days(today_date, 3)
-        two_business_days_ahead = add_business_days(today_date, 2)
-        
-        def calculate_priority(row: Any) -> int:
-            shipping_date = row['出荷予定日']
-            shipping_date_str = str(shipping_date).strip() if pd.notna(shipping_date) else ''
-            product_number = str(row.get('品番', row.get('蜩∫分', ''))).strip()
-            # 1. 当日出荷
-            try:
-                parsed = pd.to_datetime(shipping_date, errors='coerce')
-            except Exception:
-                parsed = pd.NaT
-
-            if pd.notna(parsed) and parsed.date() == today_date:
-                return 1
-            if shipping_date_str == "当日":
-                return 1
-            # 当日洗浄ラベルは先行検査より優先して最優先扱い
-            if shipping_date_str in {"当日洗浄上がり品", "当日洗浄品", "当日洗浄"} or ("当日洗浄" in shipping_date_str):
-                return 1
-
-            # 2. 当日洗浄品/先行検査
-            if self._is_same_day_cleaning_label(shipping_date):
-                return 2
-
-            # 3. 今日より後〜3営業日以内（週末除外）
-            if pd.notna(parsed):
-                parsed_date = parsed.date()
-                if parsed_date > today_date and parsed_date <= three_business_days_ahead:
-                    return 3
-            # 4. その他（固定検査員ありの特別扱いは削除）
-            return 4
-        
-        result_df['_shipping_priority'] = result_df.apply(calculate_priority, axis=1)
+        # 【高速化】行単位の apply をやめ、営業日判定を一括で行う
+        with perf_timer(loguru_logger, "inspector_assignment.manager.sort_lots.classify_shipping_priority"):
+            priority_columns = self._classify_shipping_priority(result_df['出荷予定日'], pd.Timestamp.now().normalize().date())
+        result_df['_shipping_priority'] = priority_columns['_shipping_priority']
         result_df['_is_high_priority'] = result_df['_shipping_priority'] <= HIGH_PRIORITY_SHIPPING_THRESHOLD
         
         # 同一品番の当日洗浄上がり品/先行検査品のロット数を事前にカウント（各ロットに均等に検査員を分散させるため）
-        same_day_cleaning_product_counts: Dict[str, int] = {}
-        for row_idx, row in enumerate(result_df.itertuples(index=False)):
-            shipping_date = row[result_cols.get('出荷予定日', -1)] if '出荷予定日' in result_cols else 'N/A'
-            shipping_date_str = str(shipping_date).strip() if pd.notna(shipping_date) else ''
-            is_same_day_cleaning = self._is_same_day_cleaning_label(shipping_date)
-            if is_same_day_cleaning:
-                product_number = row[result_cols['品番']]
-                same_day_cleaning_product_counts[product_number] = same_day_cleaning_product_counts.get(product_number, 0) + 1
+        # 高速化: ベクトル化（applyの代わりに条件分岐をベクトル化）
+        is_same_day_cleaning_mask = priority_columns['_is_same_day_cleaning']
+        same_day_cleaning_product_counts = result_df.loc[is_same_day_cleaning_mask, '品番'].value_counts().to_dict()
         
         # 各ロットにロット数を記録
-        # 高速化: ベクトル化（applyの代わりに条件分岐をベクトル化）
-        is_same_day_cleaning_mask = result_df['出荷予定日'].apply(self._is_same_day_cleaning_label)
         product_numbers = result_df['品番'].astype(str).str.strip()
         result_df['_same_day_cleaning_lot_count'] = (
             is_same_day_cleaning_mask * product_numbers.map(same_day_cleaning_product_counts).fillna(0)
@@ -1703,43 +2620,16 @@ class InspectorAssignmentManager:
         result_df['_sort_product_id'] = result_df['品番'].astype(str)
         # 【変更】固定検査員が設定されている品番を最優先にソート
         # 登録済み品番リストの固定検査員が設定されている品番は、出荷予定日よりも優先して割り当てる
-        def is_within_two_business_days(shipping_date: Any) -> bool:
-            if pd.isna(shipping_date):
-                return False
-            try:
-                parsed = pd.to_datetime(shipping_date, errors='coerce')
-                if pd.isna(parsed):
-                    return False
-                return parsed.date() <= two_business_days_ahead
-            except Exception:
-                return False
-
-        result_df['_within_two_business_days'] = result_df['出荷予定日'].apply(is_within_two_business_days)
+        result_df['_within_two_business_days'] = priority_columns['_within_two_business_days']
 
         # 「それ以降の日付(=翌営業日より後)」だけは日付昇順を優先し、その上で候補数の少ないロットを優先する。
         # それ以外は従来どおり候補数優先（=割付しづらいロットを先に処理）を維持する。
-        next_business_day = add_business_days(today_date, 1)
-        import warnings
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore", UserWarning)
-            parsed_shipping_date = pd.to_datetime(result_df['出荷予定日'], errors='coerce')
-        later_than_next_business_day_mask = parsed_shipping_date > pd.Timestamp(next_business_day)
-        result_df['_later_shipping_date'] = parsed_shipping_date.where(later_than_next_business_day_mask, pd.NaT)
+        result_df['_later_shipping_date'] = priority_columns['_later_shipping_date']
 
         # 優先度4（その他）は出荷予定日昇順でソート
         # 指示日のソートキーを追加（FIFO用：指示日が古い順）
         if '指示日' in result_df.columns:
-            def instruction_date_sort_key_for_priority(val):
-                if pd.isna(val):
-                    return pd.Timestamp.max  # 最後に
-                try:
-                    date_val = pd.to_datetime(val, errors='coerce')
-                    if pd.notna(date_val):
-                        return date_val
-                except:
-                    pass
-                return pd.Timestamp.max
-            result_df['_instruction_date_sort_key'] = result_df['指示日'].apply(instruction_date_sort_key_for_priority)
+            result_df['_instruction_date_sort_key'] = self._parse_dates_by_value(result_df['指示日']).fillna(pd.Timestamp.max)
         else:
             result_df['_instruction_date_sort_key'] = pd.Timestamp.max
         
@@ -1747,11 +2637,17 @@ class InspectorAssignmentManager:
         # 候補数や新規品判定はFIFOの後に回す
         result_df['_shipping_sort_key'] = result_df['出荷予定日'].apply(self._normalize_shipping_date)
         result_df['_original_index'] = result_df.index
+        sort_columns = ['_shipping_sort_key', '_sort_product_id', '_instruction_date_sort_key', '_original_index']
+        if self.tie_break_seed is not None:
+            # マルチスタート: 出荷予定日・品番・指示日が同じロット同士の並びだけをシードで摂動する（FIFOは維持）
+            result_df['_tie_break_key'] = [tie_break_rank(self.tie_break_seed, idx) for idx in result_df.index]
+            sort_columns.insert(3, '_tie_break_key')
         result_df = result_df.sort_values(
-            ['_shipping_sort_key', '_sort_product_id', '_instruction_date_sort_key', '_original_index'],
-            ascending=[True, True, True, True],
+            sort_columns,
+            ascending=[True] * len(sort_columns),
             na_position='last'
         ).reset_index(drop=True)
+        result_df = result_df.drop(columns=['_tie_break_key'], errors='ignore')
         
         # FIFO確認用ログ（デバッグ用：同一品番・同一出荷予定日のロットの指示日順を確認）
         # 同一品番・同一出荷予定日のロットが複数ある場合、指示日順になっているか確認
@@ -2124,15 +3020,43 @@ class InspectorAssignmentManager:
             if skill_master_df is None or skill_master_df.empty:
                 self.log_message("スキルマスタが読み込まれていません")
                 return inspector_df
+
+            # 【追加】マルチスタート: 摂動した割当を並列実行し、KPIが最良の結果を採用する
+            if self.multi_start_count > 1 and not self._multi_start_active:
+                best_df = self._assign_inspectors_multi_start(
+                    inspector_df,
+                    inspector_master_df,
+                    skill_master_df,
+                    show_skill_values=show_skill_values,
+                    process_master_df=process_master_df,
+                    inspection_target_keywords=inspection_target_keywords,
+                )
+                self._save_warm_start(best_df, inspector_master_df)
+                return best_df
             
+            # 【追加】フェーズ別プロファイルの計測開始
+            self.phase_profiler.start_run(solver_mode=self.solver_mode)
+            self.phase_profiler.start_phase('first_pass')
+            self._optimization_budget.start()
             self.same_day_same_name_relaxation_attempts.clear()
             self.logged_vacation_messages.clear()
+            self._shipping_date_index.clear()
             # 【高速化】同一実行内の参照をキャッシュ（結果は変えない）
-            self._skill_rows_by_product_cache = {}
+            with perf_timer(loguru_logger, "inspector_assignment.manager.build_skill_index"):
+                self._skill_index = SkillIndex.build(skill_master_df)
             self._new_team_inspectors_cache = None
+            # 固定検査員・マスタが前回の実行から変わり得るため、静的候補キャッシュを破棄
+            self.invalidate_candidate_cache()
+            # 同じマネージャーで再実行した場合に前回の勤務時間・品番時間が残らないよう、履歴を初期化
+            self.reset_assignment_history()
             # 【高速化】検査員マスタのインデックスを構築
             with perf_timer(loguru_logger, "inspector_assignment.manager.build_inspector_index"):
                 self._build_inspector_index(inspector_master_df)
+            # 【高速化】状態ストアの配列を履歴から1回だけ作成（以降は履歴への書き込みが差分で反映される）
+            self._load_state_store()
+            # 【高速化】休暇情報から稼働可否テーブルを作成（set_vacation_data で作成済みなら再利用）
+            if not self.state_store.availability_ready(inspector_master_df):
+                self._build_availability_table(inspector_master_df)
             self.same_day_constraint_relaxations.clear()
 
             if self.fifo_priority_allow_unassigned:
@@ -2146,6 +3070,8 @@ class InspectorAssignmentManager:
             # 出荷予定日でソート（古い順）- 最優先ルール
             # 日付形式を統一してからソート（当日洗浄品は文字列として保持）
             result_df['出荷予定日'] = result_df['出荷予定日'].apply(self._convert_shipping_date)
+            # 【高速化】ロット種別列・解析済み日付列を1回だけ作成（以降のフェーズは値ごとのキャッシュを参照）
+            self._shipping_date_index.annotate(result_df)
             
             # ソート用の補助列を追加
             with perf_timer(loguru_logger, "inspector_assignment.manager.add_sorting_columns"):
@@ -2171,6 +3097,25 @@ class InspectorAssignmentManager:
                     f"{HIGH_PRIORITY_RESERVED_CAPACITY_HOURS:.1f}h を確保します"
                 )
 
+            # 【追加】最小費用流モード: 第1次割当と全体最適化の代わりにフロー解＋修復ステップで割り当てる
+            if self.solver_mode == 'flow':
+                self.phase_profiler.start_phase('flow_solver')
+                with perf_timer(loguru_logger, "inspector_assignment.manager.flow_solver"):
+                    result_df = self._assign_with_flow_solver(
+                        result_df, inspector_master_df, show_skill_values
+                    )
+                self.phase_profiler.start_phase('finalize')
+                result_df = self._finalize_assignment_result(
+                    result_df,
+                    inspector_master_df,
+                    skill_master_df,
+                    show_skill_values=show_skill_values,
+                    process_master_df=process_master_df,
+                    inspection_target_keywords=inspection_target_keywords,
+                )
+                self._save_warm_start(result_df, inspector_master_df)
+                return result_df
+
             # 固定検査員が設定されている品番のロット配分を平準化するためのカウンタ（工数ベース）
             # NOTE:
             # - 現在工程名はロットごとに揺れる（例: 外観 / 外観検査）ためキーに使うとカウンタが分断される。
@@ -2201,7 +3146,25 @@ class InspectorAssignmentManager:
                     continue
                 key = (product_number_str, str(process_key or '').strip())
                 preinspection_lot_counts[key] += 1
+            # 【高速化】割当ループ中は割当行列（構造体配列）へ書き込み、検査員列・人数・分割時間はループ後に一括反映する
+            # 割当行列は第1次割当の作業用（materialize 以降は result_df が正、全体最適化・違反是正では使わない）
+            assignment_matrix = AssignmentMatrix.from_frame(
+                result_df,
+                MAX_INSPECTORS_PER_LOT,
+                lambda shipping_date: self._resolve_lot_date(shipping_date, pd.Timestamp.now().date()),
+            )
+            # 【追加】ウォームスタート: 前回から変わらず有効なロットは前回の検査員を優先順に確定し、貪欲選択を省略する
+            warm_started_positions = self._apply_warm_start(result_df, assignment_matrix, inspector_master_df, show_skill_values)
+            high_priority_remaining -= sum(1 for pos in warm_started_positions if high_priority_mask.iat[pos])
+            lot_product_numbers = result_df['品番'].tolist()
+            lot_product_names = (
+                [str(v).strip() if pd.notna(v) else '' for v in result_df['品名'].tolist()]
+                if '品名' in result_df.columns
+                else [''] * len(result_df)
+            )
             for row_idx, row in enumerate(result_df.itertuples(index=False)):
+                if row_idx in warm_started_positions:
+                    continue
                 index = result_df.index[row_idx]
                 inspection_time = row[result_cols_after_sort['検査時間']]
                 product_number = row[result_cols_after_sort['品番']]
@@ -2236,10 +3199,7 @@ class InspectorAssignmentManager:
                 if lot_quantity == 0 or pd.isna(lot_quantity) or inspection_time == 0 or pd.isna(inspection_time):
                     reason = "ロット数量0" if (lot_quantity == 0 or pd.isna(lot_quantity)) else "検査時間0"
                     self.log_message(f"ロット数量が0または検査時間が0のため、品番 {product_number} の検査員割り当てをスキップします ({reason})")
-                    result_df.at[index, '検査員人数'] = 0
-                    result_df.at[index, '分割検査時間'] = 0.0
-                    for i in range(1, MAX_INSPECTORS_PER_LOT + 1):
-                        result_df.at[index, f'検査員{i}'] = ''
+                    assignment_matrix.clear(row_idx)
                     result_df.at[index, 'チーム情報'] = f'未割当({reason})'
                     result_df.at[index, 'assignability_status'] = 'quantity_zero'
                     result_df.at[index, 'remaining_work_hours'] = round(inspection_time or 0.0, 2)
@@ -2248,9 +3208,7 @@ class InspectorAssignmentManager:
                 # 改善ポイント: 必要人数と検査時間の割り方（非対称＋部分割当）
                 # 必要人数を満たせなかった場合でも、確保できた人数分だけ部分的に割当を行う
                 # まずベース候補を取得してから、非対称分配を実行
-                base_candidates = result_df.at[index, '_base_candidates'] if '_base_candidates' in result_df.columns else []
-                if not isinstance(base_candidates, list):
-                    base_candidates = []
+                base_candidates = self._base_candidates_at(result_df, index)
                 # 高速化: 浅いコピーで十分（変更が必要な場合のみ深いコピー）
                 available_inspectors = [insp.copy() for insp in base_candidates] if base_candidates else []
                 
@@ -2835,8 +3793,7 @@ class InspectorAssignmentManager:
                 is_new_product = False
                 
                 # get_available_inspectorsは既に新製品チームを返す場合があるが、明示的に確認
-                skill_rows = skill_master_df[skill_master_df.iloc[:, 0] == product_number]
-                if skill_rows.empty:
+                if not self._is_registered_in_skill_master(product_number, skill_master_df):
                     is_new_product = True
                     self.log_message(f"品番 {product_number} は新規品です（スキルマスタ未登録）")
                     
@@ -2881,24 +3838,15 @@ class InspectorAssignmentManager:
                         continue
                 elif not available_inspectors and not (force_fixed_assignment and fixed_primary_name):
                     # 詳細な原因を特定
-                    skill_rows = skill_master_df[skill_master_df.iloc[:, 0] == product_number]
-                    if skill_rows.empty:
+                    if not self._is_registered_in_skill_master(product_number, skill_master_df):
                         reason = "スキルマスタ未登録"
                     else:
                         # 工程番号による絞り込み結果を確認
-                        filtered_rows = []
+                        skill_index = self._get_skill_index(skill_master_df)
                         if process_number is None or str(process_number).strip() == '':
-                            filtered_rows = list(skill_rows.iterrows())
+                            filtered_rows = skill_index.product_rows(product_number)
                         else:
-                            # 工程番号列のインデックスを事前に取得（高速化：itertuples()を使用）
-                            process_col_idx = 1  # iloc[1]に対応
-                            for row_tuple in skill_rows.itertuples(index=True):
-                                row_idx = row_tuple[0]  # インデックス
-                                skill_process = row_tuple[process_col_idx + 1]  # itertuplesはインデックスを含むため+1
-                                if pd.isna(skill_process) or skill_process == '' or str(skill_process) == str(process_number):
-                                    # Seriesとして扱うために元の行を取得
-                                    skill_row = skill_rows.loc[row_idx]
-                                    filtered_rows.append(skill_row)
+                            filtered_rows = skill_index.rows_for_process(product_number, process_number)
                         
                         if not filtered_rows:
                             reason = f"工程番号'{process_number}'に一致するスキル情報なし"
@@ -2908,10 +3856,7 @@ class InspectorAssignmentManager:
                     shipping_date = row[result_cols_after_sort.get('出荷予定日', -1)] if '出荷予定日' in result_cols_after_sort else 'N/A'
                     self.log_message(f"⚠️ 品番 {product_number} (出荷予定日: {shipping_date}) の検査員が見つかりません: {reason}")
                     self.log_message(f"   詳細: 工程番号={process_number}, 検査時間={inspection_time:.1f}h, ロット数量={lot_quantity}")
-                    result_df.at[index, '検査員人数'] = 0
-                    result_df.at[index, '分割検査時間'] = 0.0
-                    for i in range(1, MAX_INSPECTORS_PER_LOT + 1):
-                        result_df.at[index, f'検査員{i}'] = ''
+                    assignment_matrix.clear(row_idx)
                     result_df.at[index, 'チーム情報'] = f'未割当({reason})'
                     self.log_message(f"   チーム情報を設定: '{result_df.at[index, 'チーム情報']}'")
                     result_df.at[index, 'assignability_status'] = 'capacity_shortage'
@@ -3567,10 +4512,7 @@ class InspectorAssignmentManager:
                             # 制約を大幅に緩和して再試行（未割当ロット再処理と同じロジック）
                             # この処理は後続の未割当ロット再処理で行われるため、ここでは未割当のままにする
                             # ただし、assignability_statusは'logic_conflict'ではなく、後続処理で再試行できるようにする
-                            result_df.at[index, '検査員人数'] = 0
-                            result_df.at[index, '分割検査時間'] = 0.0
-                            for i in range(1, MAX_INSPECTORS_PER_LOT + 1):
-                                result_df.at[index, f'検査員{i}'] = ''
+                            assignment_matrix.clear(row_idx)
                             result_df.at[index, 'チーム情報'] = f'未割当({self.required_inspectors_threshold:.1f}時間基準違反: 必要{required_inspectors}人に対して{len(assigned_inspectors)}人)'
                             result_df.at[index, 'remaining_work_hours'] = round(inspection_time, 2)
                             result_df.at[index, 'assignability_status'] = 'logic_conflict'
@@ -3636,10 +4578,7 @@ class InspectorAssignmentManager:
                                         else:
                                             # 0人の場合は未割当
                                             self.log_message(f"⚠️ 警告: 品番 {product_number} (出荷予定日: {shipping_date}) は{self.required_inspectors_threshold:.1f}時間基準違反のため未割当とします（検査時間: {inspection_time:.1f}h, 必要人数: {required_inspectors}人）")
-                                            result_df.at[index, '検査員人数'] = 0
-                                            result_df.at[index, '分割検査時間'] = 0.0
-                                            for i in range(1, MAX_INSPECTORS_PER_LOT + 1):
-                                                result_df.at[index, f'検査員{i}'] = ''
+                                            assignment_matrix.clear(row_idx)
                                             result_df.at[index, 'チーム情報'] = f'未割当({self.required_inspectors_threshold:.1f}時間基準違反: 必要{required_inspectors}人に対して{len(assigned_inspectors)}人)'
                                             result_df.at[index, 'remaining_work_hours'] = round(inspection_time, 2)
                                             result_df.at[index, 'assignability_status'] = 'logic_conflict'
@@ -3650,10 +4589,7 @@ class InspectorAssignmentManager:
                                         self.log_message(f"⚠️ 警告: 品番 {product_number} (出荷予定日: {shipping_date}) は{self.required_inspectors_threshold:.1f}時間基準違反ですが、可能な限り {len(assigned_inspectors)}人を割り当てます（検査時間: {inspection_time:.1f}h, 必要人数: {required_inspectors}人）", level='warning')
                                     else:
                                         self.log_message(f"⚠️ 警告: 品番 {product_number} (出荷予定日: {shipping_date}) は{self.required_inspectors_threshold:.1f}時間基準違反のため未割当とします（検査時間: {inspection_time:.1f}h, 必要人数: {required_inspectors}人）")
-                                        result_df.at[index, '検査員人数'] = 0
-                                        result_df.at[index, '分割検査時間'] = 0.0
-                                        for i in range(1, MAX_INSPECTORS_PER_LOT + 1):
-                                            result_df.at[index, f'検査員{i}'] = ''
+                                        assignment_matrix.clear(row_idx)
                                         result_df.at[index, 'チーム情報'] = f'未割当({self.required_inspectors_threshold:.1f}時間基準違反: 必要{required_inspectors}人に対して{len(assigned_inspectors)}人)'
                                         result_df.at[index, 'remaining_work_hours'] = round(inspection_time, 2)
                                         result_df.at[index, 'assignability_status'] = 'logic_conflict'
@@ -3664,10 +4600,7 @@ class InspectorAssignmentManager:
                                     self.log_message(f"⚠️ 警告: 品番 {product_number} (出荷予定日: {shipping_date}) は{self.required_inspectors_threshold:.1f}時間基準違反ですが、可能な限り {len(assigned_inspectors)}人を割り当てます（検査時間: {inspection_time:.1f}h, 必要人数: {required_inspectors}人）", level='warning')
                                 else:
                                     self.log_message(f"⚠️ 警告: 品番 {product_number} (出荷予定日: {shipping_date}) は{self.required_inspectors_threshold:.1f}時間基準違反のため未割当とします（検査時間: {inspection_time:.1f}h, 必要人数: {required_inspectors}人）")
-                                    result_df.at[index, '検査員人数'] = 0
-                                    result_df.at[index, '分割検査時間'] = 0.0
-                                    for i in range(1, MAX_INSPECTORS_PER_LOT + 1):
-                                        result_df.at[index, f'検査員{i}'] = ''
+                                    assignment_matrix.clear(row_idx)
                                     result_df.at[index, 'チーム情報'] = f'未割当({self.required_inspectors_threshold:.1f}時間基準違反: 必要{required_inspectors}人に対して{len(assigned_inspectors)}人)'
                                     result_df.at[index, 'remaining_work_hours'] = round(inspection_time, 2)
                                     result_df.at[index, 'assignability_status'] = 'logic_conflict'
@@ -3675,10 +4608,7 @@ class InspectorAssignmentManager:
                         else:
                             # 3営業日以内でない場合は、設定時間基準違反で未割当
                             self.log_message(f"⚠️ 警告: 品番 {product_number} (出荷予定日: {shipping_date}) は{self.required_inspectors_threshold:.1f}時間基準違反のため未割当とします（検査時間: {inspection_time:.1f}h, 必要人数: {required_inspectors}人, 実際の割当人数: {len(assigned_inspectors)}人）")
-                            result_df.at[index, '検査員人数'] = 0
-                            result_df.at[index, '分割検査時間'] = 0.0
-                            for i in range(1, MAX_INSPECTORS_PER_LOT + 1):
-                                result_df.at[index, f'検査員{i}'] = ''
+                            assignment_matrix.clear(row_idx)
                             result_df.at[index, 'チーム情報'] = f'未割当({self.required_inspectors_threshold:.1f}時間基準違反: 必要{required_inspectors}人に対して{len(assigned_inspectors)}人)'
                             result_df.at[index, 'remaining_work_hours'] = round(inspection_time, 2)
                             result_df.at[index, 'assignability_status'] = 'logic_conflict'
@@ -3721,10 +4651,7 @@ class InspectorAssignmentManager:
                         self.log_message(f"⚠️ 警告: 品番 {product_number} (出荷予定日: {shipping_date}) は{reason}のため未割当とします")
                         self.log_message(f"   詳細: 候補数={len(available_inspectors)}人, 検査時間={inspection_time:.1f}h, ロット数量={lot_quantity}")
                     
-                    result_df.at[index, '検査員人数'] = 0
-                    result_df.at[index, '分割検査時間'] = 0.0
-                    for i in range(1, MAX_INSPECTORS_PER_LOT + 1):
-                        result_df.at[index, f'検査員{i}'] = ''
+                    assignment_matrix.clear(row_idx)
                     result_df.at[index, 'チーム情報'] = f'未割当({reason})'
                     self.log_message(f"   チーム情報を設定: '{result_df.at[index, 'チーム情報']}'")
                     result_df.at[index, 'remaining_work_hours'] = round(inspection_time, 2)
@@ -3763,7 +4690,7 @@ class InspectorAssignmentManager:
                         level='warning'
                     )
                     assigned_inspectors = assigned_inspectors[:MAX_INSPECTORS_PER_LOT]
-                result_df.at[index, '検査員人数'] = len(assigned_inspectors)
+                assignment_matrix.set_inspector_count(row_idx, len(assigned_inspectors))
                 # 分割検査時間の計算: 実際の割り当て時間の平均（非対称分配の場合は各検査員の割当時間が異なる）
                 if len(assigned_inspectors) > 0:
                     # 非対称分配の場合、各検査員の割当時間の平均を計算
@@ -3773,9 +4700,9 @@ class InspectorAssignmentManager:
                     else:
                         # フォールバック: 検査時間 ÷ 実際の分割した検査人数
                         divided_time = inspection_time / len(assigned_inspectors)
-                    result_df.at[index, '分割検査時間'] = round(divided_time, 1)
+                    assignment_matrix.set_divided_time(row_idx, round(divided_time, 1))
                 else:
-                    result_df.at[index, '分割検査時間'] = 0.0
+                    assignment_matrix.set_divided_time(row_idx, 0.0)
                 # inspectorが辞書でない場合の対処
                 over_limit_present = False
                 for insp in assigned_inspectors:
@@ -3793,8 +4720,7 @@ class InspectorAssignmentManager:
                 # 現在の日付を取得（勤務時間の履歴追跡用）
                 current_time = pd.Timestamp.now()
                 current_date = current_time.date()
-                shipping_date_raw = result_df.at[index, '出荷予定日'] if '出荷予定日' in result_df.columns else None
-                lot_date_for_rebuild = self._resolve_lot_date(shipping_date_raw, current_date)
+                lot_date_for_rebuild = assignment_matrix.lot_date(row_idx) or current_date
                 
                 # 【重要】当日洗浄上がり品および先行検査品の検査員を追跡（品番単位・品名単位）
                 # この追跡処理により、同一品番の複数ロットに同一検査員が割り当てられることを防ぐ
@@ -3836,24 +4762,13 @@ class InspectorAssignmentManager:
                                 self.log_message(f"警告: inspectorが辞書形式ではありません: {type(inspector)}")
                                 continue
                         
-                        if show_skill_values:
-                            # 新規品チームの場合はスキル値を表示せず(新)のみ
-                            if inspector.get('is_new_team', False):
-                                inspector_name = f"{inspector['氏名']}(新)"
-                            else:
-                                inspector_name = f"{inspector['氏名']}({inspector['スキル']})"
-                        else:
-                            # スキル非表示でも新規品チームの場合は(新)を表示
-                            if inspector.get('is_new_team', False):
-                                inspector_name = f"{inspector['氏名']}(新)"
-                            else:
-                                inspector_name = inspector['氏名']
-                        
-                        result_df.at[index, f'検査員{i+1}'] = inspector_name
-                        team_members.append(inspector['氏名'])
+                        inspector_name = self._inspector_display_label(inspector, show_skill_values)
                         
                         # 改善ポイント: 非対称分配のため、各検査員の割当時間を個別に取得
                         code = inspector['コード']
+                        assignment_matrix.set_slot(row_idx, i, code, inspector_name)
+                        team_members.append(inspector['氏名'])
+                        
                         assigned_time = inspector.get('割当時間', 0.0)  # 非対称分配で設定された個別の割当時間
                         
                         # 日次勤務時間の履歴を更新
@@ -3903,13 +4818,9 @@ class InspectorAssignmentManager:
                                 # 既にこの品番に割り当てられている検査員が複数いる場合、重複をチェック
                                 # ただし、現在のロットで追加されたものは除外
                                 other_lots_with_same_inspector = [
-                                    idx for idx, row in result_df.iterrows()
-                                    if idx != index
-                                    and row.get('品番') == product_number
-                                    and any(
-                                        str(row.get(f'検査員{j}', '')).split('(')[0].strip() == inspector['氏名']
-                                        for j in range(1, MAX_INSPECTORS_PER_LOT + 1)
-                                    )
+                                    assignment_matrix.index[pos]
+                                    for pos in assignment_matrix.positions_with_inspector(code).tolist()
+                                    if pos != row_idx and lot_product_numbers[pos] == product_number
                                 ]
                                 if other_lots_with_same_inspector:
                                     self.log_message(
@@ -3925,15 +4836,11 @@ class InspectorAssignmentManager:
                                 if code in already_assigned_to_same_product_name and len(already_assigned_to_same_product_name) > 1:
                                     # 同じ品名の他の品番に既に割り当てられているかチェック
                                     other_products_with_same_name = [
-                                        (idx, row.get('品番'))
-                                        for idx, row in result_df.iterrows()
-                                        if idx != index
-                                        and str(row.get('品名', '')).strip() == product_name_str
-                                        and row.get('品番') != product_number
-                                        and any(
-                                            str(row.get(f'検査員{j}', '')).split('(')[0].strip() == inspector['氏名']
-                                            for j in range(1, MAX_INSPECTORS_PER_LOT + 1)
-                                        )
+                                        (assignment_matrix.index[pos], lot_product_numbers[pos])
+                                        for pos in assignment_matrix.positions_with_inspector(code).tolist()
+                                        if pos != row_idx
+                                        and lot_product_names[pos] == product_name_str
+                                        and lot_product_numbers[pos] != product_number
                                     ]
                                     if other_products_with_same_name:
                                         self.log_message(
@@ -3961,6 +4868,7 @@ class InspectorAssignmentManager:
                     debug=True,
                 )
             
+            assignment_matrix.materialize(result_df, self.inspector_id_table.intern)
             loguru_logger.bind(channel="PERF").debug(
                 "PERF {}: {:.1f} ms",
                 "inspector_assignment.manager.first_pass_assign",
@@ -3979,278 +4887,661 @@ class InspectorAssignmentManager:
             with perf_timer(loguru_logger, "inspector_assignment.manager.optimize_assignments"):
                 result_df = self.optimize_assignments(result_df, inspector_master_df, skill_master_df, show_skill_values, process_master_df, inspection_target_keywords)
             self.log_message("=== 全体最適化が完了 ===")
+            self.phase_profiler.start_phase('finalize')
             
-            # 最終割り当て統計を表示
-            self.log_message("=== 最終割り当て統計 ===")
-            with perf_timer(loguru_logger, "inspector_assignment.manager.print_stats.final"):
-                self.print_assignment_statistics(inspector_master_df)
-            
-            # 低稼働の偏り緩和: FIFO/10%制約を維持したまま未割当ロットを再試行
-            try:
-                if '検査員人数' in result_df.columns and (pd.to_numeric(result_df['検査員人数'], errors='coerce').fillna(0) <= 0).any():
-                    result_df = self._run_post_final_fill_underutilized(
-                        result_df,
-                        inspector_master_df,
-                        skill_master_df,
-                        show_skill_values=show_skill_values,
-                        process_master_df=process_master_df,
-                        inspection_target_keywords=inspection_target_keywords,
-                    )
-            except Exception as e:
-                self.log_message(f"最終割当後の追加割当でエラーが発生しました: {e}", level='warning')
-            
-            if '_base_candidates' in result_df.columns:
-                result_df = result_df.drop(columns=['_base_candidates'])
-            if '_sort_product_id' in result_df.columns:
-                result_df = result_df.drop(columns=['_sort_product_id'])
-            if '_is_new_product' in result_df.columns:
-                result_df = result_df.drop(columns=['_is_new_product'])
-            if '_has_fixed_inspectors' in result_df.columns:
-                result_df = result_df.drop(columns=['_has_fixed_inspectors'])
-            if '_is_high_priority' in result_df.columns:
-                result_df = result_df.drop(columns=['_is_high_priority'])
-            if '_shipping_priority' in result_df.columns:
-                result_df = result_df.drop(columns=['_shipping_priority'])
-            if '_later_shipping_date' in result_df.columns:
-                result_df = result_df.drop(columns=['_later_shipping_date'])
+            result_df = self._finalize_assignment_result(
+                result_df,
+                inspector_master_df,
+                skill_master_df,
+                show_skill_values=show_skill_values,
+                process_master_df=process_master_df,
+                inspection_target_keywords=inspection_target_keywords,
+            )
+            self._save_warm_start(result_df, inspector_master_df)
+            return result_df
             
-            # 最終的な表示用ソート: 出荷予定日、品番、指示日の順
-            # 出荷予定日のソートキー関数
-            current_date = pd.Timestamp.now().date()
+        except Exception as e:
+            # 【高速化】ログバッファをフラッシュ（エラー時も）
+            if self.log_batch_enabled:
+                self._flush_log_buffer()
             
-            # 翌営業日の計算（金曜日の場合は翌週の月曜日）
-            def get_next_business_day(date_val):
-                """翌営業日を取得（金曜日の場合は翌週の月曜日）"""
-                weekday = date_val.weekday()  # 0=月曜日, 4=金曜日
-                if weekday == 4:  # 金曜日
-                    return date_val + timedelta(days=3)  # 翌週の月曜日
-                else:
-                    return date_val + timedelta(days=1)  # 翌日
+            error_msg = f"検査員割り当て中にエラーが発生しました: {str(e)}"
+            self.log_message(error_msg)
+            logger.error(error_msg, exc_info=True)  # スタックトレースも出力
             
-            next_business_day = get_next_business_day(current_date)
+            # エラーが発生した場合でも、最低限の列を追加して返す
+            if inspector_df is not None and not inspector_df.empty:
+                result_df = inspector_df.copy()
+                # 必要な列が存在しない場合は追加
+                if '検査員人数' not in result_df.columns:
+                    result_df['検査員人数'] = 0
+                if '分割検査時間' not in result_df.columns:
+                    result_df['分割検査時間'] = 0.0
+                for i in range(1, MAX_INSPECTORS_PER_LOT + 1):
+                    col_name = f'検査員{i}'
+                    if col_name not in result_df.columns:
+                        result_df[col_name] = ''
+                if 'チーム情報' not in result_df.columns:
+                    result_df['チーム情報'] = 'エラーにより割り当てできませんでした'
+                return result_df
             
-            def shipping_date_sort_key(val):
-                if pd.isna(val):
-                    return (5, None)  # 最後に
-                val_str = str(val).strip()
-                
-                # 1. 当日の日付（優先度0）
-                try:
-                    date_val = pd.to_datetime(val, errors='coerce')
-                    if pd.notna(date_val):
-                        date_date = date_val.date()
-                        if date_date == current_date:
-                            return (0, date_val)
-                except:
-                    pass
-                
-                # 2. 先行検査品（優先度1）
-                if (val_str == "先行検査" or
-                    val_str == "当日先行検査"):
-                    return (1, val_str)
-                
-                # 3. 当日洗浄上がり品（最下位表示）
-                if (val_str == "当日洗浄上がり品" or
-                    val_str == "当日洗浄品" or
-                    "当日洗浄" in val_str):
-                    return (6, val_str)
-                
-                # 4. 翌日または翌営業日（優先度3）
-                try:
-                    date_val = pd.to_datetime(val, errors='coerce')
-                    if pd.notna(date_val):
-                        date_date = date_val.date()
-                        if date_date == next_business_day:
-                            return (3, date_val)
-                except:
-                    pass
-                
-                # 5. それ以降の日付（優先度4）
-                try:
-                    date_val = pd.to_datetime(val, errors='coerce')
-                    if pd.notna(date_val):
-                        return (4, date_val)
-                except:
-                    pass
-                
-                return (5, val_str)  # その他文字列
+            return inspector_df
+    
+    @staticmethod
+    def _inspector_display_label(inspector: Dict[str, Any], show_skill_values: bool) -> str:
+        """検査員列に表示する氏名（スキル値表示時は「氏名(スキル)」、新規品チームは常に「氏名(新)」）"""
+        if inspector.get('is_new_team', False):
+            return f"{inspector['氏名']}(新)"
+        if show_skill_values:
+            return f"{inspector['氏名']}({inspector['スキル']})"
+        return inspector['氏名']
+
+    def _apply_warm_start(
+        self,
+        result_df: pd.DataFrame,
+        assignment_matrix: AssignmentMatrix,
+        inspector_master_df: pd.DataFrame,
+        show_skill_values: bool,
+    ) -> Set[int]:
+        """
+        前回の最終割当のうち、内容が変わらず現在も有効なロットの検査員を優先順に割当行列・履歴へ確定する
+
+        引き継いだロットは第1次割当で読み飛ばし、最適化フェーズでも動かさない（_is_warm_start_locked_lot）。
+        次のロットは割り当て直し、ベース候補の検査員を「確保」する。前回の検査員に確保済みの検査員を含む
+        以降のロットは、優先度の高いロットより先に容量を使わないよう引き継がずに割り当て直す
+        （確保は連鎖させず、確保済みの検査員と重ならないロットは引き続き引き継ぐ）:
+        - 新規、または内容（品番・工程番号・ロット数量・検査時間・出荷予定日のシグネチャ）が変わったロット
+        - 前回の検査員が終日休暇、または勤務時間上限を超えるロット（稼働可能時間が変わった）
+
+        次のロットは引き継がずに第1次割当で割り当て直すが、検査員は確保しない:
+        - 前回も未割当で内容が変わらないロット
+        - 固定検査員・先行検査の割当対象ロット（専用の配分ロジックで割り当て直す）
+        - 前回の検査員がベース候補（スキル適合）に含まれない、または同一品番時間上限・
+          当日洗浄上がり品の品番単位の重複禁止に反するロット（前回の是正フェーズで緩和した割当）
+
+        Returns:
+            引き継いだロットの行位置（第1次割当のループで読み飛ばす）
+        """
+        self._warm_start_signatures = {}
+        self._warm_start_locked_lot_ids = set()
+        self.warm_start_reused_lots = 0
+        if not self.warm_start_enabled or '生産ロットID' not in result_df.columns:
+            return set()
+
+        previous = load_warm_start(self.warm_start_path, pd.Timestamp.now().date())
+        cols = {col: idx for idx, col in enumerate(result_df.columns)}
+        reused: Set[int] = set()
+        claimed_codes: Set[str] = set()
+        claiming_lots = 0
+        invalidated_lots = 0
+        for row_idx, row in enumerate(result_df.itertuples(index=False)):
+            lot_id = str(self._get_tuple_value(row, cols, '生産ロットID') or '').strip()
+            product_number = row[cols['品番']]
+            shipping_date = row[cols['出荷予定日']] if '出荷予定日' in cols else None
+            signature = lot_signature(
+                product_number,
+                self._get_tuple_value(row, cols, '現在工程番号'),
+                self._get_tuple_value(row, cols, 'ロット数量'),
+                row[cols['検査時間']],
+                shipping_date,
+            )
+            if lot_id:
+                self._warm_start_signatures[lot_id] = signature
+            if not previous:
+                continue
+            entry = previous.get(lot_id) if lot_id else None
+            if entry is None or entry.signature != signature:
+                claimed_codes.update(self._warm_start_claimed_codes(result_df, row_idx))
+                claiming_lots += 1
+                continue
+            if not entry.codes:
+                continue
+            if self._collect_fixed_inspector_names(product_number, self._get_tuple_value(row, cols, '現在工程名')):
+                continue
+            if self._is_preinspection_label(shipping_date):
+                continue
+            if claimed_codes.intersection(entry.codes):
+                invalidated_lots += 1
+                continue
+            decision = self._warm_start_decision(result_df, assignment_matrix, row_idx, entry.codes, inspector_master_df)
+            if decision == WARM_START_REUSE:
+                self._reuse_warm_start_lot(result_df, assignment_matrix, row_idx, entry.codes, show_skill_values)
+                reused.add(row_idx)
+                if lot_id:
+                    self._warm_start_locked_lot_ids.add(lot_id)
+            elif decision == WARM_START_CLAIM:
+                claimed_codes.update(self._warm_start_claimed_codes(result_df, row_idx))
+                claiming_lots += 1
+
+        self.warm_start_reused_lots = len(reused)
+        if previous:
+            self.log_message(
+                f"ウォームスタート: 前回割当 {len(previous)}件のうち {len(reused)}件を引き継ぎました"
+                f"（残り {len(result_df) - len(reused)}件を割り当てます。新規・変更 {claiming_lots}件と"
+                f"検査員が重なる {invalidated_lots}件は割り当て直し）"
+            )
+        return reused
+
+    def _warm_start_claimed_codes(self, result_df: pd.DataFrame, row_idx: int) -> Set[str]:
+        """割り当て直すロットが確保する検査員コード（ベース候補。前回割当と重なる以降のロットは引き継がない）"""
+        return {insp['コード'] for insp in self._base_candidates_at(result_df, result_df.index[row_idx])}
+
+    def _is_warm_start_locked_lot(self, result_df: pd.DataFrame, lot_index: Any) -> bool:
+        """ウォームスタートで前回の検査員を引き継いだロットか（最適化フェーズで動かさない）"""
+        if not self._warm_start_locked_lot_ids or '生産ロットID' not in result_df.columns:
+            return False
+        try:
+            lot_id = result_df.at[lot_index, '生産ロットID']
+        except KeyError:
+            return False
+        return str(lot_id or '').strip() in self._warm_start_locked_lot_ids
+
+    def _warm_start_locked_mask(self, result_df: pd.DataFrame) -> pd.Series:
+        """ウォームスタートで前回の検査員を引き継いだロットのマスク（一括解除の対象から除く）"""
+        if not self._warm_start_locked_lot_ids or '生産ロットID' not in result_df.columns:
+            return pd.Series(False, index=result_df.index)
+        return result_df['生産ロットID'].astype(str).str.strip().isin(self._warm_start_locked_lot_ids)
+
+    def _warm_start_decision(
+        self,
+        result_df: pd.DataFrame,
+        assignment_matrix: AssignmentMatrix,
+        row_idx: int,
+        codes: Tuple[str, ...],
+        inspector_master_df: pd.DataFrame,
+    ) -> str:
+        """
+        内容が変わらないロットに前回の検査員を引き継げるか判定する（履歴は引き継ぎ済みのロット分のみ）
+
+        Returns:
+            WARM_START_REUSE / WARM_START_SKIP / WARM_START_CLAIM（条件は _apply_warm_start を参照）
+        """
+        if len(codes) > MAX_INSPECTORS_PER_LOT or len(set(codes)) != len(codes):
+            return WARM_START_CLAIM
+        index = result_df.index[row_idx]
+        try:
+            inspection_time = float(result_df.at[index, '検査時間'])
+        except (TypeError, ValueError):
+            return WARM_START_CLAIM
+        if not inspection_time > 0:
+            return WARM_START_CLAIM
+
+        candidates_by_code = {insp['コード']: insp for insp in self._base_candidates_at(result_df, index)}
+        product_number = result_df.at[index, '品番']
+        shipping_date = result_df.at[index, '出荷予定日'] if '出荷予定日' in result_df.columns else None
+        divided_time = inspection_time / len(codes)
+        lot_date = assignment_matrix.lot_date(row_idx) or pd.Timestamp.now().date()
+        is_same_day = self._should_force_assign_same_day(shipping_date)
+        decision = WARM_START_REUSE
+        for code in codes:
+            insp = candidates_by_code.get(code)
+            if insp is None:
+                # 是正フェーズでスキル外の検査員を割り当てた場合もあるため、引き継がずに割り当て直す
+                decision = WARM_START_SKIP
+                continue
+            if self.is_inspector_on_vacation(insp['氏名']):
+                return WARM_START_CLAIM
+            daily_hours = self.inspector_daily_assignments.get(code, {}).get(lot_date, 0.0)
+            allowed_hours = self._apply_work_hours_overrun(self.get_inspector_max_hours(code, inspector_master_df))
+            if daily_hours + divided_time > allowed_hours - WORK_HOURS_BUFFER:
+                return WARM_START_CLAIM
+            product_hours = self.inspector_product_hours.get(code, {}).get(product_number, 0.0)
+            if product_hours + divided_time > self.product_limit_hard_threshold:
+                decision = WARM_START_SKIP
+            # 品名単位の重複禁止は第1次割当でも緩和されることがある（最適化フェーズで是正）ため、品番単位のみ判定
+            if is_same_day and code in self.same_day_cleaning_inspectors.get(product_number, set()):
+                decision = WARM_START_SKIP
+        return decision
+
+    def _reuse_warm_start_lot(
+        self,
+        result_df: pd.DataFrame,
+        assignment_matrix: AssignmentMatrix,
+        row_idx: int,
+        codes: Tuple[str, ...],
+        show_skill_values: bool,
+    ) -> None:
+        """前回の検査員を割当行列・履歴へ確定する（_warm_start_decision で引き継げると判定したロット）"""
+        index = result_df.index[row_idx]
+        candidates_by_code = {insp['コード']: insp for insp in self._base_candidates_at(result_df, index)}
+        inspectors = [candidates_by_code[code] for code in codes]
+        product_number = result_df.at[index, '品番']
+        shipping_date = result_df.at[index, '出荷予定日'] if '出荷予定日' in result_df.columns else None
+        divided_time = float(result_df.at[index, '検査時間']) / len(codes)
+        product_name = result_df.at[index, '品名'] if '品名' in result_df.columns else None
+        product_name_str = str(product_name).strip() if product_name is not None and pd.notna(product_name) else ''
+
+        for slot, insp in enumerate(inspectors):
+            assignment_matrix.set_slot(row_idx, slot, insp['コード'], self._inspector_display_label(insp, show_skill_values))
+            self.inspector_product_variety.setdefault(insp['コード'], set()).add(product_number)
+        assignment_matrix.set_inspector_count(row_idx, len(codes))
+        assignment_matrix.set_divided_time(row_idx, round(divided_time, 1))
+        self._ledger_apply_contribution(
+            {
+                'product_number': product_number,
+                'product_name': product_name_str,
+                'divided_time': divided_time,
+                'lot_date': assignment_matrix.lot_date(row_idx) or pd.Timestamp.now().date(),
+                'is_same_day': self._should_force_assign_same_day(shipping_date),
+                'codes': list(codes),
+            },
+            1,
+        )
+        names = [insp['氏名'] for insp in inspectors]
+        result_df.at[index, 'チーム情報'] = f"チーム: {', '.join(names)}" if len(names) > 1 else f"個人: {names[0]}"
+        result_df.at[index, 'remaining_work_hours'] = 0.0
+        result_df.at[index, 'assignability_status'] = 'fully_assigned'
+        result_df.at[index, 'over_product_limit_flag'] = False
+
+    def _save_warm_start(self, result_df: pd.DataFrame, inspector_master_df: pd.DataFrame) -> None:
+        """最終割当を生産ロットIDごとに保存する（次回実行のウォームスタート用）"""
+        if not self.warm_start_enabled or self._multi_start_active or self.warm_start_path is None:
+            return
+        if result_df is None or result_df.empty or '生産ロットID' not in result_df.columns:
+            return
+        try:
+            entries: Dict[str, WarmStartEntry] = {}
+            cols = {col: idx for idx, col in enumerate(result_df.columns)}
+            for row in result_df.itertuples(index=False):
+                lot_id = str(self._get_tuple_value(row, cols, '生産ロットID') or '').strip()
+                signature = self._warm_start_signatures.get(lot_id)
+                if signature is None:
+                    continue
+                codes: List[str] = []
+                for i in range(1, MAX_INSPECTORS_PER_LOT + 1):
+                    code = self._get_inspector_id_by_name(self._get_tuple_value(row, cols, f'検査員{i}'), inspector_master_df)
+                    if code is not None:
+                        codes.append(str(code))
+                # 未割当のロットも保存する（内容が変わらなければ次回の引き継ぎを打ち切らない）
+                entries[lot_id] = WarmStartEntry(signature, tuple(codes))
+            save_warm_start(self.warm_start_path, pd.Timestamp.now().date(), entries)
+        except Exception as e:
+            # 保存に失敗しても割当結果は返す（次回は通常どおり割り当てる）
+            self.log_message(f"ウォームスタート用の割当結果の保存に失敗しました: {e}", level='warning')
+
+    def _export_multi_start_state(self) -> Dict[str, Any]:
+        """マルチスタートのワーカーへ渡す状態（ログ出力先を除く属性一式、ワーカー側では多重起動しない）"""
+        state = {key: value for key, value in self.__dict__.items() if key not in ('log_callback', 'phase_profiler')}
+        state['multi_start_count'] = 1
+        state['profile_report_path'] = None
+        state['_multi_start_active'] = True
+        state['log_buffer'] = []
+        return state
+
+    def _assign_inspectors_multi_start(
+        self,
+        inspector_df: pd.DataFrame,
+        inspector_master_df: pd.DataFrame,
+        skill_master_df: pd.DataFrame,
+        show_skill_values: bool = False,
+        process_master_df: Optional[pd.DataFrame] = None,
+        inspection_target_keywords: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
+        """
+        マルチスタートで割当を実行する
+
+        スタート0（摂動なし）を含む全スタートを、同じハッシュシードのワーカープロセスで並列に実行する。
+        未割当時間 → 勤務時間超過量 → 稼働率の最大最小差 の順に比較して最良の結果を採用し、
+        履歴は採用結果から再構築する。
+        """
+        self.log_message(
+            f"マルチスタート: {self.multi_start_count}通り（シード {self.multi_start_seed}、"
+            f"待ち時間の上限 {self.multi_start_time_budget:.0f}秒）で割当を実行します"
+        )
+        self._multi_start_active = True
+        try:
+            with perf_timer(loguru_logger, "inspector_assignment.manager.multi_start"):
+                best_df, results, histories_current = run_multi_start(
+                    self,
+                    inspector_df,
+                    inspector_master_df,
+                    skill_master_df,
+                    show_skill_values,
+                    process_master_df,
+                    inspection_target_keywords,
+                    starts=self.multi_start_count,
+                    time_budget_seconds=self.multi_start_time_budget,
+                    base_seed=self.multi_start_seed,
+                )
+        finally:
+            self._multi_start_active = False
+
+        best = min(results, key=lambda result: (result.score, result.start))
+        for result in results:
+            self.log_message(
+                f"  スタート{result.start}: 未割当 {result.score.unassigned_hours:.1f}h / "
+                f"勤務時間超過 {result.score.overrun_hours:.1f}h / 稼働率差 {result.score.utilization_spread * 100:.1f}% "
+                f"({result.elapsed:.1f}秒){' ← 採用' if result is best else ''}"
+            )
+        if not histories_current:
+            self._rebuild_assignment_histories(best_df, inspector_master_df)
+        return best_df
+
+    def _profile_counters(self) -> Dict[str, float]:
+        """フェーズ別プロファイル用のカウンタ（各メトリクスの累計値、フェーズ間の差分をレポートに記録）"""
+        return {
+            'swaps': self.swap_count,
+            'violations': self.violation_count,
+            'tabu_additions': self.tabu_list_metrics['total_additions'],
+            'tabu_skips': self.tabu_list_metrics['total_skips'],
+            'product_constraint_checks': self.product_assignment_metrics['total_checks'],
+            'product_constraint_violations': self.product_assignment_metrics['constraint_violations'],
+            'product_relaxations': self.product_assignment_metrics['relaxed_assignments'],
+            'same_day_relaxations': self.same_day_relaxation_metrics['total_relaxations'],
+            'buffer_checks': self.buffer_usage_metrics['total_checks'],
+            'buffer_exceeded': self.buffer_usage_metrics['buffer_exceeded_count'],
+            'new_product_protections': self.new_product_protection_metrics['total_protections'],
+            'fixed_inspector_protections': self.fixed_inspector_protection_metrics['total_protections'],
+            'suppressed_logs': sum(self._suppressed_log_counts.values()),
+        }
+
+    def _finish_profile_report(self, result_df: pd.DataFrame, inspector_master_df: pd.DataFrame) -> None:
+        """フェーズ別プロファイルの計測を終了し、出力先が設定されていればJSONレポートを書き出す"""
+        if not self.phase_profiler.active:
+            return
+        try:
+            assigned_lots = 0
+            if '検査員人数' in result_df.columns:
+                assigned_lots = int((pd.to_numeric(result_df['検査員人数'], errors='coerce').fillna(0) > 0).sum())
+            self.last_profile_report = self.phase_profiler.finish_run(
+                lots=int(len(result_df)),
+                inspectors=int(len(inspector_master_df)) if inspector_master_df is not None else 0,
+                assigned_lots=assigned_lots,
+            )
+            if self.settings.profile_report and self.profile_report_path is not None:
+                report_path = write_report(self.last_profile_report, self.profile_report_path)
+                self.log_message(f"フェーズ別プロファイルレポートを出力しました: {report_path}", debug=True)
+        except Exception as e:
+            # レポート出力に失敗しても割当結果は返す
+            self.log_message(f"フェーズ別プロファイルレポートの出力に失敗しました: {e}", level='warning')
+
+    def _finalize_assignment_result(
+        self,
+        result_df: pd.DataFrame,
+        inspector_master_df: pd.DataFrame,
+        skill_master_df: pd.DataFrame,
+        show_skill_values: bool = False,
+        process_master_df: Optional[pd.DataFrame] = None,
+        inspection_target_keywords: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
+        """
+        割当後の共通仕上げ（最終統計・低稼働救済・表示用ソート・FIFO厳守・3.0時間ルール・最終KPI）
+
+        貪欲法＋是正フェーズ、最小費用流のどちらのソルバーモードでも同じ処理を行う。
+        """
+        # 最終割り当て統計を表示
+        self.log_message("=== 最終割り当て統計 ===")
+        with perf_timer(loguru_logger, "inspector_assignment.manager.print_stats.final"):
+            self.print_assignment_statistics(inspector_master_df)
+        
+        # 低稼働の偏り緩和: FIFO/10%制約を維持したまま未割当ロットを再試行
+        try:
+            if '検査員人数' in result_df.columns and (pd.to_numeric(result_df['検査員人数'], errors='coerce').fillna(0) <= 0).any():
+                with self.phase_profiler.phase('2.7'):
+                    result_df = self._run_post_final_fill_underutilized(
+                        result_df,
+                        inspector_master_df,
+                        skill_master_df,
+                        show_skill_values=show_skill_values,
+                        process_master_df=process_master_df,
+                        inspection_target_keywords=inspection_target_keywords,
+                    )
+        except Exception as e:
+            self.log_message(f"最終割当後の追加割当でエラーが発生しました: {e}", level='warning')
+        
+        if '_candidate_group' in result_df.columns:
+            result_df = result_df.drop(columns=['_candidate_group'])
+        if '_sort_product_id' in result_df.columns:
+            result_df = result_df.drop(columns=['_sort_product_id'])
+        if '_is_new_product' in result_df.columns:
+            result_df = result_df.drop(columns=['_is_new_product'])
+        if '_has_fixed_inspectors' in result_df.columns:
+            result_df = result_df.drop(columns=['_has_fixed_inspectors'])
+        if '_is_high_priority' in result_df.columns:
+            result_df = result_df.drop(columns=['_is_high_priority'])
+        if '_shipping_priority' in result_df.columns:
+            result_df = result_df.drop(columns=['_shipping_priority'])
+        if '_later_shipping_date' in result_df.columns:
+            result_df = result_df.drop(columns=['_later_shipping_date'])
+        
+        # 最終的な表示用ソート: 出荷予定日、品番、指示日の順
+        # 出荷予定日のソートキー関数
+        current_date = pd.Timestamp.now().date()
+        
+        # 翌営業日の計算（金曜日の場合は翌週の月曜日）
+        def get_next_business_day(date_val):
+            """翌営業日を取得（金曜日の場合は翌週の月曜日）"""
+            weekday = date_val.weekday()  # 0=月曜日, 4=金曜日
+            if weekday == 4:  # 金曜日
+                return date_val + timedelta(days=3)  # 翌週の月曜日
+            else:
+                return date_val + timedelta(days=1)  # 翌日
+        
+        next_business_day = get_next_business_day(current_date)
+        
+        def shipping_date_sort_key(val):
+            if pd.isna(val):
+                return (5, None)  # 最後に
+            val_str = str(val).strip()
             
-            # 指示日のソートキー関数
-            def instruction_date_sort_key(val):
-                if pd.isna(val):
-                    return None
-                try:
-                    date_val = pd.to_datetime(val, errors='coerce')
-                    if pd.notna(date_val):
-                        return date_val
-                except:
-                    pass
-                return val
+            # 1. 当日の日付（優先度0）
+            try:
+                date_val = pd.to_datetime(val, errors='coerce')
+                if pd.notna(date_val):
+                    date_date = date_val.date()
+                    if date_date == current_date:
+                        return (0, date_val)
+            except:
+                pass
             
-            # ソートキーを追加
-            result_df['_shipping_sort_key'] = result_df['出荷予定日'].apply(shipping_date_sort_key)
-            if '指示日' in result_df.columns:
-                result_df['_instruction_sort_key'] = result_df['指示日'].apply(instruction_date_sort_key)
-            else:
-                result_df['_instruction_sort_key'] = None
+            # 2. 先行検査品（優先度1）
+            if (val_str == "先行検査" or
+                val_str == "当日先行検査"):
+                return (1, val_str)
             
-            # FIFO厳守: 品番内で未割当が先に存在する場合、後続の割当を解除
-            fifo_cleared = 0
-            fifo_products = set()
-            if '品番' in result_df.columns:
-                inspector_cols = [
-                    f'検査員{i}'
-                    for i in range(1, MAX_INSPECTORS_PER_LOT + 1)
-                    if f'検査員{i}' in result_df.columns
-                ]
-                fifo_sort_cols = [
-                    col for col in ['_instruction_sort_key', '_shipping_sort_key', '_original_index']
-                    if col in result_df.columns
-                ]
-                if fifo_sort_cols:
-                    if '出荷予定日' in result_df.columns:
-                        group_keys = ['品番', '出荷予定日']
-                    else:
-                        group_keys = ['品番']
-                    for group_key, group in result_df.groupby(group_keys, sort=False):
-                        group_sorted = group.sort_values(
-                            fifo_sort_cols,
-                            ascending=[True] * len(fifo_sort_cols),
-                            na_position='last',
-                        )
-                        found_unassigned = False
-                        for idx in group_sorted.index:
-                            row = result_df.loc[idx]
-                            shipping_raw_for_fifo = row.get('出荷予定日', None)
-                            # 当日洗浄/先行検査ラベルは最優先のため、FIFO解除対象から除外
-                            if self._is_same_day_cleaning_label(shipping_raw_for_fifo):
-                                continue
+            # 3. 当日洗浄上がり品（最下位表示）
+            if (val_str == "当日洗浄上がり品" or
+                val_str == "当日洗浄品" or
+                "当日洗浄" in val_str):
+                return (6, val_str)
+            
+            # 4. 翌日または翌営業日（優先度3）
+            try:
+                date_val = pd.to_datetime(val, errors='coerce')
+                if pd.notna(date_val):
+                    date_date = date_val.date()
+                    if date_date == next_business_day:
+                        return (3, date_val)
+            except:
+                pass
+            
+            # 5. それ以降の日付（優先度4）
+            try:
+                date_val = pd.to_datetime(val, errors='coerce')
+                if pd.notna(date_val):
+                    return (4, date_val)
+            except:
+                pass
+            
+            return (5, val_str)  # その他文字列
+        
+        # 指示日のソートキー関数
+        def instruction_date_sort_key(val):
+            if pd.isna(val):
+                return None
+            try:
+                date_val = pd.to_datetime(val, errors='coerce')
+                if pd.notna(date_val):
+                    return date_val
+            except:
+                pass
+            return val
+        
+        # ソートキーを追加
+        result_df['_shipping_sort_key'] = result_df['出荷予定日'].apply(shipping_date_sort_key)
+        if '指示日' in result_df.columns:
+            result_df['_instruction_sort_key'] = result_df['指示日'].apply(instruction_date_sort_key)
+        else:
+            result_df['_instruction_sort_key'] = None
+        
+        # FIFO厳守: 品番内で未割当が先に存在する場合、後続の割当を解除
+        fifo_cleared = 0
+        fifo_products = set()
+        if '品番' in result_df.columns:
+            inspector_cols = [
+                f'検査員{i}'
+                for i in range(1, MAX_INSPECTORS_PER_LOT + 1)
+                if f'検査員{i}' in result_df.columns
+            ]
+            fifo_sort_cols = [
+                col for col in ['_instruction_sort_key', '_shipping_sort_key', '_original_index']
+                if col in result_df.columns
+            ]
+            if fifo_sort_cols:
+                if '出荷予定日' in result_df.columns:
+                    group_keys = ['品番', '出荷予定日']
+                else:
+                    group_keys = ['品番']
+                for group_key, group in result_df.groupby(group_keys, sort=False):
+                    group_sorted = group.sort_values(
+                        fifo_sort_cols,
+                        ascending=[True] * len(fifo_sort_cols),
+                        na_position='last',
+                    )
+                    found_unassigned = False
+                    for idx in group_sorted.index:
+                        row = result_df.loc[idx]
+                        shipping_raw_for_fifo = row.get('出荷予定日', None)
+                        # 当日洗浄/先行検査ラベルは最優先のため、FIFO解除対象から除外
+                        if self._is_same_day_cleaning_label(shipping_raw_for_fifo):
+                            continue
+                        assigned = False
+                        count_val = row.get('検査員人数', 0)
+                        try:
+                            if pd.notna(count_val) and int(count_val) > 0:
+                                assigned = True
+                        except Exception:
                             assigned = False
-                            count_val = row.get('検査員人数', 0)
-                            try:
-                                if pd.notna(count_val) and int(count_val) > 0:
+                        if not assigned:
+                            for col in inspector_cols:
+                                val = row.get(col, '')
+                                if pd.notna(val) and str(val).strip():
                                     assigned = True
+                                    break
+                        if not assigned:
+                            found_unassigned = True
+                            continue
+                        if found_unassigned:
+                            if 'チーム情報' in result_df.columns:
+                                result_df.at[idx, 'チーム情報'] = '未割当(FIFO優先)'
+                            try:
+                                index_position = result_df.index.get_loc(idx)
                             except Exception:
-                                assigned = False
-                            if not assigned:
-                                for col in inspector_cols:
-                                    val = row.get(col, '')
-                                    if pd.notna(val) and str(val).strip():
-                                        assigned = True
-                                        break
-                            if not assigned:
-                                found_unassigned = True
-                                continue
-                            if found_unassigned:
-                                if 'チーム情報' in result_df.columns:
-                                    result_df.at[idx, 'チーム情報'] = '未割当(FIFO優先)'
-                                try:
-                                    index_position = result_df.index.get_loc(idx)
-                                except Exception:
-                                    index_position = int(idx)
-                                self.clear_assignment(result_df, index_position)
-                                if 'assignability_status' in result_df.columns:
-                                    result_df.at[idx, 'assignability_status'] = 'fifo_blocked'
-                                fifo_cleared += 1
-                                if isinstance(group_key, tuple):
-                                    fifo_products.add(str(group_key[0]))
-                                else:
-                                    fifo_products.add(str(group_key))
-
-            if fifo_cleared:
-                self.log_message(
-                    f"FIFO厳守: 未割当が先に存在する品番の後続割当を解除しました: {fifo_cleared}件 / 品番 {len(fifo_products)}件"
-                )
+                                index_position = int(idx)
+                            self.clear_assignment(result_df, index_position)
+                            if 'assignability_status' in result_df.columns:
+                                result_df.at[idx, 'assignability_status'] = 'fifo_blocked'
+                            fifo_cleared += 1
+                            if isinstance(group_key, tuple):
+                                fifo_products.add(str(group_key[0]))
+                            else:
+                                fifo_products.add(str(group_key))
 
-            # FIFO厳守(全体)は副作用が大きいため、明示有効時のみ実行する
-            if os.getenv("ENABLE_GLOBAL_FIFO_CLEAR", "0").strip() == "1":
-                fifo_global_cleared = 0
-                try:
-                    if '出荷予定日' in result_df.columns and '検査員人数' in result_df.columns:
-                        shipping_raw_series = result_df['出荷予定日']
-                        shipping_dt_series = pd.to_datetime(shipping_raw_series, errors='coerce', format='mixed')
-                        normal_mask = (
-                            shipping_dt_series.notna()
-                            & (~shipping_raw_series.apply(self._is_same_day_cleaning_label))
-                            & (~shipping_raw_series.apply(self._is_preinspection_label))
-                        )
-                        inspector_count_series = pd.to_numeric(result_df['検査員人数'], errors='coerce').fillna(0)
-                        unassigned_normal_mask = normal_mask & (inspector_count_series <= 0)
-                        if unassigned_normal_mask.any():
-                            earliest_unassigned_date = shipping_dt_series[unassigned_normal_mask].min()
-                            if pd.notna(earliest_unassigned_date):
-                                late_assigned_mask = (
-                                    normal_mask
-                                    & (shipping_dt_series > earliest_unassigned_date)
-                                    & (inspector_count_series > 0)
-                                )
-                                if late_assigned_mask.any():
-                                    for idx in result_df.index[late_assigned_mask]:
-                                        if 'チーム情報' in result_df.columns:
-                                            result_df.at[idx, 'チーム情報'] = '未割当(FIFO優先: 日付全体)'
-                                        self.clear_assignment(result_df, idx)
-                                        if 'assignability_status' in result_df.columns:
-                                            result_df.at[idx, 'assignability_status'] = 'fifo_blocked_global'
-                                        fifo_global_cleared += 1
-                                    self.log_message(
-                                        f"FIFO厳守(全体): {earliest_unassigned_date.date()} の未割当を優先するため、後続日付の割当を解除しました: {fifo_global_cleared}件",
-                                        level='warning',
-                                    )
-                except Exception as e:
-                    self.log_message(f"FIFO厳守(全体)の適用中にエラーが発生しました: {e}", level='warning')
-            
-            # ソート実行: 出荷予定日、品番、指示日（FIFO）の順
-            sort_columns = ['_shipping_sort_key', '品番']
-            if '指示日' in result_df.columns:
-                sort_columns.append('_instruction_sort_key')
-            if '_original_index' in result_df.columns:
-                sort_columns.append('_original_index')
-
-            ascending = [True] * len(sort_columns)
-            result_df = result_df.sort_values(
-                sort_columns,
-                ascending=ascending,
-                na_position='last'
-            ).reset_index(drop=True)
-            
-            # ソートキー列を削除
-            result_df = result_df.drop(columns=['_shipping_sort_key', '_instruction_sort_key'], errors='ignore')
+        if fifo_cleared:
+            self.log_message(
+                f"FIFO厳守: 未割当が先に存在する品番の後続割当を解除しました: {fifo_cleared}件 / 品番 {len(fifo_products)}件"
+            )
 
-            # 最終表示直前に3.0時間ルールを厳守（必要人数未満は必ず未割当）
+        # FIFO厳守(全体)は副作用が大きいため、明示有効時のみ実行する
+        if os.getenv("ENABLE_GLOBAL_FIFO_CLEAR", "0").strip() == "1":
+            fifo_global_cleared = 0
             try:
-                if {'検査時間'}.issubset(result_df.columns):
-                    inspector_cols_final = [
-                        f'検査員{i}'
-                        for i in range(1, MAX_INSPECTORS_PER_LOT + 1)
-                        if f'検査員{i}' in result_df.columns
-                    ]
-                    for idx, row in result_df.iterrows():
-                        inspection_time = row.get('検査時間', 0.0)
-                        if inspection_time is None or pd.isna(inspection_time):
-                            continue
-                        if inspection_time <= self.required_inspectors_threshold:
-                            continue
-                        required_count = max(2, int(inspection_time / self.required_inspectors_threshold) + 1)
-                        required_count = min(MAX_INSPECTORS_PER_LOT, required_count)
-                        actual_count = 0
-                        for col in inspector_cols_final:
-                            val = row.get(col, '')
-                            if pd.notna(val) and str(val).strip() != '':
-                                actual_count += 1
-                        if actual_count < required_count:
-                            self.clear_assignment(result_df, idx)
-                            result_df.at[idx, 'チーム情報'] = (
-                                f'未割当({self.required_inspectors_threshold:.1f}時間基準違反: '
-                                f'必要{required_count}人に対して{actual_count}人)'
+                if '出荷予定日' in result_df.columns and '検査員人数' in result_df.columns:
+                    shipping_raw_series = result_df['出荷予定日']
+                    shipping_dt_series = pd.to_datetime(shipping_raw_series, errors='coerce', format='mixed')
+                    normal_mask = (
+                        shipping_dt_series.notna()
+                        & (~shipping_raw_series.apply(self._is_same_day_cleaning_label))
+                        & (~shipping_raw_series.apply(self._is_preinspection_label))
+                    )
+                    inspector_count_series = pd.to_numeric(result_df['検査員人数'], errors='coerce').fillna(0)
+                    unassigned_normal_mask = normal_mask & (inspector_count_series <= 0)
+                    if unassigned_normal_mask.any():
+                        earliest_unassigned_date = shipping_dt_series[unassigned_normal_mask].min()
+                        if pd.notna(earliest_unassigned_date):
+                            late_assigned_mask = (
+                                normal_mask
+                                & (shipping_dt_series > earliest_unassigned_date)
+                                & (inspector_count_series > 0)
                             )
-                            result_df.at[idx, 'assignability_status'] = 'capacity_shortage_partial'
-                            result_df.at[idx, 'remaining_work_hours'] = round(float(inspection_time), 2)
+                            if late_assigned_mask.any():
+                                for idx in result_df.index[late_assigned_mask]:
+                                    if 'チーム情報' in result_df.columns:
+                                        result_df.at[idx, 'チーム情報'] = '未割当(FIFO優先: 日付全体)'
+                                    self.clear_assignment(result_df, idx)
+                                    if 'assignability_status' in result_df.columns:
+                                        result_df.at[idx, 'assignability_status'] = 'fifo_blocked_global'
+                                    fifo_global_cleared += 1
+                                self.log_message(
+                                    f"FIFO厳守(全体): {earliest_unassigned_date.date()} の未割当を優先するため、後続日付の割当を解除しました: {fifo_global_cleared}件",
+                                    level='warning',
+                                )
             except Exception as e:
-                self.log_message(f"最終表示前の3.0時間ルール適用でエラーが発生しました: {e}", level='warning')
+                self.log_message(f"FIFO厳守(全体)の適用中にエラーが発生しました: {e}", level='warning')
+        
+        # ソート実行: 出荷予定日、品番、指示日（FIFO）の順
+        sort_columns = ['_shipping_sort_key', '品番']
+        if '指示日' in result_df.columns:
+            sort_columns.append('_instruction_sort_key')
+        if '_original_index' in result_df.columns:
+            sort_columns.append('_original_index')
 
-            # FIFO厳守後の未割当に対して、低稼働救済を再試行（FIFO違反は除外）
-            try:
-                if '検査員人数' in result_df.columns and (pd.to_numeric(result_df['検査員人数'], errors='coerce').fillna(0) <= 0).any():
+        ascending = [True] * len(sort_columns)
+        result_df = result_df.sort_values(
+            sort_columns,
+            ascending=ascending,
+            na_position='last'
+        ).reset_index(drop=True)
+        
+        # ソートキー列を削除
+        result_df = result_df.drop(columns=['_shipping_sort_key', '_instruction_sort_key'], errors='ignore')
+
+        # 最終表示直前に3.0時間ルールを厳守（必要人数未満は必ず未割当）
+        try:
+            if {'検査時間'}.issubset(result_df.columns):
+                inspector_cols_final = [
+                    f'検査員{i}'
+                    for i in range(1, MAX_INSPECTORS_PER_LOT + 1)
+                    if f'検査員{i}' in result_df.columns
+                ]
+                for idx, row in result_df.iterrows():
+                    inspection_time = row.get('検査時間', 0.0)
+                    if inspection_time is None or pd.isna(inspection_time):
+                        continue
+                    if inspection_time <= self.required_inspectors_threshold:
+                        continue
+                    required_count = max(2, int(inspection_time / self.required_inspectors_threshold) + 1)
+                    required_count = min(MAX_INSPECTORS_PER_LOT, required_count)
+                    actual_count = 0
+                    for col in inspector_cols_final:
+                        val = row.get(col, '')
+                        if pd.notna(val) and str(val).strip() != '':
+                            actual_count += 1
+                    if actual_count < required_count:
+                        self.clear_assignment(result_df, idx)
+                        result_df.at[idx, 'チーム情報'] = (
+                            f'未割当({self.required_inspectors_threshold:.1f}時間基準違反: '
+                            f'必要{required_count}人に対して{actual_count}人)'
+                        )
+                        result_df.at[idx, 'assignability_status'] = 'capacity_shortage_partial'
+                        result_df.at[idx, 'remaining_work_hours'] = round(float(inspection_time), 2)
+        except Exception as e:
+            self.log_message(f"最終表示前の3.0時間ルール適用でエラーが発生しました: {e}", level='warning')
+
+        # FIFO厳守後の未割当に対して、低稼働救済を再試行（FIFO違反は除外）
+        try:
+            if '検査員人数' in result_df.columns and (pd.to_numeric(result_df['検査員人数'], errors='coerce').fillna(0) <= 0).any():
+                with self.phase_profiler.phase('2.7'):
                     result_df = self._run_post_final_fill_underutilized(
                         result_df,
                         inspector_master_df,
@@ -4260,62 +5551,241 @@ class InspectorAssignmentManager:
                         inspection_target_keywords=inspection_target_keywords,
                         skip_fifo_blocked=True,
                     )
-            except Exception as e:
-                self.log_message(f"FIFO後の追加割当でエラーが発生しました: {e}", level='warning')
+        except Exception as e:
+            self.log_message(f"FIFO後の追加割当でエラーが発生しました: {e}", level='warning')
 
-            # 最終KPI（通常は簡易、デバッグ時は詳細）※最終調整後の状態で出力
-            # ※ログとUIの整合性のため、ここで履歴を再構築
-            try:
-                self._rebuild_assignment_histories(result_df, inspector_master_df)
-            except Exception as e:
-                self.log_message(f"最終KPI前の履歴再構築でエラーが発生しました: {e}", level='warning')
-            with perf_timer(loguru_logger, "inspector_assignment.manager.print_detailed_kpi"):
-                self.print_detailed_kpi_statistics(result_df, inspector_master_df, skill_master_df)
-            self._log_utilization_summary(
-                result_df,
+        # 最終KPI（通常は簡易、デバッグ時は詳細）※最終調整後の状態で出力
+        # ※ログとUIの整合性のため、ここで履歴を再構築
+        try:
+            self._rebuild_assignment_histories(result_df, inspector_master_df)
+        except Exception as e:
+            self.log_message(f"最終KPI前の履歴再構築でエラーが発生しました: {e}", level='warning')
+        with perf_timer(loguru_logger, "inspector_assignment.manager.print_detailed_kpi"):
+            self.print_detailed_kpi_statistics(result_df, inspector_master_df, skill_master_df)
+        self._log_utilization_summary(
+            result_df,
+            inspector_master_df,
+            skill_master_df,
+            process_master_df,
+            inspection_target_keywords,
+        )
+        self._log_exception_lot_summary(result_df)
+
+        # 検査員別の負荷サマリーをログ出力（偏り確認用）
+        self._log_inspector_workload_summary(result_df)
+
+        # 【追加】フェーズ別プロファイルレポートを出力
+        self._finish_profile_report(result_df, inspector_master_df)
+
+        # 【高速化】ログバッファをフラッシュ
+        if self.log_batch_enabled:
+            self._flush_log_buffer()
+
+        # 内部列（検査員ID列・ロット種別列・解析済み日付列）は表示・出力に渡さない
+        internal_columns = [inspector_id_column(i) for i in range(1, MAX_INSPECTORS_PER_LOT + 1)]
+        internal_columns += [LOT_KIND_COLUMN, PARSED_DATE_COLUMN]
+        result_df = result_df.drop(columns=[col for col in internal_columns if col in result_df.columns])
+        return result_df
+
+    def _assign_with_flow_solver(
+        self,
+        result_df: pd.DataFrame,
+        inspector_master_df: pd.DataFrame,
+        show_skill_values: bool = False,
+    ) -> pd.DataFrame:
+        """
+        最小費用流モードの割当（第1次割当＋全体最適化の代わり）
+
+        1. ロット・検査員・勤務時間を最小費用流でモデル化し、検査時間の配分を一括で求める
+           - 容量: 勤務時間上限、同一品番の時間上限（4時間ルール）、分割検査時間
+           - 費用: スキル、FIFO順位（並べ替え後の行位置）、PENALTY_LOT_COUNT_ALPHA / PENALTY_PRODUCT_VARIETY_BETA、
+             UNDERLOAD_BONUS_FACTOR（勤務時間の逓増費用による平準化）
+        2. 修復ステップ: FIFO順にフローの多い検査員から必要人数を選び、休暇・混入防止・当日洗浄の重複禁止などの
+           副制約を filter_available_inspectors と履歴で確認して割当台帳へ反映する（満たせないロットは未割当）
+
+        Args:
+            result_df: 優先順位で並べ替え済みの結果DataFrame（_candidate_group 列を持つ）
+            inspector_master_df: 検査員マスタ
+            show_skill_values: スキル値を表示するかどうか
+        """
+        current_date = pd.Timestamp.now().date()
+        # 割当台帳で差分更新するため、履歴を未割当の状態から作り直す
+        self._rebuild_assignment_histories(result_df, inspector_master_df)
+        skill_order_map = {1: 0, 2: 1, 3: 2, 'new': 3}
+
+        def _skill_rank(insp: Dict[str, Any]) -> int:
+            if insp.get('is_new_team', False):
+                return skill_order_map['new']
+            return skill_order_map.get(insp.get('スキル', 1), 0)
+
+        # 検査員ごとの割当可能時間（終日休暇は0）
+        capacities: Dict[str, float] = {}
+        if '#ID' in inspector_master_df.columns:
+            for _, master_row in inspector_master_df.iterrows():
+                code = str(master_row.get('#ID', '') or '').strip()
+                if not code or code in capacities:
+                    continue
+                name = str(master_row.get('#氏名', '') or '').strip()
+                if name and self.is_inspector_on_vacation(name):
+                    capacities[code] = 0.0
+                    continue
+                max_hours = self.get_inspector_max_hours(code, inspector_master_df)
+                capacities[code] = max(0.0, self._apply_work_hours_overrun(max_hours) - WORK_HOURS_BUFFER)
+
+        columns = result_df.columns
+        flow_lots: List[FlowLot] = []
+        lot_candidates: Dict[int, List[Dict[str, Any]]] = {}
+        lot_fixed_codes: Dict[int, Set[str]] = {}
+        for pos, index in enumerate(result_df.index):
+            inspection_time = result_df.at[index, '検査時間']
+            lot_quantity = result_df.at[index, 'ロット数量'] if 'ロット数量' in columns else 0
+            if lot_quantity == 0 or pd.isna(lot_quantity) or inspection_time == 0 or pd.isna(inspection_time):
+                reason = "ロット数量0" if (lot_quantity == 0 or pd.isna(lot_quantity)) else "検査時間0"
+                result_df.at[index, 'チーム情報'] = f'未割当({reason})'
+                result_df.at[index, 'assignability_status'] = 'quantity_zero'
+                result_df.at[index, 'remaining_work_hours'] = round(inspection_time or 0.0, 2)
+                continue
+            inspection_time = float(inspection_time)
+            product_number = result_df.at[index, '品番']
+            process_name = result_df.at[index, '現在工程名'] if '現在工程名' in columns else ''
+            shipping_date = result_df.at[index, '出荷予定日'] if '出荷予定日' in columns else None
+
+            candidates = [insp.copy() for insp in self._base_candidates_at(result_df, index)]
+            # 固定検査員はベース候補になくても候補に加え、修復ステップで優先する
+            fixed_codes: Set[str] = set()
+            candidate_codes = {insp.get('コード') for insp in candidates}
+            for fixed_name in self._collect_fixed_inspector_names(product_number, process_name):
+                fixed_code = self._get_inspector_id_by_name(fixed_name, inspector_master_df)
+                if not fixed_code:
+                    continue
+                fixed_codes.add(fixed_code)
+                if fixed_code not in candidate_codes:
+                    candidates.append({'氏名': fixed_name, 'コード': fixed_code, 'スキル': 1, 'is_new_team': False})
+                    candidate_codes.add(fixed_code)
+            if not candidates:
+                result_df.at[index, 'チーム情報'] = '未割当(条件に合う検査員がいない)'
+                result_df.at[index, 'assignability_status'] = 'capacity_shortage'
+                result_df.at[index, 'remaining_work_hours'] = round(inspection_time, 2)
+                continue
+
+            required = self._calc_required_inspectors(inspection_time)
+            if self._is_same_day_cleaning_label(shipping_date) and self._is_same_day_high_duration(inspection_time):
+                required = max(required, 2)
+            required = max(1, min(MAX_INSPECTORS_PER_LOT, required))
+            lot_candidates[pos] = candidates
+            lot_fixed_codes[pos] = fixed_codes
+            flow_lots.append(FlowLot(
+                key=pos,
+                product_number=str(product_number),
+                inspection_time=inspection_time,
+                required_inspectors=required,
+                rank=pos,
+                candidates=tuple(
+                    (insp['コード'], 0 if insp['コード'] in fixed_codes else _skill_rank(insp))
+                    for insp in candidates
+                    if insp.get('コード')
+                ),
+            ))
+
+        solution = solve_assignment_flow(
+            flow_lots,
+            capacities,
+            self.product_limit_hard_threshold,
+            FlowCostWeights(
+                lot_count_alpha=PENALTY_LOT_COUNT_ALPHA,
+                variety_beta=PENALTY_PRODUCT_VARIETY_BETA,
+                balance_factor=UNDERLOAD_BONUS_FACTOR,
+            ),
+        )
+        self.log_message(
+            f"最小費用流: ロット {len(flow_lots)}件 / 検査員 {len(capacities)}名 / "
+            f"配分 {solution.total_hours:.1f}h / 増加路 {solution.iterations}回"
+        )
+
+        # 修復ステップ: FIFO順（行位置順）にロット単位の顔ぶれへ整数化する
+        lot_date = self._resolve_lot_date(None, current_date)
+        assigned_lots = 0
+        for lot in flow_lots:
+            pos = lot.key
+            index = result_df.index[pos]
+            product_number = lot.product_number
+            process_name = result_df.at[index, '現在工程名'] if '現在工程名' in columns else ''
+            shipping_date = result_df.at[index, '出荷予定日'] if '出荷予定日' in columns else None
+            pre_status = result_df.at[index, 'assignability_status']
+            required = lot.required_inspectors
+            divided_time = lot.inspection_time / required
+            flow_hours = solution.hours.get(pos, {})
+            fixed_codes = lot_fixed_codes[pos]
+
+            feasible = self.filter_available_inspectors(
+                lot_candidates[pos],
+                divided_time,
                 inspector_master_df,
-                skill_master_df,
-                process_master_df,
-                inspection_target_keywords,
+                product_number,
+                process_name_context=process_name,
+                lot_date=lot_date,
             )
-            self._log_exception_lot_summary(result_df)
+            # 同一品番の時間上限は最適化フェーズと同じ厳格上限で判定する
+            feasible = [
+                insp for insp in feasible
+                if insp.get('__projected_product_hours', 0.0) <= self.product_limit_hard_threshold + 1e-9
+            ]
+            if self._is_same_day_cleaning_label(shipping_date):
+                product_name = result_df.at[index, '品名'] if '品名' in columns else ''
+                product_name_str = str(product_name).strip() if pd.notna(product_name) else ''
+                excluded_codes = set(self.same_day_cleaning_inspectors.get(product_number, set()))
+                if product_name_str:
+                    excluded_codes |= self.same_day_cleaning_inspectors_by_product_name.get(product_name_str, set())
+                feasible = [insp for insp in feasible if insp.get('コード') not in excluded_codes]
 
-            # 検査員別の負荷サマリーをログ出力（偏り確認用）
-            self._log_inspector_workload_summary(result_df)
+            feasible.sort(
+                key=lambda insp: (
+                    insp.get('コード') not in fixed_codes,
+                    -flow_hours.get(insp.get('コード'), 0.0),
+                    _skill_rank(insp),
+                    self.inspector_daily_assignments.get(insp.get('コード'), {}).get(lot_date, 0.0),
+                    str(insp.get('コード', '')),
+                )
+            )
+            selected = feasible[:required]
+            if len(selected) < required:
+                result_df.at[index, 'チーム情報'] = (
+                    f'未割当(勤務時間・品番上限により必要{required}人を確保できません)'
+                )
+                result_df.at[index, 'assignability_status'] = 'capacity_shortage'
+                result_df.at[index, 'remaining_work_hours'] = round(lot.inspection_time, 2)
+                self.log_message(
+                    f"最小費用流: 品番 {product_number} は必要{required}人に対して候補{len(selected)}人のため未割当",
+                    debug=True,
+                )
+                continue
+
+            display_names = []
+            for insp in selected:
+                if insp.get('is_new_team', False):
+                    display_names.append(f"{insp['氏名']}(新)")
+                elif show_skill_values:
+                    display_names.append(f"{insp['氏名']}({insp['スキル']})")
+                else:
+                    display_names.append(insp['氏名'])
+                self.inspector_product_variety.setdefault(insp['コード'], set()).add(product_number)
+            self.ledger_assign(
+                result_df, index, display_names, inspector_master_df, show_skill_values,
+                inspector_codes=[insp['コード'] for insp in selected],
+            )
+            result_df.at[index, 'remaining_work_hours'] = 0.0
+            if pre_status == 'capacity_shortage':
+                result_df.at[index, 'assignability_status'] = 'capacity_shortage_resolved'
+            elif pre_status == 'skill_mismatch':
+                result_df.at[index, 'assignability_status'] = 'skill_mismatch_resolved'
+            else:
+                result_df.at[index, 'assignability_status'] = 'fully_assigned'
+            assigned_lots += 1
+
+        self._verify_ledger_consistency(result_df, inspector_master_df, "最小費用流の修復ステップ")
+        self.log_message(f"最小費用流モードの割当が完了しました: {assigned_lots}/{len(result_df)}件")
+        return result_df
 
-            # 【高速化】ログバッファをフラッシュ
-            if self.log_batch_enabled:
-                self._flush_log_buffer()
-                
-            return result_df
-            
-        except Exception as e:
-            # 【高速化】ログバッファをフラッシュ（エラー時も）
-            if self.log_batch_enabled:
-                self._flush_log_buffer()
-            
-            error_msg = f"検査員割り当て中にエラーが発生しました: {str(e)}"
-            self.log_message(error_msg)
-            logger.error(error_msg, exc_info=True)  # スタックトレースも出力
-            
-            # エラーが発生した場合でも、最低限の列を追加して返す
-            if inspector_df is not None and not inspector_df.empty:
-                result_df = inspector_df.copy()
-                # 必要な列が存在しない場合は追加
-                if '検査員人数' not in result_df.columns:
-                    result_df['検査員人数'] = 0
-                if '分割検査時間' not in result_df.columns:
-                    result_df['分割検査時間'] = 0.0
-                for i in range(1, MAX_INSPECTORS_PER_LOT + 1):
-                    col_name = f'検査員{i}'
-                    if col_name not in result_df.columns:
-                        result_df[col_name] = ''
-                if 'チーム情報' not in result_df.columns:
-                    result_df['チーム情報'] = 'エラーにより割り当てできませんでした'
-                return result_df
-            
-            return inspector_df
-    
     def get_available_inspectors(
         self,
         product_number: str,
@@ -4332,6 +5802,7 @@ class InspectorAssignmentManager:
     ) -> List[Dict[str, Any]]:
         """
         利用可能な検査員を取得
+        （類似製品の混入防止: 同じ混入防止クラスの別品番を担当済みの検査員は含めない）
         
         Args:
             product_number: 品番
@@ -4351,6 +5822,37 @@ class InspectorAssignmentManager:
         Returns:
             利用可能な検査員のリスト
         """
+        available_inspectors = self._get_skill_available_inspectors(
+            product_number,
+            process_number,
+            skill_master_df,
+            inspector_master_df,
+            shipping_date=shipping_date,
+            allow_new_team_fallback=allow_new_team_fallback,
+            ignore_product_limit=ignore_product_limit,
+            process_master_df=process_master_df,
+            inspection_target_keywords=inspection_target_keywords,
+            process_name_context=process_name_context,
+            **kwargs
+        )
+        # 違反是正・再割当の各経路は filter_available_inspectors を通さずに候補を選ぶことがあるため、ここで除外する
+        return self._exclude_mix_prevention_conflicts(available_inspectors, product_number)
+
+    def _get_skill_available_inspectors(
+        self,
+        product_number: str,
+        process_number: Optional[Any],
+        skill_master_df: pd.DataFrame,
+        inspector_master_df: pd.DataFrame,
+        shipping_date: Optional[Any] = None,
+        allow_new_team_fallback: bool = False,
+        ignore_product_limit: bool = False,
+        process_master_df: Optional[pd.DataFrame] = None,
+        inspection_target_keywords: Optional[List[str]] = None,
+        process_name_context: Optional[str] = None,
+        **kwargs
+    ) -> List[Dict[str, Any]]:
+        """スキル・工程・固定検査員・新製品チームのフォールバックから候補検査員を取得（引数は get_available_inspectors と同じ）"""
         try:
             if "ignore_product_limit" in kwargs:
                 ignore_product_limit = bool(kwargs.pop("ignore_product_limit"))
@@ -4359,59 +5861,46 @@ class InspectorAssignmentManager:
                     f"get_available_inspectors: 未使用のキーワード引数を無視しました: {', '.join(kwargs.keys())}",
                     level="debug"
                 )
-            available_inspectors = []
             target_process_name = str(process_name_context or '').strip()
-            is_preinspection_label = self._is_preinspection_label(shipping_date)
+            # 【高速化】出荷予定日の種別・解析済み日付は実行ごとのキャッシュから参照（呼び出しごとに解析しない）
+            shipping_info = self._shipping_date_info(shipping_date)
+            is_preinspection_label = shipping_info.is_preinspection_label
             if is_preinspection_label:
                 allow_new_team_fallback = True
             
-            # 先行検査品・当日洗浄品で工程番号が空の場合、工程マスタから推定
+            # 先行検査品・当日洗浄品で工程番号が空の場合は、工程マスタから工程番号を推定する（推定は静的候補の作成時に実施）
+            infer_process = False
             if (process_number is None or str(process_number).strip() == ''):
-                shipping_date_str = str(shipping_date).strip() if pd.notna(shipping_date) else ''
-                is_same_day_cleaning = (
-                    shipping_date_str == "当日洗浄上がり品" or
-                    shipping_date_str == "当日洗浄品" or
-                    "当日洗浄" in shipping_date_str or
-                    shipping_date_str == "先行検査" or
-                    shipping_date_str == "当日先行検査"
+                infer_process = bool(
+                    shipping_info.is_same_day_label and process_master_df is not None and inspection_target_keywords
                 )
-                
-                if is_same_day_cleaning and process_master_df is not None and inspection_target_keywords:
-                    inferred_process = self.infer_process_number_from_process_master(
-                        product_number,
-                        process_master_df,
-                        inspection_target_keywords
-                    )
-                    if inferred_process:
-                        process_number = inferred_process
-                        self.log_message(f"先行検査品・当日洗浄品: 品番 '{product_number}' の工程番号を '{inferred_process}' に設定しました（スキルマスタ検索用）", debug=True)
-            
-            # 新規品対応チームメンバーのコードリストを取得（優先度調整用）
-            new_team_cache = getattr(self, "_new_team_inspectors_cache", None)
-            if new_team_cache is None:
-                new_team_cache = self.get_new_product_team_inspectors(inspector_master_df)
-                self._new_team_inspectors_cache = new_team_cache
-            new_team_inspectors = new_team_cache
-            new_team_codes = {insp['コード'] for insp in new_team_inspectors}
             
-            # デバッグ情報を出力
-            self.log_message(f"品番 '{product_number}' の検査員を検索中...", debug=True)
-            self.log_message(f"工程番号: '{process_number}'", debug=True)
-            if new_team_codes:
-                self.log_message(f"新規品対応チームメンバー（優先度調整対象）: {sorted(new_team_codes)}", debug=True)
-            
-            # スキルマスタから該当する品番の行を取得（完全一致のみ）
-            skill_rows = None
-            skill_cache = getattr(self, "_skill_rows_by_product_cache", None)
-            if isinstance(skill_cache, dict):
-                skill_rows = skill_cache.get(product_number)
-            if skill_rows is None:
-                skill_rows = skill_master_df[skill_master_df.iloc[:, 0] == product_number]
-                if isinstance(skill_cache, dict):
-                    skill_cache[product_number] = skill_rows
+            # 【高速化】出荷予定日に依存しない候補（スキル行・工程番号の推定・勤務時間0h/終日休暇の除外・
+            # 固定検査員の優先配置）は (品番, 工程番号, 工程名, ロット種別) ごとにキャッシュする
+            # （休暇情報の設定・割当実行の開始で状態バージョンが変わると破棄）
+            cache_key = make_cache_key(
+                product_number,
+                process_number,
+                target_process_name,
+                (id(process_master_df), tuple(inspection_target_keywords)) if infer_process else None,
+                id(skill_master_df),
+                id(inspector_master_df),
+            )
+            static_candidates = self._candidate_cache.get_or_build(
+                cache_key,
+                self._candidate_state_version,
+                lambda: self._build_static_candidates(
+                    product_number,
+                    process_number,
+                    skill_master_df,
+                    inspector_master_df,
+                    target_process_name,
+                    process_master_df if infer_process else None,
+                    inspection_target_keywords if infer_process else None,
+                ),
+            )
             
-            if skill_rows.empty:
-                self.log_message(f"品番 '{product_number}' がスキルマスタに見つかりません", debug=True)
+            if static_candidates.status == STATIC_CANDIDATES_PRODUCT_MISSING:
                 # 新規品の場合は新製品チームのメンバーを取得
                 if allow_new_team_fallback:
                     if is_preinspection_label:
@@ -4422,9 +5911,8 @@ class InspectorAssignmentManager:
                 else:
                     # 出荷予定日が間近の場合は新規品対応チームを使用
                     if shipping_date is not None:
-                        shipping_date = pd.to_datetime(shipping_date, errors='coerce')
-                        if pd.notna(shipping_date):
-                            shipping_date_date = shipping_date.date()
+                        shipping_date_date = shipping_info.parsed_date
+                        if shipping_date_date is not None:
                             current_date = pd.Timestamp.now().date()
                             two_weeks_later = current_date + timedelta(days=14)
                             if shipping_date_date <= two_weeks_later:
@@ -4442,92 +5930,48 @@ class InspectorAssignmentManager:
                                 return self.get_new_product_team_inspectors(inspector_master_df)
                     self.log_message("利用可能な検査員が見つかりません")
                     return []
-            # 工程番号による絞り込み処理
-            filtered_skill_rows = []
-            # 追加仕様: 現在工程番号が空欄の場合は工程による絞り込みを行わず、品番一致行をすべて対象
-            # 洗浄指示から取得したロットの場合、工程番号が複数ある場合は数字が若い方から処理
-            if process_number is None or str(process_number).strip() == '':
-                self.log_message("現在工程番号が空欄のため、工程フィルタをスキップして品番一致行を処理", debug=True)
-                
-                # 工程番号が空の行を優先的に取得
-                empty_process_rows = []
-                numeric_process_rows = []
-                other_process_rows = []
-                
-                # 工程番号列のインデックスを事前に取得（高速化：itertuples()を使用）
-                process_col_idx = 1  # iloc[1]に対応
-                for row_tuple in skill_rows.itertuples(index=True):
-                    row_idx = row_tuple[0]  # インデックス
-                    skill_process_number = row_tuple[process_col_idx + 1]  # itertuplesはインデックスを含むため+1
-                    skill_row = skill_rows.loc[row_idx]  # Seriesとして扱うために元の行を取得
-                    
-                    # 工程番号が空の行を優先
-                    if pd.isna(skill_process_number) or skill_process_number == '':
-                        empty_process_rows.append(skill_row)
-                    else:
-                        # 工程番号を数値として判定
-                        try:
-                            process_num = int(skill_process_number)
-                            numeric_process_rows.append((process_num, skill_row))
-                        except (ValueError, TypeError):
-                            # 数値に変換できない場合は別のリストに
-                            other_process_rows.append(skill_row)
-                
-                # 工程番号が空の行がある場合はそれを使用
-                if empty_process_rows:
-                    filtered_skill_rows = empty_process_rows
-                    self.log_message(f"工程番号が空の行を優先採用: {len(empty_process_rows)}件", debug=True)
-                elif numeric_process_rows:
-                    # 数字が若い方からソート
-                    numeric_process_rows.sort(key=lambda x: x[0])
-                    filtered_skill_rows = [row for _, row in numeric_process_rows]
-                    selected_process = numeric_process_rows[0][0]
-                    self.log_message(f"工程番号が空の行が見つからず、数字が若い工程番号={selected_process}を選択: {len(filtered_skill_rows)}件", debug=True)
-                else:
-                    # その他の行も含める
-                    filtered_skill_rows = other_process_rows
-                    self.log_message(f"工程番号が空の行も数値の行も見つからず、その他の行を採用: {len(filtered_skill_rows)}件", debug=True)
-            else:
-                # 工程番号列のインデックスを事前に取得（高速化：itertuples()を使用）
-                process_col_idx = 1  # iloc[1]に対応
-                for row_tuple in skill_rows.itertuples(index=True):
-                    row_idx = row_tuple[0]  # インデックス
-                    skill_process_number = row_tuple[process_col_idx + 1]  # itertuplesはインデックスを含むため+1
-                    skill_row = skill_rows.loc[row_idx]  # Seriesとして扱うために元の行を取得
-                    
-                    # スキルマスタの工程番号が空欄の場合は、工程番号が一致しなくてもOK
-                    if pd.isna(skill_process_number) or skill_process_number == '':
-                        filtered_skill_rows.append(skill_row)
-                        self.log_message("工程番号が空欄のため、工程番号条件を無視して追加", debug=True)
-                    elif str(skill_process_number) == str(process_number):
-                        filtered_skill_rows.append(skill_row)
-                        self.log_message(f"工程番号 '{process_number}' でマッチしました", debug=True)
-                    else:
-                        self.log_message(f"工程番号 '{skill_process_number}' は条件に一致しません", debug=True)
             
-            if not filtered_skill_rows:
-                warning_key = ("skill_process_not_found", str(product_number).strip(), str(process_number).strip())
-                if warning_key not in self.logged_warnings:
-                    self.logged_warnings.add(warning_key)
-                    self.log_message(
-                        f"工程番号 '{process_number}' に一致するスキル情報が見つかりません",
-                        level="warning",
-                    )
+            if static_candidates.status == STATIC_CANDIDATES_PROCESS_MISSING:
+                # 出荷予定日が間近で他に割当てられない場合のみ新規品対応チームを使用
+                if allow_new_team_fallback and shipping_date is not None:
+                    if is_preinspection_label:
+                        self.log_message("先行検査のため、新製品チームのメンバーを取得します", debug=True)
+                        return self.get_new_product_team_inspectors(inspector_master_df)
+                    shipping_date_date = shipping_info.parsed_date
+                    if shipping_date_date is not None:
+                        current_date = pd.Timestamp.now().date()
+                        two_weeks_later = current_date + timedelta(days=14)
+                        if shipping_date_date <= two_weeks_later:
+                            warning_key = (
+                                "new_team_fallback",
+                                "process_not_found",
+                                str(product_number).strip(),
+                                str(shipping_date_date),
+                            )
+                            if warning_key not in self.logged_warnings:
+                                self.logged_warnings.add(warning_key)
+                                self.log_message(
+                                    f"出荷予定日が間近（{shipping_date_date}）で他に割当てられないため、新規品対応チームを使用します"
+                                )
+                            return self.get_new_product_team_inspectors(inspector_master_df)
+                self.log_message("利用可能な検査員が見つかりません")
+                return []
+            
+            if not static_candidates.candidates:
+                self.log_message("警告: 利用可能な検査員が0人です")
                 # 出荷予定日が間近で他に割当てられない場合のみ新規品対応チームを使用
                 if allow_new_team_fallback and shipping_date is not None:
                     if is_preinspection_label:
                         self.log_message("先行検査のため、新製品チームのメンバーを取得します", debug=True)
                         return self.get_new_product_team_inspectors(inspector_master_df)
-                    shipping_date = pd.to_datetime(shipping_date, errors='coerce')
-                    if pd.notna(shipping_date):
-                        shipping_date_date = shipping_date.date()
+                    shipping_date_date = shipping_info.parsed_date
+                    if shipping_date_date is not None:
                         current_date = pd.Timestamp.now().date()
-                        lot_date_for_relax = self._resolve_lot_date(shipping_date, current_date)
                         two_weeks_later = current_date + timedelta(days=14)
                         if shipping_date_date <= two_weeks_later:
                             warning_key = (
                                 "new_team_fallback",
-                                "process_not_found",
+                                "no_available_inspectors",
                                 str(product_number).strip(),
                                 str(shipping_date_date),
                             )
@@ -4537,416 +5981,418 @@ class InspectorAssignmentManager:
                                     f"出荷予定日が間近（{shipping_date_date}）で他に割当てられないため、新規品対応チームを使用します"
                                 )
                             return self.get_new_product_team_inspectors(inspector_master_df)
-                self.log_message("利用可能な検査員が見つかりません")
                 return []
             
-            # スキル情報から検査員を取得
-            # NOTE: 列名の全量出力はログ肥大化の原因になるため、debug かつ1回だけ出力する
-            if not self._skill_master_schema_logged:
-                self.log_message(f"スキルマスタの列数: {len(skill_master_df.columns)}", debug=True)
-                # 検査員列は V002 以降をすべて対象（従来の Z040 までの固定上限を撤廃）
+            # 呼び出し側で候補辞書に集計値を書き込むため、キャッシュとは別の辞書を返す
+            return [dict(inspector) for inspector in static_candidates.candidates]
+            
+        except Exception as e:
+            import traceback
+            error_detail = traceback.format_exc()
+            self.log_message(f"利用可能な検査員取得中にエラーが発生しました: {str(e)}")
+            self.log_message(f"エラー詳細: {error_detail}")
+            # エラーが発生した場合は新製品チームにフォールバック
+            self.log_message("エラーのため新製品チームにフォールバックします")
+            return self.get_new_product_team_inspectors(inspector_master_df)
+    
+    def _build_static_candidates(
+        self,
+        product_number: str,
+        process_number: Optional[Any],
+        skill_master_df: pd.DataFrame,
+        inspector_master_df: pd.DataFrame,
+        target_process_name: str,
+        process_master_df: Optional[pd.DataFrame] = None,
+        inspection_target_keywords: Optional[List[str]] = None,
+    ) -> StaticCandidates:
+        """
+        出荷予定日に依存しない候補検査員を作成する（get_available_inspectors のキャッシュ対象）
+        
+        Args:
+            product_number: 品番
+            process_number: 工程番号
+            skill_master_df: スキルマスタ
+            inspector_master_df: 検査員マスタ
+            target_process_name: 現在工程名（固定検査員の工程フィルタに使用）
+            process_master_df: 工程マスタ（工程番号を推定する場合のみ指定）
+            inspection_target_keywords: 検査対象CSVのキーワードリスト（工程番号を推定する場合のみ指定）
+        
+        Returns:
+            StaticCandidates: 状態（ok / product_missing / process_missing）と候補のタプル
+        """
+        available_inspectors = []
+        
+        # 先行検査品・当日洗浄品で工程番号が空の場合、工程マスタから推定
+        if process_master_df is not None and inspection_target_keywords:
+            inferred_process = self.infer_process_number_from_process_master(
+                product_number,
+                process_master_df,
+                inspection_target_keywords
+            )
+            if inferred_process:
+                process_number = inferred_process
+                self.log_message(f"先行検査品・当日洗浄品: 品番 '{product_number}' の工程番号を '{inferred_process}' に設定しました（スキルマスタ検索用）", debug=True)
+        
+        # 新規品対応チームメンバーのコードリストを取得（優先度調整用）
+        new_team_cache = getattr(self, "_new_team_inspectors_cache", None)
+        if new_team_cache is None:
+            new_team_cache = self.get_new_product_team_inspectors(inspector_master_df)
+            self._new_team_inspectors_cache = new_team_cache
+        new_team_inspectors = new_team_cache
+        new_team_codes = {insp['コード'] for insp in new_team_inspectors}
+        
+        # デバッグ情報を出力
+        self.log_message(f"品番 '{product_number}' の検査員を検索中...", debug=True)
+        self.log_message(f"工程番号: '{process_number}'", debug=True)
+        if new_team_codes:
+            self.log_message(f"新規品対応チームメンバー（優先度調整対象）: {sorted(new_team_codes)}", debug=True)
+        
+        # スキルマスタから該当する品番の行を取得（完全一致のみ、コンパイル済みインデックスを参照）
+        skill_index = self._get_skill_index(skill_master_df)
+        
+        if not skill_index.has_product(product_number):
+            self.log_message(f"品番 '{product_number}' がスキルマスタに見つかりません", debug=True)
+            return StaticCandidates(STATIC_CANDIDATES_PRODUCT_MISSING, ())
+        # 工程番号による絞り込み処理
+        # 追加仕様: 現在工程番号が空欄の場合は工程による絞り込みを行わず、品番一致行をすべて対象
+        # 洗浄指示から取得したロットの場合、工程番号が複数ある場合は数字が若い方から処理
+        if process_number is None or str(process_number).strip() == '':
+            self.log_message("現在工程番号が空欄のため、工程フィルタをスキップして品番一致行を処理", debug=True)
+            
+            # 工程番号が空の行を優先、なければ数字が若い工程番号から、それもなければその他の行
+            selection_kind, filtered_skill_rows = skill_index.default_rows(product_number)
+            if selection_kind == 'blank':
+                self.log_message(f"工程番号が空の行を優先採用: {len(filtered_skill_rows)}件", debug=True)
+            elif selection_kind == 'numeric':
+                selected_process = filtered_skill_rows[0].numeric_process
+                self.log_message(f"工程番号が空の行が見つからず、数字が若い工程番号={selected_process}を選択: {len(filtered_skill_rows)}件", debug=True)
+            else:
+                self.log_message(f"工程番号が空の行も数値の行も見つからず、その他の行を採用: {len(filtered_skill_rows)}件", debug=True)
+        else:
+            # スキルマスタの工程番号が空欄の場合は、工程番号が一致しなくてもOK
+            filtered_skill_rows = skill_index.rows_for_process(product_number, process_number)
+            self.log_message(f"工程番号 '{process_number}' で絞り込み: {len(filtered_skill_rows)}件", debug=True)
+        
+        if not filtered_skill_rows:
+            warning_key = ("skill_process_not_found", str(product_number).strip(), str(process_number).strip())
+            if warning_key not in self.logged_warnings:
+                self.logged_warnings.add(warning_key)
                 self.log_message(
-                    f"スキルマスタの検査員列数: {max(0, len(skill_master_df.columns) - 2)}（例: {list(skill_master_df.columns[2:12])}）",
-                    debug=True
+                    f"工程番号 '{process_number}' に一致するスキル情報が見つかりません",
+                    level="warning",
                 )
+            return StaticCandidates(STATIC_CANDIDATES_PROCESS_MISSING, ())
+        
+        # スキル情報から検査員を取得
+        # NOTE: 列名の全量出力はログ肥大化の原因になるため、debug かつ1回だけ出力する
+        if not self._skill_master_schema_logged:
+            self.log_message(f"スキルマスタの列数: {len(skill_master_df.columns)}", debug=True)
+            # 検査員列は V002 以降をすべて対象（従来の Z040 までの固定上限を撤廃）
+            self.log_message(
+                f"スキルマスタの検査員列数: {max(0, len(skill_master_df.columns) - 2)}（例: {list(skill_master_df.columns[2:12])}）",
+                debug=True
+            )
 
-                # 処理対象の検査員コードを事前に確認（ログ用）
-                valid_inspector_codes = []
-                for i in range(2, len(skill_master_df.columns)):
-                    col_name = skill_master_df.columns[i]
-                    if pd.notna(col_name) and str(col_name).strip() != '':
-                        valid_inspector_codes.append(col_name)
-                self.log_message(f"処理対象検査員コード数: {len(valid_inspector_codes)}", debug=True)
-                self._skill_master_schema_logged = True
+            # 処理対象の検査員コードを事前に確認（ログ用）
+            valid_inspector_codes = []
+            for i in range(2, len(skill_master_df.columns)):
+                col_name = skill_master_df.columns[i]
+                if pd.notna(col_name) and str(col_name).strip() != '':
+                    valid_inspector_codes.append(col_name)
+            self.log_message(f"処理対象検査員コード数: {len(valid_inspector_codes)}", debug=True)
+            self._skill_master_schema_logged = True
+        
+        for skill_row in filtered_skill_rows:
+            # マッチした行の品番と工程番号をログに出力
+            self.log_message(
+                f"🔍 スキルマスタ行を処理中: 品番='{product_number}', 工程番号='{skill_row.process_number}'",
+                debug=True
+            )
+            self.log_message(
+                f"スキル値1,2,3が見つかった検査員: {len(skill_row.inspector_indices)}人"
+                f"（除外: {len(skill_index.codes) - len(skill_row.inspector_indices)}人）",
+                debug=True
+            )
             
-            for skill_row in filtered_skill_rows:
-                # マッチした行の品番と工程番号をログに出力
-                matched_product = skill_row.iloc[0] if len(skill_row) > 0 else 'N/A'
-                matched_process = skill_row.iloc[1] if len(skill_row) > 1 else 'N/A'
-                self.log_message(
-                    f"🔍 スキルマスタ行を処理中: 品番='{matched_product}', 工程番号='{matched_process}'",
-                    debug=True
-                )
-                
-                # スキルマスタの列構造: 品番, 工程, V002, V004, V005, ...（右端は可変）
-                # 列2以降の全列を検査員コード列として扱う
-                skill_values_found = []  # デバッグ用: 見つかったスキル値のリスト
-                skill_values_excluded = []  # デバッグ用: 除外されたスキル値のリスト
+            # スキル値が1, 2, 3の検査員のみ（インデックス構築時に抽出済み）
+            for inspector_code, skill_level in skill_index.iter_skilled([skill_row]):
+                # 【変更】新規品対応チームメンバーも通常の品番に割り当て可能にする
+                # ただし、新規品対応チームメンバーは新規品を優先的に割り当てるため、優先度を下げる
+                # （完全に除外するのではなく、通常の検査員より優先度を低くする）
                 
-                for i in range(2, len(skill_master_df.columns)):
-                    col_name = skill_master_df.columns[i]
-                    inspector_code = col_name
-                    skill_value = skill_row.iloc[i]  # ilocを使用してインデックスでアクセス
-                    
-                    # 列名が空またはNaNの場合はスキップ
-                    if pd.isna(col_name) or str(col_name).strip() == '':
-                        continue
-                    
-                    # デバッグ: スキル値の詳細情報をログに出力
-                    skill_value_str = str(skill_value) if pd.notna(skill_value) else 'NaN'
-                    skill_value_type = type(skill_value).__name__
-                    skill_value_stripped = str(skill_value).strip() if pd.notna(skill_value) else ''
-                    
-                    # スキル値が1, 2, 3のいずれかで、かつ空でない場合
-                    if pd.notna(skill_value) and str(skill_value).strip() != '' and str(skill_value).strip() in ['1', '2', '3']:
-                        skill_values_found.append(f"{inspector_code}={skill_value_str}")
-                        # 【変更】新規品対応チームメンバーも通常の品番に割り当て可能にする
-                        # ただし、新規品対応チームメンバーは新規品を優先的に割り当てるため、優先度を下げる
-                        # （完全に除外するのではなく、通常の検査員より優先度を低くする）
-                        if inspector_code in new_team_codes:
-                            # 新規品対応チームメンバーも含めるが、優先度を下げる（後でソート時に考慮）
-                            self.log_message(
-                                f"ℹ️ 検査員コード {inspector_code} は新規品対応チームメンバーですが、通常の品番にも割り当て可能です（新規品を優先）",
-                                debug=True
-                            )
-                        
-                        self.log_message(
-                            f"✅ スキル値 {skill_value} の検査員コード {inspector_code} を処理中",
-                            debug=True
-                        )
-                    else:
-                        # スキル値が1,2,3でない場合のデバッグ情報
-                        if pd.isna(skill_value):
-                            skill_values_excluded.append(f"{inspector_code}=NaN")
-                        elif str(skill_value).strip() == '':
-                            skill_values_excluded.append(f"{inspector_code}=(空文字)")
-                        else:
-                            skill_values_excluded.append(f"{inspector_code}={skill_value_str}(型:{skill_value_type}, 条件外)")
-                        # 最初の10件のみ詳細ログを出力（ログが多くなりすぎないように）
-                        if len(skill_values_excluded) <= 10:
-                            self.log_message(
-                                f"⚠️ 検査員コード {inspector_code} のスキル値 '{skill_value_str}' "
-                                f"(型: {skill_value_type}, トリム後: '{skill_value_stripped}') は条件に一致しません",
-                                debug=True
-                            )
-                        continue  # スキル値が1,2,3でない場合は次の検査員へ
+                # 検査員マスタから該当する検査員の情報を取得
+                # 検査員コード（V002, V004等）で検索
+                inspector_data = self._get_inspector_row_by_id(inspector_code, inspector_master_df)
+                if inspector_data is not None:
+                    # 勤務時間を事前チェック（0時間の検査員を除外）
+                    start_time = inspector_data['開始時刻']
+                    end_time = inspector_data['終了時刻']
                     
-                    # 検査員マスタから該当する検査員の情報を取得
-                    # 検査員コード（V002, V004等）で検索
-                    inspector_info = inspector_master_df[inspector_master_df['#ID'] == inspector_code]
-                    if not inspector_info.empty:
-                        inspector_data = inspector_info.iloc[0]
-                        
-                        # 勤務時間を事前チェック（0時間の検査員を除外）
-                        start_time = inspector_data['開始時刻']
-                        end_time = inspector_data['終了時刻']
-                        
-                        if pd.notna(start_time) and pd.notna(end_time):
-                            try:
-                                # 時刻文字列を時間に変換
-                                if isinstance(start_time, str):
-                                    start_hour = float(start_time.split(':')[0]) + float(start_time.split(':')[1]) / 60.0
-                                else:
-                                    start_hour = start_time.hour + start_time.minute / 60.0
-                                    
-                                if isinstance(end_time, str):
-                                    end_hour = float(end_time.split(':')[0]) + float(end_time.split(':')[1]) / 60.0
-                                else:
-                                    end_hour = end_time.hour + end_time.minute / 60.0
-                                
-                                # 基本勤務時間を計算
-                                max_daily_hours = end_hour - start_hour
-                                
-                                # 休憩時間（12:15～13:00）を含む場合は1時間を差し引く
-                                if start_hour <= 12.25 and end_hour >= 13.0:
-                                    max_daily_hours -= 1.0
+                    if pd.notna(start_time) and pd.notna(end_time):
+                        try:
+                            # 時刻文字列を時間に変換
+                            if isinstance(start_time, str):
+                                start_hour = float(start_time.split(':')[0]) + float(start_time.split(':')[1]) / 60.0
+                            else:
+                                start_hour = start_time.hour + start_time.minute / 60.0
                                 
-                                # 勤務時間が0以下の場合は候補から除外
-                                if max_daily_hours <= 0:
-                                    # 重複警告を防ぐ
-                                    warning_key = (f"勤務時間0時間_一般", inspector_data['#氏名'])
-                                    if warning_key not in self.logged_warnings:
-                                        self.log_message(
-                                            f"警告: 検査員 '{inspector_data['#氏名']}' の勤務時間が0時間以下です "
-                                            f"(開始: {start_time}, 終了: {end_time}) - 候補から除外",
-                                            level='warning'
-                                        )
-                                        self.logged_warnings.add(warning_key)
-                                    continue
-                                    
-                            except Exception as e:
+                            if isinstance(end_time, str):
+                                end_hour = float(end_time.split(':')[0]) + float(end_time.split(':')[1]) / 60.0
+                            else:
+                                end_hour = end_time.hour + end_time.minute / 60.0
+                            
+                            # 基本勤務時間を計算
+                            max_daily_hours = end_hour - start_hour
+                            
+                            # 休憩時間（12:15～13:00）を含む場合は1時間を差し引く
+                            if start_hour <= 12.25 and end_hour >= 13.0:
+                                max_daily_hours -= 1.0
+                            
+                            # 勤務時間が0以下の場合は候補から除外
+                            if max_daily_hours <= 0:
                                 # 重複警告を防ぐ
-                                warning_key = (f"勤務時間計算失敗_一般", inspector_data['#氏名'])
+                                warning_key = (f"勤務時間0時間_一般", inspector_data['#氏名'])
                                 if warning_key not in self.logged_warnings:
                                     self.log_message(
-                                        f"警告: 検査員 '{inspector_data['#氏名']}' の勤務時間計算に失敗: {e} - 候補から除外",
+                                        f"警告: 検査員 '{inspector_data['#氏名']}' の勤務時間が0時間以下です "
+                                        f"(開始: {start_time}, 終了: {end_time}) - 候補から除外",
                                         level='warning'
                                     )
                                     self.logged_warnings.add(warning_key)
                                 continue
-                        else:
+                                
+                        except Exception as e:
                             # 重複警告を防ぐ
-                            warning_key = (f"時刻情報不正_一般", inspector_data['#氏名'])
+                            warning_key = (f"勤務時間計算失敗_一般", inspector_data['#氏名'])
                             if warning_key not in self.logged_warnings:
                                 self.log_message(
-                                    f"警告: 検査員 '{inspector_data['#氏名']}' の時刻情報が不正です - 候補から除外",
+                                    f"警告: 検査員 '{inspector_data['#氏名']}' の勤務時間計算に失敗: {e} - 候補から除外",
                                     level='warning'
                                 )
                                 self.logged_warnings.add(warning_key)
                             continue
-                        
-                        inspector_name = inspector_data['#氏名']
-                        
-                        # 【追加】休暇情報をチェック（終日休みの場合は除外）
-                        vacation_info = self.get_vacation_info(inspector_name)
-                        if vacation_info:
-                            code = vacation_info.get("code", "")
-                            work_status = vacation_info.get("work_status", "")
-                            
-                            # 終日休みの場合は除外
-                            if code in ["休", "出", "当"]:
-                                interpretation = vacation_info.get("interpretation", "")
-                                self.log_message(
-                                    f"検査員 '{inspector_name}' は終日休暇のため候補から除外 "
-                                    f"(休暇コード: {code}, 解釈: {interpretation})",
-                                    debug=True
-                                )
-                                continue
-                        
-                        # 新規品対応チームメンバーの場合は優先度を下げる（後でソート時に考慮）
-                        is_new_team_member = inspector_code in new_team_codes
-                        available_inspectors.append({
-                            '氏名': inspector_name,
-                            'スキル': int(str(skill_value).strip()),
-                            '就業時間': inspector_data['開始時刻'],
-                            'コード': inspector_code,
-                            'is_new_team': is_new_team_member  # 新規品対応チームメンバーの場合はTrue
-                        })
-                        if is_new_team_member:
+                    else:
+                        # 重複警告を防ぐ
+                        warning_key = (f"時刻情報不正_一般", inspector_data['#氏名'])
+                        if warning_key not in self.logged_warnings:
                             self.log_message(
-                                f"検査員 '{inspector_name}' (コード: {inspector_code}, スキル: {skill_value}, 新規品対応チーム) を追加",
-                                debug=True
+                                f"警告: 検査員 '{inspector_data['#氏名']}' の時刻情報が不正です - 候補から除外",
+                                level='warning'
                             )
-                        else:
+                            self.logged_warnings.add(warning_key)
+                        continue
+                    
+                    inspector_name = inspector_data['#氏名']
+                    
+                    # 【追加】休暇情報をチェック（終日休みの場合は除外）
+                    vacation_info = self.get_vacation_info(inspector_name)
+                    if vacation_info:
+                        code = vacation_info.get("code", "")
+                        
+                        # 終日休みの場合は除外
+                        if code in ["休", "出", "当"]:
+                            interpretation = vacation_info.get("interpretation", "")
                             self.log_message(
-                                f"検査員 '{inspector_name}' (コード: {inspector_code}, スキル: {skill_value}) を追加",
+                                f"検査員 '{inspector_name}' は終日休暇のため候補から除外 "
+                                f"(休暇コード: {code}, 解釈: {interpretation})",
                                 debug=True
                             )
+                            continue
+                    
+                    # 新規品対応チームメンバーの場合は優先度を下げる（後でソート時に考慮）
+                    is_new_team_member = inspector_code in new_team_codes
+                    available_inspectors.append({
+                        '氏名': inspector_name,
+                        'スキル': skill_level,
+                        '就業時間': inspector_data['開始時刻'],
+                        'コード': inspector_code,
+                        'is_new_team': is_new_team_member  # 新規品対応チームメンバーの場合はTrue
+                    })
+                    if is_new_team_member:
+                        self.log_message(
+                            "検査員 '%s' (コード: %s, スキル: %s, 新規品対応チーム) を追加",
+                            inspector_name, inspector_code, skill_level,
+                            debug=True
+                        )
                     else:
-                        warning_key = ("inspector_code_not_found", str(inspector_code).strip())
-                        if warning_key not in self.logged_warnings:
-                            self.logged_warnings.add(warning_key)
-                            self.log_message(
-                                f"警告: 検査員コード '{inspector_code}' が検査員マスタに見つかりません",
-                                level="warning",
-                            )
-                        # 検査員マスタの全コードを表示
                         self.log_message(
-                            f"検査員マスタの利用可能なコード: {list(inspector_master_df['#ID'].values)}",
+                            "検査員 '%s' (コード: %s, スキル: %s) を追加",
+                            inspector_name, inspector_code, skill_level,
                             debug=True
                         )
-                
-                # デバッグ: スキル値の要約をログに出力
-                if skill_values_found:
-                    self.log_message(f"スキル値1,2,3が見つかった検査員: {', '.join(skill_values_found)}", debug=True)
                 else:
-                    self.log_message("⚠️ スキル値1,2,3が見つかった検査員: 0人", debug=True)
-                
-                if skill_values_excluded:
-                    excluded_summary = ', '.join(skill_values_excluded[:20])  # 最初の20件のみ表示
-                    if len(skill_values_excluded) > 20:
-                        excluded_summary += f" ... (他{len(skill_values_excluded) - 20}件)"
-                    self.log_message(f"除外されたスキル値: {excluded_summary}", debug=True)
-                    self.log_message(f"除外された検査員数: {len(skill_values_excluded)}人", debug=True)
-            
-            # 【追加】固定検査員を優先的に配置
-            fixed_inspector_names = self._collect_fixed_inspector_names(product_number, target_process_name)
-            if fixed_inspector_names:
-                self.log_message(f"品番 '{product_number}' の固定検査員: {fixed_inspector_names}")
-                # 固定検査員とそれ以外に分離
-                fixed_inspectors = []
-                other_inspectors = []
-                fixed_name_norms = {
-                    self._normalize_person_name(n)
-                    for n in fixed_inspector_names
-                    if self._normalize_person_name(n)
-                }
-                available_inspector_names = {
-                    self._normalize_person_name(insp.get('氏名', ''))
-                    for insp in available_inspectors
-                    if self._normalize_person_name(insp.get('氏名', ''))
-                }
-                
-                for inspector in available_inspectors:
-                    inspector_name = inspector['氏名']
-                    if self._normalize_person_name(inspector_name) in fixed_name_norms:
-                        fixed_inspectors.append(inspector)
-                    else:
-                        other_inspectors.append(inspector)
-                
-                # 【特別処置】固定検査員が候補に含まれていない場合、検査員マスタから直接追加
-                # これは登録済み品番リストの固定検査員の特別処置です
-                missing_fixed_inspectors = [
-                    name for name in fixed_inspector_names
-                    if self._normalize_person_name(name) not in available_inspector_names
-                ]
-                if missing_fixed_inspectors:
-                    # 警告の重複を防ぐ
-                    warning_key = ('fixed_inspector_missing', product_number, tuple(sorted(missing_fixed_inspectors)))
+                    warning_key = ("inspector_code_not_found", str(inspector_code).strip())
                     if warning_key not in self.logged_warnings:
                         self.logged_warnings.add(warning_key)
                         self.log_message(
-                            f"⚠️ 警告: 品番 '{product_number}' の固定検査員のうち、以下の検査員が候補に含まれていません: {missing_fixed_inspectors}",
-                            level='warning'
-                        )
-                        self.log_message(
-                            f"   理由: スキルマスタに該当品番のスキル情報がないか、スキル値が1,2,3以外の可能性があります"
+                            f"警告: 検査員コード '{inspector_code}' が検査員マスタに見つかりません",
+                            level="warning",
                         )
-                        self.log_message(
-                            f"   特別処置: 固定検査員として設定されているため、スキルマスタに含まれていなくても候補に追加します"
-                        )
-                    
-                    # 検査員マスタから固定検査員の情報を取得して追加
-                    for missing_name in missing_fixed_inspectors:
-                        # 休暇情報をチェック（終日休みの場合は除外）
-                        vacation_info = self.get_vacation_info(missing_name)
-                        if vacation_info:
-                            work_status = vacation_info.get("work_status", "")
-                            if work_status == "休み":
-                                code = vacation_info.get("code", "")
-                                interpretation = vacation_info.get("interpretation", "")
-                                self.log_message(
-                                    f"   固定検査員 '{missing_name}' は終日休暇のため除外します "
-                                    f"(休暇コード: {code}, 解釈: {interpretation})",
-                                    debug=True,
-                                    level='warning'
-                                )
-                                continue
+        
+        # 【追加】固定検査員を優先的に配置
+        fixed_inspector_names = self._collect_fixed_inspector_names(product_number, target_process_name)
+        if fixed_inspector_names:
+            self.log_message(f"品番 '{product_number}' の固定検査員: {fixed_inspector_names}")
+            # 固定検査員とそれ以外に分離
+            fixed_inspectors = []
+            other_inspectors = []
+            fixed_name_norms = {
+                self._normalize_person_name(n)
+                for n in fixed_inspector_names
+                if self._normalize_person_name(n)
+            }
+            available_inspector_names = {
+                self._normalize_person_name(insp.get('氏名', ''))
+                for insp in available_inspectors
+                if self._normalize_person_name(insp.get('氏名', ''))
+            }
+            
+            for inspector in available_inspectors:
+                inspector_name = inspector['氏名']
+                if self._normalize_person_name(inspector_name) in fixed_name_norms:
+                    fixed_inspectors.append(inspector)
+                else:
+                    other_inspectors.append(inspector)
+            
+            # 【特別処置】固定検査員が候補に含まれていない場合、検査員マスタから直接追加
+            # これは登録済み品番リストの固定検査員の特別処置です
+            missing_fixed_inspectors = [
+                name for name in fixed_inspector_names
+                if self._normalize_person_name(name) not in available_inspector_names
+            ]
+            if missing_fixed_inspectors:
+                # 警告の重複を防ぐ
+                warning_key = ('fixed_inspector_missing', product_number, tuple(sorted(missing_fixed_inspectors)))
+                if warning_key not in self.logged_warnings:
+                    self.logged_warnings.add(warning_key)
+                    self.log_message(
+                        f"⚠️ 警告: 品番 '{product_number}' の固定検査員のうち、以下の検査員が候補に含まれていません: {missing_fixed_inspectors}",
+                        level='warning'
+                    )
+                    self.log_message(
+                        f"   理由: スキルマスタに該当品番のスキル情報がないか、スキル値が1,2,3以外の可能性があります"
+                    )
+                    self.log_message(
+                        f"   特別処置: 固定検査員として設定されているため、スキルマスタに含まれていなくても候補に追加します"
+                    )
+                
+                # 検査員マスタから固定検査員の情報を取得して追加
+                for missing_name in missing_fixed_inspectors:
+                    # 休暇情報をチェック（終日休みの場合は除外）
+                    vacation_info = self.get_vacation_info(missing_name)
+                    if vacation_info:
+                        work_status = vacation_info.get("work_status", "")
+                        if work_status == "休み":
+                            code = vacation_info.get("code", "")
+                            interpretation = vacation_info.get("interpretation", "")
+                            self.log_message(
+                                f"   固定検査員 '{missing_name}' は終日休暇のため除外します "
+                                f"(休暇コード: {code}, 解釈: {interpretation})",
+                                debug=True,
+                                level='warning'
+                            )
+                            continue
 
-                        inspector_info = self._get_inspector_by_name(missing_name, inspector_master_df)
-                        if not inspector_info.empty:
-                            inspector_data = inspector_info.iloc[0]
-                            inspector_code = inspector_data['#ID']
-                            
-                            # 【特別処置】固定検査員として選択されていれば、新規品対応チームメンバーでも振り分ける
-                            # （通常のスキルマスタベースの処理では新規品対応チームメンバーは除外されるが、
-                            #  固定検査員として設定されている場合は特別処置として含める）
-                            is_new_team_member = inspector_code in new_team_codes
-                            if is_new_team_member:
-                                self.log_message(
-                                    f"   固定検査員 '{missing_name}' は新規品対応チームメンバーですが、固定検査員として設定されているため特別処置として含めます"
-                                )
-                            
-                            # 勤務時間をチェック
-                            start_time = inspector_data['開始時刻']
-                            end_time = inspector_data['終了時刻']
-                            
-                            if pd.notna(start_time) and pd.notna(end_time):
-                                try:
-                                    # 時刻文字列を時間に変換
-                                    if isinstance(start_time, str):
-                                        start_hour = float(start_time.split(':')[0]) + float(start_time.split(':')[1]) / 60.0
-                                    else:
-                                        start_hour = start_time.hour + start_time.minute / 60.0
-                                        
-                                    if isinstance(end_time, str):
-                                        end_hour = float(end_time.split(':')[0]) + float(end_time.split(':')[1]) / 60.0
-                                    else:
-                                        end_hour = end_time.hour + end_time.minute / 60.0
-                                    
-                                    # 基本勤務時間を計算
-                                    max_daily_hours = end_hour - start_hour
-                                    
-                                    # 休憩時間（12:15～13:00）を含む場合は1時間を差し引く
-                                    if start_hour <= 12.25 and end_hour >= 13.0:
-                                        max_daily_hours -= 1.0
+                    inspector_info = self._get_inspector_by_name(missing_name, inspector_master_df)
+                    if not inspector_info.empty:
+                        inspector_data = inspector_info.iloc[0]
+                        inspector_code = inspector_data['#ID']
+                        
+                        # 【特別処置】固定検査員として選択されていれば、新規品対応チームメンバーでも振り分ける
+                        # （通常のスキルマスタベースの処理では新規品対応チームメンバーは除外されるが、
+                        #  固定検査員として設定されている場合は特別処置として含める）
+                        is_new_team_member = inspector_code in new_team_codes
+                        if is_new_team_member:
+                            self.log_message(
+                                f"   固定検査員 '{missing_name}' は新規品対応チームメンバーですが、固定検査員として設定されているため特別処置として含めます"
+                            )
+                        
+                        # 勤務時間をチェック
+                        start_time = inspector_data['開始時刻']
+                        end_time = inspector_data['終了時刻']
+                        
+                        if pd.notna(start_time) and pd.notna(end_time):
+                            try:
+                                # 時刻文字列を時間に変換
+                                if isinstance(start_time, str):
+                                    start_hour = float(start_time.split(':')[0]) + float(start_time.split(':')[1]) / 60.0
+                                else:
+                                    start_hour = start_time.hour + start_time.minute / 60.0
                                     
-                                    # 勤務時間が0以下の場合は除外
-                                    if max_daily_hours <= 0:
-                                        # 固定検査員は休暇でない限り0hでも割当可能（登録済品番に限る）
-                                        self.log_message(
-                                            f"   固定検査員 '{missing_name}' の勤務時間が0時間以下ですが、固定検査員のため候補に含めます",
-                                            level='warning'
-                                        )
-                                        
-                                except Exception as e:
+                                if isinstance(end_time, str):
+                                    end_hour = float(end_time.split(':')[0]) + float(end_time.split(':')[1]) / 60.0
+                                else:
+                                    end_hour = end_time.hour + end_time.minute / 60.0
+                                
+                                # 基本勤務時間を計算
+                                max_daily_hours = end_hour - start_hour
+                                
+                                # 休憩時間（12:15～13:00）を含む場合は1時間を差し引く
+                                if start_hour <= 12.25 and end_hour >= 13.0:
+                                    max_daily_hours -= 1.0
+                                
+                                # 勤務時間が0以下の場合は除外
+                                if max_daily_hours <= 0:
+                                    # 固定検査員は休暇でない限り0hでも割当可能（登録済品番に限る）
                                     self.log_message(
-                                        f"   固定検査員 '{missing_name}' の勤務時間計算に失敗: {e} - 固定検査員のため候補に含めます",
+                                        f"   固定検査員 '{missing_name}' の勤務時間が0時間以下ですが、固定検査員のため候補に含めます",
                                         level='warning'
                                     )
-                            else:
+                                    
+                            except Exception as e:
                                 self.log_message(
-                                    f"   固定検査員 '{missing_name}' の時刻情報が不正ですが、固定検査員のため候補に含めます",
+                                    f"   固定検査員 '{missing_name}' の勤務時間計算に失敗: {e} - 固定検査員のため候補に含めます",
                                     level='warning'
                                 )
-                            
-                            # 固定検査員を候補に追加（スキル値はデフォルトで1とする）
-                            fixed_inspectors.append({
-                                '氏名': missing_name,
-                                'スキル': 1,  # スキルマスタにない場合はデフォルトで1
-                                '就業時間': inspector_data['開始時刻'],
-                                'コード': inspector_code,
-                                'is_new_team': is_new_team_member,  # 新規品対応チームメンバーの場合はTrue
-                                'is_fixed_inspector': True  # 固定検査員フラグ
-                            })
-                            available_inspector_names.add(self._normalize_person_name(missing_name))
-                            team_mark = " (新規品対応チーム)" if is_new_team_member else ""
-                            self.log_message(
-                                f"   固定検査員 '{missing_name}' (コード: {inspector_code}){team_mark} を特別処置として候補に追加しました"
-                            )
                         else:
                             self.log_message(
-                                f"   固定検査員 '{missing_name}' が検査員マスタに見つかりません",
+                                f"   固定検査員 '{missing_name}' の時刻情報が不正ですが、固定検査員のため候補に含めます",
                                 level='warning'
                             )
-                
-                # 固定検査員を優先的にリストの先頭に配置
-                available_inspectors = fixed_inspectors + other_inspectors
-                self.log_message(f"固定検査員を優先配置: {len(fixed_inspectors)}名を先頭に配置（設定: {len(fixed_inspector_names)}名）")
-            
-            self.log_message(f"利用可能な検査員: {len(available_inspectors)}人", debug=True)
-            
-            # 利用可能な検査員の詳細をログ出力（デバッグモードのみ）
-            if available_inspectors:
-                self.log_message("=== 利用可能な検査員一覧 ===", debug=True)
-                for insp in available_inspectors:
-                    is_fixed = (
-                        self._normalize_person_name(insp['氏名']) in fixed_name_norms
-                        if fixed_inspector_names
-                        else False
-                    )
-                    fixed_mark = " [固定]" if is_fixed else ""
-                    self.log_message(
-                        f"  {insp['氏名']}{fixed_mark} (コード: {insp['コード']}, スキル: {insp['スキル']})",
-                        debug=True
-                    )
-                self.log_message("=============================", debug=True)
-            else:
-                self.log_message("警告: 利用可能な検査員が0人です")
-                # 出荷予定日が間近で他に割当てられない場合のみ新規品対応チームを使用
-                if allow_new_team_fallback and shipping_date is not None:
-                    if is_preinspection_label:
-                        self.log_message("先行検査のため、新製品チームのメンバーを取得します", debug=True)
-                        return self.get_new_product_team_inspectors(inspector_master_df)
-                    shipping_date = pd.to_datetime(shipping_date, errors='coerce')
-                    if pd.notna(shipping_date):
-                        shipping_date_date = shipping_date.date()
-                        current_date = pd.Timestamp.now().date()
-                        two_weeks_later = current_date + timedelta(days=14)
-                        if shipping_date_date <= two_weeks_later:
-                            warning_key = (
-                                "new_team_fallback",
-                                "no_available_inspectors",
-                                str(product_number).strip(),
-                                str(shipping_date_date),
-                            )
-                            if warning_key not in self.logged_warnings:
-                                self.logged_warnings.add(warning_key)
-                                self.log_message(
-                                    f"出荷予定日が間近（{shipping_date_date}）で他に割当てられないため、新規品対応チームを使用します"
-                                )
-                            return self.get_new_product_team_inspectors(inspector_master_df)
-            
-            return available_inspectors
+                        
+                        # 固定検査員を候補に追加（スキル値はデフォルトで1とする）
+                        fixed_inspectors.append({
+                            '氏名': missing_name,
+                            'スキル': 1,  # スキルマスタにない場合はデフォルトで1
+                            '就業時間': inspector_data['開始時刻'],
+                            'コード': inspector_code,
+                            'is_new_team': is_new_team_member,  # 新規品対応チームメンバーの場合はTrue
+                            'is_fixed_inspector': True  # 固定検査員フラグ
+                        })
+                        available_inspector_names.add(self._normalize_person_name(missing_name))
+                        team_mark = " (新規品対応チーム)" if is_new_team_member else ""
+                        self.log_message(
+                            f"   固定検査員 '{missing_name}' (コード: {inspector_code}){team_mark} を特別処置として候補に追加しました"
+                        )
+                    else:
+                        self.log_message(
+                            f"   固定検査員 '{missing_name}' が検査員マスタに見つかりません",
+                            level='warning'
+                        )
             
-        except Exception as e:
-            import traceback
-            error_detail = traceback.format_exc()
-            self.log_message(f"利用可能な検査員取得中にエラーが発生しました: {str(e)}")
-            self.log_message(f"エラー詳細: {error_detail}")
-            # エラーが発生した場合は新製品チームにフォールバック
-            self.log_message("エラーのため新製品チームにフォールバックします")
-            return self.get_new_product_team_inspectors(inspector_master_df)
+            # 固定検査員を優先的にリストの先頭に配置
+            available_inspectors = fixed_inspectors + other_inspectors
+            self.log_message(f"固定検査員を優先配置: {len(fixed_inspectors)}名を先頭に配置（設定: {len(fixed_inspector_names)}名）")
+        
+        self.log_message(f"利用可能な検査員: {len(available_inspectors)}人", debug=True)
+        
+        # 利用可能な検査員の詳細をログ出力（デバッグモードのみ）
+        if available_inspectors:
+            self.log_message("=== 利用可能な検査員一覧 ===", debug=True)
+            for insp in available_inspectors:
+                is_fixed = (
+                    self._normalize_person_name(insp['氏名']) in fixed_name_norms
+                    if fixed_inspector_names
+                    else False
+                )
+                fixed_mark = " [固定]" if is_fixed else ""
+                self.log_message(
+                    "  %s%s (コード: %s, スキル: %s)", insp['氏名'], fixed_mark, insp['コード'], insp['スキル'],
+                    debug=True
+                )
+            self.log_message("=============================", debug=True)
+        
+        return StaticCandidates(STATIC_CANDIDATES_OK, tuple(available_inspectors))
     
     def load_process_master(
         self,
@@ -4966,34 +6412,26 @@ class InspectorAssignmentManager:
                 self.log_message(f"工程マスタファイルが見つかりません: {process_master_path}")
                 return None
             
-            # キャッシュチェック（ファイル更新時刻も確認）
-            import os
-            try:
-                if (self._process_master_cache is not None and 
-                    self._process_master_cache_path == process_master_path):
-                    current_mtime = os.path.getmtime(process_master_path)
-                    if current_mtime == self._process_master_cache_mtime:
-                        logger.debug("工程マスタをキャッシュから読み込みました（ファイル未変更）")
-                        return self._process_master_cache
-            except (OSError, AttributeError):
-                pass  # キャッシュチェックでエラーが発生した場合は通常読み込みに進む
-            
-            # 通常読み込み
-            df = pd.read_excel(process_master_path, engine='openpyxl')
-            self.log_message(f"工程マスタを読み込みました: {len(df)}件")
-            
-            # キャッシュに保存
-            try:
-                self._process_master_cache = df
-                self._process_master_cache_path = process_master_path
-                self._process_master_cache_mtime = os.path.getmtime(process_master_path)
-            except (OSError, AttributeError):
-                pass  # キャッシュ保存でエラーが発生しても続行
-            
-            return df
+            # 【高速化】共有の工程マスタ参照表（プロセス内・ローカルのバイナリキャッシュ）から取得
+            process_master = load_shared_process_master(process_master_path)
+            if process_master is None:
+                self.log_message(f"工程マスタファイルが見つかりません: {process_master_path}")
+                return None
+            if process_master is not self._process_master_cache:
+                self.log_message(f"工程マスタを読み込みました: {len(process_master.frame)}件")
+                self._process_master_cache = process_master
+            return process_master.frame
         except Exception as e:
             self.log_message(f"工程マスタの読み込みに失敗しました: {str(e)}")
             return None
+
+    def _get_process_master_index(self, process_master_df: pd.DataFrame) -> ProcessMaster:
+        """工程マスタの参照表を取得（load_process_master 以外で読み込んだDataFrameの場合はその場で作成）"""
+        cached = self._process_master_cache
+        if cached is None or cached.frame is not process_master_df:
+            cached = ProcessMaster.from_frame(process_master_df)
+            self._process_master_cache = cached
+        return cached
     
     def infer_process_number_from_process_master(
         self, 
@@ -5016,54 +6454,39 @@ class InspectorAssignmentManager:
             if process_master_df is None or process_master_df.empty:
                 return None
             
-            # A列（品番）で一致する行を検索
-            product_col = process_master_df.columns[0]  # A列
-            matching_rows = process_master_df[process_master_df[product_col] == product_number]
-            
-            if matching_rows.empty:
+            # 【高速化】品番ごとのキーワード一致結果を参照（キーワードの組ごとに全品番分を1回だけ作成）
+            process_master = self._get_process_master_index(process_master_df)
+            if not process_master.has_product(product_number):
                 self.log_message(f"工程マスタに品番 '{product_number}' が見つかりません")
                 return None
-            
-            # 最初の一致行を取得
-            row = matching_rows.iloc[0]
-            
-            # B列以降を順に検索（1行目のカラム名を取得するため、列名を使用）
-            # 1行目がカラム名として読み込まれている場合
-            for col_idx in range(1, len(process_master_df.columns)):
-                col_name = process_master_df.columns[col_idx]
-                cell_value = row.iloc[col_idx]
-                
-                # セル値が空でない場合のみチェック
-                if pd.notna(cell_value):
-                    cell_str = str(cell_value).strip()
-                    
-                    # 検査対象CSVのキーワードで部分一致検索
-                    for keyword in inspection_target_keywords:
-                        if keyword in cell_str:
-                            # 一致したら、その列のカラム名（1行目の値）を工程番号として返す
-                            inferred_process = str(col_name).strip()
-                            # 同一品番で何度もログが出ると冗長になるため、初回のみINFOで出す
-                            try:
-                                logged = getattr(self, "_process_infer_logged", None)
-                                if logged is None:
-                                    logged = set()
-                                    setattr(self, "_process_infer_logged", logged)
-                                key = (str(product_number), str(keyword), str(inferred_process))
-                                if key not in logged:
-                                    logged.add(key)
-                                    self.log_message(
-                                        f"工程マスタから工程番号を推定: 品番='{product_number}', "
-                                        f"キーワード='{keyword}', 推定工程番号='{inferred_process}'",
-                                        debug=True
-                                    )
-                            except Exception:
-                                # ログ抑制で失敗しても推定処理は継続
-                                self.log_message(
-                                    f"工程マスタから工程番号を推定: 品番='{product_number}', "
-                                    f"キーワード='{keyword}', 推定工程番号='{inferred_process}'",
-                                    debug=True
-                                )
-                            return inferred_process
+
+            match = process_master.match_keywords(product_number, inspection_target_keywords or [])
+            if match is not None:
+                # 一致した列のカラム名（1行目の値）を工程番号として返す
+                inferred_process = match.process_number
+                keyword = match.keyword
+                # 同一品番で何度もログが出ると冗長になるため、初回のみINFOで出す
+                try:
+                    logged = getattr(self, "_process_infer_logged", None)
+                    if logged is None:
+                        logged = set()
+                        setattr(self, "_process_infer_logged", logged)
+                    key = (str(product_number), str(keyword), str(inferred_process))
+                    if key not in logged:
+                        logged.add(key)
+                        self.log_message(
+                            f"工程マスタから工程番号を推定: 品番='{product_number}', "
+                            f"キーワード='{keyword}', 推定工程番号='{inferred_process}'",
+                            debug=True
+                        )
+                except Exception:
+                    # ログ抑制で失敗しても推定処理は継続
+                    self.log_message(
+                        f"工程マスタから工程番号を推定: 品番='{product_number}', "
+                        f"キーワード='{keyword}', 推定工程番号='{inferred_process}'",
+                        debug=True
+                    )
+                return inferred_process
             
             self.log_message(f"工程マスタで品番 '{product_number}' の工程番号を推定できませんでした", debug=True)
             return None
@@ -5098,33 +6521,14 @@ class InspectorAssignmentManager:
             if not process_number or str(process_number).strip() == '':
                 return None
             
-            # A列（品番）で一致する行を検索
-            product_col = process_master_df.columns[0]  # A列
-            matching_rows = process_master_df[process_master_df[product_col] == product_number]
-            
-            if matching_rows.empty:
-                return None
-            
-            # 最初の一致行を取得
-            row = matching_rows.iloc[0]
-            
-            # B列以降を順に検索して、工程番号（列名）が一致する列のセル値を取得
-            for col_idx in range(1, len(process_master_df.columns)):
-                col_name = process_master_df.columns[col_idx]
-                cell_value = row.iloc[col_idx]
-                
-                # 列名（工程番号）が一致する場合
-                if str(col_name).strip() == str(process_number).strip():
-                    # セル値（工程名）を返す
-                    if pd.notna(cell_value):
-                        process_name = str(cell_value).strip()
-                        self.log_message(
-                            f"工程マスタから工程名を取得: 品番='{product_number}', "
-                            f"工程番号='{process_number}', 工程名='{process_name}'"
-                        )
-                        return process_name
-            
-            return None
+            # 【高速化】品番の工程の並びから、工程番号（列名）が一致する列の工程名を取得
+            process_name = self._get_process_master_index(process_master_df).process_name(product_number, process_number)
+            if process_name is not None:
+                self.log_message(
+                    f"工程マスタから工程名を取得: 品番='{product_number}', "
+                    f"工程番号='{process_number}', 工程名='{process_name}'"
+                )
+            return process_name
             
         except Exception as e:
             self.log_message(f"工程名の取得中にエラーが発生しました: {str(e)}")
@@ -5623,9 +7027,14 @@ class InspectorAssignmentManager:
             # 最適化フェーズ：ここで4.0h遵守へ是正。置換不可能な場合のみ未割当へ戻す。
             filtered_by_product = []
             excluded_by_product_limit = []  # 4時間上限で除外された検査員の詳細情報
-            for insp in available_inspectors:
+            # 【高速化】品番累計時間・割当回数は状態ストアの配列から一括取得
+            store = self.state_store
+            candidate_indices = store.indices_of([insp['コード'] for insp in available_inspectors])
+            current_hours_arr = store.product_column(product_number, candidate_indices)
+            assignment_count_arr = store.count_column(product_number, candidate_indices)
+            for pos, insp in enumerate(available_inspectors):
                 code = insp['コード']
-                current = self.inspector_product_hours.get(code, {}).get(product_number, 0.0)
+                current = float(current_hours_arr[pos])
                 projected_hours = current + divided_time
                 
                 if not ignore_product_limit:
@@ -5639,7 +7048,7 @@ class InspectorAssignmentManager:
                             'projected': projected_hours,
                             'threshold': PRODUCT_LIMIT_DRAFT_THRESHOLD
                         })
-                        self.log_message(f"検査員 '{insp['氏名']}' ({code}) は品番 {product_number} の累計が {current:.1f}h のため除外 (+{divided_time:.1f}hで{projected_hours:.1f}h、閾値{PRODUCT_LIMIT_DRAFT_THRESHOLD}h超過)", debug=True)
+                        self.log_message("検査員 '%s' (%s) は品番 %s の累計が %.1fh のため除外 (+%.1fhで%.1fh、閾値%sh超過)", insp['氏名'], code, product_number, current, divided_time, projected_hours, PRODUCT_LIMIT_DRAFT_THRESHOLD, debug=True)
                         continue
                 
                 # 設定時間超過の場合はフラグを設定（ドラフトフェーズでは許容、最適化フェーズで是正）
@@ -5652,11 +7061,7 @@ class InspectorAssignmentManager:
                     insp.pop('__near_product_limit', None)
                 
                 # 同一品番を同日複数回割り当てないよう制限
-                product_assignment_count = (
-                    self.inspector_product_assignment_counts
-                    .get(code, {})
-                    .get(product_number, 0)
-                )
+                product_assignment_count = int(assignment_count_arr[pos])
                 
                 # 【改善】緩和条件の明確化
                 # 緩和条件が適用される場合：
@@ -5693,7 +7098,7 @@ class InspectorAssignmentManager:
                     self.product_assignment_metrics['relaxed_assignments'] += 1
                     reason = f"検査員 '{insp['氏名']}' ({code}), 品番 '{product_number}': 緩和条件適用 (現在{product_assignment_count}回, 通常上限{MAX_ASSIGNMENTS_PER_PRODUCT}回, 緩和上限{MAX_ASSIGNMENTS_PER_PRODUCT_RELAXED}回)"
                     self.product_assignment_metrics['relaxation_reasons'].append(reason)
-                    if len(self.product_assignment_metrics['relaxation_reasons']) <= 10:  # 最初の10件のみ保持
+                    if self.product_assignment_metrics['relaxation_reasons'].total <= 10:  # 最初の10件のみ出力
                         self.log_message(reason, debug=True)
                 
                 insp['__product_assignment_count'] = product_assignment_count
@@ -5848,7 +7253,7 @@ class InspectorAssignmentManager:
                     code = insp['コード']
                     assignment_count = self.inspector_assignment_count.get(code, 0)
                     total_hours = self.inspector_work_hours.get(code, 0.0)
-                    last_assignment = self.inspector_last_assignment.get(code, pd.Timestamp.min)
+                    last_assignment = self.inspector_last_assignment.get(code, _TIMESTAMP_MIN)
                     # 未使用検査員を優先的に考慮（割り当て回数が0の場合）
                     is_unused = (assignment_count == 0)
                     # スキル別平均からの偏差を計算（小さい方が良い）
@@ -5936,9 +7341,9 @@ class InspectorAssignmentManager:
                                 if allowed_max_hours > 0
                                 else 1.0
                             )
-                            last_assignment = self.inspector_last_assignment.get(code, pd.Timestamp.min)
+                            last_assignment = self.inspector_last_assignment.get(code, _TIMESTAMP_MIN)
                             # pd.Timestampを比較可能な形式に変換（タイムスタンプ値を使用）
-                            last_assignment_key = last_assignment.value if isinstance(last_assignment, pd.Timestamp) else (last_assignment if last_assignment != pd.Timestamp.min else 0)
+                            last_assignment_key = last_assignment.value if isinstance(last_assignment, pd.Timestamp) else (last_assignment if last_assignment != _TIMESTAMP_MIN else 0)
                             is_unused = (assignment_count == 0)
                             near_limit = insp.get('__near_product_limit', False)  # 4時間上限に近い場合は優先度を下げる
                             is_fixed = insp.get('__is_fixed', False)  # 固定検査員フラグ
@@ -6049,9 +7454,9 @@ class InspectorAssignmentManager:
                                 if allowed_max_hours > 0
                                 else 1.0
                             )
-                            last_assignment = self.inspector_last_assignment.get(code, pd.Timestamp.min)
+                            last_assignment = self.inspector_last_assignment.get(code, _TIMESTAMP_MIN)
                             # pd.Timestampを比較可能な形式に変換（タイムスタンプ値を使用）
-                            last_assignment_key = last_assignment.value if isinstance(last_assignment, pd.Timestamp) else (last_assignment if last_assignment != pd.Timestamp.min else 0)
+                            last_assignment_key = last_assignment.value if isinstance(last_assignment, pd.Timestamp) else (last_assignment if last_assignment != _TIMESTAMP_MIN else 0)
                             is_unused = (assignment_count == 0)
                             near_limit = insp.get('__near_product_limit', False)  # 4時間上限に近い場合は優先度を下げる
                             is_fixed = insp.get('__is_fixed', False)  # 固定検査員フラグ
@@ -6189,6 +7594,81 @@ class InspectorAssignmentManager:
             self.log_message(f"エラー詳細: {error_detail}", debug=True)
             return []
     
+    def _rank_skill_combination_candidates(
+        self,
+        skill_groups: Dict[Any, List[Dict[str, Any]]],
+        product_number: Optional[str],
+        current_date: Optional[date],
+        inspector_master_df: Optional[pd.DataFrame]
+    ) -> List[Tuple[Tuple, Dict[str, Any], Any]]:
+        """
+        2人・3人選択用の候補を優先度順に並べて返す
+
+        スキル別・固定検査員などの絞り込みは、この並びから順序を保ったまま取り出せば
+        個別にソートした結果と一致する（ソートは安定・キーは同一のため）。
+
+        Returns:
+            (priority, inspector, skill_level) のリスト（_priority_sort_key 昇順）
+        """
+        skill_order_map = {1: 0, 2: 1, 3: 2, 'new': 3}
+        assignment_counts = self.inspector_assignment_count
+        work_hours = self.inspector_work_hours
+        daily_assignments = self.inspector_daily_assignments
+        last_assignments = self.inspector_last_assignment
+        all_candidates = []
+        for skill_level, inspectors in skill_groups.items():
+            skill_order = skill_order_map.get(skill_level, 99)
+            for insp in inspectors:
+                code = insp['コード']
+                assignment_count = assignment_counts.get(code, 0)
+                total_hours = work_hours.get(code, 0.0)
+                daily_hours = daily_assignments.get(code, {}).get(current_date, 0.0)
+                max_hours = self.get_inspector_max_hours(code, inspector_master_df)
+                allowed_max_hours = self._apply_work_hours_overrun(max_hours)
+                daily_utilization = (
+                    (daily_hours / allowed_max_hours)
+                    if allowed_max_hours > 0
+                    else 1.0
+                )
+                last_assignment = last_assignments.get(code, _TIMESTAMP_MIN)
+                is_unused = (assignment_count == 0)
+                is_fixed = insp.get('__is_fixed', False)  # 固定検査員フラグ
+
+                # 【追加】優先順位: 0)固定検査員を最優先（登録済み品番の特別処置）, 1)未使用検査員優先, 2)総勤務時間が少ない, 3)スキルレベル(1>2>3>new、1が最高スキル), 4)割り当て回数が少ない, 5)4時間上限に近い場合は優先度を下げる
+                near_limit = insp.get('__near_product_limit', False)  # 4時間上限に近い場合は優先度を下げる
+                # product_hoursが辞書の場合は0.0にフォールバック
+                projected_hours = insp.get('__projected_product_hours')
+                if projected_hours is None:
+                    product_hours_dict = self.inspector_product_hours.get(code, {})
+                    if isinstance(product_hours_dict, dict):
+                        # 辞書の場合は、該当品番の時間を取得（品番が不明な場合は0.0）
+                        if product_number and product_number in product_hours_dict:
+                            product_hours = product_hours_dict[product_number]
+                        else:
+                            product_hours = 0.0
+                    else:
+                        product_hours = product_hours_dict if isinstance(product_hours_dict, (int, float)) else 0.0
+                else:
+                    product_hours = projected_hours if isinstance(projected_hours, (int, float)) else 0.0
+                product_limit_penalty = 1 if insp.get('over_product_limit', False) else 0
+                product_assignment_count = insp.get('__product_assignment_count', 0)
+                priority = (
+                    not is_fixed,  # False=固定検査員を最優先（登録済み品番の特別処置）
+                    product_limit_penalty,  # 4時間上限を超える場合は最終手段
+                    near_limit,  # 4時間上限に近い場合は優先度を下げる（False < True）
+                    product_assignment_count,  # 同一品番の割当回数
+                    product_hours,  # 品番ごとの累計時間
+                    not is_unused,  # False=未使用を優先
+                    daily_utilization,  # 当日の稼働率が低い順
+                    total_hours,   # 総勤務時間が少ない順
+                    skill_order,  # スキル1を優先
+                    assignment_count,  # 割り当て回数が少ない順
+                    last_assignment  # 最後の割り当てが古い順
+                )
+                all_candidates.append((priority, insp, skill_level))
+        all_candidates.sort(key=self._priority_sort_key)
+        return all_candidates
+
     def select_two_inspectors_with_skill_combination(
         self,
         skill_groups: Dict[str, List[Dict[str, Any]]],
@@ -6211,7 +7691,6 @@ class InspectorAssignmentManager:
         """
         try:
             selected = []
-            skill_order_map = {1: 0, 2: 1, 3: 2, 'new': 3}
             
             # 利用可能な検査員の総数を確認
             total_available = sum(len(inspectors) for inspectors in skill_groups.values())
@@ -6231,56 +7710,10 @@ class InspectorAssignmentManager:
                 return selected
             
             # バランス重視の選択ロジック: 【追加】固定検査員 > 未使用検査員 > 総勤務時間のバランス > スキルレベル
-            all_candidates = []
-            for skill_level, inspectors in skill_groups.items():
-                for insp in inspectors:
-                    code = insp['コード']
-                    assignment_count = self.inspector_assignment_count.get(code, 0)
-                    total_hours = self.inspector_work_hours.get(code, 0.0)
-                    daily_hours = self.inspector_daily_assignments.get(code, {}).get(current_date, 0.0)
-                    max_hours = self.get_inspector_max_hours(code, inspector_master_df)
-                    allowed_max_hours = self._apply_work_hours_overrun(max_hours)
-                    daily_utilization = (
-                        (daily_hours / allowed_max_hours)
-                        if allowed_max_hours > 0
-                        else 1.0
-                    )
-                    last_assignment = self.inspector_last_assignment.get(code, pd.Timestamp.min)
-                    is_unused = (assignment_count == 0)
-                    is_fixed = insp.get('__is_fixed', False)  # 固定検査員フラグ
-                    
-                    # 【追加】優先順位: 0)固定検査員を最優先（登録済み品番の特別処置）, 1)未使用検査員優先, 2)総勤務時間が少ない, 3)スキルレベル(1>2>3>new、1が最高スキル), 4)割り当て回数が少ない, 5)4時間上限に近い場合は優先度を下げる
-                    near_limit = insp.get('__near_product_limit', False)  # 4時間上限に近い場合は優先度を下げる
-                    # product_hoursが辞書の場合は0.0にフォールバック
-                    projected_hours = insp.get('__projected_product_hours')
-                    if projected_hours is None:
-                        product_hours_dict = self.inspector_product_hours.get(code, {})
-                        if isinstance(product_hours_dict, dict):
-                            # 辞書の場合は、該当品番の時間を取得（品番が不明な場合は0.0）
-                            if product_number and product_number in product_hours_dict:
-                                product_hours = product_hours_dict[product_number]
-                            else:
-                                product_hours = 0.0
-                        else:
-                            product_hours = product_hours_dict if isinstance(product_hours_dict, (int, float)) else 0.0
-                    else:
-                        product_hours = projected_hours if isinstance(projected_hours, (int, float)) else 0.0
-                    product_limit_penalty = 1 if insp.get('over_product_limit', False) else 0
-                    product_assignment_count = insp.get('__product_assignment_count', 0)
-                    priority = (
-                        not is_fixed,  # False=固定検査員を最優先（登録済み品番の特別処置）
-                        product_limit_penalty,  # 4時間上限を超える場合は最終手段
-                        near_limit,  # 4時間上限に近い場合は優先度を下げる（False < True）
-                        product_assignment_count,  # 同一品番の割当回数
-                        product_hours,  # 品番ごとの累計時間
-                        not is_unused,  # False=未使用を優先
-                        daily_utilization,  # 当日の稼働率が低い順
-                        total_hours,   # 総勤務時間が少ない順
-                        skill_order_map.get(skill_level, 99),  # スキル1を優先
-                        assignment_count,  # 割り当て回数が少ない順
-                        last_assignment  # 最後の割り当てが古い順
-                    )
-                    all_candidates.append((priority, insp, skill_level))
+            # 【高速化】候補は1度だけ優先度順に並べ、以降の絞り込みは順序を保ったまま行う（再ソート不要）
+            all_candidates = self._rank_skill_combination_candidates(
+                skill_groups, product_number, current_date, inspector_master_df
+            )
             
             # 【改善】超過をチェックしながら選択するためのヘルパー関数
             def check_and_add_inspector_two(insp, temp_assignments=None):
@@ -6317,7 +7750,6 @@ class InspectorAssignmentManager:
                 # スキル1の候補から最適な1人を選択（固定検査員 > 未使用・時間バランスを優先）
                 skill1_candidates = [(p, i, sl) for p, i, sl in all_candidates if sl == 1]
                 if skill1_candidates:
-                    skill1_candidates.sort(key=self._priority_sort_key)
                     # 【改善】超過をチェックしながら選択
                     for priority, insp, sl in skill1_candidates:
                         if check_and_add_inspector_two(insp, temp_daily_assignments):
@@ -6336,7 +7768,6 @@ class InspectorAssignmentManager:
                             fixed_candidates = [(p, i, sl) for p, i, sl in remaining_candidates if i.get('__is_fixed', False)]
                             if fixed_candidates:
                                 # 固定検査員がいる場合、優先的に選択（バランスを考慮してソート）
-                                fixed_candidates.sort(key=self._priority_sort_key)
                                 for priority, insp, sl in fixed_candidates:
                                     if check_and_add_inspector_two(insp, temp_daily_assignments):
                                         selected.append(insp)
@@ -6348,7 +7779,6 @@ class InspectorAssignmentManager:
                                 skill3_candidates = [(p, i, sl) for p, i, sl in remaining_candidates if sl == 3]
                                 if skill3_candidates:
                                     # スキル3がいる場合、優先的に選択（バランスを考慮してソート）
-                                    skill3_candidates.sort(key=self._priority_sort_key)
                                     for priority, insp, sl in skill3_candidates:
                                         if check_and_add_inspector_two(insp, temp_daily_assignments):
                                             selected.append(insp)
@@ -6357,7 +7787,6 @@ class InspectorAssignmentManager:
                                             break
                                 else:
                                     # スキル3がいない場合、バランスを考慮して選択
-                                    remaining_candidates.sort(key=self._priority_sort_key)
                                     for priority, insp, sl in remaining_candidates:
                                         if check_and_add_inspector_two(insp, temp_daily_assignments):
                                             selected.append(insp)
@@ -6366,7 +7795,6 @@ class InspectorAssignmentManager:
                                             break
             else:
                 # スキル1がいない場合、バランスを最優先に2人選択（固定検査員を優先）
-                all_candidates.sort(key=self._priority_sort_key)
                 for priority, insp, sl in all_candidates:
                     if len(selected) >= 2:
                         break
@@ -6408,7 +7836,6 @@ class InspectorAssignmentManager:
         """
         try:
             selected = []
-            skill_order_map = {1: 0, 2: 1, 3: 2, 'new': 3}
             
             # 利用可能な検査員の総数を確認
             total_available = sum(len(inspectors) for inspectors in skill_groups.values())
@@ -6423,56 +7850,10 @@ class InspectorAssignmentManager:
                 return selected
             
             # バランス重視の選択ロジック: 【追加】固定検査員 > 未使用検査員 > 総勤務時間のバランス > スキルレベル
-            all_candidates = []
-            for skill_level, inspectors in skill_groups.items():
-                for insp in inspectors:
-                    code = insp['コード']
-                    assignment_count = self.inspector_assignment_count.get(code, 0)
-                    total_hours = self.inspector_work_hours.get(code, 0.0)
-                    daily_hours = self.inspector_daily_assignments.get(code, {}).get(current_date, 0.0)
-                    max_hours = self.get_inspector_max_hours(code, inspector_master_df)
-                    allowed_max_hours = self._apply_work_hours_overrun(max_hours)
-                    daily_utilization = (
-                        (daily_hours / allowed_max_hours)
-                        if allowed_max_hours > 0
-                        else 1.0
-                    )
-                    last_assignment = self.inspector_last_assignment.get(code, pd.Timestamp.min)
-                    is_unused = (assignment_count == 0)
-                    is_fixed = insp.get('__is_fixed', False)  # 固定検査員フラグ
-                    
-                    # 【追加】優先順位: 0)固定検査員を最優先（登録済み品番の特別処置）, 1)未使用検査員優先, 2)総勤務時間が少ない, 3)スキルレベル(1>2>3>new、1が最高スキル), 4)割り当て回数が少ない, 5)4時間上限に近い場合は優先度を下げる
-                    near_limit = insp.get('__near_product_limit', False)  # 4時間上限に近い場合は優先度を下げる
-                    # product_hoursが辞書の場合は0.0にフォールバック
-                    projected_hours = insp.get('__projected_product_hours')
-                    if projected_hours is None:
-                        product_hours_dict = self.inspector_product_hours.get(code, {})
-                        if isinstance(product_hours_dict, dict):
-                            # 辞書の場合は、該当品番の時間を取得（品番が不明な場合は0.0）
-                            if product_number and product_number in product_hours_dict:
-                                product_hours = product_hours_dict[product_number]
-                            else:
-                                product_hours = 0.0
-                        else:
-                            product_hours = product_hours_dict if isinstance(product_hours_dict, (int, float)) else 0.0
-                    else:
-                        product_hours = projected_hours if isinstance(projected_hours, (int, float)) else 0.0
-                    product_limit_penalty = 1 if insp.get('over_product_limit', False) else 0
-                    product_assignment_count = insp.get('__product_assignment_count', 0)
-                    priority = (
-                        not is_fixed,  # False=固定検査員を最優先（登録済み品番の特別処置）
-                        product_limit_penalty,  # 4時間上限を超える場合は最終手段
-                        near_limit,  # 4時間上限に近い場合は優先度を下げる（False < True）
-                        product_assignment_count,  # 同一品番の割当回数
-                        product_hours,  # 品番単位の累計時間
-                        not is_unused,  # False=未使用を優先
-                        daily_utilization,  # 当日の稼働率が低い順
-                        total_hours,   # 総勤務時間が少ない順
-                        skill_order_map.get(skill_level, 99),  # スキル1を優先
-                        assignment_count,  # 割り当て回数が少ない順
-                        last_assignment  # 最後の割り当てが古い順
-                    )
-                    all_candidates.append((priority, insp, skill_level))
+            # 【高速化】候補は1度だけ優先度順に並べ、以降の絞り込みは順序を保ったまま行う（再ソート不要）
+            all_candidates = self._rank_skill_combination_candidates(
+                skill_groups, product_number, current_date, inspector_master_df
+            )
             
             # 【改善】超過をチェックしながら選択するためのヘルパー関数
             def check_and_add_inspector_three(insp, temp_assignments=None):
@@ -6510,7 +7891,6 @@ class InspectorAssignmentManager:
                 # スキル1の候補から最適な1人を選択（固定検査員 > 未使用・時間バランスを優先）
                 skill1_candidates = [(p, i, sl) for p, i, sl in all_candidates if sl == 1]
                 if skill1_candidates:
-                    skill1_candidates.sort(key=self._priority_sort_key)
                     # 【改善】超過をチェックしながら選択
                     for priority, insp, sl in skill1_candidates:
                         if check_and_add_inspector_three(insp, temp_daily_assignments):
@@ -6529,7 +7909,6 @@ class InspectorAssignmentManager:
                             fixed_candidates = [(p, i, sl) for p, i, sl in remaining_candidates if i.get('__is_fixed', False)]
                             if fixed_candidates:
                                 # 固定検査員がいる場合、優先的に選択（バランスを考慮してソート）
-                                fixed_candidates.sort(key=self._priority_sort_key)
                                 # 【改善】超過をチェックしながら選択
                                 for priority, insp, sl in fixed_candidates:
                                     if check_and_add_inspector_three(insp, temp_daily_assignments):
@@ -6545,7 +7924,6 @@ class InspectorAssignmentManager:
                                         # 残りの固定検査員を優先的に探す
                                         remaining_fixed = [(p, i, sl) for p, i, sl in remaining_after_fixed if i.get('__is_fixed', False)]
                                         if remaining_fixed:
-                                            remaining_fixed.sort(key=self._priority_sort_key)
                                             for priority, insp, sl in remaining_fixed:
                                                 if check_and_add_inspector_three(insp, temp_daily_assignments):
                                                     selected.append(insp)
@@ -6556,7 +7934,6 @@ class InspectorAssignmentManager:
                                             # スキル3の候補を優先的に探す
                                             skill3_candidates = [(p, i, sl) for p, i, sl in remaining_after_fixed if sl == 3]
                                             if skill3_candidates:
-                                                skill3_candidates.sort(key=self._priority_sort_key)
                                                 for priority, insp, sl in skill3_candidates:
                                                     if check_and_add_inspector_three(insp, temp_daily_assignments):
                                                         selected.append(insp)
@@ -6564,7 +7941,6 @@ class InspectorAssignmentManager:
                                                         self.log_message(f"  スキル3選択（教育のため）: {insp['氏名']} (総勤務時間: {self.inspector_work_hours.get(code, 0.0):.1f}h, 割当回数: {self.inspector_assignment_count.get(code, 0)})")
                                                         break
                                             else:
-                                                remaining_after_fixed.sort(key=self._priority_sort_key)
                                                 for priority, insp, sl in remaining_after_fixed:
                                                     if check_and_add_inspector_three(insp, temp_daily_assignments):
                                                         selected.append(insp)
@@ -6577,7 +7953,6 @@ class InspectorAssignmentManager:
                             skill3_candidates = [(p, i, sl) for p, i, sl in remaining_candidates if sl == 3]
                             if skill3_candidates:
                                 # スキル3がいる場合、優先的に1人選択（バランスを考慮してソート）
-                                skill3_candidates.sort(key=self._priority_sort_key)
                                 # 【改善】超過をチェックしながら選択
                                 for priority, insp, sl in skill3_candidates:
                                     if check_and_add_inspector_three(insp, temp_daily_assignments):
@@ -6593,7 +7968,6 @@ class InspectorAssignmentManager:
                                     # 固定検査員を優先的に探す
                                     remaining_fixed = [(p, i, sl) for p, i, sl in remaining_after_skill3 if i.get('__is_fixed', False)]
                                     if remaining_fixed:
-                                        remaining_fixed.sort(key=self._priority_sort_key)
                                         for priority, insp, sl in remaining_fixed:
                                             if check_and_add_inspector_three(insp, temp_daily_assignments):
                                                 selected.append(insp)
@@ -6601,7 +7975,6 @@ class InspectorAssignmentManager:
                                                 self.log_message(f"  固定検査員選択（登録済み品番の特別処置）: {insp['氏名']} (総勤務時間: {self.inspector_work_hours.get(code, 0.0):.1f}h, 割当回数: {self.inspector_assignment_count.get(code, 0)})")
                                                 break
                                     else:
-                                        remaining_after_skill3.sort(key=self._priority_sort_key)
                                         for priority, insp, sl in remaining_after_skill3:
                                             if check_and_add_inspector_three(insp, temp_daily_assignments):
                                                 selected.append(insp)
@@ -6611,7 +7984,6 @@ class InspectorAssignmentManager:
                                                 break
                             else:
                                 # スキル3がいない場合、バランスを考慮して2人選択（固定検査員を優先）
-                                remaining_candidates.sort(key=self._priority_sort_key)
                                 for priority, insp, sl in remaining_candidates:
                                     if len(selected) >= 3:
                                         break
@@ -6623,7 +7995,6 @@ class InspectorAssignmentManager:
                                         self.log_message(f"  選択{len(selected)}: {insp['氏名']}{fixed_mark} ({skill_info}, 総勤務時間: {self.inspector_work_hours.get(code, 0.0):.1f}h, 割当回数: {self.inspector_assignment_count.get(code, 0)})")
             else:
                 # スキル1がいない場合、バランスを最優先に3人選択（固定検査員を優先）
-                all_candidates.sort(key=self._priority_sort_key)
                 for priority, insp, sl in all_candidates:
                     if len(selected) >= 3:
                         break
@@ -6640,6 +8011,36 @@ class InspectorAssignmentManager:
             self.log_message(f"3人選択中にエラーが発生しました: {str(e)}")
             return []
 
+    def _priority_code_key(self, inspector: Any) -> Tuple[int, Any]:
+        """
+        同点ブレーカー（検査員コード昇順）: 同じ優先度の候補が複数ある場合でも割当がブレないようにする
+
+        【高速化】コードごとの比較キーはキャッシュする（同点ブレーカーのシードが変わった場合は別キー）
+        """
+        raw_code = inspector.get('コード', '') if isinstance(inspector, dict) else ''
+        cache_key = (self.tie_break_seed, raw_code)
+        try:
+            return self._priority_code_key_cache[cache_key]
+        except KeyError:
+            pass
+        except TypeError:
+            cache_key = None
+        try:
+            code_str = str(raw_code).strip()
+        except Exception:
+            code_str = ''
+        try:
+            code_int = int(code_str) if code_str.isdigit() else None
+        except Exception:
+            code_int = None
+        code_key: Tuple[int, Any] = (0, code_int) if code_int is not None else (1, code_str)
+        if self.tie_break_seed is not None:
+            # マルチスタート: 同点時の順位をシードで摂動する
+            code_key = (0, tie_break_rank(self.tie_break_seed, code_str))
+        if cache_key is not None:
+            self._priority_code_key_cache[cache_key] = code_key
+        return code_key
+
     def _priority_sort_key(self, candidate_tuple: Tuple[object, Dict[str, Any], Any]) -> Tuple:
         """
         ソートキーを生成するメソッド
@@ -6657,17 +8058,7 @@ class InspectorAssignmentManager:
             # タプル形式でない場合は、デフォルト値を返す
             return (999, ('', ''))
 
-        # 同点ブレーカー（検査員コード昇順）: 同じ優先度の候補が複数ある場合でも割当がブレないようにする
-        raw_code = inspector.get('コード', '') if isinstance(inspector, dict) else ''
-        try:
-            code_str = str(raw_code).strip()
-        except Exception:
-            code_str = ''
-        try:
-            code_int = int(code_str) if code_str.isdigit() else None
-        except Exception:
-            code_int = None
-        code_key: Tuple[int, Any] = (0, code_int) if code_int is not None else (1, code_str)
+        code_key = self._priority_code_key(inspector)
 
         # priorityの型に応じて適切なソートキーを生成
         if isinstance(priority, tuple):
@@ -6694,6 +8085,25 @@ class InspectorAssignmentManager:
             # 比較できない型の場合は文字列表現を使用
             return (repr(priority), code_key)
 
+    def _exclude_mix_prevention_conflicts(
+        self,
+        available_inspectors: List[Dict[str, Any]],
+        product_number: str,
+    ) -> List[Dict[str, Any]]:
+        """
+        同じ混入防止クラスの別品番を担当済みの検査員を候補から除く
+
+        クラス別累計時間は履歴への書き込みごとに状態ストアで差分更新されているため、配列の作り直しは行わない
+        （日付に依存しないので対象日も不要）
+        """
+        product_number_str = str(product_number).strip()
+        if not available_inspectors or not self.mix_prevention_index.classes_of(product_number_str):
+            return available_inspectors
+        store = self.state_store
+        indices = store.indices_of([inspector['コード'] for inspector in available_inspectors])
+        mix_mask = store.conflict_mask(indices, product_number_str)
+        return [inspector for inspector, excluded in zip(available_inspectors, mix_mask) if not excluded]
+
     def filter_available_inspectors(
         self,
         available_inspectors: List[Dict[str, Any]],
@@ -6727,39 +8137,56 @@ class InspectorAssignmentManager:
             current_date = pd.Timestamp.now().date()
             target_date = lot_date or current_date
 
-            for inspector in available_inspectors:
-                inspector_code = inspector['コード']
+            # 【高速化】候補全員分の状態を配列で取得し、各制約をマスクで一括判定する
+            store = self.state_store
+            candidate_codes = [inspector['コード'] for inspector in available_inspectors]
+            indices = store.indices_of(candidate_codes)
+            daily_hours_arr = store.daily_column(target_date, indices)
+            product_hours_arr = store.product_column(product_number, indices)
+
+            # 類似製品の混入防止: 同じ混入防止クラスの別品番を担当済みの検査員は除外（クラス別累計時間で判定）
+            product_number_str = str(product_number).strip()
+            mix_mask = store.conflict_mask(indices, product_number_str)
+            # 【高速化】終日休暇・最大勤務時間（休暇の不在時間を考慮）は稼働可否テーブルから配列で参照する
+            in_table_mask = store.availability_mask(indices, inspector_master_df)
+            vacation_mask = store.on_vacation[indices] & in_table_mask
+            max_hours_arr = np.where(in_table_mask, store.max_hours[indices], np.nan)
+            # テーブルにない候補（マスタ外のコード等）は個別に判定し、最大勤務時間は除外されない候補のみ算出する
+            for pos in np.flatnonzero(~in_table_mask):
+                vacation_mask[pos] = self.is_inspector_on_vacation(available_inspectors[pos]['氏名'])
+                if not (vacation_mask[pos] or mix_mask[pos]):
+                    max_hours_arr[pos] = self.get_inspector_max_hours(candidate_codes[pos], inspector_master_df)
+            non_positive_mask = max_hours_arr <= 0
+            overrun_rate = SAME_DAY_WORK_HOURS_OVERRUN_RATE if relax_work_hours else WORK_HOURS_OVERRUN_RATE
+            work_hours_mask = (
+                daily_hours_arr + divided_time > max_hours_arr * (1.0 + overrun_rate) - WORK_HOURS_BUFFER
+            )
+            if ignore_product_limit:
+                product_limit_mask = np.zeros(len(indices), dtype=bool)
+            else:
+                product_limit_mask = store.product_limit_exceeded_mask(
+                    indices, product_number, divided_time, PRODUCT_LIMIT_DRAFT_THRESHOLD
+                )
+
+            for pos, inspector in enumerate(available_inspectors):
+                inspector_code = candidate_codes[pos]
                 inspector_name = inspector['氏名']
-                inspector_entry = inspector.copy()
 
                 # 【追加】休暇情報をチェック（終日休みの場合は除外）
-                vacation_info = self.get_vacation_info(inspector_name)
-                if vacation_info:
-                    code = vacation_info.get("code", "")
-                    work_status = vacation_info.get("work_status", "")
-                    
-                    # 終日休みの場合は除外
-                    if code in ["休", "出", "当"]:
-                        interpretation = vacation_info.get("interpretation", "")
-                        excluded_by_vacation.append(f"{inspector_name}({inspector_code})")
-                        self.log_message(
-                            f"検査員 '{inspector_name}' は終日休暇のため除外 "
-                            f"(休暇コード: {code}, 解釈: {interpretation})",
-                            debug=True
-                        )
-                        continue
+                if vacation_mask[pos]:
+                    vacation_info = self.get_vacation_info(inspector_name) or {}
+                    excluded_by_vacation.append(f"{inspector_name}({inspector_code})")
+                    self.log_message(
+                        f"検査員 '{inspector_name}' は終日休暇のため除外 "
+                        f"(休暇コード: {vacation_info.get('code', '')}, 解釈: {vacation_info.get('interpretation', '')})",
+                        debug=True
+                    )
+                    continue
 
-                # 類似製品の混入防止: 指定ペア品番の同一検査員重複を禁止
-                product_number_str = str(product_number).strip()
-                blocked_by_mix = False
-                for pair in MIX_PREVENTION_PRODUCT_PAIRS:
-                    if product_number_str not in pair:
-                        continue
-                    counterpart_numbers = pair - {product_number_str}
-                    for counterpart in counterpart_numbers:
+                if mix_mask[pos]:
+                    for counterpart in self.mix_prevention_index.counterparts(product_number_str):
                         counterpart_hours = self.inspector_product_hours.get(inspector_code, {}).get(counterpart, 0.0)
                         if counterpart_hours > 0:
-                            blocked_by_mix = True
                             excluded_by_mix_prevention.append(
                                 f"{inspector_name}({inspector_code}): {counterpart} {counterpart_hours:.1f}h担当済"
                             )
@@ -6769,21 +8196,15 @@ class InspectorAssignmentManager:
                                 debug=True
                             )
                             break
-                    if blocked_by_mix:
-                        break
-                if blocked_by_mix:
                     continue
 
-                # 対象日の累積勤務時間を取得
-                daily_hours = self.inspector_daily_assignments.get(inspector_code, {}).get(target_date, 0.0)
+                # 対象日の累積勤務時間と勤務時間上限（検査員マスタベース、休暇情報を考慮）
+                daily_hours = float(daily_hours_arr[pos])
                 additional_hours = divided_time
-
-                # 勤務時間上限を算出（検査員マスタベース、休暇情報を考慮）
-                max_daily_hours = self.get_inspector_max_hours(inspector_code, inspector_master_df)
-                allowed_max_hours = self._apply_work_hours_overrun(max_daily_hours)
+                max_daily_hours = float(max_hours_arr[pos])
                 
                 # 実質勤務時間が0以下の場合は除外
-                if max_daily_hours <= 0:
+                if non_positive_mask[pos]:
                     excluded_by_work_hours.append(f"{inspector_name}({inspector_code}): 調整後勤務時間0時間以下")
                     warning_key = (f"調整後勤務時間0時間", inspector_name)
                     if warning_key not in self.logged_warnings:
@@ -6794,65 +8215,47 @@ class InspectorAssignmentManager:
                         self.logged_warnings.add(warning_key)
                     continue
 
-                # 改善ポイント: 定数を使用
                 # 勤務時間チェック（WORK_HOURS_BUFFERの余裕を確保）
-                # 緩和モードの場合も超過まで許容（当日洗浄上がり品の制約緩和時など）
-                if relax_work_hours:
-                    # 緩和モード: 超過まで許容（SAME_DAY_WORK_HOURS_OVERRUN_RATEを使用）
-                    relaxed_allowed_max_hours = max_daily_hours * (1.0 + SAME_DAY_WORK_HOURS_OVERRUN_RATE)
-                    if daily_hours + additional_hours > relaxed_allowed_max_hours - WORK_HOURS_BUFFER:
-                        excluded_by_work_hours.append(f"{inspector_name}({inspector_code}): {daily_hours:.1f}h+{additional_hours:.1f}h>{relaxed_allowed_max_hours:.1f}h-{WORK_HOURS_BUFFER:.2f}h")
-                        self.log_message(
-                            f"検査員 '{inspector['氏名']}' は緩和モードでも超過を超えるため除外 "
-                            f"(今日: {daily_hours:.1f}h + {additional_hours:.1f}h > {relaxed_allowed_max_hours:.1f}h - {WORK_HOURS_BUFFER:.2f}h = {relaxed_allowed_max_hours - WORK_HOURS_BUFFER:.1f}h)",
-                            debug=True
-                        )
-                        continue
-                else:
-                    # 通常モード: 超過+バッファを厳格にチェック
-                    if daily_hours + additional_hours > allowed_max_hours - WORK_HOURS_BUFFER:
-                        excluded_by_work_hours.append(f"{inspector_name}({inspector_code}): {daily_hours:.1f}h+{additional_hours:.1f}h>{allowed_max_hours:.1f}h-{WORK_HOURS_BUFFER:.2f}h")
-                        self.log_message(
-                            f"検査員 '{inspector['氏名']}' は超過を超えるため除外 "
-                            f"(今日: {daily_hours:.1f}h + {additional_hours:.1f}h > {allowed_max_hours:.1f}h - {WORK_HOURS_BUFFER:.2f}h = {allowed_max_hours - WORK_HOURS_BUFFER:.1f}h)",
-                            debug=True
-                        )
-                        continue
+                # 緩和モードの場合は SAME_DAY_WORK_HOURS_OVERRUN_RATE、通常モードは WORK_HOURS_OVERRUN_RATE を適用
+                if work_hours_mask[pos]:
+                    allowed_max_hours = max_daily_hours * (1.0 + overrun_rate)
+                    excluded_by_work_hours.append(f"{inspector_name}({inspector_code}): {daily_hours:.1f}h+{additional_hours:.1f}h>{allowed_max_hours:.1f}h-{WORK_HOURS_BUFFER:.2f}h")
+                    self.log_message(
+                        "検査員 '%s' は%s超過を超えるため除外 (今日: %.1fh + %.1fh > %.1fh - %.2fh = %.1fh)",
+                        inspector['氏名'], '緩和モードでも' if relax_work_hours else '',
+                        daily_hours, additional_hours, allowed_max_hours, WORK_HOURS_BUFFER,
+                        allowed_max_hours - WORK_HOURS_BUFFER,
+                        debug=True
+                    )
+                    continue
 
                 # 改善ポイント: 4時間上限ルールの2段階化
                 # ドラフトフェーズ：4.5h未満までは許容（4.0h超は over_product_limit=True を設定）
                 # 最適化フェーズ：ここで4.0h遵守へ是正。置換不可能な場合のみ未割当へ戻す。
-                if not ignore_product_limit:
-                    product_hours = self.inspector_product_hours.get(inspector_code, {}).get(product_number, 0.0)
-                    projected_hours = product_hours + divided_time
-                    
-                    # ドラフトフェーズでの許容上限チェック（4.5h未満まで許容）
-                    if projected_hours >= PRODUCT_LIMIT_DRAFT_THRESHOLD:
-                        excluded_by_product_limit.append(f"{inspector_name}({inspector_code}): {product_hours:.1f}h+{divided_time:.1f}h={projected_hours:.1f}h>={PRODUCT_LIMIT_DRAFT_THRESHOLD}h")
-                        self.log_message(
-                            f"検査員 '{inspector['氏名']}' は品番 {product_number} の累計が {product_hours:.1f}h で、"
-                            f"追加すると {projected_hours:.1f}h となるため（{PRODUCT_LIMIT_DRAFT_THRESHOLD}h以上）今回は除外します",
-                            debug=True
-                        )
-                        continue
+                product_hours = float(product_hours_arr[pos])
+                projected_hours = product_hours + divided_time
+                if product_limit_mask[pos]:
+                    excluded_by_product_limit.append(f"{inspector_name}({inspector_code}): {product_hours:.1f}h+{divided_time:.1f}h={projected_hours:.1f}h>={PRODUCT_LIMIT_DRAFT_THRESHOLD}h")
+                    self.log_message(
+                        "検査員 '%s' は品番 %s の累計が %.1fh で、追加すると %.1fh となるため（%sh以上）今回は除外します",
+                        inspector['氏名'], product_number, product_hours, projected_hours, PRODUCT_LIMIT_DRAFT_THRESHOLD,
+                        debug=True
+                    )
+                    continue
 
-                    # 4.0h超過の場合はフラグを設定（ドラフトフェーズでは許容、最適化フェーズで是正）
-                    inspector_entry['over_product_limit'] = projected_hours > PRODUCT_LIMIT_HARD_THRESHOLD
-                    inspector_entry['__current_product_hours'] = product_hours
-                    inspector_entry['__projected_product_hours'] = projected_hours
-                else:
-                    # ignore_product_limit=Trueの場合、4時間上限チェックをスキップ
-                    inspector_entry['over_product_limit'] = False
-                    # ログ出力用にprojected_hoursを計算（チェックは行わない）
-                    product_hours = self.inspector_product_hours.get(inspector_code, {}).get(product_number, 0.0)
-                    projected_hours = product_hours + divided_time
-                    inspector_entry['__current_product_hours'] = product_hours
-                    inspector_entry['__projected_product_hours'] = projected_hours
+                inspector_entry = inspector.copy()
+                # 4.0h超過の場合はフラグを設定（ドラフトフェーズでは許容、最適化フェーズで是正）
+                # ignore_product_limit=Trueの場合はチェックをスキップし、ログ用にprojected_hoursのみ保持
+                inspector_entry['over_product_limit'] = (
+                    False if ignore_product_limit else projected_hours > PRODUCT_LIMIT_HARD_THRESHOLD
+                )
+                inspector_entry['__current_product_hours'] = product_hours
+                inspector_entry['__projected_product_hours'] = projected_hours
                 filtered_inspectors.append(inspector_entry)
                 self.log_message(
-                    f"検査員 '{inspector['氏名']}' は利用可能 "
-                    f"(今日: {daily_hours:.1f}h + {additional_hours:.1f}h = {daily_hours + additional_hours:.1f}h, "
-                    f"最大勤務時間: {max_daily_hours:.1f}h, 品番累計予定: {projected_hours:.1f}h)",
+                    "検査員 '%s' は利用可能 (今日: %.1fh + %.1fh = %.1fh, 最大勤務時間: %.1fh, 品番累計予定: %.1fh)",
+                    inspector['氏名'], daily_hours, additional_hours, daily_hours + additional_hours,
+                    max_daily_hours, projected_hours,
                     debug=True
                 )
 
@@ -6863,13 +8266,13 @@ class InspectorAssignmentManager:
             if input_count > 0 and filtered_count == 0:
                 # 全て除外された場合、詳細ログを出力
                 if excluded_by_vacation:
-                    self.log_message(f"filter_available_inspectors: 休暇で除外: {', '.join(excluded_by_vacation[:3])}{'...' if len(excluded_by_vacation) > 3 else ''}", debug=True)
+                    self.log_message(lambda: f"filter_available_inspectors: 休暇で除外: {', '.join(excluded_by_vacation[:3])}{'...' if len(excluded_by_vacation) > 3 else ''}", debug=True)
                 if excluded_by_work_hours:
-                    self.log_message(f"filter_available_inspectors: 勤務時間で除外（{mode_str}）: {', '.join(excluded_by_work_hours[:3])}{'...' if len(excluded_by_work_hours) > 3 else ''}", debug=True)
+                    self.log_message(lambda: f"filter_available_inspectors: 勤務時間で除外（{mode_str}）: {', '.join(excluded_by_work_hours[:3])}{'...' if len(excluded_by_work_hours) > 3 else ''}", debug=True)
                 if excluded_by_product_limit:
-                    self.log_message(f"filter_available_inspectors: 4時間上限で除外: {', '.join(excluded_by_product_limit[:3])}{'...' if len(excluded_by_product_limit) > 3 else ''}", debug=True)
+                    self.log_message(lambda: f"filter_available_inspectors: 4時間上限で除外: {', '.join(excluded_by_product_limit[:3])}{'...' if len(excluded_by_product_limit) > 3 else ''}", debug=True)
                 if excluded_by_mix_prevention:
-                    self.log_message(f"filter_available_inspectors: 混入防止で除外: {', '.join(excluded_by_mix_prevention[:3])}{'...' if len(excluded_by_mix_prevention) > 3 else ''}", debug=True)
+                    self.log_message(lambda: f"filter_available_inspectors: 混入防止で除外: {', '.join(excluded_by_mix_prevention[:3])}{'...' if len(excluded_by_mix_prevention) > 3 else ''}", debug=True)
                 warning_key = (
                     "filter_all_excluded",
                     str(product_number).strip(),
@@ -6944,6 +8347,10 @@ class InspectorAssignmentManager:
         """
         self.vacation_data = vacation_data
         self.vacation_date = target_date
+        # 休暇による不在時間が変わるため最大勤務時間キャッシュを破棄
+        self.state_store.reset_max_hours()
+        # 終日休暇による候補の除外が変わるため静的候補キャッシュも破棄
+        self.invalidate_candidate_cache()
         
         # 検査員マスタの「休暇予定表の別名」列を考慮してマッピングを作成
         self.inspector_name_to_vacation = {}
@@ -6975,6 +8382,16 @@ class InspectorAssignmentManager:
         else:
             # 検査員マスタがない場合は直接マッピング
             self.inspector_name_to_vacation = vacation_data.copy()
+
+        # 終日休暇（AM/PM/早/遅は勤務可能）の検査員名を先に確定しておく
+        self.full_day_vacation_names = {
+            inspector_name
+            for inspector_name, vacation_info in self.inspector_name_to_vacation.items()
+            if vacation_info and vacation_info.get("code", "") in FULL_DAY_VACATION_CODES
+        }
+        # 【高速化】検査員ごとの稼働可否テーブルを作成（マスタがない場合は割当実行の開始時に作成）
+        if inspector_master_df is not None:
+            self._build_availability_table(inspector_master_df)
         
         self.log_message(f"休暇情報を設定しました: {len(self.inspector_name_to_vacation)}名、対象日: {target_date}")
     
@@ -7025,13 +8442,8 @@ class InspectorAssignmentManager:
         Returns:
             bool: 休暇中の場合はTrue
         """
-        vacation_info = self.get_vacation_info(inspector_name)
-        if not vacation_info:
-            return False
-        
-        # 終日休暇のみ休暇扱い（AM/PM/早/遅は勤務可能）
-        code = vacation_info.get("code", "")
-        return code in ["休", "出", "当"]
+        # 終日休暇のみ休暇扱い（AM/PM/早/遅は勤務可能、判定は set_vacation_data で済ませている）
+        return inspector_name in self.full_day_vacation_names
     
     def get_inspector_max_hours(
         self,
@@ -7052,78 +8464,125 @@ class InspectorAssignmentManager:
         Returns:
             float: 実質的な最大勤務時間（時間単位）
         """
+        # 【高速化】同一実行内は状態ストアのキャッシュを使用（休暇情報設定時・実行開始時に破棄）
+        cached_hours = self.state_store.cached_max_hours(inspector_code, inspector_master_df)
+        if cached_hours is not None:
+            return cached_hours
+        max_hours = self._compute_inspector_max_hours(inspector_code, inspector_master_df)
+        self.state_store.store_max_hours(inspector_code, inspector_master_df, max_hours)
+        return max_hours
+
+    def _compute_inspector_max_hours(
+        self,
+        inspector_code: str,
+        inspector_master_df: pd.DataFrame
+    ) -> float:
+        """検査員マスタと休暇情報から最大勤務時間を算出（キャッシュなし）"""
         try:
             inspector_info = inspector_master_df[inspector_master_df['#ID'] == inspector_code]
             if not inspector_info.empty:
-                inspector_data = inspector_info.iloc[0]
-                start_time = inspector_data['開始時刻']
-                end_time = inspector_data['終了時刻']
-                inspector_name = inspector_data['#氏名']
-                
-                if pd.notna(start_time) and pd.notna(end_time):
-                    try:
-                        # 時刻文字列を時間に変換
-                        if isinstance(start_time, str):
-                            start_hour = float(start_time.split(':')[0]) + float(start_time.split(':')[1]) / 60.0
-                            start_time_str = start_time
-                        else:
-                            start_hour = start_time.hour + start_time.minute / 60.0
-                            start_time_str = f"{start_time.hour:02d}:{start_time.minute:02d}"
-                            
-                        if isinstance(end_time, str):
-                            end_hour = float(end_time.split(':')[0]) + float(end_time.split(':')[1]) / 60.0
-                            end_time_str = end_time
-                        else:
-                            end_hour = end_time.hour + end_time.minute / 60.0
-                            end_time_str = f"{end_time.hour:02d}:{end_time.minute:02d}"
-                        
-                        # 基本勤務時間を計算
-                        max_daily_hours = end_hour - start_hour
-                        
-                        # 休憩時間（12:15～13:00）を含む場合は1時間を差し引く
-                        if start_hour <= 12.25 and end_hour >= 13.0:
-                            max_daily_hours -= 1.0
-                        
-                        # 【追加】休暇情報を考慮して不在時間を差し引く
-                        vacation_info = self.get_vacation_info(inspector_name)
-                        if vacation_info:
-                            from app.services.vacation_schedule_service import calculate_vacation_absence_hours
-                            absence_hours = calculate_vacation_absence_hours(
-                                vacation_info, start_time_str, end_time_str
-                            )
-                            max_daily_hours -= absence_hours
-                            
-                            if absence_hours > 0:
-                                code = vacation_info.get("code", "")
-                                interpretation = vacation_info.get("interpretation", "")
-                                vacation_key = (
-                                    inspector_name,
-                                    code,
-                                    interpretation,
-                                    self.vacation_date.isoformat() if self.vacation_date else None
-                                )
-                                if vacation_key not in self.logged_vacation_messages:
-                                    self.logged_vacation_messages.add(vacation_key)
-                                    self.log_message(
-                                        f"検査員 '{inspector_name}' の休暇を考慮: "
-                                        f"基本勤務時間 {max_daily_hours + absence_hours:.1f}h - "
-                                        f"不在時間 {absence_hours:.1f}h = "
-                                        f"実質勤務時間 {max_daily_hours:.1f}h "
-                                        f"(休暇コード: {code}, {interpretation})"
-                                    )
-                        
-                        return max(0.0, max_daily_hours)
-                    except Exception as e:
-                        self.log_message(f"勤務時間計算エラー ({inspector_name}): {str(e)}", level='warning')
-                        return 8.0
-                else:
-                    return 8.0
+                return self._compute_inspector_availability(inspector_code, inspector_info.iloc[0]).max_hours
             else:
                 return 8.0
         except Exception as e:
             self.log_message(f"最大勤務時間取得エラー: {str(e)}", level='warning')
             return 8.0
 
+    def _build_availability_table(self, inspector_master_df: pd.DataFrame) -> None:
+        """
+        検査員ごとの稼働可否テーブル（終日休暇・不在時間・実質最大勤務時間）を状態ストアに作成する
+
+        休暇情報の対象日は1日分のため、ロットの対象日によらず1検査員1件で足りる。
+        filter_available_inspectors はこのテーブルを配列で参照し、候補ごとの休暇判定・勤務時間計算を省く。
+        """
+        self.state_store.reset_max_hours()
+        if inspector_master_df is None or inspector_master_df.empty or '#ID' not in inspector_master_df.columns:
+            return
+        self._build_inspector_index(inspector_master_df)
+        entries: List[InspectorAvailability] = []
+        seen_codes: Set[str] = set()
+        # 同一IDが複数行ある場合は先頭行を採用（_compute_inspector_max_hours と同じ）
+        for idx, inspector_id in inspector_master_df['#ID'].items():
+            if pd.isna(inspector_id) or not str(inspector_id).strip():
+                continue
+            code = str(inspector_id).strip()
+            if code in seen_codes:
+                continue
+            seen_codes.add(code)
+            try:
+                entries.append(self._compute_inspector_availability(code, inspector_master_df.loc[idx]))
+            except Exception as e:
+                self.log_message(f"最大勤務時間取得エラー: {str(e)}", level='warning')
+                entries.append(InspectorAvailability(code, False, 0.0, 8.0))
+        self.state_store.load_availability(inspector_master_df, entries)
+
+    def _compute_inspector_availability(self, inspector_code: str, inspector_data: pd.Series) -> InspectorAvailability:
+        """検査員マスタの1行と休暇情報から稼働可否を算出"""
+        start_time = inspector_data['開始時刻']
+        end_time = inspector_data['終了時刻']
+        inspector_name = inspector_data['#氏名']
+        on_vacation = self.is_inspector_on_vacation(inspector_name)
+        
+        if pd.notna(start_time) and pd.notna(end_time):
+            try:
+                # 時刻文字列を時間に変換
+                if isinstance(start_time, str):
+                    start_hour = float(start_time.split(':')[0]) + float(start_time.split(':')[1]) / 60.0
+                    start_time_str = start_time
+                else:
+                    start_hour = start_time.hour + start_time.minute / 60.0
+                    start_time_str = f"{start_time.hour:02d}:{start_time.minute:02d}"
+                    
+                if isinstance(end_time, str):
+                    end_hour = float(end_time.split(':')[0]) + float(end_time.split(':')[1]) / 60.0
+                    end_time_str = end_time
+                else:
+                    end_hour = end_time.hour + end_time.minute / 60.0
+                    end_time_str = f"{end_time.hour:02d}:{end_time.minute:02d}"
+                
+                # 基本勤務時間を計算
+                max_daily_hours = end_hour - start_hour
+                
+                # 休憩時間（12:15～13:00）を含む場合は1時間を差し引く
+                if start_hour <= 12.25 and end_hour >= 13.0:
+                    max_daily_hours -= 1.0
+                
+                # 【追加】休暇情報を考慮して不在時間を差し引く
+                absence_hours = 0.0
+                vacation_info = self.get_vacation_info(inspector_name)
+                if vacation_info:
+                    from app.services.vacation_schedule_service import calculate_vacation_absence_hours
+                    absence_hours = calculate_vacation_absence_hours(
+                        vacation_info, start_time_str, end_time_str
+                    )
+                    max_daily_hours -= absence_hours
+                    
+                    if absence_hours > 0:
+                        code = vacation_info.get("code", "")
+                        interpretation = vacation_info.get("interpretation", "")
+                        vacation_key = (
+                            inspector_name,
+                            code,
+                            interpretation,
+                            self.vacation_date.isoformat() if self.vacation_date else None
+                        )
+                        if vacation_key not in self.logged_vacation_messages:
+                            self.logged_vacation_messages.add(vacation_key)
+                            self.log_message(
+                                f"検査員 '{inspector_name}' の休暇を考慮: "
+                                f"基本勤務時間 {max_daily_hours + absence_hours:.1f}h - "
+                                f"不在時間 {absence_hours:.1f}h = "
+                                f"実質勤務時間 {max_daily_hours:.1f}h "
+                                f"(休暇コード: {code}, {interpretation})"
+                            )
+                
+                return InspectorAvailability(inspector_code, on_vacation, absence_hours, max(0.0, max_daily_hours))
+            except Exception as e:
+                self.log_message(f"勤務時間計算エラー ({inspector_name}): {str(e)}", level='warning')
+                return InspectorAvailability(inspector_code, on_vacation, 0.0, 8.0)
+        else:
+            return InspectorAvailability(inspector_code, on_vacation, 0.0, 8.0)
+
     def print_assignment_statistics(
         self,
         inspector_master_df: Optional[pd.DataFrame] = None
@@ -7362,6 +8821,45 @@ class InspectorAssignmentManager:
         except Exception as e:
             self.log_message(f"KPI統計表示中にエラーが発生しました: {str(e)}", level='error')
     
+    def request_cancel_optimization(self) -> None:
+        """
+        実行中の全体最適化の中止を要求する（UIスレッドなど別スレッドから呼び出してよい）
+
+        改善ループ（偏り是正・未割当再処理・追加割当）をその場で打ち切り、検証フェーズと最終是正だけを実行して返す。
+        """
+        self._optimization_budget.request_cancel()
+
+    def _optimization_checkpoint(
+        self,
+        result_df: pd.DataFrame,
+        inspector_master_df: pd.DataFrame,
+        phase: str,
+    ) -> pd.DataFrame:
+        """
+        全体最適化の検証済みフェーズ境界（phase の開始直前）で呼ぶ
+
+        割当結果のスナップショットを取り、時間予算の超過または中止要求がある場合は
+        これまでで最良のスナップショットを返す（以降のフェーズはそのスナップショットに対して実行する）。
+        """
+        budget = self._optimization_budget
+        current_is_best = budget.offer(phase, result_df, score_assignment(self, result_df, inspector_master_df))
+        if current_is_best or not budget.should_stop():
+            return result_df
+        snapshot = budget.best
+        if budget.stop_reason == STOP_REASON_CANCELLED:
+            reason_text = "中止が要求された"
+        else:
+            reason_text = f"時間予算（{budget.time_budget_seconds:.0f}秒）を超えた"
+        self.log_message(
+            f"{reason_text}ため、フェーズ{snapshot.phase}開始時点の結果（未割当 {snapshot.score.unassigned_hours:.1f}h / "
+            f"勤務時間超過 {snapshot.score.overrun_hours:.1f}h / 稼働率差 {snapshot.score.utilization_spread * 100:.1f}%）に戻して"
+            f"フェーズ{phase}を実行します（{budget.elapsed():.1f}秒経過）",
+            level='warning',
+        )
+        restored_df = snapshot.result_df.copy()
+        self._rebuild_assignment_histories(restored_df, inspector_master_df)
+        return restored_df
+
     def optimize_assignments(
         self,
         result_df: pd.DataFrame,
@@ -7401,8 +8899,8 @@ class InspectorAssignmentManager:
             except Exception:
                 inspector_name_to_id = {}
 
-            # 【高速化】固定検査員判定のローカルキャッシュ（本関数内では不変を前提）
-            fixed_names_cache: Dict[Tuple[str, str], Set[str]] = {}
+            # 【高速化】固定検査員判定は固定検査員インデックスを参照（(品番, 工程名) ごとの判定結果を保持）
+            fixed_inspector_index = self._get_fixed_inspector_index()
             on_vacation_cache: Dict[str, bool] = {}
 
             def _is_on_vacation_cached(inspector_name: str) -> bool:
@@ -7437,12 +8935,7 @@ class InspectorAssignmentManager:
                     return False
 
                 process_key = str(process_name_context_val).strip() if process_name_context_val is not None else ''
-                cache_key = (product_number_str, process_key)
-                fixed_names = fixed_names_cache.get(cache_key)
-                if fixed_names is None:
-                    fixed_names = set(self._collect_fixed_inspector_names(product_number_str, process_key))
-                    fixed_names_cache[cache_key] = fixed_names
-                return inspector_name_str in fixed_names
+                return inspector_name_str in fixed_inspector_index.lookup(product_number_str, process_key).name_set
 
             # 【高速化】スキルマスタに存在する品番セット（新規品判定）
             skill_product_values: Set[Any] = set()
@@ -7464,6 +8957,7 @@ class InspectorAssignmentManager:
                 skill_allowed_inspectors_by_product = {}
              
             self.log_message("全体最適化フェーズ0: result_dfから実際の割り当てを再計算")
+            self.phase_profiler.start_phase('0')
             perf_logger = loguru_logger.bind(channel="PERF")
             _t_perf_phase0 = perf_counter()
              
@@ -7487,17 +8981,14 @@ class InspectorAssignmentManager:
             def sort_key(val):
                 if pd.isna(val):
                     return (5, None)  # 最後に
-                val_str = str(val).strip()
+                info = self._shipping_date_info(val)
+                val_str = info.text
+                date_val = info.parsed
+                has_date = date_val is not None and pd.notna(date_val)
                 
                 # 1. 当日の日付（優先度0）
-                try:
-                    date_val = pd.to_datetime(val, errors='coerce')
-                    if pd.notna(date_val):
-                        date_date = date_val.date()
-                        if date_date == current_date:
-                            return (0, date_val)
-                except:
-                    pass
+                if has_date and date_val.date() == current_date:
+                    return (0, date_val)
                 
                 # 2. 先行検査品（優先度1）
                 if (val_str == "先行検査" or
@@ -7511,22 +9002,12 @@ class InspectorAssignmentManager:
                     return (2, val_str)
                 
                 # 4. 翌日または翌営業日（優先度3）
-                try:
-                    date_val = pd.to_datetime(val, errors='coerce')
-                    if pd.notna(date_val):
-                        date_date = date_val.date()
-                        if date_date == next_business_day:
-                            return (3, date_val)
-                except:
-                    pass
+                if has_date and date_val.date() == next_business_day:
+                    return (3, date_val)
                 
                 # 5. それ以降の日付（優先度4）
-                try:
-                    date_val = pd.to_datetime(val, errors='coerce')
-                    if pd.notna(date_val):
-                        return (4, date_val)
-                except:
-                    pass
+                if has_date:
+                    return (4, date_val)
                 
                 return (5, val_str)  # その他文字列
             
@@ -7588,16 +9069,22 @@ class InspectorAssignmentManager:
                     if inspector_col_idx != -1:
                         inspector_name_raw = row[inspector_col_idx]
                         if pd.notna(inspector_name_raw) and str(inspector_name_raw).strip() != '':
-                            inspector_name = str(inspector_name_raw).strip()
-                            # スキル値や(新)を除去
-                            if '(' in inspector_name:
-                                inspector_name = inspector_name.split('(')[0].strip()
+                            slot_inspector = self._slot_inspector(inspector_name_raw, row[result_cols[inspector_id_column(i)]] if inspector_id_column(i) in result_cols else None)
+                            if slot_inspector is not None:
+                                inspector_code, inspector_name = slot_inspector
+                            else:
+                                inspector_code = None
+                                inspector_name = str(inspector_name_raw).strip()
+                                # スキル値や(新)を除去
+                                if '(' in inspector_name:
+                                    inspector_name = inspector_name.split('(')[0].strip()
                             
                             if not inspector_name:
                                 continue
                             
                             # 検査員コードを取得（辞書 -> フォールバック）
-                            inspector_code = inspector_name_to_id.get(inspector_name)
+                            if inspector_code is None:
+                                inspector_code = inspector_name_to_id.get(inspector_name)
                             if inspector_code is None:
                                 inspector_info = self._get_inspector_by_name(inspector_name, inspector_master_df)
                                 if not inspector_info.empty:
@@ -7650,6 +9137,7 @@ class InspectorAssignmentManager:
             
             # フェーズ1: 勤務時間超過と同一品番の時間上限超過を検出・是正（繰り返し処理）
             self.log_message(f"全体最適化フェーズ1: 勤務時間超過と同一品番{self.product_limit_hard_threshold:.1f}時間超過の検出と是正を開始")
+            self.phase_profiler.start_phase('1')
             _t_perf_phase1_total = perf_counter()
              
             # 【改善】最大繰り返し回数を調整可能にする（環境変数で設定可能）
@@ -7682,6 +9170,7 @@ class InspectorAssignmentManager:
             divided_time_idx = sorted_cols.get('分割検査時間', -1)
             inspection_time_idx = sorted_cols.get('検査時間', -1)
             inspector_col_idxs = [sorted_cols.get(f'検査員{i}', -1) for i in range(1, MAX_INSPECTORS_PER_LOT + 1)]
+            inspector_id_col_idxs = [sorted_cols.get(inspector_id_column(i), -1) for i in range(1, MAX_INSPECTORS_PER_LOT + 1)]
             two_weeks_later = current_date + timedelta(days=14)
             shipping_date_date_cache: Dict[int, Optional[date]] = {}
             violation_date_cache: Dict[int, date] = {}
@@ -7696,23 +9185,189 @@ class InspectorAssignmentManager:
                     shipping_date_date_cache[row_index] = None
                     return None
 
+                value = self._shipping_date_info(shipping_date).parsed_date
+                shipping_date_date_cache[row_index] = value
+                return value
+             
+            def _violation_tie_break(violation_index: int, inspector_code: str, product_number: str) -> Tuple:
+                """違反の優先順位を計算（ヒープの同順位内の並び順）"""
                 try:
-                    if isinstance(shipping_date, pd.Timestamp):
-                        value = shipping_date.date()
-                    elif isinstance(shipping_date, str):
-                        parsed = pd.to_datetime(shipping_date, errors='coerce')
-                        value = parsed.date() if pd.notna(parsed) else None
+                    if violation_index < len(result_df):
+                        violation_date = violation_date_cache.get(violation_index)
+                        if violation_date is None:
+                            shipping_date_raw = result_df.at[violation_index, '出荷予定日']
+                            violation_date = (
+                                self._shipping_date_info(shipping_date_raw).parsed_date
+                                or pd.Timestamp.max.date()
+                            )
+                            violation_date_cache[violation_index] = violation_date
                     else:
-                        value = shipping_date.date() if hasattr(shipping_date, 'date') else shipping_date
-                    shipping_date_date_cache[row_index] = value
-                    return value
-                except Exception:
-                    shipping_date_date_cache[row_index] = None
-                    return None
-             
+                        violation_date = pd.Timestamp.min.date()
+                    relaxed_flag = (inspector_code, product_number) in self.relaxed_product_limit_assignments
+                    return (0 if relaxed_flag else 1, violation_date, violation_index)
+                except Exception as e:
+                    # エラー発生時は優先度を最低にしてソートを継続
+                    self.log_message(f"violation_priority計算エラー: {str(e)} (ロットインデックス: {violation_index})", level='warning')
+                    return (2, pd.Timestamp.max.date(), violation_index)
+
+            def _is_same_day_cleaning_index(row_index: int) -> bool:
+                shipping_date_raw = result_df.at[row_index, '出荷予定日'] if '出荷予定日' in result_df.columns else None
+                return self._shipping_date_info(shipping_date_raw).kind == LOT_KIND_SAME_DAY_CLEANING
+
+            def _record_phase1_fixed_protection(index: int, product_number: Any, inspector_name: str, process_name_context_str: str) -> None:
+                # 【追加】保護の履歴追跡
+                self.fixed_inspector_protection_metrics['total_protections'] += 1
+                self.fixed_inspector_protection_metrics['protection_by_phase']['phase1_violation_detection'] = \
+                    self.fixed_inspector_protection_metrics['protection_by_phase'].get('phase1_violation_detection', 0) + 1
+                self.fixed_inspector_protection_metrics['protection_by_reason']['violation_detection_exclusion'] = \
+                    self.fixed_inspector_protection_metrics['protection_by_reason'].get('violation_detection_exclusion', 0) + 1
+                self.fixed_inspector_protection_metrics['protected_lots'].add(index)
+                self.fixed_inspector_protection_metrics['protected_inspectors'].add(inspector_name)
+
+                protection_history_entry = {
+                    'lot_index': index,
+                    'product_number': product_number,
+                    'inspector_name': inspector_name,
+                    'phase': 'phase1',
+                    'reason': 'violation_detection_exclusion',
+                    'process_name': process_name_context_str,
+                }
+                self.fixed_inspector_protection_metrics['protection_history'].append(protection_history_entry)
+
+            def _register_lot(
+                index: int,
+                product_number: Any,
+                process_name_context: Any,
+                divided_time: Any,
+                inspection_time: Any,
+                inspector_values: List[Any],
+                inspector_ids: Optional[List[Any]] = None,
+                record_protection: bool = False,
+            ) -> Set[str]:
+                """ロットの割当内容を違反キューへ登録し、影響を受けた検査員コードを返す"""
+                if process_name_context is None or pd.isna(process_name_context):
+                    process_name_context = ''
+                process_name_context_str = str(process_name_context).strip()
+                if divided_time is None or pd.isna(divided_time) or divided_time == -1:
+                    divided_time = 0.0
+                if inspection_time is None or pd.isna(inspection_time) or inspection_time == -1:
+                    inspection_time = divided_time
+
+                members = []
+                for i, inspector_name_raw in enumerate(inspector_values, start=1):
+                    if inspector_name_raw is None or pd.isna(inspector_name_raw) or str(inspector_name_raw).strip() == '':
+                        continue
+                    slot_inspector = self._slot_inspector(inspector_name_raw, inspector_ids[i - 1] if inspector_ids else None)
+                    if slot_inspector is not None:
+                        inspector_code, inspector_name = slot_inspector
+                    else:
+                        inspector_code = None
+                        inspector_name = str(inspector_name_raw).strip()
+                        if '(' in inspector_name:
+                            inspector_name = inspector_name.split('(')[0].strip()
+                    if not inspector_name:
+                        continue
+
+                    # 検査員コードを取得（辞書 -> フォールバック）
+                    if inspector_code is None:
+                        inspector_code = inspector_name_to_id.get(inspector_name)
+                    if inspector_code is None:
+                        inspector_info = self._get_inspector_by_name(inspector_name, inspector_master_df)
+                        if inspector_info.empty:
+                            continue
+                        inspector_code = inspector_info.iloc[0]['#ID']
+
+                    # 固定検査員が割当済みのロットは、勤務時間/同一品番上限の違反検出・是正対象から除外する（時間は集計する）
+                    detectable = True
+                    if _is_fixed_inspector_for_lot_cached(product_number, process_name_context_str, inspector_name):
+                        detectable = False
+                        if record_protection:
+                            _record_phase1_fixed_protection(index, product_number, inspector_name, process_name_context_str)
+                    members.append(LotMember(i, inspector_code, inspector_name, detectable))
+
+                return violation_queue.set_lot(
+                    index, product_number, float(divided_time), float(inspection_time), members,
+                    rank=0 if _is_same_day_cleaning_index(index) else 1,
+                )
+
+            def _sync_histories(inspector_codes: Iterable[str]) -> None:
+                """違反キューの集計値を履歴へ書き戻す（対象検査員のみ）"""
+                for inspector_code in inspector_codes:
+                    hours = violation_queue.daily_hours.get(inspector_code, 0.0)
+                    self.inspector_daily_assignments[inspector_code] = {current_date: hours}
+                    self.inspector_work_hours[inspector_code] = hours
+                    self.inspector_product_hours[inspector_code] = dict(violation_queue.product_hours.get(inspector_code, {}))
+
+            def _apply_lot_change(index: int, recalc_divided_time: bool = False) -> None:
+                """是正・解除したロットを読み直し、関係する検査員だけ履歴とヒープを更新する"""
+                inspector_values = [
+                    result_df.at[index, f'検査員{i}'] if inspector_col_idxs[i - 1] != -1 else None
+                    for i in range(1, MAX_INSPECTORS_PER_LOT + 1)
+                ]
+                inspector_ids = [
+                    result_df.at[index, inspector_id_column(i)] if inspector_id_col_idxs[i - 1] != -1 else None
+                    for i in range(1, MAX_INSPECTORS_PER_LOT + 1)
+                ]
+                inspection_time = result_df.at[index, '検査時間'] if inspection_time_idx != -1 else None
+                if recalc_divided_time and inspection_time is not None and pd.notna(inspection_time) and inspection_time not in (-1, 0):
+                    # 【改善】分割検査時間を実際の検査員数で再計算
+                    actual_inspector_count = sum(
+                        1 for value in inspector_values
+                        if value is not None and pd.notna(value) and str(value).strip() != ''
+                    )
+                    if actual_inspector_count > 0:
+                        result_df.at[index, '分割検査時間'] = round(inspection_time / actual_inspector_count, 1)
+                affected_codes = _register_lot(
+                    index,
+                    result_df.at[index, '品番'],
+                    result_df.at[index, '現在工程名'] if process_name_idx != -1 else '',
+                    result_df.at[index, '分割検査時間'] if divided_time_idx != -1 else 0.0,
+                    inspection_time,
+                    inspector_values,
+                    inspector_ids,
+                )
+                _sync_histories(affected_codes)
+                violation_queue.refresh(affected_codes)
+
+            # 【高速化】違反キューを1回の走査で構築（以降はロット単位の差分更新のみ）
+            _t_perf_queue_build = perf_counter()
+            violation_queue = ViolationQueue(
+                inspector_max_hours,
+                WORK_HOURS_OVERRUN_RATE,
+                WORK_HOURS_BUFFER,
+                self.product_limit_hard_threshold,
+                _violation_tie_break,
+            )
+            for row_idx, row in enumerate(result_df.itertuples(index=False)):
+                _register_lot(
+                    result_df.index[row_idx],
+                    row[sorted_cols['品番']],
+                    row[process_name_idx] if process_name_idx != -1 else '',
+                    row[divided_time_idx] if divided_time_idx != -1 else 0.0,
+                    row[inspection_time_idx] if inspection_time_idx != -1 else None,
+                    [row[idx] if idx != -1 else None for idx in inspector_col_idxs],
+                    [row[idx] if idx != -1 else None for idx in inspector_id_col_idxs],
+                    record_protection=True,
+                )
+            self.inspector_daily_assignments = {}
+            self.inspector_work_hours = {}
+            self.inspector_product_hours = {}
+            _sync_histories(list(violation_queue.lots_by_inspector.keys()))
+            perf_logger.debug(
+                "PERF {}: {:.1f} ms",
+                "inspector_assignment.optimize.phase1.build_violation_queue",
+                (perf_counter() - _t_perf_queue_build) * 1000.0,
+            )
+
+            result_df_sorted = result_df
+            overworked_assignments: List[Tuple] = []
+            product_limit_violations: List[Tuple] = []
+            violations_found = False
+
             while iteration < max_iterations:
                 _t_perf_iter_total = perf_counter()
                 iteration += 1
+                self.phase_profiler.increment('iterations')
                 self.log_message(f"是正処理 イテレーション {iteration}")
                 
                 # 改善ポイント: タブーリストの更新（古いエントリを削除）
@@ -7722,98 +9377,17 @@ class InspectorAssignmentManager:
                 if removed_count > 0:
                     self.log_message(f"タブーリスト更新: {removed_count}件のエントリが期限切れで削除されました（残り: {len(self.tabu_list)}件）", debug=True)
                 
-                violations_found = False
-                overworked_assignments = []
-                product_limit_violations = []
-
-                # 出荷予定日の変換とソートは最初に一度だけ実施済み（出荷予定日は最適化中に変化しないため）
-                # 以降の処理は常に「出荷予定日順（最優先ルール）」を維持した result_df を前提とする。
-                result_df_sorted = result_df
-                
+                # 違反は違反キューの集計値から取得（result_dfの再走査は行わない）
                 _t_perf_iter_detect = perf_counter()
-                for row_idx, row in enumerate(result_df_sorted.itertuples(index=False)):
-                    index = result_df_sorted.index[row_idx]
-                    product_number = row[sorted_cols['品番']]
-                    process_name_context = row[process_name_idx] if process_name_idx != -1 else ''
-                    if pd.isna(process_name_context):
-                        process_name_context = ''
-                    process_name_context_str = str(process_name_context).strip()
-
-                    divided_time = row[divided_time_idx] if divided_time_idx != -1 else 0.0
-                    if divided_time == -1:
-                        divided_time = 0.0
-                    inspection_time = row[inspection_time_idx] if inspection_time_idx != -1 else divided_time
-                    if inspection_time == -1:
-                        inspection_time = divided_time
-                    
-                    # 各検査員の割り当てを確認
-                    for i, inspector_col_idx in enumerate(inspector_col_idxs, start=1):
-                        if inspector_col_idx == -1:
-                            continue
-                        inspector_name_raw = row[inspector_col_idx]
-                        if pd.notna(inspector_name_raw) and str(inspector_name_raw).strip() != '':
-                            inspector_name = str(inspector_name_raw).strip()
-                            if '(' in inspector_name:
-                                inspector_name = inspector_name.split('(')[0].strip()
-
-                            if not inspector_name:
-                                continue
-
-                            # 固定検査員が割当済みのロットは、勤務時間/同一品番上限の違反検出・是正対象から除外する
-                            if _is_fixed_inspector_for_lot_cached(product_number, process_name_context_str, inspector_name):
-                                # 【追加】保護の履歴追跡
-                                self.fixed_inspector_protection_metrics['total_protections'] += 1
-                                self.fixed_inspector_protection_metrics['protection_by_phase']['phase1_violation_detection'] = \
-                                    self.fixed_inspector_protection_metrics['protection_by_phase'].get('phase1_violation_detection', 0) + 1
-                                self.fixed_inspector_protection_metrics['protection_by_reason']['violation_detection_exclusion'] = \
-                                    self.fixed_inspector_protection_metrics['protection_by_reason'].get('violation_detection_exclusion', 0) + 1
-                                self.fixed_inspector_protection_metrics['protected_lots'].add(index)
-                                self.fixed_inspector_protection_metrics['protected_inspectors'].add(inspector_name)
-                                
-                                protection_history_entry = {
-                                    'lot_index': index,
-                                    'product_number': product_number,
-                                    'inspector_name': inspector_name,
-                                    'phase': 'phase1',
-                                    'reason': 'violation_detection_exclusion',
-                                    'process_name': process_name_context_str,
-                                }
-                                self.fixed_inspector_protection_metrics['protection_history'].append(protection_history_entry)
-                                if len(self.fixed_inspector_protection_metrics['protection_history']) > 100:
-                                    self.fixed_inspector_protection_metrics['protection_history'] = \
-                                        self.fixed_inspector_protection_metrics['protection_history'][-100:]
-                                continue
-
-                            # 検査員コードを取得（辞書 -> フォールバック）
-                            inspector_code = inspector_name_to_id.get(inspector_name)
-                            if inspector_code is None:
-                                inspector_info = self._get_inspector_by_name(inspector_name, inspector_master_df)
-                                if not inspector_info.empty:
-                                    inspector_code = inspector_info.iloc[0]['#ID']
-                                else:
-                                    continue
-                                     
-                                    # 現在の履歴を取得
-                                    daily_hours = self.inspector_daily_assignments.get(inspector_code, {}).get(current_date, 0.0)
-                                    max_hours = inspector_max_hours.get(inspector_code, 8.0)
-                                    product_hours = self.inspector_product_hours.get(inspector_code, {}).get(product_number, 0.0)
-                                    
-                                    # 【修正】勤務時間超過をチェック（超過まで許容）
-                                    # 超過を考慮した許容最大勤務時間を計算
-                                    allowed_max_hours = max_hours * (1.0 + WORK_HOURS_OVERRUN_RATE)
-                                    # 実際の勤務時間が超過を超えている場合のみ違反とする
-                                    if daily_hours > allowed_max_hours - WORK_HOURS_BUFFER:
-                                        excess = daily_hours - allowed_max_hours
-                                        overworked_assignments.append((index, inspector_code, inspector_name, excess, divided_time, product_number, inspection_time, i))
-                                        violations_found = True
-                                        self.log_message(f"⚠️ 勤務時間超過: 検査員 '{inspector_name}' (コード: {inspector_code}) {daily_hours:.1f}h > {allowed_max_hours:.1f}h - {WORK_HOURS_BUFFER:.2f}h (超過: {excess:.1f}h, 品番: {product_number}, ロットインデックス: {index})", level='warning')
-                                    
-                                    # 改善ポイント: 最適化フェーズでの設定時間上限チェック（厳格）
-                                    if product_hours > self.product_limit_hard_threshold:
-                                        excess = product_hours - self.product_limit_hard_threshold
-                                        product_limit_violations.append((index, inspector_code, inspector_name, excess, divided_time, product_number, inspection_time, i))
-                                        violations_found = True
-                                        self.log_message(f"⚠️ 同一品番{self.product_limit_hard_threshold:.1f}時間超過: 検査員 '{inspector_name}' (コード: {inspector_code}) 品番 {product_number} {product_hours:.1f}h > {self.product_limit_hard_threshold:.1f}h (超過: {excess:.1f}h, ロットインデックス: {index})", level='warning')
+                overworked_assignments, product_limit_violations = violation_queue.violations()
+                violations_found = bool(overworked_assignments or product_limit_violations)
+                for index, inspector_code, inspector_name, excess, _, product_number, _, _ in overworked_assignments:
+                    daily_hours = violation_queue.daily_hours.get(inspector_code, 0.0)
+                    allowed_max_hours = violation_queue.allowed_max_hours(inspector_code)
+                    self.log_message(f"⚠️ 勤務時間超過: 検査員 '{inspector_name}' (コード: {inspector_code}) {daily_hours:.1f}h > {allowed_max_hours:.1f}h - {WORK_HOURS_BUFFER:.2f}h (超過: {excess:.1f}h, 品番: {product_number}, ロットインデックス: {index})", level='warning')
+                for index, inspector_code, inspector_name, excess, _, product_number, _, _ in product_limit_violations:
+                    product_hours = violation_queue.product_hours.get(inspector_code, {}).get(product_number, 0.0)
+                    self.log_message(f"⚠️ 同一品番{self.product_limit_hard_threshold:.1f}時間超過: 検査員 '{inspector_name}' (コード: {inspector_code}) 品番 {product_number} {product_hours:.1f}h > {self.product_limit_hard_threshold:.1f}h (超過: {excess:.1f}h, ロットインデックス: {index})", level='warning')
                 perf_logger.debug(
                     "PERF {}: {:.1f} ms",
                     f"inspector_assignment.optimize.phase1.iter{iteration}.detect_violations",
@@ -7822,6 +9396,9 @@ class InspectorAssignmentManager:
                 
                 # 【追加】違反件数を記録
                 current_violation_count = len(overworked_assignments) + len(product_limit_violations)
+                self.phase_profiler.gauge('violations_remaining', current_violation_count)
+                if iteration == 1:
+                    self.phase_profiler.gauge('violations_detected', current_violation_count)
                 phase1_metrics['iterations'].append(iteration)
                 phase1_metrics['violation_counts'].append(current_violation_count)
                 phase1_metrics['overworked_counts'].append(len(overworked_assignments))
@@ -7844,7 +9421,6 @@ class InspectorAssignmentManager:
                                     overworked_assignments, product_limit_violations,
                                     result_df_sorted, inspector_master_df, inspector_max_hours
                                 )
-                            result_df = result_df_sorted
                             break
                     else:
                         convergence_stable_iterations = 0
@@ -7856,7 +9432,6 @@ class InspectorAssignmentManager:
                     phase1_metrics['convergence_reason'] = 'no_violations'
                     phase1_metrics['resolved_counts'].append(current_violation_count)
                     self.log_message(f"全てのルール違反が解消されました（{iteration}回目のイテレーションで完了）")
-                    result_df = result_df_sorted
                     perf_logger.debug(
                         "PERF {}: {:.1f} ms",
                         f"inspector_assignment.optimize.phase1.iter{iteration}.total",
@@ -7864,101 +9439,32 @@ class InspectorAssignmentManager:
                     )
                     break
                 
-                # 違反を是正（当日洗浄上がり品を優先）
-                all_violations = overworked_assignments + product_limit_violations
-                # 重複を除去（同じロットの複数の違反を1つにまとめる）
-                unique_violations = {}
-                for violation in all_violations:
-                    index = violation[0]
-                    if index not in unique_violations:
-                        unique_violations[index] = violation
-                    else:
-                        # 既存の違反より新しい違反の方が重要度が高い場合は置き換え
-                        existing = unique_violations[index]
-                        if violation[3] > existing[3]:  # excess値が大きい方
-                            unique_violations[index] = violation
-                
-                # 【改善】当日洗浄上がり品の違反を分離
-                same_day_cleaning_violations = []
-                other_violations = []
-                
-                for violation in unique_violations.values():
-                    violation_index = violation[0]
-                    if violation_index < len(result_df_sorted):
-                        shipping_date_raw = result_df_sorted.at[violation_index, '出荷予定日']
-                        shipping_date_str = str(shipping_date_raw).strip() if pd.notna(shipping_date_raw) else ''
-                        is_same_day_cleaning = (
-                            shipping_date_str == "当日洗浄上がり品" or
-                            shipping_date_str == "当日洗浄品" or
-                            "当日洗浄" in shipping_date_str
-                        )
-                        
-                        if is_same_day_cleaning:
-                            same_day_cleaning_violations.append(violation)
-                        else:
-                            other_violations.append(violation)
-                    else:
-                        other_violations.append(violation)
-                
-                def violation_priority(violation):
-                    """違反の優先順位を計算（ソート用）"""
-                    try:
-                        violation_index = violation[0]
-                        if violation_index < len(result_df_sorted):
-                            violation_date = violation_date_cache.get(violation_index)
-                            if violation_date is None:
-                                shipping_date_raw = result_df_sorted.at[violation_index, '出荷予定日']
-                                if pd.notna(shipping_date_raw):
-                                    if isinstance(shipping_date_raw, pd.Timestamp):
-                                        violation_date = shipping_date_raw.date()
-                                    elif isinstance(shipping_date_raw, str):
-                                        parsed = pd.to_datetime(shipping_date_raw, errors='coerce')
-                                        violation_date = parsed.date() if pd.notna(parsed) else pd.Timestamp.max.date()
-                                    else:
-                                        try:
-                                            violation_date = shipping_date_raw.date() if hasattr(shipping_date_raw, 'date') else shipping_date_raw
-                                        except Exception:
-                                            violation_date = pd.Timestamp.max.date()
-                                else:
-                                    violation_date = pd.Timestamp.max.date()
-                                violation_date_cache[violation_index] = violation_date
-                        else:
-                            violation_date = pd.Timestamp.min.date()
-                        inspector_code = violation[1]
-                        product_number = violation[5]
-                        relaxed_flag = (inspector_code, product_number) in self.relaxed_product_limit_assignments
-                        return (0 if relaxed_flag else 1, violation_date, violation_index)
-                    except Exception as e:
-                        # エラー発生時は優先度を最低にしてソートを継続
-                        self.log_message(f"violation_priority計算エラー: {str(e)} (ロットインデックス: {violation[0]})", level='warning')
-                        return (2, pd.Timestamp.max.date(), violation[0])
-                
-                # 当日洗浄上がり品の違反を優先的に処理
-                same_day_cleaning_violations_sorted = sorted(same_day_cleaning_violations, key=violation_priority)
-                other_violations_sorted = sorted(other_violations, key=violation_priority)
-                violations_to_fix = same_day_cleaning_violations_sorted + other_violations_sorted
-                
-                if same_day_cleaning_violations:
-                    self.log_message(f"当日洗浄上がり品の違反 {len(same_day_cleaning_violations)}件を優先的に処理します", level='info')
-
-                try:
-                    sorted_violations = violations_to_fix
-                except Exception as e:
-                    # ソートエラーが発生した場合は、インデックス順でソート
-                    self.log_message(f"違反のソート中にエラーが発生しました: {str(e)}。インデックス順で処理します。", level='warning')
-                    sorted_violations = sorted(unique_violations.values(), key=lambda v: v[0])
-                
-                self.log_message(f"違反ロット数: {len(sorted_violations)}件を是正します")
+                # 違反を是正（当日洗浄上がり品を優先し、超過時間の大きい順に取り出す）
+                violation_lot_indices = {v[0] for v in overworked_assignments} | {v[0] for v in product_limit_violations}
+                same_day_cleaning_lot_count = sum(
+                    1 for violation_index in violation_lot_indices
+                    if violation_queue.lots[violation_index].rank == 0
+                )
+                if same_day_cleaning_lot_count:
+                    self.log_message(f"当日洗浄上がり品の違反 {same_day_cleaning_lot_count}件を優先的に処理します", level='info')
+                self.log_message(f"違反ロット数: {len(violation_lot_indices)}件を是正します")
+                violation_queue.seed()
                 
-                # 各違反を是正
+                # 各違反を是正（是正のたびに関係する検査員の違反だけをヒープへ積み直す）
                 _t_perf_iter_fix = perf_counter()
                 fixed_any = False
                 fixed_indices = set()
-                for violation in sorted_violations:
+                attempted_indices = set()
+                unresolved_violations = []
+                while True:
+                    violation = violation_queue.pop()
+                    if violation is None:
+                        break
                     index, inspector_code, inspector_name, excess, divided_time, product_number, inspection_time, inspector_col_num = violation
-                    # 既に是正済みのロットはスキップ
-                    if index in fixed_indices:
+                    # 既に是正済み・是正を試みたロットはスキップ（同じロットの違反は1件にまとめる）
+                    if index in fixed_indices or index in attempted_indices:
                         continue
+                    attempted_indices.add(index)
                     
                     # 改善ポイント: フェーズ間スラッシング防止 - タブーリストに含まれるロットはスキップ
                     if index in self.tabu_list:
@@ -7966,6 +9472,10 @@ class InspectorAssignmentManager:
                         self.tabu_list_metrics['total_skips'] += 1
                         continue
 
+                    # ウォームスタートで引き継いだロットは動かさない（固定検査員の保護件数には数えない）
+                    if self._is_warm_start_locked_lot(result_df_sorted, index):
+                        continue
+
                     # 登録済み品番の先行検査×固定検査員ロットは最適化フェーズで動かさない（固定維持）
                     if self._is_locked_fixed_preinspection_lot(result_df_sorted, index):
                         # 【追加】保護の履歴追跡
@@ -7976,23 +9486,21 @@ class InspectorAssignmentManager:
                             self.fixed_inspector_protection_metrics['protection_by_reason'].get('reassignment_skip', 0) + 1
                         self.fixed_inspector_protection_metrics['protected_lots'].add(index)
                         
-                        # 固定検査員名を取得
+                        # 固定検査員名を取得（ロットの検査員列を一括判定）
                         fixed_inspector_name = None
-                        for i in range(1, MAX_INSPECTORS_PER_LOT + 1):
-                            inspector_col = f'検査員{i}'
-                            if inspector_col in result_df_sorted.columns:
-                                inspector_value = result_df_sorted.at[index, inspector_col]
-                                if pd.notna(inspector_value) and str(inspector_value).strip() != '':
-                                    inspector_name = str(inspector_value).strip()
-                                    if '(' in inspector_name:
-                                        inspector_name = inspector_name.split('(')[0].strip()
-                                    if inspector_name:
-                                        product_number = result_df_sorted.at[index, '品番']
-                                        process_name = result_df_sorted.at[index, '現在工程名'] if '現在工程名' in result_df_sorted.columns else ''
-                                        if self._is_fixed_inspector_for_lot(product_number, process_name, inspector_name):
-                                            fixed_inspector_name = inspector_name
-                                            self.fixed_inspector_protection_metrics['protected_inspectors'].add(inspector_name)
-                                            break
+                        slot_names = [
+                            str(result_df_sorted.at[index, f'検査員{i}']).split('(')[0].strip()
+                            for i in range(1, MAX_INSPECTORS_PER_LOT + 1)
+                            if f'検査員{i}' in result_df_sorted.columns and pd.notna(result_df_sorted.at[index, f'検査員{i}'])
+                        ]
+                        fixed_mask = self._fixed_inspector_mask(
+                            result_df_sorted.at[index, '品番'],
+                            result_df_sorted.at[index, '現在工程名'] if '現在工程名' in result_df_sorted.columns else '',
+                            slot_names,
+                        )
+                        if fixed_mask.any():
+                            fixed_inspector_name = slot_names[int(np.argmax(fixed_mask))]
+                            self.fixed_inspector_protection_metrics['protected_inspectors'].add(fixed_inspector_name)
                         
                         protection_history_entry = {
                             'lot_index': index,
@@ -8003,9 +9511,6 @@ class InspectorAssignmentManager:
                             'process_name': str(result_df_sorted.at[index, '現在工程名']).strip() if '現在工程名' in result_df_sorted.columns else '',
                         }
                         self.fixed_inspector_protection_metrics['protection_history'].append(protection_history_entry)
-                        if len(self.fixed_inspector_protection_metrics['protection_history']) > 100:
-                            self.fixed_inspector_protection_metrics['protection_history'] = \
-                                self.fixed_inspector_protection_metrics['protection_history'][-100:]
                         continue
                     
                     # 改善ポイント: 新規品（出荷予定日指定日数以内）は保護対象として移動対象外にする
@@ -8033,9 +9538,6 @@ class InspectorAssignmentManager:
                             'protection_days': NEW_PRODUCT_PROTECTION_DAYS,
                         }
                         self.new_product_protection_metrics['protection_history'].append(protection_history_entry)
-                        if len(self.new_product_protection_metrics['protection_history']) > 100:
-                            self.new_product_protection_metrics['protection_history'] = \
-                                self.new_product_protection_metrics['protection_history'][-100:]
                         
                         self.log_message(
                             f"⚠️ 新規品（出荷予定日{NEW_PRODUCT_PROTECTION_DAYS}日以内）のため保護: "
@@ -8066,6 +9568,9 @@ class InspectorAssignmentManager:
                         self.tabu_list[index] = TABU_LIST_MAX_ITERATIONS
                         self.tabu_list_metrics['total_additions'] += 1
                         self.log_message(f"✅ 違反是正成功: ロットインデックス {index} (タブーリストに追加)")
+                        _apply_lot_change(index)
+                    else:
+                        unresolved_violations.append(violation)
                 
                 # 【追加】最初の是正処理での解決件数を記録
                 if fixed_any:
@@ -8073,51 +9578,24 @@ class InspectorAssignmentManager:
                 else:
                     phase1_metrics['resolved_counts'].append(0)
                 
-                if not fixed_any and len(sorted_violations) > 0:
+                if not fixed_any and len(unresolved_violations) > 0:
                     # 是正できなかった違反がある場合は、出荷予定日が古いロットを優先的に再割り当てを試みる
-                    unresolved_violations = [v for v in sorted_violations if v[0] not in fixed_indices]
+                    re_resolved_count = 0
                     if unresolved_violations:
                         self.log_message(f"⚠️ 是正できなかった違反が {len(unresolved_violations)}件あります", level='warning')
                         
                         # 出荷予定日が古いロットを優先的に再割り当てを試みる
                         violations_with_date = []
-                        for violation in unresolved_violations:
-                            index = violation[0]
-                            if index < len(result_df_sorted):
-                                shipping_date_raw = result_df_sorted.at[index, '出荷予定日']
-                                if pd.notna(shipping_date_raw):
-                                    # pd.Timestampをdatetime.dateに変換して比較エラーを防ぐ
-                                    if isinstance(shipping_date_raw, pd.Timestamp):
-                                        shipping_date = shipping_date_raw.date()
-                                    elif isinstance(shipping_date_raw, str):
-                                        shipping_date_str = str(shipping_date_raw).strip()
-                                        # 「当日洗浄上がり品」「先行検査」などの文字列の場合は最優先として扱う
-                                        if (shipping_date_str == "当日洗浄上がり品" or
-                                            shipping_date_str == "当日洗浄品" or
-                                            "当日洗浄" in shipping_date_str or
-                                            shipping_date_str == "先行検査" or
-                                            shipping_date_str == "当日先行検査"):
-                                            shipping_date = pd.Timestamp.min.date()  # 最優先として扱う
-                                        else:
-                                            # 日付文字列の場合は変換を試みる
-                                            try:
-                                                shipping_date_parsed = pd.to_datetime(shipping_date_raw, errors='coerce')
-                                                if pd.notna(shipping_date_parsed):
-                                                    shipping_date = shipping_date_parsed.date()
-                                                else:
-                                                    shipping_date = pd.Timestamp.max.date()
-                                            except Exception as e:
-                                                logger.debug(f"出荷日の変換でエラーが発生しました（デフォルト値を使用）: {e}")
-                                                shipping_date = pd.Timestamp.max.date()
-                                    else:
-                                        # その他の型（datetime.date等）の場合はそのまま使用
-                                        try:
-                                            shipping_date = shipping_date_raw.date() if hasattr(shipping_date_raw, 'date') else shipping_date_raw
-                                        except Exception as e:
-                                            logger.debug(f"出荷日の変換でエラーが発生しました（デフォルト値を使用）: {e}")
-                                            shipping_date = pd.Timestamp.max.date()
+                        for violation in unresolved_violations:
+                            index = violation[0]
+                            if index < len(result_df_sorted):
+                                shipping_date_raw = result_df_sorted.at[index, '出荷予定日']
+                                # 【高速化】出荷予定日の解析結果は実行ごとのキャッシュから参照（当日洗浄・先行検査は最優先）
+                                shipping_info = self._shipping_date_info(shipping_date_raw)
+                                if shipping_info.is_same_day_label:
+                                    shipping_date = pd.Timestamp.min.date()
                                 else:
-                                    shipping_date = pd.Timestamp.max.date()
+                                    shipping_date = shipping_info.parsed_date or pd.Timestamp.max.date()
                             else:
                                 shipping_date = pd.Timestamp.max.date()
                             violations_with_date.append((violation, shipping_date))
@@ -8146,109 +9624,25 @@ class InspectorAssignmentManager:
                                 # 再是正できなかった場合は未割当にする
                                 self.clear_assignment(result_df_sorted, index)
                                 self.log_message(f"⚠️ ロットインデックス {index} (品番: {product_number}) を未割当にしました")
+                            # 【改善】分割検査時間を実際の検査員数で再計算し、関係する検査員だけ履歴を更新
+                            _apply_lot_change(index, recalc_divided_time=True)
                         
                         self.log_message(f"再是正結果: {re_resolved_count}件是正、{len(unresolved_violations) - re_resolved_count}件未割当")
                     
                     # 【追加】解決件数を記録
                     total_resolved = len(fixed_indices) + re_resolved_count
                     phase1_metrics['resolved_counts'].append(total_resolved)
-                    
-                    result_df = result_df_sorted
-                    # 【改善】分割検査時間を実際の検査員数で再計算（是正できなかった違反の処理後）
-                    sorted_cols_recalc_pre = {col: idx for idx, col in enumerate(result_df_sorted.columns)}
-                    for row_idx, row in enumerate(result_df_sorted.itertuples(index=False)):
-                        index = result_df_sorted.index[row_idx]
-                        inspection_time = row[sorted_cols_recalc_pre.get('検査時間', -1)] if '検査時間' in sorted_cols_recalc_pre else 0.0
-                        if inspection_time == -1 or inspection_time == 0:
-                            continue
-                        
-                        # 実際に割り当てられた検査員数をカウント
-                        actual_inspector_count = 0
-                        for i in range(1, MAX_INSPECTORS_PER_LOT + 1):
-                            inspector_col = f'検査員{i}'
-                            inspector_col_idx = sorted_cols_recalc_pre.get(inspector_col, -1)
-                            if inspector_col_idx != -1:
-                                inspector_name = row[inspector_col_idx]
-                                if pd.notna(inspector_name) and str(inspector_name).strip() != '':
-                                    actual_inspector_count += 1
-                        
-                        # 分割検査時間を再計算: 検査時間 ÷ 実際の分割した検査人数
-                        if actual_inspector_count > 0:
-                            actual_divided_time = inspection_time / actual_inspector_count
-                            result_df_sorted.at[index, '分割検査時間'] = round(actual_divided_time, 1)
-                    # 履歴再計算は、イテレーションの最後に1回だけ実行する（重複を避ける）
-                    # continue は削除し、履歴再計算をイテレーションの最後に統合
 
                 perf_logger.debug(
                     "PERF {}: {:.1f} ms",
                     f"inspector_assignment.optimize.phase1.iter{iteration}.fix_violations",
                     (perf_counter() - _t_perf_iter_fix) * 1000.0,
                 )
-                
-                # 【改善】履歴を再計算（是正後の状態を反映）- 是正できなかった違反の処理後も含めて1回だけ実行
-                _t_perf_iter_rebuild = perf_counter()
-                self.inspector_daily_assignments = {}
-                self.inspector_work_hours = {}
-                self.inspector_product_hours = {}
-                
-                sorted_cols_recalc2 = {col: idx for idx, col in enumerate(result_df_sorted.columns)}
-                for row_idx, row in enumerate(result_df_sorted.itertuples(index=False)):
-                    index = result_df_sorted.index[row_idx]
-                    product_number = row[sorted_cols_recalc2['品番']]
-                    divided_time = row[sorted_cols_recalc2.get('分割検査時間', -1)] if '分割検査時間' in sorted_cols_recalc2 else 0.0
-                    if divided_time == -1:
-                        divided_time = 0.0
-                    inspection_time = row[sorted_cols_recalc2.get('検査時間', -1)] if '検査時間' in sorted_cols_recalc2 else divided_time
-                    if inspection_time == -1:
-                        inspection_time = divided_time
-                    
-                    for i in range(1, MAX_INSPECTORS_PER_LOT + 1):
-                        inspector_col = f'検査員{i}'
-                        inspector_col_idx = sorted_cols_recalc2.get(inspector_col, -1)
-                        if inspector_col_idx != -1:
-                            inspector_name_raw = row[inspector_col_idx]
-                            if pd.notna(inspector_name_raw) and str(inspector_name_raw).strip() != '':
-                                inspector_name = str(inspector_name_raw).strip()
-                                if '(' in inspector_name:
-                                    inspector_name = inspector_name.split('(')[0].strip()
-                                if not inspector_name:
-                                    continue
-
-                                inspector_code = inspector_name_to_id.get(inspector_name)
-                                if inspector_code is None:
-                                    inspector_info = self._get_inspector_by_name(inspector_name, inspector_master_df)
-                                    if not inspector_info.empty:
-                                        inspector_code = inspector_info.iloc[0]['#ID']
-                                    else:
-                                        continue
-                                    
-                                    if inspector_code not in self.inspector_daily_assignments:
-                                        self.inspector_daily_assignments[inspector_code] = {}
-                                    if current_date not in self.inspector_daily_assignments[inspector_code]:
-                                        self.inspector_daily_assignments[inspector_code][current_date] = 0.0
-                                    if inspector_code not in self.inspector_work_hours:
-                                        self.inspector_work_hours[inspector_code] = 0.0
-                                    if inspector_code not in self.inspector_product_hours:
-                                        self.inspector_product_hours[inspector_code] = {}
-                                    if product_number not in self.inspector_product_hours[inspector_code]:
-                                        self.inspector_product_hours[inspector_code][product_number] = 0.0
-                                    
-                                    self.inspector_daily_assignments[inspector_code][current_date] += divided_time
-                                    self.inspector_work_hours[inspector_code] += divided_time
-                                    self.inspector_product_hours[inspector_code][product_number] += divided_time
-                
-                result_df = result_df_sorted
-                perf_logger.debug(
-                    "PERF {}: {:.1f} ms",
-                    f"inspector_assignment.optimize.phase1.iter{iteration}.rebuild_histories",
-                    (perf_counter() - _t_perf_iter_rebuild) * 1000.0,
-                )
                 perf_logger.debug(
                     "PERF {}: {:.1f} ms",
                     f"inspector_assignment.optimize.phase1.iter{iteration}.total",
                     (perf_counter() - _t_perf_iter_total) * 1000.0,
                 )
-
             # 【追加】最大繰り返し回数に達した場合の処理
             if iteration >= max_iterations:
                 phase1_metrics['convergence_reason'] = 'max_iterations'
@@ -8337,7 +9731,7 @@ class InspectorAssignmentManager:
                     f"違反タイプ別={dict(self.new_product_protection_metrics['protection_by_violation_type'])}, "
                     f"フェーズ別={dict(self.new_product_protection_metrics['protection_by_phase'])}, "
                     f"保護ロット数={len(self.new_product_protection_metrics['protected_lots'])}, "
-                    f"保護履歴件数={len(self.new_product_protection_metrics['protection_history'])}",
+                    f"保護履歴件数={self.new_product_protection_metrics['protection_history'].total}",
                     debug=True,
                 )
                 if self.new_product_protection_metrics['protection_history']:
@@ -8356,7 +9750,7 @@ class InspectorAssignmentManager:
                     f"保護理由別={dict(self.fixed_inspector_protection_metrics['protection_by_reason'])}, "
                     f"保護ロット数={len(self.fixed_inspector_protection_metrics['protected_lots'])}, "
                     f"保護検査員数={len(self.fixed_inspector_protection_metrics['protected_inspectors'])}, "
-                    f"保護履歴件数={len(self.fixed_inspector_protection_metrics['protection_history'])}",
+                    f"保護履歴件数={self.fixed_inspector_protection_metrics['protection_history'].total}",
                     debug=True,
                 )
                 if self.fixed_inspector_protection_metrics['protection_history']:
@@ -8374,6 +9768,7 @@ class InspectorAssignmentManager:
             
             # フェーズ1.5: 最終違反チェック（是正が完全に機能したか確認）
             self.log_message("全体最適化フェーズ1.5: 最終違反チェックを開始")
+            self.phase_profiler.start_phase('1.5')
             
             # 最終的な履歴を再計算
             self.inspector_daily_assignments = {}
@@ -8396,13 +9791,19 @@ class InspectorAssignmentManager:
                     if inspector_col_idx != -1:
                         inspector_name_raw = row[inspector_col_idx]
                         if pd.notna(inspector_name_raw) and str(inspector_name_raw).strip() != '':
-                            inspector_name = str(inspector_name_raw).strip()
-                            if '(' in inspector_name:
-                                inspector_name = inspector_name.split('(')[0].strip()
+                            slot_inspector = self._slot_inspector(inspector_name_raw, row[final_cols[inspector_id_column(i)]] if inspector_id_column(i) in final_cols else None)
+                            if slot_inspector is not None:
+                                inspector_code, inspector_name = slot_inspector
+                            else:
+                                inspector_code = None
+                                inspector_name = str(inspector_name_raw).strip()
+                                if '(' in inspector_name:
+                                    inspector_name = inspector_name.split('(')[0].strip()
                             if not inspector_name:
                                 continue
 
-                            inspector_code = inspector_name_to_id.get(inspector_name)
+                            if inspector_code is None:
+                                inspector_code = inspector_name_to_id.get(inspector_name)
                             if inspector_code is None:
                                 inspector_info = self._get_inspector_by_name(inspector_name, inspector_master_df)
                                 if not inspector_info.empty:
@@ -8446,9 +9847,14 @@ class InspectorAssignmentManager:
                     if inspector_col_idx != -1:
                         inspector_name_raw = row[inspector_col_idx]
                         if pd.notna(inspector_name_raw) and str(inspector_name_raw).strip() != '':
-                            inspector_name = str(inspector_name_raw).strip()
-                            if '(' in inspector_name:
-                                inspector_name = inspector_name.split('(')[0].strip()
+                            slot_inspector = self._slot_inspector(inspector_name_raw, row[final_cols[inspector_id_column(i)]] if inspector_id_column(i) in final_cols else None)
+                            if slot_inspector is not None:
+                                inspector_code, inspector_name = slot_inspector
+                            else:
+                                inspector_code = None
+                                inspector_name = str(inspector_name_raw).strip()
+                                if '(' in inspector_name:
+                                    inspector_name = inspector_name.split('(')[0].strip()
                             if not inspector_name:
                                 continue
 
@@ -8472,12 +9878,10 @@ class InspectorAssignmentManager:
                                     'process_name': str(process_name_context).strip(),
                                 }
                                 self.fixed_inspector_protection_metrics['protection_history'].append(protection_history_entry)
-                                if len(self.fixed_inspector_protection_metrics['protection_history']) > 100:
-                                    self.fixed_inspector_protection_metrics['protection_history'] = \
-                                        self.fixed_inspector_protection_metrics['protection_history'][-100:]
                                 continue
                             
-                            inspector_code = inspector_name_to_id.get(inspector_name)
+                            if inspector_code is None:
+                                inspector_code = inspector_name_to_id.get(inspector_name)
                             if inspector_code is None:
                                 inspector_info = self._get_inspector_by_name(inspector_name, inspector_master_df)
                                 if not inspector_info.empty:
@@ -8537,12 +9941,8 @@ class InspectorAssignmentManager:
                     product_number = row_series['品番'] if '品番' in row_series.index else ''
                     
                     # 出荷予定日が「当日洗浄上がり品」の場合は文字列として保持
-                    shipping_date_str = str(shipping_date_raw).strip() if pd.notna(shipping_date_raw) else ''
-                    is_same_day_cleaning = (
-                        shipping_date_str == "当日洗浄上がり品" or
-                        shipping_date_str == "当日洗浄品" or
-                        "当日洗浄" in shipping_date_str
-                    )
+                    shipping_info = self._shipping_date_info(shipping_date_raw)
+                    is_same_day_cleaning = shipping_info.kind == LOT_KIND_SAME_DAY_CLEANING
                     
                     if is_same_day_cleaning:
                         # 当日洗浄品の場合は文字列として保持
@@ -8551,22 +9951,13 @@ class InspectorAssignmentManager:
                         shipping_date = shipping_date_raw
                     
                     # 新製品かどうかを判定
-                    skill_rows = skill_master_df[skill_master_df.iloc[:, 0] == product_number]
-                    is_new_product = skill_rows.empty
+                    is_new_product = not self._is_registered_in_skill_master(product_number, skill_master_df)
                     
                     # 2週間以内の出荷予定日かどうかを判定（当日洗浄品の場合はスキップ）
                     is_within_two_weeks = False
                     if not is_same_day_cleaning and pd.notna(shipping_date):
                         try:
-                            if isinstance(shipping_date, pd.Timestamp):
-                                shipping_date_date = shipping_date.date()
-                            elif isinstance(shipping_date, str):
-                                shipping_date_date = pd.to_datetime(shipping_date, errors='coerce').date()
-                                if pd.isna(shipping_date_date):
-                                    shipping_date_date = None
-                            else:
-                                shipping_date_date = shipping_date.date() if hasattr(shipping_date, 'date') else shipping_date
-                            
+                            shipping_date_date = shipping_info.parsed_date
                             if shipping_date_date is not None:
                                 two_weeks_later = current_date + timedelta(days=14)
                                 is_within_two_weeks = shipping_date_date <= two_weeks_later
@@ -8668,7 +10059,7 @@ class InspectorAssignmentManager:
                                 result_df.at[index, '分割検査時間'] = round(actual_divided_time, 1)
                                 for i, inspector in enumerate(assigned_inspectors, 1):
                                     if i <= MAX_INSPECTORS_PER_LOT:
-                                        result_df.at[index, f'検査員{i}'] = inspector.get('氏名', '')
+                                        self._set_inspector_slot(result_df, index, i, inspector.get('氏名', ''), inspector.get('コード'))
                                 result_df.at[index, 'チーム情報'] = f"新製品チーム({len(assigned_inspectors)}人)"
                                 result_df.at[index, 'assignability_status'] = 'assigned'
                                 resolved_count += 1
@@ -8713,17 +10104,10 @@ class InspectorAssignmentManager:
                         original_shipping_date = row_series.get('出荷予定日', '') if '出荷予定日' in row_series.index else ''
                         original_shipping_date_str = str(original_shipping_date).strip() if pd.notna(original_shipping_date) else ''
                         
+                        original_shipping_info = self._shipping_date_info(original_shipping_date)
                         is_same_day_cleaning = (
-                            shipping_date_str == "当日洗浄上がり品" or 
-                            shipping_date_str == "当日洗浄品" or
-                            "当日洗浄" in shipping_date_str or
-                            shipping_date_str == "先行検査" or
-                            shipping_date_str == "当日先行検査" or
-                            original_shipping_date_str == "当日洗浄上がり品" or 
-                            original_shipping_date_str == "当日洗浄品" or
-                            "当日洗浄" in original_shipping_date_str or
-                            original_shipping_date_str == "先行検査" or
-                            original_shipping_date_str == "当日先行検査"
+                            self._shipping_date_info(shipping_date).is_same_day_label
+                            or original_shipping_info.is_same_day_label
                         )
                         is_preinspection = (
                             shipping_date_str == "先行検査"
@@ -8733,13 +10117,10 @@ class InspectorAssignmentManager:
                         )
                         if is_same_day_cleaning:
                             shipping_date_val = original_shipping_date
-                            shipping_date_dt = pd.to_datetime(shipping_date_val, errors='coerce')
-                            is_today_or_past = False
-                            try:
-                                if pd.notna(shipping_date_dt):
-                                    is_today_or_past = shipping_date_dt.normalize().date() <= current_date
-                            except Exception:
-                                is_today_or_past = False
+                            original_shipping_date_date = original_shipping_info.parsed_date
+                            is_today_or_past = (
+                                original_shipping_date_date is not None and original_shipping_date_date <= current_date
+                            )
                             is_priority_keep = (
                                 self._is_same_day_cleaning_label(shipping_date_val)
                                 or self._is_preinspection_label(shipping_date_val)
@@ -8883,6 +10264,7 @@ class InspectorAssignmentManager:
             except Exception as e:
                 self.log_message(f"偏り是正前の履歴再構築でエラーが発生しました: {e}", level='warning')
             self.log_message("全体最適化フェーズ2: 偏りの是正を開始")
+            self.phase_profiler.start_phase('2')
             _t_perf_phase2_total = perf_counter()
             
             # 平均勤務時間を計算
@@ -8983,17 +10365,14 @@ class InspectorAssignmentManager:
                         def sort_key(val):
                             if pd.isna(val):
                                 return (5, None)  # 最後に
-                            val_str = str(val).strip()
+                            info = self._shipping_date_info(val)
+                            val_str = info.text
+                            date_val = info.parsed
+                            has_date = date_val is not None and pd.notna(date_val)
                             
                             # 1. 当日の日付（優先度0）
-                            try:
-                                date_val = pd.to_datetime(val, errors='coerce')
-                                if pd.notna(date_val):
-                                    date_date = date_val.date()
-                                    if date_date == current_date:
-                                        return (0, date_val)
-                            except:
-                                pass
+                            if has_date and date_val.date() == current_date:
+                                return (0, date_val)
                             
                             # 2. 先行検査品（優先度1）
                             if (val_str == "先行検査" or
@@ -9007,22 +10386,12 @@ class InspectorAssignmentManager:
                                 return (2, val_str)
                             
                             # 4. 翌日または翌営業日（優先度3）
-                            try:
-                                date_val = pd.to_datetime(val, errors='coerce')
-                                if pd.notna(date_val):
-                                    date_date = date_val.date()
-                                    if date_date == next_business_day:
-                                        return (3, date_val)
-                            except:
-                                pass
+                            if has_date and date_val.date() == next_business_day:
+                                return (3, date_val)
                             
                             # 5. それ以降の日付（優先度4）
-                            try:
-                                date_val = pd.to_datetime(val, errors='coerce')
-                                if pd.notna(date_val):
-                                    return (4, date_val)
-                            except:
-                                pass
+                            if has_date:
+                                return (4, date_val)
                             
                             return (5, val_str)  # その他文字列
                         
@@ -9090,6 +10459,11 @@ class InspectorAssignmentManager:
                             self._overrun_inspector_history.clear()
                         
                         for pass_num in range(max_passes):
+                            # 【追加】時間予算の超過・中止要求: 残りのパスを打ち切る（直後のフェーズ2.5で検証）
+                            if pass_num > 0 and self._optimization_budget.should_stop():
+                                self.log_message(f"時間予算の超過または中止要求のため偏り是正をパス{pass_num}で打ち切ります", level='warning')
+                                break
+                            self.phase_profiler.increment('iterations')
                             # 【追加】各パスの開始時に、inspector_daily_assignmentsを再計算して正確な勤務時間を反映
                             # 偏り是正の段階で、複数の再割当が連続して発生すると、累積的に超過が発生する可能性があるため
                             if pass_num > 0:  # 最初のパス以外は再計算
@@ -9273,6 +10647,9 @@ class InspectorAssignmentManager:
                         for overloaded_code, overloaded_hours in over_loaded_pass:
                             if reassignment_count >= max_reassignments_per_pass:
                                 break
+                            # 【追加】時間予算の超過・中止要求: このパスの残りの再割当を打ち切る
+                            if self._optimization_budget.should_stop():
+                                break
                             
                             # この検査員が割り当てられているロットを取得（出荷予定日順、FIFO維持）
                             # result_df_sortedは既に出荷予定日の古い順にソートされているため、
@@ -9288,6 +10665,9 @@ class InspectorAssignmentManager:
                             # 出荷予定日の古い順（FIFO）で処理
                             for row_tuple in result_df_sorted.itertuples(index=True):
                                 index = row_tuple[0]  # インデックス
+                                # ウォームスタートで引き継いだロットは再割当ての対象にしない
+                                if self._is_warm_start_locked_lot(result_df_sorted, index):
+                                    continue
                                 product_number = row_tuple[product_col_idx + 1]  # itertuplesはインデックスを含むため+1
                                 divided_time = row_tuple[divided_time_col_idx + 1] if divided_time_col_idx < len(row_tuple) - 1 else 0.0
                                 shipping_date_raw = None
@@ -9323,7 +10703,7 @@ class InspectorAssignmentManager:
                                                 assigned_lots.append((index, product_number, divided_time, i, row))
                                                 break
                             
-                                self.log_message(f"偏り是正パス{pass_num + 1}: 多忙な検査員 {overloaded_code} の割り当てロット数: {len(assigned_lots)}件", debug=True)
+                                self.log_message("偏り是正パス%d: 多忙な検査員 %s の割り当てロット数: %d件", pass_num + 1, overloaded_code, len(assigned_lots), debug=True)
                             
                             # 各ロットについて、余裕のある検査員への再割当てを試みる
                             for lot_index, product_number, divided_time, inspector_col_num, row in assigned_lots:
@@ -9394,9 +10774,6 @@ class InspectorAssignmentManager:
                                                 'process_name': lot_process_name,
                                             }
                                             self.fixed_inspector_protection_metrics['protection_history'].append(protection_history_entry)
-                                            if len(self.fixed_inspector_protection_metrics['protection_history']) > 100:
-                                                self.fixed_inspector_protection_metrics['protection_history'] = \
-                                                    self.fixed_inspector_protection_metrics['protection_history'][-100:]
                                             
                                             once_key = (
                                                 "bias_skip_fixed_inspector",
@@ -9416,24 +10793,17 @@ class InspectorAssignmentManager:
                                 
                                 # 当日洗浄上がり品かどうかを判定
                                 shipping_date_raw = row.get('出荷予定日', None)
-                                shipping_date_str = str(shipping_date_raw).strip() if pd.notna(shipping_date_raw) else ''
-                                is_same_day_cleaning_lot = (
-                                    shipping_date_str == "当日洗浄上がり品" or
-                                    shipping_date_str == "当日洗浄品" or
-                                    "当日洗浄" in shipping_date_str
-                                )
+                                shipping_info = self._shipping_date_info(shipping_date_raw)
+                                is_same_day_cleaning_lot = shipping_info.kind == LOT_KIND_SAME_DAY_CLEANING
                                 
                                 # スキルマスタに登録があるか確認
-                                skill_rows = skill_master_df[skill_master_df.iloc[:, 0] == product_number]
-                                is_new_product = skill_rows.empty
+                                is_new_product = not self._is_registered_in_skill_master(product_number, skill_master_df)
                                 
                                 # 新規品で出荷予定日が2週間以内の場合は、再割当てを避ける（保護）
                                 if is_new_product:
-                                    shipping_date = row.get('出荷予定日', None)
-                                    if pd.notna(shipping_date):
-                                        shipping_date = pd.to_datetime(shipping_date, errors='coerce')
-                                        if pd.notna(shipping_date):
-                                            shipping_date_date = shipping_date.date()
+                                    if pd.notna(shipping_date_raw):
+                                        shipping_date_date = shipping_info.parsed_date
+                                        if shipping_date_date is not None:
                                             # 本日から2週間以内の出荷予定日かどうかを判定
                                             two_weeks_later = current_date + timedelta(days=14)
                                             if shipping_date_date <= two_weeks_later:
@@ -9597,7 +10967,7 @@ class InspectorAssignmentManager:
                                                 replacement_name = replacement_inspector['氏名']
                                         
                                             # 結果データフレームで該当する検査員を置き換え（一時的に）
-                                        result_df_sorted.at[lot_index, f'検査員{inspector_col_num}'] = replacement_name
+                                        self._set_inspector_slot(result_df_sorted, lot_index, inspector_col_num, replacement_name, new_code)
                                         
                                         # 【改善】分割検査時間を再計算（再割当て後の実際の検査員数で）
                                         inspection_time_for_recalc = row.get('検査時間', 0.0)
@@ -9629,7 +10999,7 @@ class InspectorAssignmentManager:
                                                     debug=True,
                                                 )
                                                 # 元の検査員に戻す
-                                                result_df_sorted.at[lot_index, f'検査員{inspector_col_num}'] = old_inspector_name
+                                                self._set_inspector_slot(result_df_sorted, lot_index, inspector_col_num, old_inspector_name, overloaded_code)
                                                 continue
                                             
                                             # 分割検査時間を更新
@@ -9657,7 +11027,7 @@ class InspectorAssignmentManager:
                                                         debug=True,
                                                     )
                                                     # 結果データフレームを元に戻す（一時的に変更していたため）
-                                                    result_df_sorted.at[lot_index, f'検査員{inspector_col_num}'] = old_inspector_name
+                                                    self._set_inspector_slot(result_df_sorted, lot_index, inspector_col_num, old_inspector_name, overloaded_code)
                                                     continue
                                                 divided_time = adjusted_divided_time
                                                 # 分割検査時間も更新
@@ -9772,7 +11142,7 @@ class InspectorAssignmentManager:
                                                         )
                                                 
                                                 # 結果データフレームを元に戻す
-                                                result_df_sorted.at[lot_index, f'検査員{inspector_col_num}'] = old_inspector_name
+                                                self._set_inspector_slot(result_df_sorted, lot_index, inspector_col_num, old_inspector_name, overloaded_code)
                                                 result_df_sorted.at[lot_index, '分割検査時間'] = row.get('分割検査時間', divided_time)
                                                 
                                                 self.log_message(
@@ -9926,7 +11296,7 @@ class InspectorAssignmentManager:
                                                 self.same_day_cleaning_inspectors_by_product_name.setdefault(product_name_str, set()).add(old_code)
                                     
                                     # 結果データフレームを元に戻す
-                                    result_df_sorted.at[lot_index, f'検査員{inspector_col_num}'] = old_name
+                                    self._set_inspector_slot(result_df_sorted, lot_index, inspector_col_num, old_name, old_code)
                                     
                                     self.log_message(
                                         f"偏り是正パス{pass_num + 1}: 超過を引き起こす再割当を元に戻しました - '{new_name}' → '{old_name}' (ロットインデックス: {lot_index})",
@@ -9987,6 +11357,9 @@ class InspectorAssignmentManager:
                                         for row_idx, row in enumerate(result_df_sorted.itertuples(index=False)):
                                             lot_index_overrun = result_df_sorted.index[row_idx]
                                             product_number_overrun = row[result_cols_bias_verify['品番']]
+                                            # ウォームスタートで引き継いだロットは再割当ての対象にしない
+                                            if self._is_warm_start_locked_lot(result_df_sorted, lot_index_overrun):
+                                                continue
                                             divided_time_overrun = row[result_cols_bias_verify.get('分割検査時間', -1)] if '分割検査時間' in result_cols_bias_verify else 0.0
                                             if divided_time_overrun == -1:
                                                 divided_time_overrun = 0.0
@@ -10189,7 +11562,7 @@ class InspectorAssignmentManager:
                                                 else:
                                                     replacement_name_overrun = new_name_overrun
                                             
-                                            result_df_sorted.at[lot_index_overrun, f'検査員{inspector_col_num_overrun}'] = replacement_name_overrun
+                                            self._set_inspector_slot(result_df_sorted, lot_index_overrun, inspector_col_num_overrun, replacement_name_overrun, new_code_overrun)
                                             
                                             # 当日洗浄上がり品のロットの場合、same_day_cleaning_inspectorsを更新（品番単位・品名単位）
                                             if is_same_day_cleaning_lot_overrun:
@@ -10382,8 +11755,8 @@ class InspectorAssignmentManager:
                             # 【追加】バッファ効果測定メトリクスを出力
                             if self.buffer_usage_metrics['total_checks'] > 0:
                                 buffer_exceeded_rate = (self.buffer_usage_metrics['buffer_exceeded_count'] / self.buffer_usage_metrics['total_checks']) * 100
-                                avg_exceeded_by = sum(self.buffer_usage_metrics['buffer_exceeded_by']) / len(self.buffer_usage_metrics['buffer_exceeded_by']) if self.buffer_usage_metrics['buffer_exceeded_by'] else 0.0
-                                max_exceeded_by = max(self.buffer_usage_metrics['buffer_exceeded_by']) if self.buffer_usage_metrics['buffer_exceeded_by'] else 0.0
+                                avg_exceeded_by = self.buffer_usage_metrics['buffer_exceeded_by'].mean
+                                max_exceeded_by = self.buffer_usage_metrics['buffer_exceeded_by'].maximum
                                 
                                 self.log_message(
                                     f"勤務時間バッファ効果測定メトリクス: "
@@ -10406,6 +11779,7 @@ class InspectorAssignmentManager:
 
             # フェーズ2.5: 偏り是正後の最終検証（勤務時間超過の再チェック）
             self.log_message("全体最適化フェーズ2.5: 偏り是正後の最終検証を開始")
+            self.phase_profiler.start_phase('2.5')
             _t_perf_phase2_5_total = perf_counter()
 
             def _is_priority_lot_local(shipping_date_val: Any) -> bool:
@@ -10433,6 +11807,7 @@ class InspectorAssignmentManager:
             product_col_idx = result_df.columns.get_loc('品番')
             divided_time_col_idx = result_df.columns.get_loc('分割検査時間')
             inspector_col_indices = [result_df.columns.get_loc(f'検査員{i}') for i in range(1, MAX_INSPECTORS_PER_LOT + 1)]
+            inspector_id_col_indices = self._inspector_id_col_positions(result_df)
             
             for row_tuple in result_df.itertuples(index=True):
                 index = row_tuple[0]  # インデックス
@@ -10443,13 +11818,19 @@ class InspectorAssignmentManager:
                     inspector_col_idx = inspector_col_indices[i - 1]
                     inspector_value = row_tuple[inspector_col_idx + 1] if inspector_col_idx < len(row_tuple) - 1 else None
                     if pd.notna(inspector_value) and str(inspector_value).strip() != '':
-                        inspector_name = str(inspector_value).strip()
-                        if '(' in inspector_name:
-                            inspector_name = inspector_name.split('(')[0].strip()
+                        slot_inspector = self._slot_inspector(inspector_value, row_tuple[inspector_id_col_indices[i - 1] + 1] if inspector_id_col_indices[i - 1] != -1 else None)
+                        if slot_inspector is not None:
+                            inspector_code, inspector_name = slot_inspector
+                        else:
+                            inspector_code = None
+                            inspector_name = str(inspector_value).strip()
+                            if '(' in inspector_name:
+                                inspector_name = inspector_name.split('(')[0].strip()
                         if not inspector_name:
                             continue
 
-                        inspector_code = inspector_name_to_id.get(inspector_name)
+                        if inspector_code is None:
+                            inspector_code = inspector_name_to_id.get(inspector_name)
                         if inspector_code is None:
                             inspector_info = self._get_inspector_by_name(inspector_name, inspector_master_df)
                             if not inspector_info.empty:
@@ -10575,8 +11956,7 @@ class InspectorAssignmentManager:
                         # 利用可能な検査員を取得
                         process_number_overrun = lot_info_overrun['row'].get('現在工程番号', '')
                         lot_process_name_overrun = str(lot_info_overrun['row'].get('現在工程名', '') or '').strip()
-                        skill_rows_overrun = skill_master_df[skill_master_df.iloc[:, 0] == product_number_overrun]
-                        is_new_product_overrun = skill_rows_overrun.empty
+                        is_new_product_overrun = not self._is_registered_in_skill_master(product_number_overrun, skill_master_df)
                         available_inspectors_overrun = self.get_available_inspectors(
                             product_number_overrun, process_number_overrun, skill_master_df, inspector_master_df,
                             shipping_date=shipping_date_overrun, allow_new_team_fallback=is_new_product_overrun,
@@ -10662,7 +12042,7 @@ class InspectorAssignmentManager:
                                         if '(' in inspector_name_check:
                                             inspector_name_check = inspector_name_check.split('(')[0].strip()
                                         if inspector_name_check == overrun_name:
-                                            result_df.at[lot_index_overrun, inspector_col] = new_name_overrun
+                                            self._set_inspector_slot(result_df, lot_index_overrun, i, new_name_overrun, new_code_overrun)
                                             break
                             
                             # 【改善】再割当後に履歴を更新
@@ -10738,9 +12118,14 @@ class InspectorAssignmentManager:
                     inspector_col_idx = inspector_col_indices[i - 1]
                     inspector_value = row_tuple[inspector_col_idx + 1] if inspector_col_idx < len(row_tuple) - 1 else None
                     if pd.notna(inspector_value) and str(inspector_value).strip() != '':
-                        inspector_name = str(inspector_value).strip()
-                        if '(' in inspector_name:
-                            inspector_name = inspector_name.split('(')[0].strip()
+                        slot_inspector = self._slot_inspector(inspector_value, row_tuple[inspector_id_col_indices[i - 1] + 1] if inspector_id_col_indices[i - 1] != -1 else None)
+                        if slot_inspector is not None:
+                            inspector_code, inspector_name = slot_inspector
+                        else:
+                            inspector_code = None
+                            inspector_name = str(inspector_value).strip()
+                            if '(' in inspector_name:
+                                inspector_name = inspector_name.split('(')[0].strip()
                         if not inspector_name:
                             continue
 
@@ -10764,12 +12149,10 @@ class InspectorAssignmentManager:
                                 'process_name': str(process_name_context).strip(),
                             }
                             self.fixed_inspector_protection_metrics['protection_history'].append(protection_history_entry)
-                            if len(self.fixed_inspector_protection_metrics['protection_history']) > 100:
-                                self.fixed_inspector_protection_metrics['protection_history'] = \
-                                    self.fixed_inspector_protection_metrics['protection_history'][-100:]
                             continue
                         
-                        inspector_code = inspector_name_to_id.get(inspector_name)
+                        if inspector_code is None:
+                            inspector_code = inspector_name_to_id.get(inspector_name)
                         if inspector_code is None:
                             inspector_info = self._get_inspector_by_name(inspector_name, inspector_master_df)
                             if not inspector_info.empty:
@@ -10997,8 +12380,7 @@ class InspectorAssignmentManager:
                             # スキルマスタから利用可能な検査員を取得
                             process_number = lot_info['row'].get('現在工程番号', '')
                             lot_process_name = str(lot_info['row'].get('現在工程名', '') or '').strip()
-                            skill_rows = skill_master_df[skill_master_df.iloc[:, 0] == product_number]
-                            is_new_product = skill_rows.empty
+                            is_new_product = not self._is_registered_in_skill_master(product_number, skill_master_df)
                             available_inspectors = self.get_available_inspectors(
                                 product_number, process_number, skill_master_df, inspector_master_df,
                                 shipping_date=shipping_date, allow_new_team_fallback=is_new_product,
@@ -11027,7 +12409,7 @@ class InspectorAssignmentManager:
                                     divided_time,
                                     inspector_master_df,
                                     product_number,
-                                    is_new_product=skill_rows.empty,
+                                    is_new_product=is_new_product,
                                     ignore_product_limit=self._should_force_assign_same_day(shipping_date),
                                     lot_date=lot_date_for_assign,
                                 )
@@ -11063,7 +12445,7 @@ class InspectorAssignmentManager:
                                                     inspector_name = f"{inspector['氏名']}(新)"
                                                 else:
                                                     inspector_name = inspector['氏名']
-                                            result_df.at[index, f'検査員{i}'] = inspector_name
+                                            self._set_inspector_slot(result_df, index, i, inspector_name, inspector.get('コード'))
                                     
                                     result_df.at[index, 'assignability_status'] = 'assigned'
                                     resolved_count += 1
@@ -11218,6 +12600,7 @@ class InspectorAssignmentManager:
                 product_col_idx = result_df.columns.get_loc('品番')
                 divided_time_col_idx = result_df.columns.get_loc('分割検査時間')
                 inspector_col_indices = [result_df.columns.get_loc(f'検査員{i}') for i in range(1, MAX_INSPECTORS_PER_LOT + 1)]
+                inspector_id_col_indices = self._inspector_id_col_positions(result_df)
                 
                 for row_tuple in result_df.itertuples(index=True):
                     index = row_tuple[0]  # インデックス
@@ -11228,13 +12611,19 @@ class InspectorAssignmentManager:
                         inspector_col_idx = inspector_col_indices[i - 1]
                         inspector_value = row_tuple[inspector_col_idx + 1] if inspector_col_idx < len(row_tuple) - 1 else None
                         if pd.notna(inspector_value) and str(inspector_value).strip() != '':
-                            inspector_name = str(inspector_value).strip()
-                            if '(' in inspector_name:
-                                inspector_name = inspector_name.split('(')[0].strip()
+                            slot_inspector = self._slot_inspector(inspector_value, row_tuple[inspector_id_col_indices[i - 1] + 1] if inspector_id_col_indices[i - 1] != -1 else None)
+                            if slot_inspector is not None:
+                                inspector_code, inspector_name = slot_inspector
+                            else:
+                                inspector_code = None
+                                inspector_name = str(inspector_value).strip()
+                                if '(' in inspector_name:
+                                    inspector_name = inspector_name.split('(')[0].strip()
                             if not inspector_name:
                                 continue
 
-                            inspector_code = inspector_name_to_id.get(inspector_name)
+                            if inspector_code is None:
+                                inspector_code = inspector_name_to_id.get(inspector_name)
                             if inspector_code is None:
                                 inspector_info = self._get_inspector_by_name(inspector_name, inspector_master_df)
                                 if not inspector_info.empty:
@@ -11264,7 +12653,9 @@ class InspectorAssignmentManager:
             )
 
             # フェーズ3: 未割当ロットの再処理（出荷予定日順、新規品優先）
+            result_df = self._optimization_checkpoint(result_df, inspector_master_df, '3')
             self.log_message("全体最適化フェーズ3: 未割当ロットの再処理を開始")
+            self.phase_profiler.start_phase('3')
             _t_perf_phase3_total = perf_counter()
             skip_phase3_reprocess = False
             
@@ -11336,6 +12727,7 @@ class InspectorAssignmentManager:
                 col_name = f'検査員{i}'
                 if col_name in result_df.columns:
                     inspector_col_indices[i] = result_df.columns.get_loc(col_name)
+            inspector_id_col_indices = self._inspector_id_col_positions(result_df)
             
             for row_tuple in result_df.itertuples(index=True):
                 index = row_tuple[0]  # インデックス
@@ -11363,13 +12755,19 @@ class InspectorAssignmentManager:
                         inspector_value = row_tuple[inspector_col_idx + 1] if inspector_col_idx + 1 < len(row_tuple) else None
                         
                         if pd.notna(inspector_value) and str(inspector_value).strip() != '':
-                            inspector_name = str(inspector_value).strip()
-                            if '(' in inspector_name:
-                                inspector_name = inspector_name.split('(')[0].strip()
+                            slot_inspector = self._slot_inspector(inspector_value, row_tuple[inspector_id_col_indices[i - 1] + 1] if inspector_id_col_indices[i - 1] != -1 else None)
+                            if slot_inspector is not None:
+                                inspector_code, inspector_name = slot_inspector
+                            else:
+                                inspector_code = None
+                                inspector_name = str(inspector_value).strip()
+                                if '(' in inspector_name:
+                                    inspector_name = inspector_name.split('(')[0].strip()
                             if not inspector_name:
                                 continue
 
-                            inspector_code = inspector_name_to_id.get(inspector_name)
+                            if inspector_code is None:
+                                inspector_code = inspector_name_to_id.get(inspector_name)
                             if inspector_code is None:
                                 inspector_info = self._get_inspector_by_name(inspector_name, inspector_master_df)
                                 if not inspector_info.empty:
@@ -11581,13 +12979,19 @@ class InspectorAssignmentManager:
                             inspector_col = f'検査員{i}'
                             inspector_value = low_priority_row.get(inspector_col, '')
                             if pd.notna(inspector_value) and str(inspector_value).strip() != '':
-                                inspector_name = str(inspector_value).strip()
-                                if '(' in inspector_name:
-                                    inspector_name = inspector_name.split('(')[0].strip()
+                                slot_inspector = self._slot_inspector(inspector_value, low_priority_row.get(inspector_id_column(i)))
+                                if slot_inspector is not None:
+                                    inspector_code, inspector_name = slot_inspector
+                                else:
+                                    inspector_code = None
+                                    inspector_name = str(inspector_value).strip()
+                                    if '(' in inspector_name:
+                                        inspector_name = inspector_name.split('(')[0].strip()
                                 if not inspector_name:
                                     continue
                                     
-                                inspector_code = inspector_name_to_id.get(inspector_name)
+                                if inspector_code is None:
+                                    inspector_code = inspector_name_to_id.get(inspector_name)
                                 if inspector_code is None:
                                     inspector_info = self._get_inspector_by_name(inspector_name, inspector_master_df)
                                     if not inspector_info.empty:
@@ -11649,7 +13053,7 @@ class InspectorAssignmentManager:
                                 reassigned_codes.add(inspector_code)
                                 
                                 # 優先度の低いロットからこの検査員を削除
-                                result_df.at[low_priority_index, inspector_col] = ''
+                                self._set_inspector_slot(result_df, low_priority_index, self._inspector_slot_number(inspector_col), '')
                                 self.log_message(
                                     f"アプローチ3: 優先度の低いロット {low_priority_index} (品番: {low_priority_row['品番']}, 出荷予定日: {low_priority_shipping_date}) "
                                     f"から検査員 '{inspector_name}' (コード: {inspector_code}) を再割当てしました"
@@ -11714,10 +13118,16 @@ class InspectorAssignmentManager:
                                 inspector_value = low_priority_row.get(inspector_col, '')
                                 if pd.isna(inspector_value) or str(inspector_value).strip() == '':
                                     continue
-                                inspector_name = str(inspector_value).split('(')[0].strip()
+                                slot_inspector = self._slot_inspector(inspector_value, low_priority_row.get(inspector_id_column(i)))
+                                if slot_inspector is not None:
+                                    inspector_code, inspector_name = slot_inspector
+                                else:
+                                    inspector_code = None
+                                    inspector_name = str(inspector_value).split('(')[0].strip()
                                 if not inspector_name:
                                     continue
-                                inspector_code = inspector_name_to_id.get(inspector_name)
+                                if inspector_code is None:
+                                    inspector_code = inspector_name_to_id.get(inspector_name)
                                 if inspector_code is None:
                                     inspector_info = self._get_inspector_by_name(inspector_name, inspector_master_df)
                                     if inspector_info.empty:
@@ -11746,7 +13156,7 @@ class InspectorAssignmentManager:
                                     '割当時間': divided_time
                                 })
                                 reassigned_codes.add(inspector_code)
-                                result_df.at[low_priority_index, inspector_col] = ''
+                                self._set_inspector_slot(result_df, low_priority_index, self._inspector_slot_number(inspector_col), '')
                                 self._remove_inspector_from_same_day_sets(
                                     low_priority_product_number,
                                     low_priority_product_name_str,
@@ -11797,7 +13207,7 @@ class InspectorAssignmentManager:
                             inspector_code = inspector['コード']
                             divided_time = inspector['割当時間']
                             
-                            result_df.at[unassigned_index, f'検査員{i}'] = inspector_name
+                            self._set_inspector_slot(result_df, unassigned_index, i, inspector_name, inspector_code)
                             
                             # 履歴を更新
                             if inspector_code not in self.inspector_daily_assignments:
@@ -11919,6 +13329,7 @@ class InspectorAssignmentManager:
                                     & (~is_preinspection_label)
                                     & shipping_dt_norm.notna()
                                     & (shipping_dt_norm > cutoff_ts)
+                                    & ~self._warm_start_locked_mask(result_df)
                                 )
                                 normal_assigned_count = int(normal_assigned_mask.sum())
                                 if normal_assigned_count > 0:
@@ -11926,6 +13337,9 @@ class InspectorAssignmentManager:
                                         col = f'検査員{i}'
                                         if col in result_df.columns:
                                             result_df.loc[normal_assigned_mask, col] = ''
+                                        id_col = inspector_id_column(i)
+                                        if id_col in result_df.columns:
+                                            result_df.loc[normal_assigned_mask, id_col] = EMPTY_INSPECTOR_ID
                                     result_df.loc[normal_assigned_mask, '検査員人数'] = 0
                                     if 'remaining_work_hours' in result_df.columns and '検査時間' in result_df.columns:
                                         result_df.loc[normal_assigned_mask, 'remaining_work_hours'] = pd.to_numeric(
@@ -12034,6 +13448,7 @@ class InspectorAssignmentManager:
                             (inspector_counts > 0)
                             & shipping_dt_norm.notna()
                             & (shipping_dt_norm > release_cutoff)
+                            & ~self._warm_start_locked_mask(result_df)
                         )
                         far_assigned_count = int(far_assigned_mask.sum())
                         if far_assigned_count > 0:
@@ -12041,6 +13456,9 @@ class InspectorAssignmentManager:
                                 col = f'検査員{i}'
                                 if col in result_df.columns:
                                     result_df.loc[far_assigned_mask, col] = ''
+                                id_col = inspector_id_column(i)
+                                if id_col in result_df.columns:
+                                    result_df.loc[far_assigned_mask, id_col] = EMPTY_INSPECTOR_ID
                             result_df.loc[far_assigned_mask, '検査員人数'] = 0
                             if 'remaining_work_hours' in result_df.columns and '検査時間' in result_df.columns:
                                 result_df.loc[far_assigned_mask, 'remaining_work_hours'] = pd.to_numeric(
@@ -12133,8 +13551,7 @@ class InspectorAssignmentManager:
                 # 新規品かどうかを判定
                 def is_new_product_for_unassigned(row):
                     product_number = row['品番']
-                    skill_rows = skill_master_df[skill_master_df.iloc[:, 0] == product_number]
-                    return skill_rows.empty
+                    return not self._is_registered_in_skill_master(product_number, skill_master_df)
                 
                 unassigned_df['_is_new_product'] = unassigned_df.apply(is_new_product_for_unassigned, axis=1)
                 
@@ -12180,6 +13597,10 @@ class InspectorAssignmentManager:
                 lot_qty_col_idx = unassigned_df.columns.get_loc('ロット数量') if 'ロット数量' in unassigned_df.columns else -1
                 
                 for row_tuple in unassigned_df.itertuples(index=True):
+                    # 【追加】時間予算の超過・中止要求: 残りの未割当ロットは再処理しない（直後のフェーズ3.5で検証）
+                    if self._optimization_budget.should_stop():
+                        self.log_message("時間予算の超過または中止要求のため未割当ロットの再処理を打ち切ります", level='warning')
+                        break
                     idx = row_tuple[0]  # インデックス
                     original_index = original_indices[idx]  # 元のインデックスを取得
                     product_number = row_tuple[prod_num_col_idx_u + 1]  # +1はインデックス分
@@ -12217,8 +13638,7 @@ class InspectorAssignmentManager:
                     divided_time = inspection_time / required_inspectors
                     
                     # 新規品かどうかを判定
-                    skill_rows = skill_master_df[skill_master_df.iloc[:, 0] == product_number]
-                    is_new_product = skill_rows.empty
+                    is_new_product = not self._is_registered_in_skill_master(product_number, skill_master_df)
                     
                     # 出荷予定日が近日（3営業日以内または2週間以内）かどうかを判定
                     shipping_date = row.get('出荷予定日', None)
@@ -12605,9 +14025,6 @@ class InspectorAssignmentManager:
                                     'candidates_count': len(relaxed_work_hours_candidates),
                                 }
                                 self.same_day_relaxation_metrics['relaxation_history'].append(relaxation_history_entry)
-                                if len(self.same_day_relaxation_metrics['relaxation_history']) > 100:
-                                    self.same_day_relaxation_metrics['relaxation_history'] = \
-                                        self.same_day_relaxation_metrics['relaxation_history'][-100:]
                                 
                                 self.log_message(f"未割当ロット再処理: 品番 {product_number} の勤務時間制約緩和条件で割り当て成功")
                     
@@ -12766,9 +14183,6 @@ class InspectorAssignmentManager:
                             }
                             self.same_day_relaxation_metrics['relaxation_history'].append(relaxation_history_entry)
                             # 履歴は最大100件まで保持
-                            if len(self.same_day_relaxation_metrics['relaxation_history']) > 100:
-                                self.same_day_relaxation_metrics['relaxation_history'] = \
-                                    self.same_day_relaxation_metrics['relaxation_history'][-100:]
                             
                             # 緩和条件で再試行
                             lot_date_for_assign = self._resolve_lot_date(shipping_date, pd.Timestamp.now().date())
@@ -12813,7 +14227,7 @@ class InspectorAssignmentManager:
                                     else:
                                         inspector_name = inspector['氏名']
                                 
-                                result_df.at[original_index, f'検査員{i+1}'] = inspector_name
+                                self._set_inspector_slot(result_df, original_index, i + 1, inspector_name, inspector.get('コード'))
                                 team_members.append(inspector['氏名'])
                                 
                                 # 履歴を更新
@@ -12977,7 +14391,7 @@ class InspectorAssignmentManager:
                         f"勤務時間制約={self.same_day_relaxation_metrics['constraints_relaxed']['work_hours_constraint']}回, "
                         f"緩和閾値チェック回数={self.same_day_relaxation_metrics['relaxation_threshold_checks']}, "
                         f"緩和閾値適用回数={self.same_day_relaxation_metrics['relaxation_threshold_applied']}, "
-                        f"緩和履歴件数={len(self.same_day_relaxation_metrics['relaxation_history'])}",
+                        f"緩和履歴件数={self.same_day_relaxation_metrics['relaxation_history'].total}",
                         debug=True,
                     )
                     if self.same_day_relaxation_metrics['relaxation_history']:
@@ -12997,6 +14411,7 @@ class InspectorAssignmentManager:
 
             # フェーズ3.5: 未割当ロット再処理後の最終検証（勤務時間超過の再チェック）
             self.log_message("全体最適化フェーズ3.5: 未割当ロット再処理後の最終検証を開始")
+            self.phase_profiler.start_phase('3.5')
             _t_perf_phase3_5_total = perf_counter()
             
             # 現在日付を取得
@@ -13217,9 +14632,6 @@ class InspectorAssignmentManager:
                                 'process_name': str(process_name_context).strip(),
                             }
                             self.fixed_inspector_protection_metrics['protection_history'].append(protection_history_entry)
-                            if len(self.fixed_inspector_protection_metrics['protection_history']) > 100:
-                                self.fixed_inspector_protection_metrics['protection_history'] = \
-                                    self.fixed_inspector_protection_metrics['protection_history'][-100:]
                             continue
                         
                         inspector_info = self._get_inspector_by_name(inspector_name, inspector_master_df)
@@ -13606,7 +15018,7 @@ class InspectorAssignmentManager:
                             replacement_found = True
                             skill_value = insp.get('スキル値', '')
                             display_name = f"{insp['氏名']}({skill_value})" if skill_value else insp['氏名']
-                            result_df.at[violation_index, violating_inspector_col] = display_name
+                            self._set_inspector_slot(result_df, violation_index, self._inspector_slot_number(violating_inspector_col), display_name, code)
                             
                             # 履歴を更新（旧検査員から時間を引く）
                             if violation_code in self.inspector_daily_assignments:
@@ -13712,7 +15124,7 @@ class InspectorAssignmentManager:
                                 replacement_found = True
                                 skill_value = insp.get('スキル値', '')
                                 display_name = f"{insp['氏名']}({skill_value})" if skill_value else insp['氏名']
-                                result_df.at[violation_index, violating_inspector_col] = display_name
+                                self._set_inspector_slot(result_df, violation_index, self._inspector_slot_number(violating_inspector_col), display_name, code)
                                 
                                 # 履歴を更新（旧検査員から時間を引く）
                                 if violation_code in self.inspector_daily_assignments:
@@ -13825,6 +15237,11 @@ class InspectorAssignmentManager:
                                 protected_indices.add(index)
                                 resolved_count += 1
                                 continue
+                            # ウォームスタートで引き継いだロットはクリアせず、同じ品番の他の違反ロットを割り当て直す
+                            if self._is_warm_start_locked_lot(result_df, index):
+                                protected_indices.add(index)
+                                resolved_count += 1
+                                continue
                             # 3営業日以内のロットかどうかを判定
                             def add_business_days_local(start: date, business_days: int) -> date:
                                 def next_business_day(date_val: date) -> date:
@@ -13865,8 +15282,7 @@ class InspectorAssignmentManager:
                                     self.log_message(f"出荷予定日の比較エラー: {str(e)} (ロットインデックス: {index})", level='warning')
                             
                             # 2週間以内の新規品かどうかを判定
-                            skill_rows = skill_master_df[skill_master_df.iloc[:, 0] == product_number]
-                            is_new_product = skill_rows.empty
+                            is_new_product = not self._is_registered_in_skill_master(product_number, skill_master_df)
                             
                             # 3営業日以内または2週間以内のロットは保護（未割当にしない）
                             # 未割当ロット再処理と同様に、「近日（2週間以内）」のロットも保護する
@@ -14004,8 +15420,7 @@ class InspectorAssignmentManager:
                             # スキルマスタから利用可能な検査員を取得
                             process_number = lot_info['row'].get('現在工程番号', '')
                             lot_process_name = str(lot_info['row'].get('現在工程名', '') or '').strip()
-                            skill_rows = skill_master_df[skill_master_df.iloc[:, 0] == product_number]
-                            is_new_product = skill_rows.empty
+                            is_new_product = not self._is_registered_in_skill_master(product_number, skill_master_df)
                             available_inspectors = self.get_available_inspectors(
                                 product_number, process_number, skill_master_df, inspector_master_df,
                                 shipping_date=shipping_date, allow_new_team_fallback=is_new_product,
@@ -14034,7 +15449,7 @@ class InspectorAssignmentManager:
                                     divided_time,
                                     inspector_master_df,
                                     product_number,
-                                    is_new_product=skill_rows.empty,
+                                    is_new_product=is_new_product,
                                     ignore_product_limit=self._should_force_assign_same_day(shipping_date),
                                     lot_date=lot_date_for_assign,
                                 )
@@ -14070,7 +15485,7 @@ class InspectorAssignmentManager:
                                                     inspector_name = f"{inspector['氏名']}(新)"
                                                 else:
                                                     inspector_name = inspector['氏名']
-                                            result_df.at[index, f'検査員{i}'] = inspector_name
+                                            self._set_inspector_slot(result_df, index, i, inspector_name, inspector.get('コード'))
                                     
                                     result_df.at[index, 'assignability_status'] = 'assigned'
                                     resolved_count += 1
@@ -14283,7 +15698,9 @@ class InspectorAssignmentManager:
                 (perf_counter() - _t_perf_phase3_5_total) * 1000.0,
             )
 
+            result_df = self._optimization_checkpoint(result_df, inspector_master_df, '4')
             self.log_message("全体最適化フェーズ4: チーム情報の再計算を開始")
+            self.phase_profiler.start_phase('4')
             _t_perf_phase4_total = perf_counter()
             
             # 最終的に出荷予定日順にソート（最優先ルールの維持）
@@ -14317,17 +15734,14 @@ class InspectorAssignmentManager:
             def sort_key(val):
                 if pd.isna(val):
                     return (5, None)  # 最後に
-                val_str = str(val).strip()
+                info = self._shipping_date_info(val)
+                val_str = info.text
+                date_val = info.parsed
+                has_date = date_val is not None and pd.notna(date_val)
                 
                 # 1. 当日の日付（優先度0）
-                try:
-                    date_val = pd.to_datetime(val, errors='coerce')
-                    if pd.notna(date_val):
-                        date_date = date_val.date()
-                        if date_date == current_date:
-                            return (0, date_val)
-                except:
-                    pass
+                if has_date and date_val.date() == current_date:
+                    return (0, date_val)
                 
                 # 2. 先行検査品（優先度1）
                 if (val_str == "先行検査" or
@@ -14341,22 +15755,12 @@ class InspectorAssignmentManager:
                     return (6, val_str)
                 
                 # 4. 今日より後〜3営業日以内（週末除外、優先度3）
-                try:
-                    date_val = pd.to_datetime(val, errors='coerce')
-                    if pd.notna(date_val):
-                        date_date = date_val.date()
-                        if date_date > current_date and date_date <= three_business_days_ahead:
-                            return (3, date_val)
-                except:
-                    pass
+                if has_date and current_date < date_val.date() <= three_business_days_ahead:
+                    return (3, date_val)
                 
                 # 5. それ以降の日付（優先度4、出荷予定日昇順でソート）
-                try:
-                    date_val = pd.to_datetime(val, errors='coerce')
-                    if pd.notna(date_val):
-                        return (4, date_val)
-                except:
-                    pass
+                if has_date:
+                    return (4, date_val)
                 
                 return (5, val_str)  # その他文字列
             
@@ -14399,8 +15803,7 @@ class InspectorAssignmentManager:
                         reason = "ロット数量0" if (lot_quantity == 0 or pd.isna(lot_quantity)) else "検査時間0"
                     elif status == 'capacity_shortage':
                         # スキルマスタに登録があるか確認
-                        skill_rows = skill_master_df[skill_master_df.iloc[:, 0] == product_number]
-                        if skill_rows.empty:
+                        if not self._is_registered_in_skill_master(product_number, skill_master_df):
                             reason = "スキルマスタ未登録"
                         else:
                             process_number = row.get('現在工程番号', '')
@@ -14413,8 +15816,7 @@ class InspectorAssignmentManager:
                     elif status == 'final_product_limit_violation':
                         # 最終検証で違反検出された場合、元の理由を推測
                         # スキルマスタに登録があるか確認
-                        skill_rows = skill_master_df[skill_master_df.iloc[:, 0] == product_number]
-                        if skill_rows.empty:
+                        if not self._is_registered_in_skill_master(product_number, skill_master_df):
                             reason = "スキルマスタ未登録(最終検証で違反検出)"
                         else:
                             process_number = row.get('現在工程番号', '')
@@ -14481,57 +15883,48 @@ class InspectorAssignmentManager:
                     candidate_by_name: Dict[str, Dict[str, Any]] = {}
                     
                     # スキルマスタから3D025-G4960のスキル保有者全員を取得（工程番号フィルタなし）
-                    skill_rows = skill_master_df[skill_master_df.iloc[:, 0] == target_product]
-                    if not skill_rows.empty:
-                        skill_columns = skill_master_df.columns[2:]
+                    skill_index = self._get_skill_index(skill_master_df)
+                    target_skill_rows = skill_index.product_rows(target_product)
+                    if target_skill_rows:
                         seen_codes = set()
                         
-                        for _, skill_row in skill_rows.iterrows():
-                            for col_name in skill_columns:
-                                inspector_code = str(col_name).strip()
-                                if not inspector_code or inspector_code in seen_codes:
-                                    continue
-                                skill_value = skill_row.get(col_name, None)
-                                if pd.notna(skill_value) and str(skill_value).strip() in {'1', '2', '3'}:
-                                    inspector_info = inspector_master_df[inspector_master_df['#ID'] == inspector_code]
-                                    if inspector_info.empty:
-                                        continue
-                                    inspector_name = inspector_info.iloc[0]['#氏名']
-                                    # 休暇中の検査員は除外
-                                    if self.is_inspector_on_vacation(inspector_name):
-                                        continue
-                                    # 勤務時間が0以下の検査員は除外
-                                    max_hours = self.get_inspector_max_hours(inspector_code, inspector_master_df)
-                                    if max_hours <= 0:
-                                        continue
-                                    try:
-                                        numeric_skill = int(str(skill_value).strip())
-                                    except ValueError:
-                                        numeric_skill = 1
-                                    
-                                    # 検査員マスタから詳細情報を取得
-                                    inspector_row = inspector_info.iloc[0]
-                                    candidate = {
-                                        '氏名': inspector_name,
-                                        'コード': inspector_code,
-                                        'スキル': numeric_skill,
-                                        'is_new_team': False,
-                                        '開始時刻': inspector_row.get('開始時刻', ''),
-                                        '終了時刻': inspector_row.get('終了時刻', ''),
-                                        '残業可能時間': inspector_row.get('残業可能時間', 0.0),
-                                    }
-                                    name = _normalize_name(inspector_name)
-                                    if name:
-                                        existing = candidate_by_name.get(name)
-                                        if existing is None:
-                                            candidate_by_name[name] = candidate
-                                        else:
-                                            # 検査員コード昇順で代表を固定
-                                            existing_code = _get_code(existing)
-                                            new_code = _get_code(candidate)
-                                            if _code_key(new_code) < _code_key(existing_code):
-                                                candidate_by_name[name] = candidate
-                                        seen_codes.add(inspector_code)
+                        for inspector_code, numeric_skill in skill_index.iter_skilled(target_skill_rows):
+                            if inspector_code in seen_codes:
+                                continue
+                            inspector_row = self._get_inspector_row_by_id(inspector_code, inspector_master_df)
+                            if inspector_row is None:
+                                continue
+                            inspector_name = inspector_row['#氏名']
+                            # 休暇中の検査員は除外
+                            if self.is_inspector_on_vacation(inspector_name):
+                                continue
+                            # 勤務時間が0以下の検査員は除外
+                            max_hours = self.get_inspector_max_hours(inspector_code, inspector_master_df)
+                            if max_hours <= 0:
+                                continue
+                            
+                            # 検査員マスタから詳細情報を取得
+                            candidate = {
+                                '氏名': inspector_name,
+                                'コード': inspector_code,
+                                'スキル': numeric_skill,
+                                'is_new_team': False,
+                                '開始時刻': inspector_row.get('開始時刻', ''),
+                                '終了時刻': inspector_row.get('終了時刻', ''),
+                                '残業可能時間': inspector_row.get('残業可能時間', 0.0),
+                            }
+                            name = _normalize_name(inspector_name)
+                            if name:
+                                existing = candidate_by_name.get(name)
+                                if existing is None:
+                                    candidate_by_name[name] = candidate
+                                else:
+                                    # 検査員コード昇順で代表を固定
+                                    existing_code = _get_code(existing)
+                                    new_code = _get_code(candidate)
+                                    if _code_key(new_code) < _code_key(existing_code):
+                                        candidate_by_name[name] = candidate
+                                seen_codes.add(inspector_code)
                     
                     # スキル保有者が見つからない場合は、従来の方法で候補を取得（フォールバック）
                     if not candidate_by_name:
@@ -14627,13 +16020,13 @@ class InspectorAssignmentManager:
 
                             # 結果反映（最大2人固定）
                             if '検査員1' in result_df.columns:
-                                result_df.at[target_index, '検査員1'] = inspector1
+                                self._set_inspector_slot(result_df, target_index, 1, inspector1)
                             if '検査員2' in result_df.columns:
-                                result_df.at[target_index, '検査員2'] = inspector2
+                                self._set_inspector_slot(result_df, target_index, 2, inspector2)
                             for i in range(3, 6):
                                 col = f'検査員{i}'
                                 if col in result_df.columns:
-                                    result_df.at[target_index, col] = ''
+                                    self._set_inspector_slot(result_df, target_index, i, '')
                             result_df.at[target_index, '検査員人数'] = 2 if inspector1 and inspector2 else (1 if inspector1 else 0)
 
                             if '分割検査時間' in result_df.columns:
@@ -14810,7 +16203,7 @@ class InspectorAssignmentManager:
                             fixed_rotation[product_key] = count + 1
                             if not preferred_name:
                                 continue
-                            result_df.at[idx, inspector_cols[0]] = preferred_name
+                            self._set_inspector_slot(result_df, idx, self._inspector_slot_number(inspector_cols[0]), preferred_name)
                             self.update_team_info(result_df, idx, inspector_master_df, show_skill_values)
                             self.log_message(
                                 f"Fixed inspector final adjust: product={product_key}, name={preferred_name}"
@@ -14871,7 +16264,7 @@ class InspectorAssignmentManager:
                                             continue
                                     except Exception:
                                         pass
-                                    result_df.at[target_idx, inspector_cols[0]] = preferred_name
+                                    self._set_inspector_slot(result_df, target_idx, self._inspector_slot_number(inspector_cols[0]), preferred_name)
                                     self.update_team_info(result_df, target_idx, inspector_master_df, show_skill_values)
                                     used_rows.add(target_idx)
                                     counts[missing_norm] = counts.get(missing_norm, 0) + 1
@@ -14974,6 +16367,10 @@ class InspectorAssignmentManager:
                             lot_date_for_row = self._resolve_lot_date(shipping_date, pd.Timestamp.now().date())
                             if lot_date_for_row != target_lot_date:
                                 break
+                            # ウォームスタートで引き継いだロットは、通常解除候補が無い場合の最終フォールバック候補にのみ残す
+                            if self._is_warm_start_locked_lot(result_df, idx):
+                                protected_candidates.append((self._normalize_shipping_date(shipping_date), idx))
+                                break
                             shipping_date_str = str(shipping_date).strip() if pd.notna(shipping_date) else ''
                             shipping_date_dt = pd.to_datetime(shipping_date, errors='coerce')
                             is_today_or_past = False
@@ -15113,7 +16510,7 @@ class InspectorAssignmentManager:
                                         assigned_clean = str(assigned_name).split('(')[0].strip()
                                         if self._normalize_person_name(assigned_clean) != inspector_norm:
                                             continue
-                                        result_df.at[target_idx, col] = candidate_name
+                                        self._set_inspector_slot(result_df, target_idx, self._inspector_slot_number(col), candidate_name)
                                         self.update_team_info(result_df, target_idx, inspector_master_df, show_skill_values)
                                         self._rebuild_assignment_histories(result_df, inspector_master_df)
                                         self.log_message(
@@ -15170,7 +16567,7 @@ class InspectorAssignmentManager:
                         )
                         continue
 
-                    result_df.at[target_idx, target_col] = ''
+                    self._set_inspector_slot(result_df, target_idx, self._inspector_slot_number(target_col), '')
                     result_df.at[target_idx, '検査員人数'] = next_count
                     if inspection_time > 0 and next_count > 0:
                         result_df.at[target_idx, '分割検査時間'] = round(inspection_time / next_count, 1)
@@ -15188,27 +16585,29 @@ class InspectorAssignmentManager:
 
             # 最終是正後に偏り是正を1回だけ実行（超過を出さず、優先度を維持）
             try:
-                result_df = self._run_post_final_bias_correction(
-                    result_df,
-                    inspector_master_df,
-                    skill_master_df,
-                    show_skill_values=show_skill_values,
-                    process_master_df=process_master_df,
-                    inspection_target_keywords=inspection_target_keywords,
-                )
+                with self.phase_profiler.phase('2.6'):
+                    result_df = self._run_post_final_bias_correction(
+                        result_df,
+                        inspector_master_df,
+                        skill_master_df,
+                        show_skill_values=show_skill_values,
+                        process_master_df=process_master_df,
+                        inspection_target_keywords=inspection_target_keywords,
+                    )
             except Exception as e:
                 self.log_message(f"最終是正後の偏り是正中にエラーが発生しました: {e}", level='warning')
 
             # 最終是正後に余裕検査員へ追加割当（超過なし、偏り悪化なし）
             try:
-                result_df = self._run_post_final_fill_underutilized(
-                    result_df,
-                    inspector_master_df,
-                    skill_master_df,
-                    show_skill_values=show_skill_values,
-                    process_master_df=process_master_df,
-                    inspection_target_keywords=inspection_target_keywords,
-                )
+                with self.phase_profiler.phase('2.7'):
+                    result_df = self._run_post_final_fill_underutilized(
+                        result_df,
+                        inspector_master_df,
+                        skill_master_df,
+                        show_skill_values=show_skill_values,
+                        process_master_df=process_master_df,
+                        inspection_target_keywords=inspection_target_keywords,
+                    )
             except Exception as e:
                 self.log_message(f"最終是正後の追加割当中にエラーが発生しました: {e}", level='warning')
 
@@ -15334,7 +16733,7 @@ class InspectorAssignmentManager:
                                                     name = str(candidate.get('氏名', candidate.get('#氏名', candidate.get('name', '')))).strip()
                                                     if not name:
                                                         continue
-                                                    result_df.at[index, col] = name
+                                                    self._set_inspector_slot(result_df, index, self._inspector_slot_number(col), name, candidate.get('コード'))
                                                 self.update_team_info(result_df, index, inspector_master_df, show_skill_values)
                                                 # 再計算
                                                 actual_inspector_count = 0
@@ -15488,14 +16887,20 @@ class InspectorAssignmentManager:
                                     far_name_val = far_row.get(far_col, '')
                                     if pd.isna(far_name_val) or str(far_name_val).strip() == '':
                                         continue
-                                    far_name = str(far_name_val).split('(')[0].strip()
+                                    slot_inspector = self._slot_inspector(far_name_val, far_row.get(inspector_id_column(i)))
+                                    if slot_inspector is not None:
+                                        inspector_code, far_name = slot_inspector
+                                    else:
+                                        inspector_code = None
+                                        far_name = str(far_name_val).split('(')[0].strip()
                                     if not far_name:
                                         continue
                                     far_name_norm = self._normalize_person_name(far_name)
                                     if far_name_norm in assigned_name_norms:
                                         continue
 
-                                    inspector_code = inspector_name_to_id.get(far_name)
+                                    if inspector_code is None:
+                                        inspector_code = inspector_name_to_id.get(far_name)
                                     if inspector_code is None:
                                         inspector_info = self._get_inspector_by_name(far_name, inspector_master_df)
                                         if inspector_info.empty:
@@ -15519,7 +16924,7 @@ class InspectorAssignmentManager:
                                         continue
 
                                     # 遠いロットから解除
-                                    result_df.at[far_index, far_col] = ''
+                                    self._set_inspector_slot(result_df, far_index, self._inspector_slot_number(far_col), '')
                                     far_count_after = max(0, far_count - 1)
                                     result_df.at[far_index, '検査員人数'] = far_count_after
                                     far_inspection_time = float(far_row.get('検査時間', 0.0) or 0.0)
@@ -15534,7 +16939,7 @@ class InspectorAssignmentManager:
                                             continue
                                         near_name_val = result_df.at[near_index, near_col]
                                         if pd.isna(near_name_val) or str(near_name_val).strip() == '':
-                                            result_df.at[near_index, near_col] = far_name
+                                            self._set_inspector_slot(result_df, near_index, j, far_name, inspector_code)
                                             break
                                     current_assigned_count += 1
                                     result_df.at[near_index, '検査員人数'] = current_assigned_count
@@ -15680,8 +17085,7 @@ class InspectorAssignmentManager:
             row = result_df.iloc[index]
             
             # 新規品かどうかを判定（スキルマスタに登録がない場合）
-            skill_rows = skill_master_df[skill_master_df.iloc[:, 0] == product_number]
-            is_new_product = skill_rows.empty
+            is_new_product = not self._is_registered_in_skill_master(product_number, skill_master_df)
             
             # 出荷予定日を取得
             shipping_date = None
@@ -15691,8 +17095,8 @@ class InspectorAssignmentManager:
             if '出荷予定日' in row.index:
                 shipping_date = row.get('出荷予定日', None)
                 if pd.notna(shipping_date):
-                    shipping_date = pd.to_datetime(shipping_date, errors='coerce')
-                    if pd.notna(shipping_date):
+                    shipping_date = self._shipping_date_info(shipping_date).parsed
+                    if shipping_date is not None and pd.notna(shipping_date):
                         shipping_date_date = shipping_date.date()
                         # 本日から2週間以内の出荷予定日かどうかを判定
                         two_weeks_later = current_date + timedelta(days=14)
@@ -15725,27 +17129,17 @@ class InspectorAssignmentManager:
                     process_number = row.get('現在工程番号', '')
                     lot_process_name = str(row.get('現在工程名', '') or '').strip()
                     # スキルマスタに登録があるか確認
-                    skill_rows = skill_master_df[skill_master_df.iloc[:, 0] == product_number]
-                    is_new_product = skill_rows.empty
+                    is_new_product = not self._is_registered_in_skill_master(product_number, skill_master_df)
                     shipping_date = row.get('出荷予定日', None)
                     
                     # 【改善】3営業日以内のロットについては、スキルマッチングを緩和（新製品チームを追加）
                     is_within_three_business_days = False
                     if shipping_date and pd.notna(shipping_date):
                         try:
-                            shipping_date_parsed = pd.to_datetime(shipping_date, errors='coerce')
-                            if pd.notna(shipping_date_parsed):
-                                shipping_date_date = shipping_date_parsed.date()
+                            shipping_date_date = self._shipping_date_info(shipping_date).parsed_date
+                            if shipping_date_date is not None:
                                 today = pd.Timestamp.now().date()
-                                def add_business_days(start: date, business_days: int) -> date:
-                                    result_date = start
-                                    added = 0
-                                    while added < business_days:
-                                        result_date += timedelta(days=1)
-                                        if result_date.weekday() < 5:
-                                            added += 1
-                                    return result_date
-                                three_business_days_ahead = add_business_days(today, 3)
+                                three_business_days_ahead = self._get_business_calendar().add_business_days(today, 3)
                                 is_within_three_business_days = shipping_date_date <= three_business_days_ahead
                         except Exception:
                             pass
@@ -15961,7 +17355,7 @@ class InspectorAssignmentManager:
                             else:
                                 replacement_name = replacement_inspector['氏名']
                         
-                        result_df.at[index, f'検査員{i_col}'] = replacement_name
+                        self._set_inspector_slot(result_df, index, i_col, replacement_name, replacement_inspector.get('コード'))
                         
                         # 履歴を更新（元の検査員から時間を引く）
                         old_code = inspector_code
@@ -16041,8 +17435,7 @@ class InspectorAssignmentManager:
                     process_number = row.get('現在工程番号', '')
                     lot_process_name = str(row.get('現在工程名', '') or '').strip()
                     # スキルマスタに登録があるか確認
-                    skill_rows = skill_master_df[skill_master_df.iloc[:, 0] == product_number]
-                    is_new_product = skill_rows.empty
+                    is_new_product = not self._is_registered_in_skill_master(product_number, skill_master_df)
                     shipping_date = row.get('出荷予定日', None)
                     available_inspectors = self.get_available_inspectors(
                         product_number, process_number, skill_master_df, inspector_master_df,
@@ -16243,7 +17636,7 @@ class InspectorAssignmentManager:
                             else:
                                 replacement_name = replacement_inspector['氏名']
                         
-                        result_df.at[index, '検査員1'] = replacement_name
+                        self._set_inspector_slot(result_df, index, 1, replacement_name, replacement_inspector.get('コード'))
                         
                         # 履歴を更新（元の検査員から時間を引く）
                         old_code = inspector_code
@@ -16311,8 +17704,7 @@ class InspectorAssignmentManager:
                     process_number = row.get('現在工程番号', '')
                     lot_process_name = str(row.get('現在工程名', '') or '').strip()
                     # スキルマスタに登録があるか確認
-                    skill_rows = skill_master_df[skill_master_df.iloc[:, 0] == product_number]
-                    is_new_product = skill_rows.empty
+                    is_new_product = not self._is_registered_in_skill_master(product_number, skill_master_df)
                     shipping_date = row.get('出荷予定日', None)
                     available_inspectors = self.get_available_inspectors(
                         product_number, process_number, skill_master_df, inspector_master_df,
@@ -16414,7 +17806,7 @@ class InspectorAssignmentManager:
                             else:
                                 replacement_name = replacement_inspector['氏名']
                         
-                        result_df.at[index, '検査員1'] = replacement_name
+                        self._set_inspector_slot(result_df, index, 1, replacement_name, replacement_inspector.get('コード'))
                         
                         # 履歴を更新（元の検査員から時間を引く）
                         old_code = inspector_code
@@ -16475,8 +17867,7 @@ class InspectorAssignmentManager:
                         process_number = row.get('現在工程番号', '')
                         lot_process_name = str(row.get('現在工程名', '') or '').strip()
                         # スキルマスタに登録があるか確認
-                        skill_rows = skill_master_df[skill_master_df.iloc[:, 0] == product_number]
-                        is_new_product = skill_rows.empty
+                        is_new_product = not self._is_registered_in_skill_master(product_number, skill_master_df)
                         shipping_date = row.get('出荷予定日', None)
                         available_inspectors = self.get_available_inspectors(
                             product_number, process_number, skill_master_df, inspector_master_df,
@@ -16494,8 +17885,10 @@ class InspectorAssignmentManager:
                     # 既に割り当てられている検査員を除外
                     current_codes = [inspector_code]
                     
-                    # 追加できる検査員を探す
+                    # 追加できる検査員を探す（増員後の分割検査時間で勤務時間・同一品番の上限を確認）
                     addition_candidates = []
+                    prospective_count = len(current_inspectors) + 1
+                    prospective_divided_time = inspection_time / prospective_count
                     excluded_reasons = {}  # 除外理由を記録
                     
                     # 当日洗浄上がり品かどうかを判定
@@ -16579,7 +17972,7 @@ class InspectorAssignmentManager:
                             else:
                                 addition_name = addition_inspector['氏名']
                         
-                        result_df.at[index, f'検査員{new_count}'] = addition_name
+                        self._set_inspector_slot(result_df, index, new_count, addition_name, addition_inspector.get('コード'))
                         result_df.at[index, '検査員人数'] = new_count
                         
                         # 分割検査時間の計算: 検査時間 ÷ 実際の分割した検査人数
@@ -16730,7 +18123,7 @@ class InspectorAssignmentManager:
             
             # 検査員1～10をクリア
             for i in range(1, MAX_INSPECTORS_PER_LOT + 1):
-                result_df.at[index, f'検査員{i}'] = ''
+                self._set_inspector_slot(result_df, index, i, '')
             result_df.at[index, '検査員人数'] = 0
             result_df.at[index, '分割検査時間'] = 0.0
             
@@ -17063,8 +18456,10 @@ class InspectorAssignmentManager:
                 replacement_name = replacement['氏名']
                 skill_value = replacement.get('スキル値', '')
                 display_name = f"{replacement_name}({skill_value})" if skill_value else replacement_name
-                result_df.at[lot_index, inspector_col] = display_name
-                self.update_team_info(result_df, lot_index, inspector_master_df, show_skill_values)
+                self.ledger_move(
+                    result_df, lot_index, inspector_col, display_name, inspector_master_df, show_skill_values,
+                    inspector_code=replacement.get('コード'),
+                )
                 reassignment_count += 1
                 self.log_message(
                     f"偏り是正(後処理): ロット {lot_index} の検査員を '{overloaded_name}' → '{replacement_name}' に変更しました",
@@ -17075,15 +18470,14 @@ class InspectorAssignmentManager:
                     debug=True,
                 )
 
-                # 履歴を再構築して安全に継続
-                self._rebuild_assignment_histories(result_df, inspector_master_df)
+                # 履歴は割当台帳で差分更新済み
                 total_hours = sum(self.inspector_work_hours.values())
                 active_codes = [c for c, h in self.inspector_work_hours.items() if h > 0]
                 avg_hours = total_hours / len(active_codes) if active_codes else 0.0
 
         # Extra rescue pass: swap from high utilization to low utilization
         try:
-            self._rebuild_assignment_histories(result_df, inspector_master_df)
+            self._verify_ledger_consistency(result_df, inspector_master_df, "偏り是正(後処理)")
             all_codes = []
             if inspector_master_df is not None and not inspector_master_df.empty:
                 if '#ID' in inspector_master_df.columns:
@@ -17299,9 +18693,10 @@ class InspectorAssignmentManager:
                             if not available_inspectors:
                                 continue
 
-                            result_df.at[idx, inspector_col] = low_name
-                            self.update_team_info(result_df, idx, inspector_master_df, show_skill_values)
-                            self._rebuild_assignment_histories(result_df, inspector_master_df)
+                            self.ledger_move(
+                                result_df, idx, inspector_col, low_name, inspector_master_df, show_skill_values,
+                                inspector_code=low_code,
+                            )
                             swaps += 1
                             swaps_for_low += 1
                             replaced = True
@@ -17461,9 +18856,10 @@ class InspectorAssignmentManager:
                         if worst_col is None:
                             continue
 
-                        result_df.at[idx, worst_col] = low_name
-                        self.update_team_info(result_df, idx, inspector_master_df, show_skill_values)
-                        self._rebuild_assignment_histories(result_df, inspector_master_df)
+                        self.ledger_move(
+                            result_df, idx, worst_col, low_name, inspector_master_df, show_skill_values,
+                            inspector_code=low_code,
+                        )
                         swaps += 1
                         swaps_for_low += 1
                         self.log_message(
@@ -17475,6 +18871,7 @@ class InspectorAssignmentManager:
         except Exception as e:
             self.log_message(f"偏り是正(後処理): 低稼働救済でエラーが発生しました: {e}", level='warning')
 
+        self._verify_ledger_consistency(result_df, inspector_master_df, "偏り是正(後処理)・低稼働救済")
         self.log_message(f"偏り是正(後処理): 再割当 {reassignment_count}件")
         return result_df
 
@@ -17557,6 +18954,9 @@ class InspectorAssignmentManager:
         pending_indices: List[int] = []
 
         for idx, row in df_sorted.iterrows():
+            # 【追加】時間予算の超過・中止要求: 残りのロットへの追加割当は行わない（各割当は制約を満たすため途中終了しても安全）
+            if self._optimization_budget.should_stop():
+                break
             inspector_count = row.get('検査員人数', 0)
             try:
                 inspector_count = int(inspector_count) if pd.notna(inspector_count) else 0
@@ -17598,6 +18998,8 @@ class InspectorAssignmentManager:
                 level='debug'
             )
             for idx in pending_indices:
+                if self._optimization_budget.should_stop():
+                    break
                 row = result_df.loc[idx]
                 shipping_date = row.get('出荷予定日', None)
                 lot_date_for_filter = self._resolve_lot_date(shipping_date, pd.Timestamp.now().date())
@@ -17649,7 +19051,8 @@ class InspectorAssignmentManager:
         if result_df is None or result_df.empty:
             return result_df
 
-        self._rebuild_assignment_histories(result_df, inspector_master_df)
+        # 履歴は追加割当（割当台帳）で差分更新済み
+        self._verify_ledger_consistency(result_df, inspector_master_df, "勤務時間上限是正(開始)")
         current_date = pd.Timestamp.now().date()
         inspector_cols = [
             f'検査員{i}'
@@ -17848,12 +19251,10 @@ class InspectorAssignmentManager:
                 replacement_skill = replacement_insp.get('スキル値', '')
                 if replacement_name:
                     display_name = f"{replacement_name}({replacement_skill})" if replacement_skill else replacement_name
-                    result_df.at[target_idx, target_col] = display_name
-                    result_df.at[target_idx, '検査員人数'] = assigned_count_before
-                    if inspection_time > 0 and assigned_count_before > 0:
-                        result_df.at[target_idx, '分割検査時間'] = round(inspection_time / assigned_count_before, 1)
-                    self.update_team_info(result_df, target_idx, inspector_master_df, show_skill_values)
-                    self._rebuild_assignment_histories(result_df, inspector_master_df)
+                    self.ledger_move(
+                        result_df, target_idx, target_col, display_name, inspector_master_df,
+                        show_skill_values, recount=True, inspector_code=replacement_insp.get('コード'),
+                    )
                     replacement_code = str(
                         replacement_insp.get('コード', replacement_insp.get('#ID', replacement_insp.get('コーチID', replacement_insp.get('コーチE', ''))))
                     ).strip()
@@ -17875,46 +19276,23 @@ class InspectorAssignmentManager:
                     f"(index {target_idx}, 品番 {product_number}, 必要 {required_inspectors_for_lot}人, 解除後 {remaining_if_removed}人)",
                     level='warning',
                 )
-                try:
-                    pos = result_df.index.get_loc(target_idx)
-                except Exception:
-                    pos = int(target_idx)
-                self.clear_assignment(result_df, pos)
-                if 'チーム情報' in result_df.columns:
-                    result_df.at[target_idx, 'チーム情報'] = '未割当(勤務時間上限厳守: 必要人数確保不可)'
-                self._rebuild_assignment_histories(result_df, inspector_master_df)
+                self.ledger_unassign(
+                    result_df, target_idx, None, inspector_master_df, show_skill_values,
+                    unassigned_reason='未割当(勤務時間上限厳守: 必要人数確保不可)',
+                )
                 continue
 
-            result_df.at[target_idx, target_col] = ''
-            remaining_names = []
-            for col in inspector_cols:
-                val = result_df.at[target_idx, col] if col in result_df.columns else ''
-                if pd.isna(val) or str(val).strip() == '':
-                    continue
-                remaining_names.append(str(val))
-            remaining_count = len(remaining_names)
-
-            if remaining_count <= 0:
-                try:
-                    pos = result_df.index.get_loc(target_idx)
-                except Exception:
-                    pos = int(target_idx)
-                self.clear_assignment(result_df, pos)
-                if 'チーム情報' in result_df.columns:
-                    result_df.at[target_idx, 'チーム情報'] = '未割当(勤務時間上限是正)'
-            else:
-                result_df.at[target_idx, '検査員人数'] = remaining_count
-                divided_time = round(inspection_time / remaining_count, 1) if inspection_time > 0 else 0.0
-                result_df.at[target_idx, '分割検査時間'] = divided_time
-                self.update_team_info(result_df, target_idx, inspector_master_df, show_skill_values)
-
-            self._rebuild_assignment_histories(result_df, inspector_master_df)
+            self.ledger_unassign(
+                result_df, target_idx, target_col, inspector_master_df, show_skill_values,
+                unassigned_reason='未割当(勤務時間上限是正)',
+            )
             self.log_message(
                 f"勤務時間上限是正: {target_name}({target_code}) のロットを解除しました "
                 f"(index {target_idx}, 列 {target_col})",
                 level='warning',
             )
 
+        self._verify_ledger_consistency(result_df, inspector_master_df, "勤務時間上限是正")
         remaining_overrun = []
         for inspector_code, daily_dict in self.inspector_daily_assignments.items():
             daily_hours = float(daily_dict.get(current_date, 0.0) or 0.0)
@@ -18039,6 +19417,15 @@ class InspectorAssignmentManager:
                     debug=True,
                 )
 
+        # select_inspectors_with_skill_combination は選択時に履歴を仮加算するため、退避して後で戻す
+        # （新製品チームの補充で候補外の検査員も加算されるため、マスタ全員分を対象にする）
+        snapshot_codes = [
+            insp.get('コード', insp.get('#ID', insp.get('コーチID', insp.get('コーチE', ''))))
+            for insp in available_inspectors
+        ]
+        if inspector_master_df is not None and '#ID' in inspector_master_df.columns:
+            snapshot_codes.extend(str(code).strip() for code in inspector_master_df['#ID'].dropna())
+        selection_snapshot = self._snapshot_selection_histories(snapshot_codes)
         selected = None
         thresholds = [0.85, 0.9, 0.95, 1.0]
         for threshold in thresholds:
@@ -18101,6 +19488,7 @@ class InspectorAssignmentManager:
             selected = candidate
             break
 
+        self._restore_selection_histories(selection_snapshot)
         if not selected:
             return False
         # 3時間分割ルール保護:
@@ -18108,31 +19496,23 @@ class InspectorAssignmentManager:
         if len(selected) < required_inspectors:
             return False
 
-        for i in range(1, MAX_INSPECTORS_PER_LOT + 1):
-            if f'検査員{i}' in result_df.columns:
-                result_df.at[idx, f'検査員{i}'] = ''
-        for i, insp in enumerate(selected, start=1):
+        display_names = []
+        for insp in selected:
             name = insp.get('氏名', '')
             skill_value = insp.get('スキル値', '')
-            display_name = f"{name}({skill_value})" if skill_value else name
-            column_name = f'検査員{i}'
-            if column_name in result_df.columns:
-                result_df.at[idx, column_name] = display_name
-        assigned_count = len(selected)
-        result_df.at[idx, '検査員人数'] = assigned_count
-        # 実際の割当人数で分割時間を再計算（必要人数ベースの暫定値を表示しない）
-        if assigned_count > 0:
-            result_df.at[idx, '分割検査時間'] = round(inspection_time / assigned_count, 1)
-        else:
-            result_df.at[idx, '分割検査時間'] = 0.0
-        self.update_team_info(result_df, idx, inspector_master_df, show_skill_values)
+            display_names.append(f"{name}({skill_value})" if skill_value else name)
+        # 実際の割当人数で分割時間を再計算（必要人数ベースの暫定値を表示しない）し、履歴へ差分を反映
         try:
-            self._rebuild_assignment_histories(result_df, inspector_master_df)
+            self.ledger_assign(
+                result_df, idx, display_names, inspector_master_df, show_skill_values,
+                inspector_codes=[insp.get('コード') for insp in selected],
+            )
         except Exception as exc:
             self.log_message(
-                f"追加割当後の履歴再構築でエラー: {exc}",
+                f"追加割当後の履歴更新でエラー: {exc}",
                 level='warning'
             )
+            self._rebuild_assignment_histories(result_df, inspector_master_df)
         return True
 
     def _log_exception_lot_summary(self, result_df: pd.DataFrame) -> None:
@@ -18682,11 +20062,8 @@ class InspectorAssignmentManager:
             raise
     
     def reset_assignment_history(self) -> None:
-        """割り当て履歴をリセット"""
-        self.inspector_assignment_count = {}
-        self.inspector_last_assignment = {}
-        self.inspector_work_hours = {}
-        self.inspector_daily_assignments = {}
-        self.inspector_product_hours = {}
+        """割り当て履歴をリセット（勤務時間・品番時間・当日洗浄上がり品の担当・割当台帳の参照カウント、状態ストアは履歴の代入で初期化）"""
+        self._rebuild_assignment_histories(None, None)
+        self.inspector_product_variety = {}
         self.relaxed_product_limit_assignments = set()
-        self.log_message("検査員割り当て履歴と勤務時間をリセットしました")
+        self.log_message("検査員割り当て履歴と勤務時間をリセットしました", debug=True)
@@ -0,0 +1,75 @@
+"""
+検査員ID（結果DataFrameの非表示列）
+検査員コードを整数IDに登録し、結果DataFrameの検査員1〜N列と並べて非表示のID列（inspector_id_1〜N）に保持する。
+各フェーズは検査員列の表示名（スキル表記付き氏名）を分解・正規化せずに、ID列から検査員コードを直接求める。
+表示名はID列の検証にだけ使い、ID列が未設定・表示名と食い違う場合（UIでの直接編集など）は呼び出し側で氏名から解決する。
+"""
+
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+# 空き枠・未登録を表すID
+EMPTY_INSPECTOR_ID = -1
+
+
+def inspector_id_column(slot: int) -> str:
+    """検査員{slot}列に対応するID列名（slotは1始まり）"""
+    return f'inspector_id_{slot}'
+
+
+def label_matches_name(label: str, name: str) -> bool:
+    """表示名が氏名そのもの、または氏名にスキル表記等の括弧書きを付けたものか"""
+    return label == name or (label.startswith(name) and label[len(name):].lstrip().startswith('('))
+
+
+class InspectorIdTable:
+    """検査員コード ↔ 整数ID の対応表（追記のみ、マネージャーの生存期間中はIDが変わらない）"""
+
+    def __init__(self) -> None:
+        # 検査員コードは最初に登録された値をそのまま保持（検査員マスタの#IDと同じ値を返すため）
+        self.codes: List[Any] = []
+        self.names: List[str] = []
+        self.code_to_id: Dict[str, int] = {}
+
+    def intern(self, code: Any, name: Any = None) -> int:
+        """検査員コードのIDを返す（未登録の場合は追加、氏名が渡された場合は更新）"""
+        if code is None or (isinstance(code, float) and pd.isna(code)):
+            return EMPTY_INSPECTOR_ID
+        code_key = str(code).strip()
+        if not code_key:
+            return EMPTY_INSPECTOR_ID
+        name_key = str(name).strip() if name is not None and not pd.isna(name) else None
+        inspector_id = self.code_to_id.get(code_key)
+        if inspector_id is None:
+            inspector_id = len(self.codes)
+            self.code_to_id[code_key] = inspector_id
+            self.codes.append(code)
+            self.names.append(name_key or '')
+        elif name_key:
+            self.names[inspector_id] = name_key
+        return inspector_id
+
+    def resolve(self, inspector_id: Any, label: Any) -> Optional[int]:
+        """
+        ID列の値が表示名と一致していればIDを返す
+
+        Returns:
+            IDが未設定・範囲外、または表示名と食い違う場合はNone
+        """
+        if inspector_id is None:
+            return None
+        try:
+            if pd.isna(inspector_id):
+                return None
+            inspector_id = int(inspector_id)
+        except (TypeError, ValueError):
+            return None
+        if inspector_id < 0 or inspector_id >= len(self.codes):
+            return None
+        name = self.names[inspector_id]
+        if not name or label is None:
+            return None
+        if not label_matches_name(str(label).strip(), name):
+            return None
+        return inspector_id
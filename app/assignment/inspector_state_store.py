@@ -0,0 +1,559 @@
+"""
+検査員状態ストア
+検査員ごとの勤務時間・品番別時間・割当回数をNumPy配列で保持し、
+実行可能性チェック（勤務時間上限・同一品番上限・割当回数上限）を全検査員分まとめてマスク計算する
+
+履歴辞書（品番別時間・品番別割当回数・日別勤務時間）は MirroredHistory として状態ストアに接続し、
+辞書への書き込みをその場で配列へ反映する（フィルタ呼び出しごとの配列再構築は行わない）
+"""
+
+from datetime import date
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+# 混入防止クラスの「他品番を担当済み」と判定する時間の下限（加減算の丸め誤差を無視する）
+CONFLICT_HOURS_EPSILON = 1e-9
+
+# 状態ストアへ接続する履歴の種類
+HISTORY_PRODUCT_HOURS = 'product_hours'  # {検査員コード: {品番: 時間}}
+HISTORY_PRODUCT_COUNTS = 'product_counts'  # {検査員コード: {品番: 回数}}
+HISTORY_DAILY_HOURS = 'daily_hours'  # {検査員コード: {日付: 時間}}
+
+
+class InspectorAvailability(NamedTuple):
+    """検査員1名分の稼働可否（休暇情報とマスタの勤務時刻から算出）"""
+
+    code: str  # 検査員コード
+    on_vacation: bool  # 終日休暇（候補から除外）
+    absence_hours: float  # 休暇による不在時間
+    max_hours: float  # 実質的な最大勤務時間（基本勤務時間 − 休憩 − 不在時間）
+
+
+class InspectorStateStore:
+    """
+    整数インデックスで検査員状態を管理するストア
+
+    - 行: 検査員（コード → 行番号）
+    - 列: 品番（品番 → 列番号）
+    - product_hours: 検査員×品番の累計時間行列
+    - product_counts: 検査員×品番の割当回数行列
+    - daily_hours: 検査員×日付の累計勤務時間行列（列: 日付 → 列番号）
+    - max_hours: 検査員別の最大勤務時間キャッシュ（NaNは未計算）
+    - on_vacation / absence_hours / has_availability: 稼働可否テーブル（休暇情報設定時・実行開始時に作成）
+    - class_hours: 検査員×混入防止クラスの累計時間（クラスに属する品番の時間の合計）
+    """
+
+    _INITIAL_PRODUCT_CAPACITY = 32
+    _INITIAL_DATE_CAPACITY = 8
+
+    def __init__(self) -> None:
+        self.codes: List[str] = []
+        self.code_to_index: Dict[str, int] = {}
+        self.products: List[str] = []
+        self.product_to_column: Dict[str, int] = {}
+        self.product_hours = np.zeros((0, self._INITIAL_PRODUCT_CAPACITY), dtype=np.float64)
+        self.product_counts = np.zeros((0, self._INITIAL_PRODUCT_CAPACITY), dtype=np.int32)
+        self.dates: List[date] = []
+        self.date_to_column: Dict[date, int] = {}
+        self.daily_hours = np.zeros((0, self._INITIAL_DATE_CAPACITY), dtype=np.float64)
+        self.max_hours = np.zeros(0, dtype=np.float64)
+        self.on_vacation = np.zeros(0, dtype=bool)
+        self.absence_hours = np.zeros(0, dtype=np.float64)
+        self.has_availability = np.zeros(0, dtype=bool)
+        self.availability_loaded = False
+        # 混入防止クラス（品番 → クラスID）
+        self.product_conflict_classes: Dict[str, Tuple[int, ...]] = {}
+        self.class_hours = np.zeros((0, 0), dtype=np.float64)
+        # 最大勤務時間キャッシュの対象マスタ（同一オブジェクトの場合のみキャッシュを使用）
+        self.master_df_id: Optional[int] = None
+
+    # ------------------------------------------------------------------
+    # インデックス管理
+    # ------------------------------------------------------------------
+    def bind_inspectors(self, codes: Iterable[Any], master_df: Any = None) -> None:
+        """検査員コード一覧から行インデックスを作り直す（状態はすべて初期化、履歴は load_histories で接続し直す）"""
+        self.codes = []
+        self.code_to_index = {}
+        for code in codes:
+            if code is None:
+                continue
+            code_key = str(code).strip()
+            if not code_key or code_key in self.code_to_index:
+                continue
+            self.code_to_index[code_key] = len(self.codes)
+            self.codes.append(code_key)
+        n = len(self.codes)
+        capacity = max(self._INITIAL_PRODUCT_CAPACITY, self.product_hours.shape[1])
+        self.products = []
+        self.product_to_column = {}
+        self.product_hours = np.zeros((n, capacity), dtype=np.float64)
+        self.product_counts = np.zeros((n, capacity), dtype=np.int32)
+        self.dates = []
+        self.date_to_column = {}
+        self.daily_hours = np.zeros((n, max(self._INITIAL_DATE_CAPACITY, self.daily_hours.shape[1])), dtype=np.float64)
+        self.max_hours = np.full(n, np.nan, dtype=np.float64)
+        self.on_vacation = np.zeros(n, dtype=bool)
+        self.absence_hours = np.zeros(n, dtype=np.float64)
+        self.has_availability = np.zeros(n, dtype=bool)
+        self.availability_loaded = False
+        self.class_hours = np.zeros((n, self.class_hours.shape[1]), dtype=np.float64)
+        self.master_df_id = id(master_df) if master_df is not None else None
+
+    def ensure_inspector(self, code: str) -> int:
+        """検査員の行インデックスを返す（未登録の場合は行を追加）"""
+        idx = self.code_to_index.get(code)
+        if idx is not None:
+            return idx
+        idx = len(self.codes)
+        self.code_to_index[code] = idx
+        self.codes.append(code)
+        width = self.product_hours.shape[1]
+        self.product_hours = np.vstack([self.product_hours, np.zeros((1, width), dtype=np.float64)])
+        self.product_counts = np.vstack([self.product_counts, np.zeros((1, width), dtype=np.int32)])
+        self.daily_hours = np.vstack([self.daily_hours, np.zeros((1, self.daily_hours.shape[1]), dtype=np.float64)])
+        self.max_hours = np.append(self.max_hours, np.nan)
+        self.on_vacation = np.append(self.on_vacation, False)
+        self.absence_hours = np.append(self.absence_hours, 0.0)
+        self.has_availability = np.append(self.has_availability, False)
+        self.class_hours = np.vstack([self.class_hours, np.zeros((1, self.class_hours.shape[1]), dtype=np.float64)])
+        return idx
+
+    def set_conflict_classes(self, product_classes: Dict[str, Tuple[int, ...]], class_count: int) -> None:
+        """混入防止クラスを設定し、クラス別累計時間を現在の品番別時間から作り直す"""
+        self.product_conflict_classes = dict(product_classes)
+        self.class_hours = np.zeros((len(self.codes), class_count), dtype=np.float64)
+        self._rebuild_class_hours()
+
+    def _rebuild_class_hours(self) -> None:
+        """品番別時間からクラス別累計時間を再計算する"""
+        self.class_hours[:] = 0.0
+        for product_number, class_ids in self.product_conflict_classes.items():
+            col = self.product_to_column.get(product_number)
+            if col is None:
+                continue
+            for class_id in class_ids:
+                self.class_hours[:, class_id] += self.product_hours[:, col]
+
+    def ensure_product(self, product_number: str) -> int:
+        """品番の列インデックスを返す（未登録の場合は列を追加、容量は倍々で拡張）"""
+        col = self.product_to_column.get(product_number)
+        if col is not None:
+            return col
+        col = len(self.products)
+        if col >= self.product_hours.shape[1]:
+            new_width = max(self._INITIAL_PRODUCT_CAPACITY, self.product_hours.shape[1] * 2)
+            rows = self.product_hours.shape[0]
+            hours = np.zeros((rows, new_width), dtype=np.float64)
+            counts = np.zeros((rows, new_width), dtype=np.int32)
+            hours[:, :col] = self.product_hours[:, :col]
+            counts[:, :col] = self.product_counts[:, :col]
+            self.product_hours = hours
+            self.product_counts = counts
+        self.product_to_column[product_number] = col
+        self.products.append(product_number)
+        return col
+
+    def ensure_date(self, work_date: date) -> int:
+        """日付の列インデックスを返す（未登録の場合は列を追加、容量は倍々で拡張）"""
+        col = self.date_to_column.get(work_date)
+        if col is not None:
+            return col
+        col = len(self.dates)
+        if col >= self.daily_hours.shape[1]:
+            new_width = max(self._INITIAL_DATE_CAPACITY, self.daily_hours.shape[1] * 2)
+            hours = np.zeros((self.daily_hours.shape[0], new_width), dtype=np.float64)
+            hours[:, :col] = self.daily_hours[:, :col]
+            self.daily_hours = hours
+        self.date_to_column[work_date] = col
+        self.dates.append(work_date)
+        return col
+
+    def indices_of(self, codes: Sequence[str]) -> np.ndarray:
+        """検査員コード列を行インデックス配列に変換（未登録コードは行を追加）"""
+        return np.fromiter(
+            (self.ensure_inspector(code) for code in codes),
+            dtype=np.int64,
+            count=len(codes),
+        )
+
+    # ------------------------------------------------------------------
+    # 状態の同期・更新
+    # ------------------------------------------------------------------
+    def load_histories(
+        self,
+        inspector_product_hours: Dict[str, Dict[str, float]],
+        inspector_product_assignment_counts: Dict[str, Dict[str, int]],
+        inspector_daily_assignments: Dict[str, Dict[date, float]],
+    ) -> Tuple['MirroredHistory', 'MirroredHistory', 'MirroredHistory']:
+        """
+        履歴辞書から配列を再構築し、以降の書き込みを差分反映する履歴として接続し直す（実行開始時に1回）
+
+        Returns:
+            (品番別時間, 品番別割当回数, 日別勤務時間) の MirroredHistory
+        """
+        return (
+            self.attach_history(HISTORY_PRODUCT_HOURS, inspector_product_hours),
+            self.attach_history(HISTORY_PRODUCT_COUNTS, inspector_product_assignment_counts),
+            self.attach_history(HISTORY_DAILY_HOURS, inspector_daily_assignments),
+        )
+
+    def attach_history(self, kind: str, histories: Dict[str, Dict[Any, Any]]) -> 'MirroredHistory':
+        """
+        履歴1種類分の配列を作り直し、配列へ書き込みを反映する MirroredHistory を返す
+
+        Args:
+            kind: HISTORY_PRODUCT_HOURS / HISTORY_PRODUCT_COUNTS / HISTORY_DAILY_HOURS
+            histories: {検査員コード: {キー: 値}} の履歴辞書（内容をコピーして接続する）
+        """
+        if kind == HISTORY_PRODUCT_HOURS:
+            self.product_hours[:, : len(self.products)] = 0.0
+            self.class_hours[:] = 0.0
+        elif kind == HISTORY_PRODUCT_COUNTS:
+            self.product_counts[:, : len(self.products)] = 0
+        else:
+            self.daily_hours[:, : len(self.dates)] = 0.0
+        mirrored = MirroredHistory(self, kind)
+        for code, row in histories.items():
+            mirrored[code] = row
+        return mirrored
+
+    def write_history_value(self, kind: str, code: str, key: Any, value: Any, previous: Any) -> None:
+        """
+        履歴1件（検査員×キー）の書き込みを配列へ反映する
+
+        行列のセルには辞書の値をそのまま書き込み（加減算の丸め誤差を溜めない）、
+        クラス別累計時間だけは前回値との差分で更新する
+        """
+        row = self.ensure_inspector(code)
+        if kind == HISTORY_DAILY_HOURS:
+            col = self.ensure_date(key)
+            self.daily_hours[row, col] = value
+            return
+        # 列の追加で配列が作り直されるため、列番号を先に確定してから書き込む
+        col = self.ensure_product(key)
+        if kind == HISTORY_PRODUCT_COUNTS:
+            self.product_counts[row, col] = value
+            return
+        self.product_hours[row, col] = value
+        delta = value - previous
+        if delta:
+            for class_id in self.product_conflict_classes.get(key, ()):
+                self.class_hours[row, class_id] += delta
+
+    def add_assignment(
+        self,
+        code: str,
+        product_number: str,
+        hours: float,
+        count: int = 1,
+        work_date: Optional[date] = None,
+    ) -> None:
+        """割当の差分を配列へ反映（count/hoursに負値を渡すと解除、履歴辞書を接続していない場合に使用）"""
+        row = self.ensure_inspector(code)
+        col = self.ensure_product(product_number)
+        self.product_hours[row, col] += hours
+        self.product_counts[row, col] += count
+        for class_id in self.product_conflict_classes.get(product_number, ()):
+            self.class_hours[row, class_id] += hours
+        if work_date is not None:
+            self.daily_hours[row, self.ensure_date(work_date)] += hours
+
+    # ------------------------------------------------------------------
+    # 参照
+    # ------------------------------------------------------------------
+    def product_column(self, product_number: str, indices: Optional[np.ndarray] = None) -> np.ndarray:
+        """品番の累計時間列（未登録品番はゼロ）"""
+        col = self.product_to_column.get(product_number)
+        rows = indices if indices is not None else slice(None)
+        if col is None:
+            return np.zeros(len(self.codes) if indices is None else len(indices), dtype=np.float64)
+        return self.product_hours[rows, col]
+
+    def count_column(self, product_number: str, indices: Optional[np.ndarray] = None) -> np.ndarray:
+        """品番の割当回数列（未登録品番はゼロ）"""
+        col = self.product_to_column.get(product_number)
+        rows = indices if indices is not None else slice(None)
+        if col is None:
+            return np.zeros(len(self.codes) if indices is None else len(indices), dtype=np.int32)
+        return self.product_counts[rows, col]
+
+    def daily_column(self, work_date: Optional[date], indices: Optional[np.ndarray] = None) -> np.ndarray:
+        """日付の累計勤務時間列（未登録日はゼロ）"""
+        col = self.date_to_column.get(work_date)
+        rows = indices if indices is not None else slice(None)
+        if col is None:
+            return np.zeros(len(self.codes) if indices is None else len(indices), dtype=np.float64)
+        return self.daily_hours[rows, col]
+
+    def reset_max_hours(self) -> None:
+        """最大勤務時間キャッシュと稼働可否テーブルを破棄（休暇情報・マスタ変更時に呼ぶ）"""
+        self.max_hours[:] = np.nan
+        self.on_vacation[:] = False
+        self.absence_hours[:] = 0.0
+        self.has_availability[:] = False
+        self.availability_loaded = False
+
+    def load_availability(self, master_df: Any, entries: Iterable[InspectorAvailability]) -> None:
+        """稼働可否テーブルを配列へ反映する（最大勤務時間キャッシュも同時に埋める）"""
+        self.reset_max_hours()
+        if self.master_df_id is None or id(master_df) != self.master_df_id:
+            return
+        for entry in entries:
+            idx = self.ensure_inspector(entry.code)
+            self.on_vacation[idx] = entry.on_vacation
+            self.absence_hours[idx] = entry.absence_hours
+            self.max_hours[idx] = entry.max_hours
+            self.has_availability[idx] = True
+        self.availability_loaded = True
+
+    def availability_ready(self, master_df: Any) -> bool:
+        """指定マスタに対する稼働可否テーブルが作成済みか"""
+        return self.availability_loaded and self.master_df_id is not None and id(master_df) == self.master_df_id
+
+    def availability_mask(self, indices: np.ndarray, master_df: Any) -> np.ndarray:
+        """稼働可否テーブルに載っている検査員のマスク（テーブル未作成・別マスタの場合はすべてFalse）"""
+        if not self.availability_ready(master_df):
+            return np.zeros(len(indices), dtype=bool)
+        return self.has_availability[indices]
+
+    def cached_max_hours(self, code: str, master_df: Any) -> Optional[float]:
+        """キャッシュ済みの最大勤務時間を返す（未計算または別マスタの場合はNone）"""
+        if self.master_df_id is None or id(master_df) != self.master_df_id:
+            return None
+        idx = self.code_to_index.get(code)
+        if idx is None:
+            return None
+        value = self.max_hours[idx]
+        if np.isnan(value):
+            return None
+        return float(value)
+
+    def store_max_hours(self, code: str, master_df: Any, hours: float) -> None:
+        """最大勤務時間をキャッシュへ保存"""
+        if self.master_df_id is None or id(master_df) != self.master_df_id:
+            return
+        self.max_hours[self.ensure_inspector(code)] = hours
+
+    def remaining_capacity(self, indices: np.ndarray, work_date: Optional[date], overrun_rate: float = 0.0) -> np.ndarray:
+        """残り勤務可能時間（最大勤務時間×(1+超過率) − 対象日の累計）"""
+        return self.max_hours[indices] * (1.0 + overrun_rate) - self.daily_column(work_date, indices)
+
+    # ------------------------------------------------------------------
+    # 実行可能性マスク（True=除外）
+    # ------------------------------------------------------------------
+    def product_limit_exceeded_mask(
+        self,
+        indices: np.ndarray,
+        product_number: str,
+        additional_hours: float,
+        threshold_hours: float,
+    ) -> np.ndarray:
+        """同一品番の累計時間が閾値以上になる検査員のマスク"""
+        return self.product_column(product_number, indices) + additional_hours >= threshold_hours
+
+    def count_limit_reached_mask(
+        self,
+        indices: np.ndarray,
+        product_number: str,
+        max_count: int,
+    ) -> np.ndarray:
+        """同一品番の割当回数が上限に達している検査員のマスク"""
+        return self.count_column(product_number, indices) >= max_count
+
+    def conflict_mask(self, indices: np.ndarray, product_number: str) -> np.ndarray:
+        """同じ混入防止クラスの別品番を既に担当している検査員のマスク（クラス別累計時間 − 当該品番の時間で判定）"""
+        mask = np.zeros(len(indices), dtype=bool)
+        class_ids = self.product_conflict_classes.get(product_number)
+        if not class_ids:
+            return mask
+        own_hours = self.product_column(product_number, indices)
+        for class_id in class_ids:
+            mask |= self.class_hours[indices, class_id] - own_hours > CONFLICT_HOURS_EPSILON
+        return mask
+
+
+# ----------------------------------------------------------------------
+# 状態ストアへ書き込みを反映する履歴辞書
+# ----------------------------------------------------------------------
+def _history_number(value: Any) -> Any:
+    """配列へ反映できる数値か（数値以外は0扱い）"""
+    return value if isinstance(value, (int, float, np.number)) else 0
+
+
+class _HistoryRow(dict):
+    """検査員1名分の履歴行（{キー: 値}、書き込みを所属する MirroredHistory 経由で配列へ反映する）"""
+
+    __slots__ = ('_history', '_code')
+
+    def __init__(self, history: Optional['MirroredHistory'], code: str) -> None:
+        super().__init__()
+        self._history = history
+        self._code = code
+
+    def _write(self, key: Any, value: Any, previous: Any) -> None:
+        history = self._history
+        if history is not None and history._store is not None:
+            history._store.write_history_value(
+                history._kind, self._code, key, _history_number(value), _history_number(previous)
+            )
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        previous = dict.get(self, key, 0)
+        dict.__setitem__(self, key, value)
+        self._write(key, value, previous)
+
+    def __delitem__(self, key: Any) -> None:
+        previous = dict.__getitem__(self, key)
+        dict.__delitem__(self, key)
+        self._write(key, 0, previous)
+
+    def pop(self, key: Any, *default: Any) -> Any:
+        if key not in self:
+            return dict.pop(self, key, *default)
+        previous = dict.pop(self, key)
+        self._write(key, 0, previous)
+        return previous
+
+    def popitem(self) -> Tuple[Any, Any]:
+        key, previous = dict.popitem(self)
+        self._write(key, 0, previous)
+        return key, previous
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        if key not in self:
+            self[key] = default
+        return dict.__getitem__(self, key)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def __ior__(self, other: Any) -> '_HistoryRow':
+        self.update(other)
+        return self
+
+    def clear(self) -> None:
+        while self:
+            self.popitem()
+
+    def copy(self) -> Dict[Any, Any]:
+        return dict(self)
+
+    def __copy__(self) -> Dict[Any, Any]:
+        return dict(self)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Dict[Any, Any]:
+        return dict(self)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # 単独でpickleされた場合は通常の辞書として復元する
+        return (dict, (dict(self),))
+
+
+class MirroredHistory(dict):
+    """
+    状態ストアへ接続された履歴辞書（{検査員コード: {キー: 値}}）
+
+    行・値の書き込み、削除、行の差し替えをその場で状態ストアの配列へ反映する。
+    読み取りは通常の辞書と同じ（コピー・deepcopy は通常の辞書を返す）。
+    接続を外した履歴（detach 後）は通常の辞書として振る舞う。
+    """
+
+    __slots__ = ('_store', '_kind')
+
+    def __init__(self, store: Optional[InspectorStateStore], kind: str) -> None:
+        super().__init__()
+        self._store = store
+        self._kind = kind
+
+    def detach(self) -> None:
+        """状態ストアとの接続を外す（履歴を差し替えたときに旧履歴から呼ぶ）"""
+        self._store = None
+
+    def _new_row(self, code: str, values: Any) -> _HistoryRow:
+        row = _HistoryRow(self, code)
+        if values:
+            for key, value in dict(values).items():
+                row[key] = value
+        return row
+
+    def _drop_row(self, row: Any) -> None:
+        """行の値を配列から消して行を切り離す（呼び出し側が保持している行の内容は変えない）"""
+        if isinstance(row, _HistoryRow) and row._history is self:
+            for key, value in row.items():
+                row._write(key, 0, value)
+            row._history = None
+
+    def __setitem__(self, code: str, values: Any) -> None:
+        previous = dict.get(self, code)
+        if previous is values and isinstance(values, _HistoryRow):
+            return
+        if previous is not None:
+            self._drop_row(previous)
+        dict.__setitem__(self, code, self._new_row(code, values))
+
+    def __delitem__(self, code: str) -> None:
+        row = dict.__getitem__(self, code)
+        dict.__delitem__(self, code)
+        self._drop_row(row)
+
+    def pop(self, code: str, *default: Any) -> Any:
+        if code not in self:
+            return dict.pop(self, code, *default)
+        row = dict.pop(self, code)
+        self._drop_row(row)
+        return row
+
+    def popitem(self) -> Tuple[str, Any]:
+        code, row = dict.popitem(self)
+        self._drop_row(row)
+        return code, row
+
+    def setdefault(self, code: str, default: Any = None) -> Any:
+        if code not in self:
+            self[code] = default
+        return dict.__getitem__(self, code)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        for code, values in dict(*args, **kwargs).items():
+            self[code] = values
+
+    def __ior__(self, other: Any) -> 'MirroredHistory':
+        self.update(other)
+        return self
+
+    def clear(self) -> None:
+        while self:
+            self.popitem()
+
+    def plain_rows(self) -> Dict[str, Dict[Any, Any]]:
+        """接続のない通常の辞書として内容を複製する"""
+        return {code: dict(row) for code, row in self.items()}
+
+    def copy(self) -> Dict[str, Dict[Any, Any]]:
+        return dict(self)
+
+    def __copy__(self) -> Dict[str, Dict[Any, Any]]:
+        return dict(self)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Dict[str, Dict[Any, Any]]:
+        return self.plain_rows()
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # 状態ストアと一緒にpickleされる前提で、配列へは反映せずに接続だけ復元する
+        return (_restore_mirrored_history, (self._store, self._kind, self.plain_rows()))
+
+
+def _restore_mirrored_history(
+    store: Optional[InspectorStateStore],
+    kind: str,
+    rows: Dict[str, Dict[Any, Any]],
+) -> MirroredHistory:
+    """pickleから MirroredHistory を復元する（配列はストア側の内容をそのまま使う）"""
+    history = MirroredHistory(store, kind)
+    for code, values in rows.items():
+        row = _HistoryRow(history, code)
+        dict.update(row, values)
+        dict.__setitem__(history, code, row)
+    return history
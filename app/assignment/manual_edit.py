@@ -0,0 +1,81 @@
+"""
+手動修正の差分検証
+検査員割当テーブルで1枠だけ変更した場合に、全体最適化を再実行せずに
+影響を受けた検査員だけの勤務時間・同一品番時間を再評価し、違反と局所的な差し替え候補を返す。
+履歴の差分更新は割当台帳（ledger_move / ledger_unassign）が担い、本モジュールは結果の型と候補の順位付けを持つ。
+"""
+
+from typing import Any, Callable, Iterable, List, NamedTuple, Set, Tuple
+
+# 違反種別
+VIOLATION_WORK_HOURS = 'work_hours'  # 当日勤務時間の上限超過
+VIOLATION_PRODUCT_LIMIT = 'product_limit'  # 同一品番の累計時間上限超過
+VIOLATION_DUPLICATE = 'duplicate'  # 同一ロット内で同じ検査員が重複
+
+
+class EditViolation(NamedTuple):
+    """手動修正後に検出された違反1件分"""
+
+    kind: str  # 違反種別（VIOLATION_*）
+    code: str  # 検査員コード
+    name: str  # 検査員名
+    value: float  # 実績（当日勤務時間・品番累計時間・重複数）
+    limit: float  # 上限
+
+
+class SwapSuggestion(NamedTuple):
+    """違反を解消できる局所的な差し替え候補（編集したロットの1枠を入れ替える）"""
+
+    column: str  # 差し替え対象の検査員列
+    out_code: str  # 外す検査員コード
+    in_code: str  # 入れる検査員コード
+    in_name: str  # 入れる検査員名
+    daily_hours_after: float  # 差し替え後の当日勤務時間（入れる検査員）
+    product_hours_after: float  # 差し替え後の品番累計時間（入れる検査員）
+
+
+class ManualEditResult(NamedTuple):
+    """apply_manual_edit の結果"""
+
+    index: Any  # 編集したロットの行インデックス
+    affected_codes: Tuple[str, ...]  # 再評価した検査員コード（編集前後のロット構成員）
+    violations: Tuple[EditViolation, ...]
+    suggestions: Tuple[SwapSuggestion, ...]
+    elapsed_ms: float  # 差分更新と検証に要した時間
+
+
+def rank_swap_candidates(
+    candidate_codes: Iterable[str],
+    excluded_codes: Set[str],
+    divided_time: float,
+    daily_hours: Callable[[str], float],
+    product_hours: Callable[[str], float],
+    allowed_hours: Callable[[str], float],
+    product_limit: float,
+    tie_break: Callable[[str], Any],
+    limit: int,
+) -> List[Tuple[str, float, float]]:
+    """
+    差し替え候補を勤務時間・品番時間の余裕で順位付けする
+
+    当日勤務時間・品番累計時間に分割検査時間を加えても上限内に収まる検査員だけを対象とし、
+    (当日勤務時間, 品番累計時間, tie_break) の昇順で上位 limit 件を返す。
+
+    Returns:
+        (検査員コード, 差し替え後の当日勤務時間, 差し替え後の品番累計時間) のリスト
+    """
+    ranked: List[Tuple[float, float, Any, str]] = []
+    seen: Set[str] = set()
+    for code in candidate_codes:
+        if not code or code in excluded_codes or code in seen:
+            continue
+        seen.add(code)
+        daily_after = daily_hours(code) + divided_time
+        if daily_after > allowed_hours(code):
+            continue
+        product_after = product_hours(code) + divided_time
+        if product_after > product_limit:
+            continue
+        ranked.append((daily_after, product_after, tie_break(code), code))
+    ranked.sort()
+    return [(code, daily_after, product_after) for daily_after, product_after, _, code in ranked[:limit]]
@@ -0,0 +1,84 @@
+"""
+類似製品の混入防止
+見た目が似ている品番のグループ（混入防止グループ）を設定ファイルから読み込み、品番 → 混入防止クラス の参照表にコンパイルする。
+同じクラスに属する別品番を既に担当している検査員には割り当てない。
+検査員ごとのクラス別累計時間は状態ストア（InspectorStateStore）が保持し、候補判定はクラス単位の配列参照で行う。
+
+設定ファイル（CSV, UTF-8）は1行1グループで、各列に品番を並べる（2品番以上の行のみ有効、# で始まる行はコメント）。
+"""
+
+import csv
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple, Union
+
+# 設定ファイルが指定されていない場合の混入防止グループ
+DEFAULT_MIX_PREVENTION_GROUPS: Tuple[Tuple[str, ...], ...] = (
+    ("08131-00810", "08131-01010"),
+)
+
+
+def load_mix_prevention_groups(path: Optional[Union[str, Path]]) -> List[Tuple[str, ...]]:
+    """
+    混入防止グループの設定ファイルを読み込む
+
+    Raises:
+        OSError: ファイルを読み込めない場合
+    """
+    if not path:
+        return []
+    groups: List[Tuple[str, ...]] = []
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        for row in csv.reader(f):
+            cells = [cell.strip() for cell in row]
+            if not cells or cells[0].startswith('#'):
+                continue
+            products = tuple(dict.fromkeys(cell for cell in cells if cell))
+            if len(products) >= 2:
+                groups.append(products)
+    return groups
+
+
+class MixPreventionIndex:
+    """
+    コンパイル済みの混入防止グループ
+
+    - classes: 混入防止クラス（クラスID → 品番の集合、重複グループは1つにまとめる）
+    - product_classes: {品番: 所属するクラスIDのタプル}
+    """
+
+    def __init__(self, classes: List[FrozenSet[str]]) -> None:
+        self.classes = classes
+        self.product_classes: Dict[str, Tuple[int, ...]] = {}
+        for class_id, members in enumerate(classes):
+            for product_number in sorted(members):
+                self.product_classes[product_number] = self.product_classes.get(product_number, ()) + (class_id,)
+
+    @classmethod
+    def build(cls, groups: Iterable[Sequence[str]]) -> "MixPreventionIndex":
+        """品番グループの並びからインデックスを構築する（2品番未満のグループは無視）"""
+        classes: List[FrozenSet[str]] = []
+        seen: set = set()
+        for group in groups:
+            members = frozenset(str(product).strip() for product in group if str(product).strip())
+            if len(members) < 2 or members in seen:
+                continue
+            seen.add(members)
+            classes.append(members)
+        return cls(classes)
+
+    @property
+    def groups(self) -> List[Tuple[str, ...]]:
+        """クラスを品番グループの並びとして返す（別のマネージャーへの引き継ぎ用）"""
+        return [tuple(sorted(members)) for members in self.classes]
+
+    def classes_of(self, product_number: str) -> Tuple[int, ...]:
+        """品番が属する混入防止クラスID（対象外の品番は空）"""
+        return self.product_classes.get(product_number, ())
+
+    def counterparts(self, product_number: str) -> Tuple[str, ...]:
+        """品番と同じクラスに属する別品番（ログ出力用、品番順）"""
+        counterparts = set()
+        for class_id in self.classes_of(product_number):
+            counterparts |= self.classes[class_id]
+        counterparts.discard(product_number)
+        return tuple(sorted(counterparts))
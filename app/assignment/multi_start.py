@@ -0,0 +1,341 @@
+"""
+マルチスタート最適化
+同点ブレーカー（候補検査員の順位・同順位ロットの並び）をシードで摂動した割当（assign_inspectors + optimize_assignments）を
+別プロセスで並列に実行し、KPIスコアが最良の結果を採用する。
+
+- スタート0は摂動なし（従来と同じ割当ロジック）、スタート1以降はシードで摂動する
+- 全スタートをワーカープロセス（subprocess）で実行し、待ち時間の上限（wall-clock）を超えたらスタート0も含めて打ち切る。
+  スタート0が上限までに完了しなかった場合は呼び出し元のプロセスで摂動なしの割当を1回実行する
+- ワーカーの PYTHONHASHSEED はベースシードから決め、ワーカーの環境変数として渡す（呼び出し元の os.environ は変更しない）。
+  同じシード・同じ完了スタートなら結果は同じになる
+- exe化後は main.py が MULTI_START_WORKER_FLAG 付きの起動をワーカーとして処理する
+"""
+
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+import zlib
+from pathlib import Path
+from time import perf_counter
+from typing import IO, TYPE_CHECKING, Any, Dict, List, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+if TYPE_CHECKING:
+    from app.assignment.inspector_assignment_service import InspectorAssignmentManager
+
+
+# exe化後にワーカーとして起動する際のコマンドライン引数（main.py で処理する）
+MULTI_START_WORKER_FLAG = '--multi-start-worker'
+
+_PROJECT_ROOT = Path(__file__).resolve().parents[2]
+_POLL_INTERVAL_SECONDS = 0.05
+
+
+class AssignmentScore(NamedTuple):
+    """割当結果のKPIスコア（各項目とも小さいほど良い、項目順に比較）"""
+
+    unassigned_hours: float  # 未割当ロットの検査時間合計
+    overrun_hours: float  # 勤務時間上限の超過量合計
+    utilization_spread: float  # 稼働率（勤務時間 / 上限）の最大 - 最小
+
+
+class StartResult(NamedTuple):
+    """1スタート分の結果"""
+
+    start: int
+    tie_break_seed: Optional[int]
+    score: AssignmentScore
+    elapsed: float
+    result_df: pd.DataFrame
+
+
+def derive_tie_break_seed(base_seed: int, start: int) -> Optional[int]:
+    """スタート番号ごとの同点ブレーカー用シード（スタート0は摂動なし）"""
+    if start == 0:
+        return None
+    return zlib.crc32(f"{base_seed}:{start}".encode('utf-8'))
+
+
+def tie_break_rank(seed: int, value: Any) -> int:
+    """シード付きの同点ブレーカー順位（プロセス間で同じ値になるよう crc32 を使用）"""
+    return zlib.crc32(f"{seed}:{value}".encode('utf-8'))
+
+
+def score_assignment(
+    manager: "InspectorAssignmentManager",
+    result_df: pd.DataFrame,
+    inspector_master_df: pd.DataFrame,
+) -> AssignmentScore:
+    """割当結果のKPIスコアを算出する（稼働率は _log_utilization_summary と同じく勤務時間 / 超過許容込み上限）"""
+    if result_df is None or result_df.empty or '検査時間' not in result_df.columns:
+        return AssignmentScore(0.0, 0.0, 0.0)
+    inspection_time = pd.to_numeric(result_df['検査時間'], errors='coerce').fillna(0.0)
+    if '検査員人数' in result_df.columns:
+        counts = pd.to_numeric(result_df['検査員人数'], errors='coerce').fillna(0)
+    else:
+        counts = pd.Series(0, index=result_df.index)
+    unassigned_hours = float(inspection_time[(counts <= 0) & (inspection_time > 0)].sum())
+
+    if '分割検査時間' in result_df.columns:
+        divided_time = pd.to_numeric(result_df['分割検査時間'], errors='coerce').fillna(0.0).tolist()
+    else:
+        divided_time = [0.0] * len(result_df)
+    hours_by_code: Dict[str, float] = {}
+    name_to_code: Dict[str, Optional[str]] = {}
+    inspector_columns = [
+        column for column in result_df.columns
+        if column.startswith('検査員') and column[len('検査員'):].isdigit()
+    ]
+    for column in inspector_columns:
+        for pos, value in enumerate(result_df[column].tolist()):
+            if value is None or pd.isna(value):
+                continue
+            name = str(value).split('(')[0].strip()
+            if not name:
+                continue
+            if name not in name_to_code:
+                name_to_code[name] = manager._get_inspector_id_by_name(name, inspector_master_df)
+            code = name_to_code[name]
+            if code:
+                hours_by_code[code] = hours_by_code.get(code, 0.0) + float(divided_time[pos])
+
+    overrun_hours = 0.0
+    utilizations: List[float] = []
+    if '#ID' in inspector_master_df.columns:
+        for raw_code in inspector_master_df['#ID'].dropna().tolist():
+            code = str(raw_code).strip()
+            allowed_max = manager._apply_work_hours_overrun(manager.get_inspector_max_hours(code, inspector_master_df))
+            if allowed_max <= 0:
+                continue
+            hours = hours_by_code.get(code, 0.0)
+            overrun_hours += max(0.0, hours - allowed_max)
+            utilizations.append(hours / allowed_max)
+    spread = (max(utilizations) - min(utilizations)) if utilizations else 0.0
+    return AssignmentScore(round(unassigned_hours, 2), round(overrun_hours, 2), round(spread, 4))
+
+
+def _discard_log(message: Any, level: str = 'info', channel: Any = None) -> None:
+    return None
+
+
+def _run_start(
+    state: Dict[str, Any],
+    start: int,
+    tie_break_seed: Optional[int],
+    arguments: Tuple[Any, ...],
+) -> Tuple[int, AssignmentScore, float, pd.DataFrame]:
+    """ワーカープロセスで1スタート分の割当を実行する"""
+    from app.assignment.inspector_assignment_service import InspectorAssignmentManager
+    from app.utils.phase_profiler import PhaseProfiler
+
+    manager = InspectorAssignmentManager.__new__(InspectorAssignmentManager)
+    manager.__dict__.update(state)
+    manager.log_callback = _discard_log
+    manager.phase_profiler = PhaseProfiler(manager._profile_counters)
+    manager.tie_break_seed = tie_break_seed
+    inspector_df, inspector_master_df, skill_master_df, show_skill_values, process_master_df, keywords = arguments
+    started = perf_counter()
+    result_df = manager.assign_inspectors(
+        inspector_df,
+        inspector_master_df,
+        skill_master_df,
+        show_skill_values=show_skill_values,
+        process_master_df=process_master_df,
+        inspection_target_keywords=keywords,
+    )
+    elapsed = perf_counter() - started
+    return start, score_assignment(manager, result_df, inspector_master_df), elapsed, result_df
+
+
+def worker_main(argv: List[str]) -> int:
+    """
+    ワーカープロセスの入口: タスクファイル（pickle）を読み込んで1スタート分を実行し、結果ファイルに書き出す
+
+    Args:
+        argv: [タスクファイルのパス, 結果ファイルのパス]
+
+    Returns:
+        終了コード（0: 成功）
+    """
+    task_path, result_path = argv[0], argv[1]
+    try:
+        with open(task_path, 'rb') as task_file:
+            state, start, tie_break_seed, arguments = pickle.load(task_file)
+        outcome = _run_start(state, start, tie_break_seed, arguments)
+        temp_path = f"{result_path}.tmp"
+        with open(temp_path, 'wb') as result_file:
+            pickle.dump(outcome, result_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, result_path)
+    except Exception:
+        traceback.print_exc()
+        return 1
+    return 0
+
+
+def _worker_command(task_path: Path, result_path: Path) -> List[str]:
+    """ワーカープロセスの起動コマンド"""
+    if getattr(sys, 'frozen', False):
+        return [sys.executable, MULTI_START_WORKER_FLAG, str(task_path), str(result_path)]
+    return [
+        sys.executable,
+        '-c',
+        'import sys; from app.assignment.multi_start import worker_main; sys.exit(worker_main(sys.argv[1:]))',
+        str(task_path),
+        str(result_path),
+    ]
+
+
+def _worker_env(hash_seed: int) -> Dict[str, str]:
+    """ワーカープロセスの環境変数（集合の列挙順をスタート間で揃えるため、ハッシュシードを固定する）"""
+    env = dict(os.environ)
+    env['PYTHONHASHSEED'] = str(hash_seed)
+    if not getattr(sys, 'frozen', False):
+        python_path = env.get('PYTHONPATH')
+        env['PYTHONPATH'] = str(_PROJECT_ROOT) + (os.pathsep + python_path if python_path else '')
+    return env
+
+
+class _Worker(NamedTuple):
+    """実行中のワーカープロセス"""
+
+    process: "subprocess.Popen[bytes]"
+    result_path: Path
+    error_log: IO[bytes]
+
+
+def _error_summary(worker: _Worker) -> str:
+    """ワーカーのエラー出力の最終行（例外メッセージ）"""
+    try:
+        worker.error_log.seek(0)
+        lines = [line for line in worker.error_log.read().decode('utf-8', errors='replace').splitlines() if line.strip()]
+    except Exception:
+        lines = []
+    return lines[-1] if lines else f"終了コード {worker.process.returncode}"
+
+
+def run_multi_start(
+    manager: "InspectorAssignmentManager",
+    inspector_df: pd.DataFrame,
+    inspector_master_df: pd.DataFrame,
+    skill_master_df: pd.DataFrame,
+    show_skill_values: bool,
+    process_master_df: Optional[pd.DataFrame],
+    inspection_target_keywords: Optional[List[str]],
+    starts: int,
+    time_budget_seconds: float,
+    base_seed: int,
+    max_workers: Optional[int] = None,
+) -> Tuple[pd.DataFrame, List[StartResult], bool]:
+    """
+    マルチスタートで割当を実行し、(採用した結果, 完了した全スタートの結果, 呼び出し元で実行したか) を返す
+
+    待ち時間の上限はスタート0を含む全ワーカーに適用し、上限を超えたら実行中のワーカーを終了する。
+    スタート0のワーカーが上限までに完了しなかった場合（起動・実行の失敗を含む）は呼び出し元の manager で
+    摂動なしの割当を実行するため、従来どおりの結果が得られる（この場合のみ manager の履歴が更新される）。
+    """
+    budget_started = perf_counter()
+    state = manager._export_multi_start_state()
+    arguments = (
+        inspector_df,
+        inspector_master_df,
+        skill_master_df,
+        show_skill_values,
+        process_master_df,
+        inspection_target_keywords,
+    )
+    start_numbers = list(range(max(1, starts)))
+    if max_workers is None:
+        max_workers = os.cpu_count() or 2
+    max_workers = max(1, min(max_workers, len(start_numbers)))
+    env = _worker_env(base_seed & 0xFFFFFFFF)
+    creation_flags = getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+
+    results: List[StartResult] = []
+    pending = list(start_numbers)
+    running: Dict[int, _Worker] = {}
+    timed_out = 0
+    with tempfile.TemporaryDirectory(prefix='multi_start_') as work_dir:
+        try:
+            while pending or running:
+                if perf_counter() - budget_started > time_budget_seconds:
+                    timed_out = len(pending) + len(running)
+                    break
+                while pending and len(running) < max_workers:
+                    start = pending.pop(0)
+                    task_path = Path(work_dir) / f"start{start}.task"
+                    result_path = Path(work_dir) / f"start{start}.result"
+                    error_log = open(Path(work_dir) / f"start{start}.log", 'w+b')
+                    try:
+                        with open(task_path, 'wb') as task_file:
+                            pickle.dump(
+                                (state, start, derive_tie_break_seed(base_seed, start), arguments),
+                                task_file,
+                                protocol=pickle.HIGHEST_PROTOCOL,
+                            )
+                        process = subprocess.Popen(
+                            _worker_command(task_path, result_path),
+                            env=env,
+                            stdout=subprocess.DEVNULL,
+                            stderr=error_log,
+                            creationflags=creation_flags,
+                        )
+                    except Exception as exc:
+                        error_log.close()
+                        manager.log_message(f"マルチスタート: スタート{start}のワーカーを起動できません: {exc}", level='warning')
+                        continue
+                    running[start] = _Worker(process, result_path, error_log)
+
+                for start, worker in list(running.items()):
+                    if worker.process.poll() is None:
+                        continue
+                    del running[start]
+                    try:
+                        if worker.process.returncode != 0:
+                            raise RuntimeError(_error_summary(worker))
+                        with open(worker.result_path, 'rb') as result_file:
+                            _, score, elapsed, result_df = pickle.load(result_file)
+                    except Exception as exc:
+                        manager.log_message(f"マルチスタート: スタート{start}の実行に失敗しました: {exc}", level='warning')
+                        continue
+                    finally:
+                        worker.error_log.close()
+                    results.append(StartResult(start, derive_tie_break_seed(base_seed, start), score, elapsed, result_df))
+
+                if running:
+                    time.sleep(_POLL_INTERVAL_SECONDS)
+        finally:
+            for worker in running.values():
+                worker.process.kill()
+                worker.process.wait()
+                worker.error_log.close()
+    if timed_out:
+        manager.log_message(
+            f"マルチスタート: 待ち時間の上限 {time_budget_seconds:.0f}秒 に達したため {timed_out}件のスタートを打ち切りました",
+            level='warning',
+        )
+
+    ran_in_process = False
+    if not any(result.start == 0 for result in results):
+        manager.log_message("マルチスタート: スタート0をこのプロセスで実行します", level='warning')
+        started = perf_counter()
+        baseline_df = manager.assign_inspectors(
+            inspector_df,
+            inspector_master_df,
+            skill_master_df,
+            show_skill_values=show_skill_values,
+            process_master_df=process_master_df,
+            inspection_target_keywords=inspection_target_keywords,
+        )
+        results.append(StartResult(
+            0, None, score_assignment(manager, baseline_df, inspector_master_df), perf_counter() - started, baseline_df
+        ))
+        ran_in_process = True
+
+    results.sort(key=lambda result: result.start)
+    best = min(results, key=lambda result: (result.score, result.start))
+    return best.result_df, results, ran_in_process and best.start == 0
@@ -0,0 +1,88 @@
+"""
+全体最適化の時間予算と中止要求（anytime最適化）
+時間予算（wall-clock）を超えた場合やUIスレッドから中止が要求された場合は、改善のみを目的とするループ
+（フェーズ2の偏り是正パス・フェーズ3の未割当再処理・フェーズ2.7の追加割当）をその場で打ち切る。
+違反の是正・検証（フェーズ1・1.5・2.5・3.5）と最終是正（フェーズ4・2.6・仕上げ）は打ち切らないため、
+途中で打ち切っても返す結果は通常の実行と同じルールを満たす。
+
+- 検証済みのフェーズ境界（フェーズ2.5・3.5の完了時点）で割当結果のスナップショットを取り、
+  打ち切った場合はKPIスコアが最良のスナップショットからフェーズ4を実行する
+- 時間予算が0の場合は無制限（中止要求がない限り従来どおり全フェーズを実行する）
+"""
+
+import threading
+from time import perf_counter
+from typing import Any, Dict, NamedTuple, Optional
+
+import pandas as pd
+
+from app.assignment.multi_start import AssignmentScore
+
+# 打ち切り理由
+STOP_REASON_TIME_BUDGET = 'time_budget'  # 時間予算を超過
+STOP_REASON_CANCELLED = 'cancelled'  # 中止要求
+
+
+class PhaseSnapshot(NamedTuple):
+    """フェーズ境界時点の割当結果"""
+
+    phase: str  # スナップショットを取った直後に開始するフェーズ
+    score: AssignmentScore
+    elapsed: float  # 計測開始からの経過秒数
+    result_df: pd.DataFrame
+
+
+class OptimizationBudget:
+    """全体最適化の時間予算・中止要求・最良スナップショット"""
+
+    def __init__(self, time_budget_seconds: float = 0.0):
+        self.time_budget_seconds = max(0.0, float(time_budget_seconds or 0.0))
+        self._cancel_event = threading.Event()
+        self._started_at: Optional[float] = None
+        self._deadline: Optional[float] = None
+        self.stop_reason: Optional[str] = None
+        self.best: Optional[PhaseSnapshot] = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # マルチスタートのワーカーへは設定値だけを渡す（Event はプロセス間で共有できない）
+        return {'time_budget_seconds': self.time_budget_seconds}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(state.get('time_budget_seconds', 0.0))
+
+    def start(self) -> None:
+        """割当実行の開始時に呼ぶ（計測開始・前回の中止要求とスナップショットを破棄）"""
+        self._cancel_event.clear()
+        self._started_at = perf_counter()
+        self._deadline = self._started_at + self.time_budget_seconds if self.time_budget_seconds > 0 else None
+        self.stop_reason = None
+        self.best = None
+
+    def request_cancel(self) -> None:
+        """中止を要求する（UIスレッドなど別スレッドから呼び出してよい）"""
+        self._cancel_event.set()
+
+    def elapsed(self) -> float:
+        return perf_counter() - self._started_at if self._started_at is not None else 0.0
+
+    def should_stop(self) -> bool:
+        """時間予算を超過したか中止が要求されていれば True（理由は stop_reason に記録）"""
+        if self.stop_reason is not None:
+            return True
+        if self._cancel_event.is_set():
+            self.stop_reason = STOP_REASON_CANCELLED
+        elif self._deadline is not None and perf_counter() >= self._deadline:
+            self.stop_reason = STOP_REASON_TIME_BUDGET
+        return self.stop_reason is not None
+
+    def offer(self, phase: str, result_df: pd.DataFrame, score: AssignmentScore) -> bool:
+        """
+        スコアがこれまでの最良以上に良ければスナップショットとして保持する（同点は後のフェーズを優先）
+
+        Returns:
+            result_df が最良として保持された場合は True
+        """
+        if self.best is not None and self.best.score < score:
+            return False
+        self.best = PhaseSnapshot(phase, score, self.elapsed(), result_df.copy())
+        return True
@@ -0,0 +1,244 @@
+"""
+工程マスタの参照表
+工程マスタ.xlsx を1回だけ読み込み、品番ごとの工程の並び（工程番号・工程名）と
+検査対象キーワードの一致結果を参照表として提供する。
+読み込んだ内容はファイルのパス・更新時刻・サイズをキーにローカル（LOCALAPPDATA）へバイナリキャッシュとして保存し、
+次回起動時はNAS上のxlsxを開かずにキャッシュから復元する。
+"""
+
+import hashlib
+import os
+import pickle
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import pandas as pd
+from loguru import logger
+
+from app.utils.perf import perf_timer
+
+# ログ分類（app_.logの視認性向上）
+logger = logger.bind(channel="ASSIGN")
+
+# キャッシュ形式のバージョン（形式を変えた場合は上げ、古いキャッシュは読み捨てる）
+PROCESS_MASTER_CACHE_VERSION = 1
+
+
+class ProcessEntry(NamedTuple):
+    """品番の工程1件分（工程マスタの列順）"""
+
+    position: int  # 工程マスタ上の列位置（B列=1）
+    process_number: str  # 工程番号（1行目の見出し）
+    process_name: str  # 工程名（セル値、空欄は空文字）
+
+
+class KeywordMatch(NamedTuple):
+    """検査対象キーワードに一致した工程"""
+
+    process_number: str
+    process_name: str
+    keyword: str  # 一致したキーワード
+
+
+def _mangle_header(values: Sequence[Any]) -> List[Any]:
+    """見出し行を pandas.read_excel と同じ列名にする（空欄は Unnamed: n、重複は .1, .2 …）"""
+    columns: List[Any] = []
+    seen: Dict[str, int] = {}
+    for idx, value in enumerate(values):
+        name: Any = f"Unnamed: {idx}" if value is None or pd.isna(value) else value
+        key = str(name)
+        count = seen.get(key, 0)
+        seen[key] = count + 1
+        if count:
+            name = f"{key}.{count}"
+        columns.append(name)
+    return columns
+
+
+class ProcessMaster:
+    """
+    工程マスタの参照表
+
+    - rows: 見出し行を含むセル値の並び（空欄はNaN）
+    - process_numbers: B列以降の工程番号（見出しを文字列化したもの）
+    - cells_by_product: {品番: B列以降の工程名のタプル}（同じ品番が複数行ある場合は最初の行）
+    """
+
+    def __init__(self, rows: List[Tuple[Any, ...]]) -> None:
+        self.rows = rows
+        header = list(rows[0]) if rows else []
+        self.columns = _mangle_header(header)
+        self.process_numbers: Tuple[str, ...] = tuple(str(col).strip() for col in self.columns[1:])
+        self.cells_by_product: Dict[str, Tuple[str, ...]] = {}
+        for row in rows[1:]:
+            if not row:
+                continue
+            product = row[0]
+            if product is None or pd.isna(product):
+                continue
+            product_key = str(product).strip()
+            if not product_key or product_key in self.cells_by_product:
+                continue
+            self.cells_by_product[product_key] = tuple(
+                '' if value is None or pd.isna(value) else str(value).strip() for value in row[1:]
+            )
+        self._frame: Optional[pd.DataFrame] = None
+        self._keyword_matches: Dict[Tuple[str, ...], Dict[str, Optional[KeywordMatch]]] = {}
+
+    @classmethod
+    def from_frame(cls, process_master_df: pd.DataFrame) -> "ProcessMaster":
+        """読み込み済みのDataFrame（1行目を見出しとして読み込んだもの）から参照表を作る"""
+        rows = [tuple(process_master_df.columns)] + list(process_master_df.itertuples(index=False, name=None))
+        master = cls(rows)
+        master._frame = process_master_df
+        return master
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """1行目を見出しとしたDataFrame（従来の pd.read_excel(header=0) 相当、同じオブジェクトを返す）"""
+        if self._frame is None:
+            self._frame = pd.DataFrame(self.rows[1:], columns=self.columns).infer_objects()
+        return self._frame
+
+    def has_product(self, product_number: Any) -> bool:
+        return str(product_number).strip() in self.cells_by_product
+
+    def processes(self, product_number: Any) -> Tuple[ProcessEntry, ...]:
+        """品番の工程を工程マスタの列順で返す（工程名が空欄の列も含む）"""
+        cells = self.cells_by_product.get(str(product_number).strip())
+        if cells is None:
+            return ()
+        return tuple(
+            ProcessEntry(pos + 1, process_number, cells[pos])
+            for pos, process_number in enumerate(self.process_numbers)
+            if pos < len(cells)
+        )
+
+    def process_name(self, product_number: Any, process_number: Any) -> Optional[str]:
+        """品番・工程番号の工程名（見出しが一致する列のうち空欄でない最初の列、見つからない場合はNone）"""
+        if process_number is None or str(process_number).strip() == '':
+            return None
+        cells = self.cells_by_product.get(str(product_number).strip())
+        if cells is None:
+            return None
+        process_key = str(process_number).strip()
+        for pos, header in enumerate(self.process_numbers):
+            if header == process_key and pos < len(cells) and cells[pos]:
+                return cells[pos]
+        return None
+
+    def match_keywords(self, product_number: Any, keywords: Sequence[str]) -> Optional[KeywordMatch]:
+        """
+        工程名に検査対象キーワードを含む最初の工程（列順、同じ列ではキーワードの並び順）
+
+        一致結果はキーワードの組ごとに全品番分をまとめて作成し、以降は参照のみ。
+        """
+        keyword_key = tuple(keywords)
+        matches = self._keyword_matches.get(keyword_key)
+        if matches is None:
+            matches = {}
+            for product_key, cells in self.cells_by_product.items():
+                matches[product_key] = self._first_match(cells, keyword_key)
+            self._keyword_matches[keyword_key] = matches
+        return matches.get(str(product_number).strip())
+
+    def _first_match(self, cells: Tuple[str, ...], keywords: Tuple[str, ...]) -> Optional[KeywordMatch]:
+        for pos, cell in enumerate(cells):
+            if not cell or pos >= len(self.process_numbers):
+                continue
+            for keyword in keywords:
+                if keyword in cell:
+                    return KeywordMatch(self.process_numbers[pos], cell, keyword)
+        return None
+
+
+def default_cache_dir() -> Optional[Path]:
+    """キャッシュ保存先の既定値（LOCALAPPDATA、未設定の場合はTEMP。どちらもない場合はNone）"""
+    base_dir = os.getenv("LOCALAPPDATA", "").strip() or os.getenv("TEMP", "").strip()
+    if not base_dir:
+        return None
+    return Path(base_dir) / "appearance_sorting_system" / "process_master_cache"
+
+
+def _cache_file(cache_dir: Path, path: str, stat: os.stat_result) -> Path:
+    key = hashlib.sha1(os.path.abspath(path).lower().encode("utf-8", errors="ignore")).hexdigest()[:10]
+    return cache_dir / f"process_master_{key}_{int(stat.st_mtime)}_{int(stat.st_size)}.pkl"
+
+
+def _read_disk_cache(cache_path: Path) -> Optional[List[Tuple[Any, ...]]]:
+    try:
+        with cache_path.open('rb') as f:
+            payload = pickle.load(f)
+    except (OSError, pickle.PickleError, EOFError, AttributeError, ValueError):
+        return None
+    if not isinstance(payload, dict) or payload.get('version') != PROCESS_MASTER_CACHE_VERSION:
+        return None
+    rows = payload.get('rows')
+    return rows if isinstance(rows, list) else None
+
+
+def _write_disk_cache(cache_path: Path, rows: List[Tuple[Any, ...]]) -> None:
+    """キャッシュを保存し、同じファイルの古いキャッシュを削除する（一時ファイルへ書いてから置き換える）"""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(cache_path.suffix + '.tmp')
+        with tmp_path.open('wb') as f:
+            pickle.dump({'version': PROCESS_MASTER_CACHE_VERSION, 'rows': rows}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+        prefix = cache_path.name.rsplit('_', 2)[0] + '_'
+        for old in cache_path.parent.glob(f"{prefix}*.pkl"):
+            if old != cache_path:
+                old.unlink(missing_ok=True)
+    except OSError as e:
+        logger.debug("工程マスタのキャッシュ保存に失敗しました: {}", e)
+
+
+_lock = threading.Lock()
+# {正規化したパス: ((更新時刻, サイズ), ProcessMaster)}（プロセス内で共有）
+_loaded: Dict[str, Tuple[Tuple[float, int], ProcessMaster]] = {}
+
+
+def load_process_master(path: Optional[str], cache_dir: Optional[Path] = None) -> Optional[ProcessMaster]:
+    """
+    工程マスタを読み込む（プロセス内・ディスクの順にキャッシュを参照）
+
+    Args:
+        path: 工程マスタ.xlsx のパス
+        cache_dir: バイナリキャッシュの保存先（省略時は default_cache_dir()）
+
+    Returns:
+        ファイルが存在しない場合はNone
+
+    Raises:
+        Exception: xlsxの読み込みに失敗した場合（pandas/openpyxlの例外をそのまま送出）
+    """
+    if not path:
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    signature = (stat.st_mtime, stat.st_size)
+    memo_key = os.path.abspath(path)
+    with _lock:
+        cached = _loaded.get(memo_key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        if cache_dir is None:
+            cache_dir = default_cache_dir()
+        cache_path = _cache_file(cache_dir, path, stat) if cache_dir is not None else None
+        rows = _read_disk_cache(cache_path) if cache_path is not None and cache_path.exists() else None
+        if rows is None:
+            with perf_timer(logger, "process_master.read_xlsx"):
+                grid = pd.read_excel(path, header=None, engine='openpyxl')
+            rows = list(grid.itertuples(index=False, name=None))
+            if cache_path is not None:
+                _write_disk_cache(cache_path, rows)
+        else:
+            logger.debug("工程マスタをディスクキャッシュから読み込みました: {}", cache_path)
+
+        master = ProcessMaster(rows)
+        _loaded[memo_key] = (signature, master)
+        return master
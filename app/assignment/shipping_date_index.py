@@ -0,0 +1,151 @@
+"""
+出荷予定日の分類
+出荷予定日（当日洗浄・先行検査などのラベル、または日付）を値ごとに1回だけ解析し、
+ロット種別・解析済み日付・FIFO用ソートキーをキャッシュする。
+割当実行の冒頭で結果DataFrameに種別列・解析済み日付列を付与し、各フェーズはそれを参照する。
+"""
+
+import warnings
+from typing import Any, Dict, NamedTuple, Optional
+
+import pandas as pd
+
+# ロット種別
+LOT_KIND_MISSING = 'missing'  # 出荷予定日なし
+LOT_KIND_SAME_DAY_CLEANING = 'same_day_cleaning'  # 当日洗浄上がり品など
+LOT_KIND_PREINSPECTION = 'preinspection'  # 先行検査・当日先行検査
+LOT_KIND_SAME_DAY = 'same_day'  # 「当日」ラベル
+LOT_KIND_DATE = 'date'  # 日付
+LOT_KIND_OTHER = 'other'  # 解釈できない文字列
+LOT_KINDS = (
+    LOT_KIND_SAME_DAY_CLEANING,
+    LOT_KIND_PREINSPECTION,
+    LOT_KIND_SAME_DAY,
+    LOT_KIND_DATE,
+    LOT_KIND_OTHER,
+    LOT_KIND_MISSING,
+)
+
+# 当日洗浄・先行検査系のラベル（完全一致）
+SAME_DAY_LABELS = frozenset({"当日洗浄上がり品", "当日洗浄品", "当日洗浄", "当日先行検査", "先行検査"})
+# FIFOソートで最優先（最小値）に寄せるキーワード（部分一致）
+PRIORITY_SORT_KEYWORDS = (
+    "当日洗浄上がり品",
+    "当日洗浄上がり",
+    "当日洗浄あがり",
+    "当日洗浄品",
+    "当日洗浄",
+    "当日先行検査",
+    "先行検査",
+)
+
+LOT_KIND_COLUMN = '_lot_kind'
+PARSED_DATE_COLUMN = '_shipping_date_parsed'
+
+
+class ShippingDateInfo(NamedTuple):
+    """出荷予定日1値分の解析結果"""
+
+    kind: str
+    text: str  # 文字列化・トリム後（欠損は空文字）
+    parsed: Optional[pd.Timestamp]  # pd.to_datetime の結果（解析不可はNaT、例外時はNone）
+    is_same_day_label: bool  # 当日洗浄・先行検査系ラベルか
+    is_preinspection_label: bool  # 先行検査系ラベルか
+    sort_key: pd.Timestamp  # FIFO用ソートキー（優先ラベルは最小値、解析不可は最大値）
+
+    @property
+    def parsed_date(self):
+        """解析済み日付（date、解析不可の場合はNone）"""
+        if self.parsed is None or pd.isna(self.parsed):
+            return None
+        return self.parsed.date()
+
+
+def _is_missing(value: Any) -> bool:
+    try:
+        return bool(pd.isna(value))
+    except (TypeError, ValueError):
+        return False
+
+
+def classify_shipping_date(value: Any) -> ShippingDateInfo:
+    """出荷予定日の値を解析する"""
+    missing = _is_missing(value)
+    text = '' if missing else str(value).strip()
+
+    parsed: Optional[pd.Timestamp]
+    try:
+        with warnings.catch_warnings():
+            # 日付形式の推測に関する警告は抑止（解析不可はNaT）
+            warnings.simplefilter("ignore", UserWarning)
+            parsed = pd.to_datetime(value, errors='coerce')
+        if not isinstance(parsed, pd.Timestamp):
+            parsed = pd.NaT
+    except Exception:
+        parsed = None
+
+    is_same_day_label = bool(text) and (
+        text in SAME_DAY_LABELS or "当日洗浄" in text or "当日洗流E" in text
+    )
+    is_preinspection_label = bool(text) and "先行検査" in text
+
+    # FIFO用ソートキー（None/NaN(float)/空文字は最大値、優先ラベルは最小値）
+    if value is None or (isinstance(value, float) and missing):
+        sort_key = pd.Timestamp.max
+    elif isinstance(value, str) and (not text or any(keyword in text for keyword in PRIORITY_SORT_KEYWORDS)):
+        sort_key = pd.Timestamp.max if not text else pd.Timestamp.min
+    elif parsed is None or pd.isna(parsed):
+        sort_key = pd.Timestamp.max
+    else:
+        sort_key = parsed
+
+    if missing or not text:
+        kind = LOT_KIND_MISSING
+    elif "当日洗浄" in text or "当日洗流E" in text:
+        kind = LOT_KIND_SAME_DAY_CLEANING
+    elif is_preinspection_label:
+        kind = LOT_KIND_PREINSPECTION
+    elif text == "当日":
+        kind = LOT_KIND_SAME_DAY
+    elif parsed is not None and not pd.isna(parsed):
+        kind = LOT_KIND_DATE
+    else:
+        kind = LOT_KIND_OTHER
+
+    return ShippingDateInfo(kind, text, parsed, is_same_day_label, is_preinspection_label, sort_key)
+
+
+class ShippingDateIndex:
+    """出荷予定日の値 → 解析結果 のキャッシュ（割当実行ごとに作り直す）"""
+
+    def __init__(self) -> None:
+        self._cache: Dict[Any, ShippingDateInfo] = {}
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def info(self, value: Any) -> ShippingDateInfo:
+        try:
+            cached = self._cache.get(value)
+        except TypeError:
+            # ハッシュ不可の値はキャッシュしない
+            return classify_shipping_date(value)
+        if cached is None:
+            cached = classify_shipping_date(value)
+            self._cache[value] = cached
+        return cached
+
+    def annotate(self, df: pd.DataFrame, column: str = '出荷予定日') -> None:
+        """ロット種別列（カテゴリ型）と解析済み日付列を付与する"""
+        if column not in df.columns:
+            df[LOT_KIND_COLUMN] = pd.Categorical([LOT_KIND_MISSING] * len(df), categories=LOT_KINDS)
+            df[PARSED_DATE_COLUMN] = pd.NaT
+            return
+        infos = [self.info(value) for value in df[column].tolist()]
+        df[LOT_KIND_COLUMN] = pd.Categorical([info.kind for info in infos], categories=LOT_KINDS)
+        df[PARSED_DATE_COLUMN] = pd.to_datetime(
+            [info.parsed if info.parsed is not None else pd.NaT for info in infos]
+        )
+
+    def __len__(self) -> int:
+        return len(self._cache)
@@ -0,0 +1,163 @@
+"""
+スキルインデックス
+スキルマスタを割当実行ごとに1回だけ走査し、(品番, 工程番号) → 検査員インデックス配列・スキル値(int8) の
+参照表にコンパイルする。全フェーズで共有し、品番ごとのDataFrameブール走査を O(1) 参照に置き換える。
+"""
+
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# スキル値として有効な値（文字列化・トリム後に比較）
+VALID_SKILL_LEVELS = ('1', '2', '3')
+
+
+class SkillRow(NamedTuple):
+    """スキルマスタ1行分のコンパイル結果"""
+
+    process_number: Any  # スキルマスタの工程番号（元の値）
+    is_blank_process: bool  # 工程番号が空欄か（空欄は全工程に一致）
+    numeric_process: Optional[int]  # 工程番号の数値（数値化できない場合はNone）
+    inspector_indices: np.ndarray  # スキル保有者の検査員インデックス（codes上の位置、int32）
+    levels: np.ndarray  # スキル値（int8、inspector_indicesと同順）
+
+
+class SkillIndex:
+    """
+    コンパイル済みスキルマスタ
+
+    - codes: スキルマスタの検査員列（列2以降）のコード一覧
+    - rows_by_product: {品番: [SkillRow, ...]}（スキルマスタ上の行順を維持）
+    """
+
+    def __init__(self, codes: List[str], rows_by_product: Dict[Any, List[SkillRow]], source_id: int) -> None:
+        self.codes = codes
+        self.rows_by_product = rows_by_product
+        self._source_id = source_id
+
+    @classmethod
+    def build(cls, skill_master_df: pd.DataFrame) -> "SkillIndex":
+        """スキルマスタからインデックスを構築する"""
+        codes: List[str] = []
+        positions: List[int] = []
+        for pos in range(2, len(skill_master_df.columns)):
+            col_name = skill_master_df.columns[pos]
+            if pd.isna(col_name) or str(col_name).strip() == '':
+                continue
+            codes.append(str(col_name).strip())
+            positions.append(pos)
+
+        rows_by_product: Dict[Any, List[SkillRow]] = {}
+        if skill_master_df.empty:
+            return cls(codes, rows_by_product, id(skill_master_df))
+
+        # スキル値をまとめて int8 に変換（'1','2','3' 以外は0）
+        if positions:
+            text = skill_master_df.iloc[:, positions].astype(str).apply(lambda col: col.str.strip()).to_numpy()
+            levels_matrix = np.zeros(text.shape, dtype=np.int8)
+            for level in VALID_SKILL_LEVELS:
+                levels_matrix[text == level] = int(level)
+        else:
+            levels_matrix = np.zeros((len(skill_master_df), 0), dtype=np.int8)
+
+        product_values = skill_master_df.iloc[:, 0].tolist()
+        process_values = (
+            skill_master_df.iloc[:, 1].tolist()
+            if len(skill_master_df.columns) > 1
+            else [None] * len(skill_master_df)
+        )
+        for row_pos, (product_number, process_number) in enumerate(zip(product_values, process_values)):
+            if pd.isna(product_number):
+                continue
+            is_blank = bool(pd.isna(process_number) or str(process_number).strip() == '')
+            numeric_process: Optional[int] = None
+            if not is_blank:
+                try:
+                    numeric_process = int(process_number)
+                except (ValueError, TypeError):
+                    numeric_process = None
+            row_levels = levels_matrix[row_pos]
+            inspector_indices = np.flatnonzero(row_levels).astype(np.int32)
+            rows_by_product.setdefault(product_number, []).append(
+                SkillRow(
+                    process_number=process_number,
+                    is_blank_process=is_blank,
+                    numeric_process=numeric_process,
+                    inspector_indices=inspector_indices,
+                    levels=row_levels[inspector_indices].copy(),
+                )
+            )
+        return cls(codes, rows_by_product, id(skill_master_df))
+
+    def is_built_from(self, skill_master_df: Any) -> bool:
+        """指定のスキルマスタから構築されたインデックスか"""
+        return id(skill_master_df) == self._source_id
+
+    def has_product(self, product_number: Any) -> bool:
+        """品番がスキルマスタに登録されているか（完全一致）"""
+        try:
+            return product_number in self.rows_by_product
+        except TypeError:
+            return False
+
+    def product_rows(self, product_number: Any) -> List[SkillRow]:
+        """品番に一致する全行（工程番号で絞り込まない）"""
+        try:
+            return self.rows_by_product.get(product_number, [])
+        except TypeError:
+            return []
+
+    def rows_for_process(self, product_number: Any, process_number: Any) -> List[SkillRow]:
+        """工程番号が一致する行、または工程番号が空欄の行"""
+        process_str = str(process_number)
+        return [
+            row
+            for row in self.product_rows(product_number)
+            if row.is_blank_process or str(row.process_number) == process_str
+        ]
+
+    def default_rows(self, product_number: Any) -> Tuple[str, List[SkillRow]]:
+        """
+        ロット側の工程番号が空欄の場合の行選択
+
+        Returns:
+            (選択種別, 行リスト)
+            - 'blank': 工程番号が空欄の行
+            - 'numeric': 空欄行がない場合、工程番号の数字が若い順に並べた数値行
+            - 'other': 上記いずれもない場合のその他の行
+        """
+        blank_rows: List[SkillRow] = []
+        numeric_rows: List[SkillRow] = []
+        other_rows: List[SkillRow] = []
+        for row in self.product_rows(product_number):
+            if row.is_blank_process:
+                blank_rows.append(row)
+            elif row.numeric_process is not None:
+                numeric_rows.append(row)
+            else:
+                other_rows.append(row)
+        if blank_rows:
+            return 'blank', blank_rows
+        if numeric_rows:
+            numeric_rows.sort(key=lambda row: row.numeric_process)
+            return 'numeric', numeric_rows
+        return 'other', other_rows
+
+    def iter_skilled(self, rows: List[SkillRow]) -> Iterator[Tuple[str, int]]:
+        """行リスト内のスキル保有者を (検査員コード, スキル値) で列挙（行順・列順、重複あり）"""
+        codes = self.codes
+        for row in rows:
+            for inspector_idx, level in zip(row.inspector_indices.tolist(), row.levels.tolist()):
+                yield codes[inspector_idx], level
+
+    def unique_skilled(self, rows: List[SkillRow]) -> List[Tuple[str, int]]:
+        """行リスト内のスキル保有者を重複なしで列挙（最初に現れた行のスキル値を採用）"""
+        seen = set()
+        result: List[Tuple[str, int]] = []
+        for code, level in self.iter_skilled(rows):
+            if code in seen:
+                continue
+            seen.add(code)
+            result.append((code, level))
+        return result
@@ -0,0 +1,230 @@
+"""
+違反キュー
+全体最適化フェーズ1（勤務時間超過・同一品番時間上限超過の是正）用に、
+ロットごとの割当内容から検査員別の勤務時間・品番別時間を差分管理し、
+違反を超過時間の大きい順に取り出すヒープを保持する。
+是正のたびに全ロットを再走査する代わりに、変化したロットの検査員だけを再評価する。
+"""
+
+import heapq
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+# (ロットインデックス, 検査員コード, 検査員名, 超過時間, 分割検査時間, 品番, 検査時間, 検査員列番号)
+Violation = Tuple[Any, str, str, float, float, str, float, int]
+
+
+class LotMember(NamedTuple):
+    """ロットに割り当てられた検査員1名分"""
+
+    column: int  # 検査員列番号（1始まり）
+    code: str  # 検査員コード
+    name: str  # 検査員名（スキル表記除去済み）
+    detectable: bool  # 違反検出の対象か（固定検査員はFalse）
+
+
+class LotEntry(NamedTuple):
+    """ロット1件分の割当内容"""
+
+    product_number: str
+    divided_time: float
+    inspection_time: float
+    members: Tuple[LotMember, ...]
+    rank: int  # 処理順の優先グループ（0: 当日洗浄上がり品, 1: その他）
+
+
+class ViolationQueue:
+    """
+    差分更新型の違反ヒープ
+
+    - daily_hours: 検査員別の累計勤務時間（ロットの分割検査時間の合計）
+    - product_hours: 検査員別・品番別の累計時間
+    - ヒープのキーは (優先グループ, -超過時間, tie_break(...))。検査員ごとの版番号で古いエントリを遅延破棄する
+    """
+
+    def __init__(
+        self,
+        inspector_max_hours: Dict[str, float],
+        overrun_rate: float,
+        work_hours_buffer: float,
+        product_limit: float,
+        tie_break: Callable[[Any, str, str], Tuple],
+        default_max_hours: float = 8.0,
+    ) -> None:
+        self.inspector_max_hours = inspector_max_hours
+        self.overrun_rate = overrun_rate
+        self.work_hours_buffer = work_hours_buffer
+        self.product_limit = product_limit
+        self.default_max_hours = default_max_hours
+        self._tie_break = tie_break
+
+        self.lots: Dict[Any, LotEntry] = {}
+        self.daily_hours: Dict[str, float] = {}
+        self.product_hours: Dict[str, Dict[str, float]] = {}
+        self.lots_by_inspector: Dict[str, Set[Any]] = {}
+
+        self._heap: List[Tuple] = []
+        self._versions: Dict[str, int] = {}
+        self._sequence = 0
+
+    # ------------------------------------------------------------------
+    # 割当内容の更新
+    # ------------------------------------------------------------------
+    def set_lot(
+        self,
+        index: Any,
+        product_number: str,
+        divided_time: float,
+        inspection_time: float,
+        members: Iterable[LotMember],
+        rank: int = 1,
+    ) -> Set[str]:
+        """
+        ロットの割当内容を置き換え、集計に差分を反映する
+
+        Returns:
+            変更前後いずれかでロットに割り当てられていた検査員コードの集合
+        """
+        affected: Set[str] = set()
+        previous = self.lots.pop(index, None)
+        if previous is not None:
+            for member in previous.members:
+                affected.add(member.code)
+                self._apply(member.code, previous.product_number, -previous.divided_time)
+                lots = self.lots_by_inspector.get(member.code)
+                if lots is not None:
+                    lots.discard(index)
+
+        entry = LotEntry(product_number, divided_time, inspection_time, tuple(members), rank)
+        if entry.members:
+            self.lots[index] = entry
+            for member in entry.members:
+                affected.add(member.code)
+                self._apply(member.code, product_number, divided_time)
+                self.lots_by_inspector.setdefault(member.code, set()).add(index)
+        return affected
+
+    def _apply(self, code: str, product_number: str, hours: float) -> None:
+        daily = self.daily_hours.get(code, 0.0) + hours
+        self.daily_hours[code] = daily if abs(daily) > 1e-9 else 0.0
+        by_product = self.product_hours.setdefault(code, {})
+        product_total = by_product.get(product_number, 0.0) + hours
+        if abs(product_total) > 1e-9:
+            by_product[product_number] = product_total
+        else:
+            # 担当がなくなった品番はキーごと削除（履歴辞書の再構築結果と揃える）
+            by_product.pop(product_number, None)
+
+    # ------------------------------------------------------------------
+    # 違反判定
+    # ------------------------------------------------------------------
+    def allowed_max_hours(self, code: str) -> float:
+        """超過許容率を適用した勤務時間上限"""
+        return self.inspector_max_hours.get(code, self.default_max_hours) * (1.0 + self.overrun_rate)
+
+    def work_excess(self, code: str) -> Optional[float]:
+        """勤務時間超過量（バッファ内に収まっている場合はNone）"""
+        daily = self.daily_hours.get(code, 0.0)
+        allowed = self.allowed_max_hours(code)
+        if daily > allowed - self.work_hours_buffer:
+            return daily - allowed
+        return None
+
+    def product_excess(self, code: str, product_number: str) -> Optional[float]:
+        """同一品番時間上限の超過量（上限以内の場合はNone）"""
+        hours = self.product_hours.get(code, {}).get(product_number, 0.0)
+        if hours > self.product_limit:
+            return hours - self.product_limit
+        return None
+
+    def _iter_member_violations(self, code: str):
+        """検査員の担当ロットごとに (entry, member, work_excess, product_excess) を列挙"""
+        work_excess = self.work_excess(code)
+        over_products = {
+            product_number
+            for product_number, hours in self.product_hours.get(code, {}).items()
+            if hours > self.product_limit
+        }
+        if work_excess is None and not over_products:
+            return
+        for index in self.lots_by_inspector.get(code, ()):
+            entry = self.lots[index]
+            product_excess = (
+                self.product_excess(code, entry.product_number)
+                if entry.product_number in over_products
+                else None
+            )
+            if work_excess is None and product_excess is None:
+                continue
+            for member in entry.members:
+                if member.code == code and member.detectable:
+                    yield index, entry, member, work_excess, product_excess
+
+    def violations(self) -> Tuple[List[Violation], List[Violation]]:
+        """現在の違反一覧を (勤務時間超過, 同一品番時間上限超過) で返す（ロットインデックス順）"""
+        overworked: List[Violation] = []
+        product_limit: List[Violation] = []
+        for code in list(self.lots_by_inspector.keys()):
+            for index, entry, member, work_excess, product_excess in self._iter_member_violations(code):
+                if work_excess is not None:
+                    overworked.append(self._as_violation(index, entry, member, work_excess))
+                if product_excess is not None:
+                    product_limit.append(self._as_violation(index, entry, member, product_excess))
+        overworked.sort(key=lambda v: (v[0], v[7]))
+        product_limit.sort(key=lambda v: (v[0], v[7]))
+        return overworked, product_limit
+
+    @staticmethod
+    def _as_violation(index: Any, entry: LotEntry, member: LotMember, excess: float) -> Violation:
+        return (
+            index, member.code, member.name, excess,
+            entry.divided_time, entry.product_number, entry.inspection_time, member.column,
+        )
+
+    # ------------------------------------------------------------------
+    # ヒープ操作
+    # ------------------------------------------------------------------
+    def seed(self) -> None:
+        """現在の全違反でヒープを作り直す"""
+        self._heap = []
+        for code in list(self.lots_by_inspector.keys()):
+            self._push_inspector(code)
+        heapq.heapify(self._heap)
+
+    def refresh(self, codes: Iterable[str]) -> None:
+        """指定検査員の古いエントリを無効化し、現在の違反を積み直す"""
+        for code in codes:
+            self._versions[code] = self._versions.get(code, 0) + 1
+            for item in self._violation_items(code):
+                heapq.heappush(self._heap, item)
+
+    def _push_inspector(self, code: str) -> None:
+        self._heap.extend(self._violation_items(code))
+
+    def _violation_items(self, code: str) -> List[Tuple]:
+        version = self._versions.get(code, 0)
+        items: List[Tuple] = []
+        for index, entry, member, work_excess, product_excess in self._iter_member_violations(code):
+            excess = max(e for e in (work_excess, product_excess) if e is not None)
+            self._sequence += 1
+            items.append((
+                entry.rank,
+                -excess,
+                self._tie_break(index, code, entry.product_number),
+                self._sequence,
+                version,
+                self._as_violation(index, entry, member, excess),
+            ))
+        return items
+
+    def pop(self) -> Optional[Violation]:
+        """超過時間の大きい違反を1件取り出す（古いエントリは読み捨て）"""
+        while self._heap:
+            item = heapq.heappop(self._heap)
+            violation = item[-1]
+            if item[-2] != self._versions.get(violation[1], 0):
+                continue
+            return violation
+        return None
+
+    def __len__(self) -> int:
+        return len(self._heap)
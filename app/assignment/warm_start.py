@@ -0,0 +1,117 @@
+"""
+ウォームスタート
+前回実行の最終割当を生産ロットIDごとに保存し、次回実行で内容が変わっていないロットは
+前回の検査員をそのまま引き継ぐ（第1次割当の貪欲選択を省略する）ための保存・読込を行う。
+ロットの同一性は (品番, 工程番号, ロット数量, 検査時間, 出荷予定日) のシグネチャで判定する。
+"""
+
+import json
+import os
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+# 保存形式のバージョン（形式を変えた場合は上げ、古いファイルは読み捨てる）
+WARM_START_FORMAT_VERSION = 2
+
+# ロットごとの引き継ぎ判定
+WARM_START_REUSE = 'reuse'  # 前回の検査員を引き継ぐ
+WARM_START_SKIP = 'skip'  # 引き継がずに割り当て直す（以降のロットの判定には影響しない）
+WARM_START_CLAIM = 'claim'  # 引き継がずに割り当て直し、候補の検査員を前回割当に含む以降のロットも割り当て直す
+
+
+class WarmStartEntry(NamedTuple):
+    """ロット1件分の前回割当"""
+
+    signature: Tuple[str, ...]  # lot_signature の結果
+    codes: Tuple[str, ...]  # 割り当てられていた検査員コード（検査員列の順、未割当は空）
+
+
+def _normalize_value(value: Any) -> str:
+    """シグネチャ用に値を文字列化（欠損は空文字、数値は表記揺れを吸収）"""
+    if value is None:
+        return ''
+    try:
+        if pd.isna(value):
+            return ''
+    except (TypeError, ValueError):
+        pass
+    if isinstance(value, float):
+        return f"{value:.3f}"
+    return str(value).strip()
+
+
+def lot_signature(
+    product_number: Any,
+    process_number: Any,
+    lot_quantity: Any,
+    inspection_time: Any,
+    shipping_date: Any,
+) -> Tuple[str, ...]:
+    """ロットの内容を表すシグネチャ（いずれかが変わったロットは前回割当を引き継がない）"""
+    try:
+        inspection_time = float(inspection_time)
+    except (TypeError, ValueError):
+        pass
+    return tuple(
+        _normalize_value(value)
+        for value in (product_number, process_number, lot_quantity, inspection_time, shipping_date)
+    )
+
+
+def default_warm_start_path() -> Optional[Path]:
+    """保存先の既定値（LOCALAPPDATA、未設定の場合はTEMP。どちらもない場合はNone）"""
+    base_dir = os.getenv("LOCALAPPDATA", "").strip() or os.getenv("TEMP", "").strip()
+    if not base_dir:
+        return None
+    return Path(base_dir) / "appearance_sorting_system" / "warm_start" / "last_assignment.json"
+
+
+def load_warm_start(path: Optional[Path], work_date: date) -> Dict[str, WarmStartEntry]:
+    """
+    前回割当を読み込む
+
+    対象日が異なる・形式が古い・読込に失敗した場合は空を返す（ウォームスタートせずに通常どおり割り当てる）。
+    """
+    if path is None or not path.exists():
+        return {}
+    try:
+        with path.open('r', encoding='utf-8') as f:
+            payload = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(payload, dict):
+        return {}
+    if payload.get('version') != WARM_START_FORMAT_VERSION or payload.get('date') != work_date.isoformat():
+        return {}
+    entries: Dict[str, WarmStartEntry] = {}
+    for lot_id, entry in (payload.get('lots') or {}).items():
+        try:
+            entries[str(lot_id)] = WarmStartEntry(
+                tuple(str(v) for v in entry['signature']),
+                tuple(str(v) for v in entry['codes']),
+            )
+        except (KeyError, TypeError):
+            continue
+    return entries
+
+
+def save_warm_start(path: Optional[Path], work_date: date, entries: Dict[str, WarmStartEntry]) -> None:
+    """今回の最終割当を保存する（一時ファイルへ書いてから置き換える）"""
+    if path is None:
+        return
+    payload = {
+        'version': WARM_START_FORMAT_VERSION,
+        'date': work_date.isoformat(),
+        'lots': {
+            lot_id: {'signature': list(entry.signature), 'codes': list(entry.codes)}
+            for lot_id, entry in entries.items()
+        },
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+    with tmp_path.open('w', encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
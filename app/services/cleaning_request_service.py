@@ -15,6 +15,7 @@ from typing import Optional, List, Dict, Tuple
 from loguru import logger
 
 from app.export.google_sheets_exporter_service import GoogleSheetsExporter
+from app.assignment.process_master import load_process_master
 from app.utils.perf import perf_timer
 from time import perf_counter
 
@@ -985,7 +986,12 @@ def _load_process_master(process_master_path: str, log_callback: callable) -> Op
         log_callback(f"工程マスタファイルが見つかりません: {process_master_path}")
         return None
     try:
-        df = pd.read_excel(process_master_path, engine='openpyxl')
+        # 【高速化】検査員割当て・UIと同じ工程マスタ（プロセス内・ローカルのバイナリキャッシュ）を共有する
+        process_master = load_process_master(process_master_path)
+        if process_master is None:
+            log_callback(f"工程マスタファイルが見つかりません: {process_master_path}")
+            return None
+        df = process_master.frame
         log_callback(f"工程マスタを読み込みました: {len(df)}件")
         return df
     except Exception as e:
@@ -53,6 +53,10 @@ import calendar
 import locale
 from app.export.google_sheets_exporter_service import GoogleSheetsExporter
 from app.assignment.inspector_assignment_service import InspectorAssignmentManager
+from app.assignment.manual_edit import VIOLATION_PRODUCT_LIMIT, VIOLATION_WORK_HOURS
+from app.assignment.mix_prevention import DEFAULT_MIX_PREVENTION_GROUPS, load_mix_prevention_groups
+from app.assignment.assignment_settings import resolve_settings_path
+from app.assignment.process_master import load_process_master
 from app.services.cleaning_request_service import get_cleaning_lots
 from app.config_manager import AppConfigManager
 from app.utils.path_resolver import resolve_resource_path
@@ -2495,8 +2499,8 @@ class ModernDataExtractorUI:
                     'inspectors': unique_inspectors
                 })
             
-            # InspectorAssignmentManagerに設定
-            self.inspector_manager.fixed_inspectors_by_product = fixed_inspectors_dict
+            # InspectorAssignmentManagerに設定（固定検査員インデックスもここで1回だけ構築）
+            self.inspector_manager.set_fixed_inspector_rules(fixed_inspectors_by_product=fixed_inspectors_dict)
             
             if fixed_inspectors_dict:
                 self.log_message(f"固定検査員情報を設定しました: {len(fixed_inspectors_dict)}品番")
@@ -2563,7 +2567,7 @@ class ModernDataExtractorUI:
                         )
                 self._runtime_preinspection_headcount_overrides = {}
 
-            self.inspector_manager.preinspection_assignment_targets = targets
+            self.inspector_manager.set_fixed_inspector_rules(preinspection_assignment_targets=targets)
 
             if targets:
                 self.log_message(f"検査割当て人数情報を設定しました: {len(targets)}品番")
@@ -2572,6 +2576,26 @@ class ModernDataExtractorUI:
         except Exception as e:
             self.log_message(f"検査割当て人数情報の設定に失敗しました: {str(e)}")
             logger.error(f"検査割当て人数情報の設定に失敗しました: {str(e)}", exc_info=True)
+
+    def _set_mix_prevention_groups_to_manager(self):
+        """類似製品の混入防止グループを設定ファイルから読み込み、InspectorAssignmentManagerに設定"""
+        if not hasattr(self, 'inspector_manager') or self.inspector_manager is None:
+            return
+        # 設定ファイルのパスは割当エンジンの設定（MIX_PREVENTION_GROUPS_PATH）から取得
+        configured_path = self.inspector_manager.settings.mix_prevention_groups_path
+        file_path = resolve_settings_path(configured_path) if configured_path else None
+        if not file_path:
+            self.inspector_manager.set_mix_prevention_groups(DEFAULT_MIX_PREVENTION_GROUPS)
+            return
+        try:
+            groups = load_mix_prevention_groups(file_path)
+        except Exception as e:
+            # 読み込めない場合は既定のグループで割り当てる（混入防止を無効にはしない）
+            self.log_message(f"混入防止グループの読み込みに失敗したため既定の設定を使用します: {str(e)}")
+            logger.error(f"混入防止グループの読み込みに失敗しました: {str(e)}", exc_info=True)
+            groups = list(DEFAULT_MIX_PREVENTION_GROUPS)
+        self.inspector_manager.set_mix_prevention_groups(groups)
+        self.log_message(f"混入防止グループを設定しました: {len(self.inspector_manager.mix_prevention_index.classes)}グループ")
     
     def load_registered_products(self):
         """登録済み品番リストをファイルから読み込む"""
@@ -6390,46 +6414,14 @@ class ModernDataExtractorUI:
             前後工程情報が追加されたDataFrame
         """
         try:
-            from pathlib import Path
-            import os
-            
-            # 工程マスタをキャッシュから読み込み（高速化）
-            cache_key = 'process_master'
-            process_master_df = None
-            
-            # キャッシュチェック
-            if cache_key in self.master_cache:
-                try:
-                    current_mtime = os.path.getmtime(process_master_path)
-                    cached_mtime = self.cache_file_mtimes.get(cache_key, 0)
-                    if current_mtime == cached_mtime:
-                        process_master_df = self.master_cache[cache_key]
-                        logger.debug("工程マスタをキャッシュから読み込みました（ファイル未変更）")
-                except (OSError, AttributeError):
-                    pass
-            
-            # キャッシュミスの場合は読み込み
-            if process_master_df is None:
-                process_master_path_obj = Path(process_master_path)
-                if not process_master_path_obj.exists():
-                    return lots_df
-                
-                try:
-                    process_master_df = pd.read_excel(process_master_path, header=None, engine='openpyxl')
-                except Exception as e:
-                    self.log_message(f"工程マスタの読み込みに失敗しました: {str(e)}")
-                    return lots_df
-                
-                if process_master_df.empty:
-                    return lots_df
-                
-                # キャッシュに保存
-                try:
-                    self.master_cache[cache_key] = process_master_df
-                    self.cache_file_mtimes[cache_key] = os.path.getmtime(process_master_path)
-                    self.cache_timestamps[cache_key] = datetime.now()
-                except Exception:
-                    pass
+            # 【高速化】工程マスタは共有の参照表（プロセス内・ローカルのバイナリキャッシュ）で共有する
+            try:
+                process_master = load_process_master(process_master_path)
+            except Exception as e:
+                self.log_message(f"工程マスタの読み込みに失敗しました: {str(e)}")
+                return lots_df
+            if process_master is None or not process_master.cells_by_product:
+                return lots_df
             
             # 前後工程情報の列を追加（初期化）
             lots_df = lots_df.copy()
@@ -6443,86 +6435,41 @@ class ModernDataExtractorUI:
             if '品番' not in lots_df.columns or '現在工程番号' not in lots_df.columns:
                 return lots_df
             
-            # 工程マスタの列名を事前に準備（高速化）
-            product_col = process_master_df.columns[0]
-            process_master_df[product_col] = process_master_df[product_col].astype(str).str.strip()
-            
-            # 工程番号と列インデックスのマッピングを事前作成（高速化）
-            process_number_to_col_idx = {}
-            for col_idx in range(1, len(process_master_df.columns)):
-                col_name = str(process_master_df.columns[col_idx]).strip()
-                if col_name:
-                    process_number_to_col_idx[col_name] = col_idx
-            
             # 品番と工程番号の組み合わせで一括処理（高速化）
-            # 品番と現在工程番号の組み合わせを取得
-            lots_df['品番_clean'] = lots_df['品番'].astype(str).str.strip()
-            lots_df['現在工程番号_clean'] = lots_df['現在工程番号'].astype(str).str.strip()
-            
-            # 有効な行のみをフィルタリング
-            valid_mask = (lots_df['品番_clean'] != '') & (lots_df['品番_clean'] != 'nan') & \
-                        (lots_df['現在工程番号_clean'] != '') & (lots_df['現在工程番号_clean'] != 'nan')
-            
-            if not valid_mask.any():
-                lots_df = lots_df.drop(columns=['品番_clean', '現在工程番号_clean'])
-                return lots_df
-            
-            # 工程マスタから該当品番の行を一括取得（高速化）
-            unique_products = lots_df[valid_mask]['品番_clean'].unique()
-            matching_rows_dict = {}
-            
-            for product in unique_products:
-                matching_rows = process_master_df[process_master_df[product_col] == product]
-                if not matching_rows.empty:
-                    matching_rows_dict[product] = matching_rows.iloc[0]
-            
-            # ベクトル化された処理（高速化）
-            def get_process_info(row):
-                product = row['品番_clean']
-                current_process = row['現在工程番号_clean']
-                
-                if product not in matching_rows_dict or current_process not in process_number_to_col_idx:
-                    return pd.Series({
-                        '前工程番号': '',
-                        '前工程名': '',
-                        '後工程番号': '',
-                        '後工程名': ''
-                    })
-                
-                matching_row = matching_rows_dict[product]
-                current_col_idx = process_number_to_col_idx[current_process]
-                
-                # 前工程
-                prev_process_number = ''
-                prev_process_name = ''
-                if current_col_idx > 1:
-                    prev_col_idx = current_col_idx - 1
-                    prev_process_number = str(process_master_df.columns[prev_col_idx]).strip()
-                    prev_value = matching_row.iloc[prev_col_idx]
-                    prev_process_name = str(prev_value).strip() if pd.notna(prev_value) else ''
-                
-                # 後工程
-                next_process_number = ''
-                next_process_name = ''
-                if current_col_idx < len(process_master_df.columns) - 1:
-                    next_col_idx = current_col_idx + 1
-                    next_process_number = str(process_master_df.columns[next_col_idx]).strip()
-                    next_value = matching_row.iloc[next_col_idx]
-                    next_process_name = str(next_value).strip() if pd.notna(next_value) else ''
-                
-                return pd.Series({
-                    '前工程番号': prev_process_number,
-                    '前工程名': prev_process_name,
-                    '後工程番号': next_process_number,
-                    '後工程名': next_process_name
-                })
+            product_keys = lots_df['品番'].astype(str).str.strip()
+            process_keys = lots_df['現在工程番号'].astype(str).str.strip()
+            
+            # 品番・現在工程番号の組み合わせごとに1回だけ前後工程を求める（品番ごとの工程の並びを参照）
+            adjacent_cache: Dict[Tuple[str, str], Tuple[str, str, str, str]] = {}
+            
+            def get_adjacent(product: str, current_process: str) -> Tuple[str, str, str, str]:
+                key = (product, current_process)
+                cached = adjacent_cache.get(key)
+                if cached is not None:
+                    return cached
+                result = ('', '', '', '')
+                if product and product != 'nan' and current_process and current_process != 'nan':
+                    processes = process_master.processes(product)
+                    for pos, entry in enumerate(processes):
+                        if entry.process_number != current_process:
+                            continue
+                        prev_entry = processes[pos - 1] if pos > 0 else None
+                        next_entry = processes[pos + 1] if pos + 1 < len(processes) else None
+                        result = (
+                            prev_entry.process_number if prev_entry else '',
+                            prev_entry.process_name if prev_entry else '',
+                            next_entry.process_number if next_entry else '',
+                            next_entry.process_name if next_entry else '',
+                        )
+                        break
+                adjacent_cache[key] = result
+                return result
             
-            # 一括処理（高速化）
-            process_info_df = lots_df[valid_mask].apply(get_process_info, axis=1)
-            lots_df.loc[valid_mask, '前工程番号'] = process_info_df['前工程番号']
-            lots_df.loc[valid_mask, '前工程名'] = process_info_df['前工程名']
-            lots_df.loc[valid_mask, '後工程番号'] = process_info_df['後工程番号']
-            lots_df.loc[valid_mask, '後工程名'] = process_info_df['後工程名']
+            adjacent = [get_adjacent(product, process) for product, process in zip(product_keys, process_keys)]
+            if adjacent:
+                lots_df['前工程番号'], lots_df['前工程名'], lots_df['後工程番号'], lots_df['後工程名'] = (
+                    list(values) for values in zip(*adjacent)
+                )
             
             # 工程情報をまとめる（ベクトル化）
             def build_process_info(row):
@@ -6537,9 +6484,6 @@ class ModernDataExtractorUI:
             
             lots_df['工程情報'] = lots_df.apply(build_process_info, axis=1)
             
-            # 一時列を削除
-            lots_df = lots_df.drop(columns=['品番_clean', '現在工程番号_clean'])
-            
             return lots_df
             
         except Exception as e:
@@ -8406,7 +8350,18 @@ class ModernDataExtractorUI:
             # 固定検査員情報を設定
             self._set_fixed_inspectors_to_manager()
             self._set_preinspection_assignment_targets_to_manager()
-            
+            self._set_mix_prevention_groups_to_manager()
+
+            # フェーズ別プロファイルレポートはログファイルと同じ場所に出力
+            try:
+                current_log_file = getattr(self, 'current_log_file', None)
+                if current_log_file is not None:
+                    self.inspector_manager.profile_report_path = current_log_file.with_name(
+                        f"{current_log_file.stem}_profile.json"
+                    )
+            except Exception:
+                pass
+
             # 検査員を割り当て（スキル値付きで保存）
             self.update_progress(assign_start, "検査員を割り当て中...")
             self.start_progress_pulse(assign_start, assign_end - 0.01, "検査員を割り当て中...")
@@ -11377,17 +11332,13 @@ class ModernDataExtractorUI:
     def update_inspector_assignment(self, original_index, col_name, col_index, new_inspector_name, new_inspector_code, old_inspector_name, row, inspector_df):
         """検査員割当てを更新"""
         try:
-            from datetime import date as date_type
-            
             if inspector_df is None:
                 self.log_message("エラー: 検査員割当てデータが見つかりません")
                 return
             
             # データフレームの行を取得
             df = inspector_df.copy()
-            divided_time = row.get('分割検査時間', 0.0)
             product_number = row.get('品番', '')
-            current_date = pd.Timestamp.now().date()
             
             # 検査員マスタを読み込む（キャッシュを活用）
             inspector_master_df = self.load_inspector_master_cached()
@@ -11395,169 +11346,27 @@ class ModernDataExtractorUI:
                 self.log_message("エラー: 検査員マスタを読み込めません")
                 return
             
-            # 旧検査員のコードを取得
-            old_inspector_code = None
-            if old_inspector_name:
-                old_name_clean = old_inspector_name.split('(')[0].strip()
-                old_info = inspector_master_df[inspector_master_df['#氏名'] == old_name_clean]
-                if not old_info.empty:
-                    old_inspector_code = old_info.iloc[0]['#ID']
-            
-            # 新検査員が空の場合は削除処理のみ実行
-            if not new_inspector_name or not new_inspector_code:
-                # 検査員を削除（未割当にする）処理
-                # 旧検査員から時間を引く
-                if old_inspector_code:
-                    if old_inspector_code in self.inspector_manager.inspector_daily_assignments:
-                        if current_date in self.inspector_manager.inspector_daily_assignments[old_inspector_code]:
-                            self.inspector_manager.inspector_daily_assignments[old_inspector_code][current_date] = max(
-                                0.0,
-                                self.inspector_manager.inspector_daily_assignments[old_inspector_code][current_date] - divided_time
-                            )
-                    
-                    if old_inspector_code in self.inspector_manager.inspector_work_hours:
-                        self.inspector_manager.inspector_work_hours[old_inspector_code] = max(
-                            0.0,
-                            self.inspector_manager.inspector_work_hours[old_inspector_code] - divided_time
-                        )
-                    
-                    # 品番別累計時間も更新
-                    if old_inspector_code in self.inspector_manager.inspector_product_hours:
-                        if product_number in self.inspector_manager.inspector_product_hours[old_inspector_code]:
-                            self.inspector_manager.inspector_product_hours[old_inspector_code][product_number] = max(
-                                0.0,
-                                self.inspector_manager.inspector_product_hours[old_inspector_code][product_number] - divided_time
-                            )
-                
-                # データフレームを更新（空文字列を設定）
-                df.at[original_index, col_name] = ''
-                
-                # 検査員人数と分割検査時間を再計算
-                self._recalculate_inspector_count_and_divided_time(df, original_index)
-                
-                # 当日洗浄上がり品の制約を更新
-                shipping_date_str = str(row.get('出荷予定日', '')).strip()
-                is_same_day_cleaning = (
-                    shipping_date_str == "当日洗浄上がり品" or
-                    shipping_date_str == "当日洗浄品" or
-                    "当日洗浄" in shipping_date_str or
-                    shipping_date_str == "先行検査" or
-                    shipping_date_str == "当日先行検査"
-                )
-                
-                if is_same_day_cleaning and old_inspector_code:
-                    # 旧検査員を削除
-                    if product_number in self.inspector_manager.same_day_cleaning_inspectors:
-                        self.inspector_manager.same_day_cleaning_inspectors[product_number].discard(old_inspector_code)
-                
-                # データフレームを更新
-                self.current_inspector_data = df
-                
-                # テーブルを再描画（スクロール位置と選択行を保持）
-                self.display_inspector_assignment_table(df, preserve_scroll_position=True, target_row_index=original_index)
-                
-                self.log_message(
-                    f"検査員を削除しました: {old_inspector_name} → 未割当 "
-                    f"(品番: {product_number}, {col_name})"
-                )
-                return
-            
-            # 新検査員の情報を取得
-            new_info = inspector_master_df[inspector_master_df['#ID'] == new_inspector_code]
-            if new_info.empty:
-                self.log_message(f"エラー: 検査員コード {new_inspector_code} が見つかりません")
-                return
-            
-            # 制約チェック（簡易版）
-            # 1. 勤務時間チェック
-            max_hours = self.inspector_manager.get_inspector_max_hours(new_inspector_code, inspector_master_df)
-            daily_hours = self.inspector_manager.inspector_daily_assignments.get(new_inspector_code, {}).get(current_date, 0.0)
-            
-            if daily_hours + divided_time > max_hours:
-                self.log_message(
-                    f"警告: 検査員 '{new_inspector_name}' の勤務時間が超過します "
-                    f"({daily_hours:.1f}h + {divided_time:.1f}h > {max_hours:.1f}h)。"
-                    f"変更を続行します。",
-                    level='warning'
-                )
-            
-            # 2. 同一品番4時間上限チェック
-            product_hours = self.inspector_manager.inspector_product_hours.get(new_inspector_code, {}).get(product_number, 0.0)
-            if product_hours + divided_time > 4.0:
-                self.log_message(
-                    f"警告: 検査員 '{new_inspector_name}' の同一品番累計時間が4時間を超過します "
-                    f"({product_hours:.1f}h + {divided_time:.1f}h = {product_hours + divided_time:.1f}h)。"
-                    f"変更を続行します。",
-                    level='warning'
-                )
-            
-            # 旧検査員から時間を引く
-            if old_inspector_code:
-                if old_inspector_code in self.inspector_manager.inspector_daily_assignments:
-                    if current_date in self.inspector_manager.inspector_daily_assignments[old_inspector_code]:
-                        self.inspector_manager.inspector_daily_assignments[old_inspector_code][current_date] = max(
-                            0.0,
-                            self.inspector_manager.inspector_daily_assignments[old_inspector_code][current_date] - divided_time
-                        )
-                
-                if old_inspector_code in self.inspector_manager.inspector_work_hours:
-                    self.inspector_manager.inspector_work_hours[old_inspector_code] = max(
-                        0.0,
-                        self.inspector_manager.inspector_work_hours[old_inspector_code] - divided_time
-                    )
-                
-                # 品番別累計時間も更新
-                if old_inspector_code in self.inspector_manager.inspector_product_hours:
-                    if product_number in self.inspector_manager.inspector_product_hours[old_inspector_code]:
-                        self.inspector_manager.inspector_product_hours[old_inspector_code][product_number] = max(
-                            0.0,
-                            self.inspector_manager.inspector_product_hours[old_inspector_code][product_number] - divided_time
-                        )
-            
-            # 新検査員に時間を追加
-            if new_inspector_code not in self.inspector_manager.inspector_daily_assignments:
-                self.inspector_manager.inspector_daily_assignments[new_inspector_code] = {}
-            if current_date not in self.inspector_manager.inspector_daily_assignments[new_inspector_code]:
-                self.inspector_manager.inspector_daily_assignments[new_inspector_code][current_date] = 0.0
-            
-            self.inspector_manager.inspector_daily_assignments[new_inspector_code][current_date] += divided_time
-            
-            if new_inspector_code not in self.inspector_manager.inspector_work_hours:
-                self.inspector_manager.inspector_work_hours[new_inspector_code] = 0.0
-            self.inspector_manager.inspector_work_hours[new_inspector_code] += divided_time
-            
-            # 品番別累計時間も更新
-            if new_inspector_code not in self.inspector_manager.inspector_product_hours:
-                self.inspector_manager.inspector_product_hours[new_inspector_code] = {}
-            self.inspector_manager.inspector_product_hours[new_inspector_code][product_number] = (
-                self.inspector_manager.inspector_product_hours[new_inspector_code].get(product_number, 0.0) + divided_time
-            )
-            
-            # データフレームを更新（氏名のみ）
-            new_inspector_display = new_inspector_name
-            
-            df.at[original_index, col_name] = new_inspector_display
-            
-            # 検査員人数と分割検査時間を再計算
-            self._recalculate_inspector_count_and_divided_time(df, original_index)
+            # 新検査員が空の場合は削除（未割当にする）
+            is_removal = not new_inspector_name or not new_inspector_code
+            if not is_removal:
+                # 新検査員の情報を取得
+                new_info = inspector_master_df[inspector_master_df['#ID'] == new_inspector_code]
+                if new_info.empty:
+                    self.log_message(f"エラー: 検査員コード {new_inspector_code} が見つかりません")
+                    return
             
-            # 当日洗浄上がり品の制約を更新
-            shipping_date_str = str(row.get('出荷予定日', '')).strip()
-            is_same_day_cleaning = (
-                shipping_date_str == "当日洗浄上がり品" or
-                shipping_date_str == "当日洗浄品" or
-                "当日洗浄" in shipping_date_str or
-                shipping_date_str == "先行検査" or
-                shipping_date_str == "当日先行検査"
+            # 【高速化】割当台帳で差分反映し、影響を受けた検査員だけを再検証（全体最適化は再実行しない）
+            # 削除の場合も台帳経由で時間を戻し、残りの検査員の分割検査時間を再配分する
+            edit_result = self.inspector_manager.apply_manual_edit(
+                df,
+                original_index,
+                col_name,
+                None if is_removal else new_inspector_name,
+                inspector_master_df,
+                skill_master_df=self.load_skill_master_cached(),
+                show_skill_values=True,
             )
-            
-            if is_same_day_cleaning:
-                # 旧検査員を削除
-                if old_inspector_code and product_number in self.inspector_manager.same_day_cleaning_inspectors:
-                    self.inspector_manager.same_day_cleaning_inspectors[product_number].discard(old_inspector_code)
-                
-                # 新検査員を追加
-                self.inspector_manager.same_day_cleaning_inspectors.setdefault(product_number, set()).add(new_inspector_code)
+            self._log_manual_edit_result(edit_result)
             
             # データフレームを更新
             self.current_inspector_data = df
@@ -11565,29 +11374,51 @@ class ModernDataExtractorUI:
             # テーブルを再描画（スクロール位置と選択行を保持）
             self.display_inspector_assignment_table(df, preserve_scroll_position=True, target_row_index=original_index)
             
-            self.log_message(
-                f"検査員を変更しました: {old_inspector_name if old_inspector_name else '未割当'} → {new_inspector_name} "
-                f"(品番: {product_number}, {col_name})"
-            )
+            if is_removal:
+                self.log_message(
+                    f"検査員を削除しました: {old_inspector_name} → 未割当 "
+                    f"(品番: {product_number}, {col_name})"
+                )
+            else:
+                self.log_message(
+                    f"検査員を変更しました: {old_inspector_name if old_inspector_name else '未割当'} → {new_inspector_name} "
+                    f"(品番: {product_number}, {col_name})"
+                )
             
         except Exception as e:
             self.log_message(f"検査員割当ての更新に失敗しました: {str(e)}")
             logger.error(f"検査員割当ての更新に失敗しました: {str(e)}", exc_info=True)
     
+    def _log_manual_edit_result(self, edit_result):
+        """手動修正の再検証結果（違反・差し替え候補）をログに出力"""
+        for violation in edit_result.violations:
+            if violation.kind == VIOLATION_WORK_HOURS:
+                detail = f"勤務時間が超過します ({violation.value:.1f}h > {violation.limit:.1f}h)"
+            elif violation.kind == VIOLATION_PRODUCT_LIMIT:
+                detail = f"同一品番累計時間が{violation.limit:.0f}時間を超過します ({violation.value:.1f}h)"
+            else:
+                detail = "同一ロット内で重複しています"
+            self.log_message(
+                f"警告: 検査員 '{violation.name}' の{detail}。変更を続行します。",
+                level='warning'
+            )
+        for suggestion in edit_result.suggestions:
+            self.log_message(
+                f"  差し替え候補（{suggestion.column}）: {suggestion.in_name} "
+                f"(当日 {suggestion.daily_hours_after:.1f}h, 同一品番 {suggestion.product_hours_after:.1f}h)"
+            )
+        logger.debug(f"手動修正の差分検証: {edit_result.elapsed_ms:.1f}ms (影響検査員 {len(edit_result.affected_codes)}人)")
+    
     def update_inspector_assignment_multiple(self, original_index, col_name, col_index, selected_inspectors_dict, old_inspector_name, row, inspector_df):
         """複数の検査員を割り当てる（検査員変更ダイアログ用）"""
         try:
-            from datetime import date as date_type
-            
             if inspector_df is None:
                 self.log_message("エラー: 検査員割当てデータが見つかりません")
                 return
             
             # データフレームの行を取得
             df = inspector_df.copy()
-            inspection_time = row.get('検査時間', 0.0)
             product_number = row.get('品番', '')
-            current_date = pd.Timestamp.now().date()
             
             # 検査員マスタを読み込む（キャッシュを活用）
             inspector_master_df = self.load_inspector_master_cached()
@@ -11608,104 +11439,17 @@ class ModernDataExtractorUI:
                 )
                 return
             
-            # 旧検査員のコードを取得
-            old_inspector_codes = []
-            if old_inspector_name:
-                old_name_clean = old_inspector_name.split('(')[0].strip()
-                old_info = inspector_master_df[inspector_master_df['#氏名'] == old_name_clean]
-                if not old_info.empty:
-                    old_inspector_codes.append(old_info.iloc[0]['#ID'])
-            
-            # 現在の検査員列（検査員1～10）から旧検査員のコードを取得
-            for i in range(1, MAX_INSPECTORS_PER_LOT + 1):
-                inspector_col = f'検査員{i}'
-                if inspector_col in df.columns:
-                    inspector_value = row.get(inspector_col, '')
-                    if pd.notna(inspector_value) and str(inspector_value).strip() != '':
-                        inspector_name_clean = str(inspector_value).split('(')[0].strip()
-                        inspector_info = inspector_master_df[inspector_master_df['#氏名'] == inspector_name_clean]
-                        if not inspector_info.empty:
-                            inspector_code = inspector_info.iloc[0]['#ID']
-                            if inspector_code not in old_inspector_codes:
-                                old_inspector_codes.append(inspector_code)
-            
-            # 分割検査時間を計算
-            divided_time = inspection_time / len(selected_names) if len(selected_names) > 0 else 0.0
-            
-            # 旧検査員から時間を引く
-            for old_code in old_inspector_codes:
-                if old_code in self.inspector_manager.inspector_daily_assignments:
-                    if current_date in self.inspector_manager.inspector_daily_assignments[old_code]:
-                        self.inspector_manager.inspector_daily_assignments[old_code][current_date] = max(
-                            0.0,
-                            self.inspector_manager.inspector_daily_assignments[old_code][current_date] - divided_time
-                        )
-                
-                if old_code in self.inspector_manager.inspector_work_hours:
-                    self.inspector_manager.inspector_work_hours[old_code] = max(
-                        0.0,
-                        self.inspector_manager.inspector_work_hours[old_code] - divided_time
-                    )
-                
-                # 品番別累計時間も更新
-                if old_code in self.inspector_manager.inspector_product_hours:
-                    if product_number in self.inspector_manager.inspector_product_hours[old_code]:
-                        self.inspector_manager.inspector_product_hours[old_code][product_number] = max(
-                            0.0,
-                            self.inspector_manager.inspector_product_hours[old_code][product_number] - divided_time
-                        )
-            
-            # 新検査員に時間を追加
-            for new_code in selected_codes:
-                if new_code not in self.inspector_manager.inspector_daily_assignments:
-                    self.inspector_manager.inspector_daily_assignments[new_code] = {}
-                if current_date not in self.inspector_manager.inspector_daily_assignments[new_code]:
-                    self.inspector_manager.inspector_daily_assignments[new_code][current_date] = 0.0
-                
-                self.inspector_manager.inspector_daily_assignments[new_code][current_date] += divided_time
-                
-                if new_code not in self.inspector_manager.inspector_work_hours:
-                    self.inspector_manager.inspector_work_hours[new_code] = 0.0
-                self.inspector_manager.inspector_work_hours[new_code] += divided_time
-                
-                # 品番別累計時間も更新
-                if new_code not in self.inspector_manager.inspector_product_hours:
-                    self.inspector_manager.inspector_product_hours[new_code] = {}
-                self.inspector_manager.inspector_product_hours[new_code][product_number] = (
-                    self.inspector_manager.inspector_product_hours[new_code].get(product_number, 0.0) + divided_time
-                )
-            
-            # データフレームを更新（検査員1～10に設定）
-            for i in range(1, MAX_INSPECTORS_PER_LOT + 1):
-                inspector_col = f'検査員{i}'
-                if inspector_col in df.columns:
-                    if i <= len(selected_names):
-                        df.at[original_index, inspector_col] = selected_names[i - 1]
-                    else:
-                        df.at[original_index, inspector_col] = ''
-            
-            # 検査員人数と分割検査時間を再計算
-            self._recalculate_inspector_count_and_divided_time(df, original_index)
-            
-            # 当日洗浄上がり品の制約を更新
-            shipping_date_str = str(row.get('出荷予定日', '')).strip()
-            is_same_day_cleaning = (
-                shipping_date_str == "当日洗浄上がり品" or
-                shipping_date_str == "当日洗浄品" or
-                "当日洗浄" in shipping_date_str or
-                shipping_date_str == "先行検査" or
-                shipping_date_str == "当日先行検査"
-            )
-            
-            if is_same_day_cleaning:
-                # 旧検査員を削除
-                for old_code in old_inspector_codes:
-                    if product_number in self.inspector_manager.same_day_cleaning_inspectors:
-                        self.inspector_manager.same_day_cleaning_inspectors[product_number].discard(old_code)
-                
-                # 新検査員を追加
-                for new_code in selected_codes:
-                    self.inspector_manager.same_day_cleaning_inspectors.setdefault(product_number, set()).add(new_code)
+            # 【高速化】割当台帳で旧検査員の時間を戻して新検査員に差分反映（検査員1～10・人数・分割検査時間・当日洗浄の制約も更新）
+            edit_result = self.inspector_manager.apply_manual_team_edit(
+                df,
+                original_index,
+                selected_names,
+                inspector_master_df,
+                skill_master_df=self.load_skill_master_cached(),
+                show_skill_values=True,
+                inspector_codes=selected_codes,
+            )
+            self._log_manual_edit_result(edit_result)
             
             # データフレームを更新
             self.current_inspector_data = df
@@ -11903,7 +11647,14 @@ class ModernDataExtractorUI:
         try:
             # ログ出力
             logger.info("アプリケーションを終了しています...")
-            
+
+            # 割当中の場合は全体最適化の中止を要求（ワーカースレッドは改善ループを打ち切り、最終是正だけを実行して終わる）
+            if hasattr(self.inspector_manager, 'request_cancel_optimization'):
+                try:
+                    self.inspector_manager.request_cancel_optimization()
+                except Exception as e:
+                    logger.debug(f"全体最適化の中止要求でエラー（無視）: {e}")
+
             # 【高速化】ログバッファをフラッシュ（終了時）
             if hasattr(self.inspector_manager, 'log_batch_enabled') and self.inspector_manager.log_batch_enabled:
                 try:
@@ -11953,6 +11704,7 @@ class ModernDataExtractorUI:
             # 固定検査員情報を設定
             self._set_fixed_inspectors_to_manager()
             self._set_preinspection_assignment_targets_to_manager()
+            self._set_mix_prevention_groups_to_manager()
             
             # 検査員割振りテーブルを作成（製品マスタパスを渡す）
             product_master_path = self.config.product_master_path if self.config else None
@@ -12845,6 +12597,7 @@ class ModernDataExtractorUI:
 
         self._set_fixed_inspectors_to_manager()
         self._set_preinspection_assignment_targets_to_manager()
+        self._set_mix_prevention_groups_to_manager()
 
         temp_manager = InspectorAssignmentManager(
             log_callback=self.log_message,
@@ -12853,8 +12606,8 @@ class ModernDataExtractorUI:
         )
 
         import copy
-        temp_manager.fixed_inspectors_by_product = copy.deepcopy(self.inspector_manager.fixed_inspectors_by_product)
-        temp_manager.preinspection_assignment_targets = copy.deepcopy(self.inspector_manager.preinspection_assignment_targets)
+        fixed_inspectors_by_product = copy.deepcopy(self.inspector_manager.fixed_inspectors_by_product)
+        preinspection_assignment_targets = copy.deepcopy(self.inspector_manager.preinspection_assignment_targets)
 
         fixed_overrides = getattr(self, "_additional_assignment_fixed_overrides", {}) or {}
         if fixed_overrides:
@@ -12863,7 +12616,7 @@ class ModernDataExtractorUI:
                 if not inspectors:
                     continue
                 process_name = str(entry.get("process", "") or "").strip()
-                temp_manager.fixed_inspectors_by_product[product_number] = [{
+                fixed_inspectors_by_product[product_number] = [{
                     "process": process_name,
                     "inspectors": inspectors
                 }]
@@ -12882,10 +12635,12 @@ class ModernDataExtractorUI:
                 if not headcount_val or headcount_val <= 0:
                     continue
                 process_name = str(entry.get("process", "") or "").strip()
-                temp_manager.preinspection_assignment_targets[norm_product_number] = [{
+                preinspection_assignment_targets[norm_product_number] = [{
                     "process": process_name,
                     "headcount": headcount_val
                 }]
+        temp_manager.set_fixed_inspector_rules(fixed_inspectors_by_product, preinspection_assignment_targets)
+        temp_manager.set_mix_prevention_groups(self.inspector_manager.mix_prevention_index.groups)
 
         try:
             vacation_data = getattr(self.inspector_manager, "vacation_data", {}) or {}
@@ -0,0 +1,207 @@
+"""
+フェーズ別プロファイラ
+割当1回分のフェーズ（第1次割当・全体最適化フェーズ0〜4・2.6・2.7・仕上げ）ごとに
+所要時間・イテレーション数・各種カウンタ（swap・タブースキップ・緩和・違反など）の増分を記録し、
+機械可読なJSONレポートとして出力する。2つのレポートの差分表示（比較モード）も提供する。
+
+使い方（比較モード）:
+    python -m app.utils.phase_profiler before_profile.json after_profile.json
+"""
+
+import argparse
+import json
+import sys
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+REPORT_VERSION = 1
+
+
+class PhaseProfiler:
+    """
+    フェーズ別の所要時間とカウンタ増分を記録する
+
+    - start_phase() で直前のフェーズを閉じて次のフェーズを開始する（同じフェーズが複数回現れた場合は合算）
+    - phase() は別のフェーズの途中から呼ばれる処理用で、終了時に呼び出し元のフェーズへ戻す
+    - カウンタは counter_source() のスナップショット差分と、increment() / gauge() で直接記録した値の両方を保持する
+    """
+
+    def __init__(self, counter_source: Optional[Callable[[], Dict[str, float]]] = None) -> None:
+        self._counter_source = counter_source
+        self._run_started: Optional[float] = None
+        self._run_meta: Dict[str, Any] = {}
+        self._phases: Dict[str, Dict[str, Any]] = {}
+        self._current: Optional[str] = None
+        self._phase_started = 0.0
+        self._phase_snapshot: Dict[str, float] = {}
+
+    @property
+    def active(self) -> bool:
+        return self._run_started is not None
+
+    def start_run(self, **meta: Any) -> None:
+        """計測を開始する（前回の計測結果は破棄）"""
+        self._phases = {}
+        self._current = None
+        self._run_meta = dict(meta)
+        self._run_started = perf_counter()
+
+    def start_phase(self, name: str) -> None:
+        """直前のフェーズを閉じてフェーズ name を開始する"""
+        self._open_phase(name, count_call=True)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """フェーズ name を計測し、終了後に呼び出し元のフェーズを再開する"""
+        previous = self._current
+        self._open_phase(name, count_call=True)
+        try:
+            yield
+        finally:
+            if previous is not None:
+                self._open_phase(previous, count_call=False)
+            else:
+                self._close_phase()
+
+    def increment(self, name: str, amount: float = 1) -> None:
+        """現在のフェーズのカウンタを加算する"""
+        if self._current is None:
+            return
+        counters = self._phases[self._current]['counters']
+        counters[name] = counters.get(name, 0) + amount
+
+    def gauge(self, name: str, value: float) -> None:
+        """現在のフェーズの値を記録する（最後に記録した値を採用）"""
+        if self._current is None:
+            return
+        self._phases[self._current]['gauges'][name] = value
+
+    def finish_run(self, **meta: Any) -> Dict[str, Any]:
+        """計測を終了し、レポート（dict）を返す"""
+        if self._run_started is None:
+            return {}
+        self._close_phase()
+        total_seconds = perf_counter() - self._run_started
+        self._run_started = None
+        self._run_meta.update(meta)
+        totals: Dict[str, float] = {}
+        for phase in self._phases.values():
+            for name, value in phase['counters'].items():
+                totals[name] = totals.get(name, 0) + value
+        return {
+            'version': REPORT_VERSION,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'meta': self._run_meta,
+            'total_seconds': round(total_seconds, 4),
+            'phases': {
+                name: {
+                    'calls': phase['calls'],
+                    'seconds': round(phase['seconds'], 4),
+                    'counters': phase['counters'],
+                    'gauges': phase['gauges'],
+                }
+                for name, phase in self._phases.items()
+            },
+            'totals': totals,
+        }
+
+    def _open_phase(self, name: str, count_call: bool) -> None:
+        if self._run_started is None:
+            return
+        self._close_phase()
+        phase = self._phases.setdefault(name, {'calls': 0, 'seconds': 0.0, 'counters': {}, 'gauges': {}})
+        if count_call:
+            phase['calls'] += 1
+        self._current = name
+        self._phase_started = perf_counter()
+        self._phase_snapshot = self._snapshot()
+
+    def _snapshot(self) -> Dict[str, float]:
+        if self._counter_source is None:
+            return {}
+        try:
+            return dict(self._counter_source())
+        except Exception:
+            # カウンタ取得に失敗しても計測は継続
+            return {}
+
+    def _close_phase(self) -> None:
+        if self._current is None:
+            return
+        phase = self._phases[self._current]
+        phase['seconds'] += perf_counter() - self._phase_started
+        after = self._snapshot()
+        for name, value in after.items():
+            delta = value - self._phase_snapshot.get(name, 0)
+            if delta:
+                phase['counters'][name] = phase['counters'].get(name, 0) + delta
+        self._current = None
+
+
+def write_report(report: Dict[str, Any], path: Union[str, Path]) -> Path:
+    """レポートをJSONファイルに書き出す"""
+    report_path = Path(path)
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    report_path.write_text(json.dumps(report, ensure_ascii=False, indent=2, default=str), encoding='utf-8')
+    return report_path
+
+
+def load_report(path: Union[str, Path]) -> Dict[str, Any]:
+    return json.loads(Path(path).read_text(encoding='utf-8'))
+
+
+def compare_reports(before: Dict[str, Any], after: Dict[str, Any]) -> List[Tuple[str, str, float, float]]:
+    """
+    2つのレポートの差分を (フェーズ, 項目, 比較元の値, 比較先の値) のリストで返す
+
+    項目は seconds / calls / counters・gauges の各キー。値が同じ項目は含めない。
+    """
+    rows: List[Tuple[str, str, float, float]] = []
+    rows.append(('(total)', 'seconds', float(before.get('total_seconds', 0.0)), float(after.get('total_seconds', 0.0))))
+    before_phases = before.get('phases', {})
+    after_phases = after.get('phases', {})
+    phase_names = list(before_phases)
+    phase_names.extend(name for name in after_phases if name not in before_phases)
+    for phase_name in phase_names:
+        old = before_phases.get(phase_name, {})
+        new = after_phases.get(phase_name, {})
+        items: Dict[str, Tuple[float, float]] = {
+            'seconds': (float(old.get('seconds', 0.0)), float(new.get('seconds', 0.0))),
+            'calls': (float(old.get('calls', 0)), float(new.get('calls', 0))),
+        }
+        for section in ('counters', 'gauges'):
+            old_values = old.get(section, {})
+            new_values = new.get(section, {})
+            for key in sorted(set(old_values) | set(new_values)):
+                items[key] = (float(old_values.get(key, 0)), float(new_values.get(key, 0)))
+        for key, (old_value, new_value) in items.items():
+            if key == 'seconds' or old_value != new_value:
+                rows.append((phase_name, key, old_value, new_value))
+    return rows
+
+
+def format_comparison(rows: List[Tuple[str, str, float, float]]) -> str:
+    lines = [f"{'phase':<12}{'item':<34}{'before':>12}{'after':>12}{'diff':>12}{'ratio':>8}"]
+    lines.append('-' * len(lines[0]))
+    for phase_name, key, old_value, new_value in rows:
+        ratio = f"x{new_value / old_value:.2f}" if old_value else '-'
+        lines.append(
+            f"{phase_name:<12}{key:<34}{old_value:>12.3f}{new_value:>12.3f}{new_value - old_value:>+12.3f}{ratio:>8}"
+        )
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="フェーズ別プロファイルレポート（JSON）の比較")
+    parser.add_argument('before', type=Path, help="比較元のレポート")
+    parser.add_argument('after', type=Path, help="比較先のレポート")
+    args = parser.parse_args(argv)
+    print(format_comparison(compare_reports(load_report(args.before), load_report(args.after))))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
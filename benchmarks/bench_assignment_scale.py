@@ -0,0 +1,285 @@
+"""
+割当エンジンの規模別ベンチマーク
+シード固定の合成データ（ロット・検査員マスタ・スキルマスタ・休暇予定・固定検査員）で assign_inspectors を実行し、
+全体の実行時間と optimize_assignments のフェーズ別時間を計測して JSON に出力する。
+保存済みのベースライン（JSON）と比較し、しきい値を超えて遅くなったシナリオ・フェーズを回帰として報告する。
+
+フェーズ別時間・カウンタは InspectorAssignmentManager のフェーズ別プロファイル（last_profile_report）から取得する
+（first_pass: 第1次割当、0〜4・2.6・2.7: 全体最適化の各フェーズ、finalize: 最終処理）。
+
+使い方:
+    python benchmarks/bench_assignment_scale.py                                   # small, medium
+    python benchmarks/bench_assignment_scale.py --scenarios small medium large --repeat 3
+    python benchmarks/bench_assignment_scale.py --save-baseline                   # 結果をベースラインとして保存
+    python benchmarks/bench_assignment_scale.py --baseline path/to/baseline.json --threshold 0.2
+
+回帰を検出した場合は終了コード1で終了する（リリース前チェック用）。
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+from datetime import datetime
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCHMARK_DIR.parent))
+sys.path.insert(0, str(BENCHMARK_DIR))
+
+from app.assignment.inspector_assignment_service import InspectorAssignmentManager  # noqa: E402
+from bench_solver_modes import make_synthetic_inputs, summarize_result  # noqa: E402
+
+DEFAULT_BASELINE_PATH = BENCHMARK_DIR / 'baseline_assignment_scale.json'
+DEFAULT_OUTPUT_PATH = BENCHMARK_DIR / 'results' / 'assignment_scale_latest.json'
+
+# 休暇予定の合成に使う休暇コード（終日・午前・午後・早退・遅刻）
+VACATION_CODES = ('休', 'AM', 'PM', '早', '遅')
+
+FIRST_PASS_PHASE = 'first_pass'
+FINALIZE_PHASE = 'finalize'
+OPTIMIZE_PHASES = ('0', '1', '1.5', '2', '2.5', '2.6', '2.7', '3', '3.5', '4')
+
+
+class Scenario(NamedTuple):
+    """ベンチマークのシナリオ（合成データの規模）"""
+
+    name: str
+    lot_count: int
+    inspector_count: int
+    product_count: int
+    vacation_ratio: float = 0.1  # 休暇予定を持つ検査員の割合
+    fixed_product_ratio: float = 0.05  # 固定検査員を登録する品番の割合
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    scenario.name: scenario
+    for scenario in (
+        Scenario('small', 100, 20, 30),
+        Scenario('medium', 1000, 60, 150),
+        Scenario('medium_wide', 1000, 200, 150),
+        Scenario('large', 10000, 200, 600),
+    )
+}
+DEFAULT_SCENARIOS = ('small', 'medium')
+
+
+def make_vacation_data(
+    inspector_master_df: pd.DataFrame,
+    ratio: float,
+    seed: int = 0,
+) -> Dict[str, Dict[str, Any]]:
+    """休暇予定（{氏名: 休暇情報}）を合成する"""
+    if ratio <= 0:
+        return {}
+    from app.services.vacation_schedule_service import get_vacation_info
+
+    rng = random.Random(seed + 1)
+    names = [str(name) for name in inspector_master_df['#氏名'].tolist()]
+    count = int(round(len(names) * ratio))
+    return {
+        name: get_vacation_info(rng.choice(VACATION_CODES))
+        for name in rng.sample(names, min(count, len(names)))
+    }
+
+
+def make_fixed_inspectors(
+    inspector_master_df: pd.DataFrame,
+    skill_master_df: pd.DataFrame,
+    ratio: float,
+    seed: int = 0,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """登録済み品番の固定検査員（fixed_inspectors_by_product と同じ形式）を合成する"""
+    rng = random.Random(seed + 2)
+    code_to_name = dict(zip(inspector_master_df['#ID'].astype(str), inspector_master_df['#氏名'].astype(str)))
+    fixed: Dict[str, List[Dict[str, Any]]] = {}
+    for _, row in skill_master_df.iterrows():
+        if rng.random() >= ratio:
+            continue
+        skilled = [code for code in code_to_name if str(row.get(code, '')).strip() in ('1', '2', '3')]
+        if not skilled:
+            continue
+        chosen = rng.sample(skilled, min(len(skilled), rng.randint(1, 2)))
+        fixed[str(row['品番'])] = [{'process': '', 'inspectors': [code_to_name[code] for code in chosen]}]
+    return fixed
+
+
+def run_scenario_once(
+    scenario: Scenario,
+    solver_mode: str,
+    seed: int,
+) -> Dict[str, Any]:
+    """シナリオを1回実行し、全体時間・フェーズ別時間・フェーズ別カウンタ・集計値を返す"""
+    lots_df, inspector_master_df, skill_master_df = make_synthetic_inputs(
+        scenario.lot_count, scenario.inspector_count, scenario.product_count, seed=seed
+    )
+    vacation_data = make_vacation_data(inspector_master_df, scenario.vacation_ratio, seed=seed)
+
+    def discard(message: Any, level: str = 'info', channel: Any = None) -> None:
+        return None
+
+    manager = InspectorAssignmentManager(log_callback=discard)
+    manager.solver_mode = solver_mode
+    manager.fixed_inspectors_by_product = make_fixed_inspectors(
+        inspector_master_df, skill_master_df, scenario.fixed_product_ratio, seed=seed
+    )
+    if vacation_data:
+        manager.set_vacation_data(vacation_data, pd.Timestamp.now().date(), inspector_master_df)
+
+    started = perf_counter()
+    result_df = manager.assign_inspectors(
+        lots_df, inspector_master_df, skill_master_df, show_skill_values=True
+    )
+    elapsed = perf_counter() - started
+
+    profile_phases = manager.last_profile_report.get('phases', {})
+    phases = {name: phase['seconds'] for name, phase in profile_phases.items()}
+    return {
+        'elapsed': elapsed,
+        'optimize_elapsed': sum(seconds for name, seconds in phases.items() if name in OPTIMIZE_PHASES),
+        'phases': phases,
+        'counters': {name: phase['counters'] for name, phase in profile_phases.items() if phase['counters']},
+        'summary': summarize_result(manager, result_df, inspector_master_df),
+    }
+
+
+def run_scenario(scenario: Scenario, solver_mode: str, seed: int, repeat: int) -> Dict[str, Any]:
+    """シナリオを repeat 回実行し、中央値で集計する"""
+    runs = [run_scenario_once(scenario, solver_mode, seed) for _ in range(max(1, repeat))]
+    phase_names = sorted({name for run in runs for name in run['phases']}, key=_phase_sort_key)
+    return {
+        'lots': scenario.lot_count,
+        'inspectors': scenario.inspector_count,
+        'products': scenario.product_count,
+        'solver_mode': solver_mode,
+        'repeat': len(runs),
+        'elapsed': statistics.median(run['elapsed'] for run in runs),
+        'elapsed_runs': [run['elapsed'] for run in runs],
+        'optimize_elapsed': statistics.median(run['optimize_elapsed'] for run in runs),
+        'phases': {
+            name: statistics.median(run['phases'].get(name, 0.0) for run in runs)
+            for name in phase_names
+        },
+        'counters': runs[-1]['counters'],
+        'summary': runs[-1]['summary'],
+    }
+
+
+def _phase_sort_key(name: str) -> Tuple[int, float]:
+    if name == FIRST_PASS_PHASE:
+        return (0, 0.0)
+    if name == FINALIZE_PHASE:
+        return (2, 0.0)
+    try:
+        return (1, float(name))
+    except ValueError:
+        return (3, 0.0)
+
+
+def find_regressions(
+    report: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float,
+    min_seconds: float,
+) -> List[str]:
+    """
+    ベースラインと比較して回帰を検出する
+
+    全体時間・フェーズ別時間のそれぞれについて、(1 + threshold) 倍を超え、かつ差が min_seconds 以上の場合を回帰とする。
+    """
+    regressions: List[str] = []
+    baseline_scenarios = baseline.get('scenarios', {})
+    for name, current in report.get('scenarios', {}).items():
+        previous = baseline_scenarios.get(name)
+        if not previous or previous.get('solver_mode') != current.get('solver_mode'):
+            continue
+        pairs = [('elapsed', previous.get('elapsed', 0.0), current['elapsed'])]
+        pairs.extend(
+            (phase, previous.get('phases', {}).get(phase, 0.0), seconds)
+            for phase, seconds in current['phases'].items()
+        )
+        for label, before, after in pairs:
+            if after - before >= min_seconds and after > before * (1.0 + threshold):
+                ratio = after / before if before > 0 else float('inf')
+                regressions.append(f"{name} {label}: {before:.2f}s → {after:.2f}s (x{ratio:.2f})")
+    return regressions
+
+
+def _environment() -> Dict[str, str]:
+    return {
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    for name, result in report['scenarios'].items():
+        summary = result['summary']
+        print(
+            f"[{name}] ロット {result['lots']}件 / 検査員 {result['inspectors']}名 ({result['solver_mode']}): "
+            f"{result['elapsed']:.2f}s（最適化 {result['optimize_elapsed']:.2f}s）"
+            f" 割当 {summary['assigned_lots']}/{summary['total_lots']}"
+        )
+        for phase, seconds in result['phases'].items():
+            print(f"    {phase:<12}{seconds:>9.2f}s")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="割当エンジンの規模別ベンチマーク（JSON出力・ベースライン比較）")
+    parser.add_argument('--scenarios', nargs='+', default=list(DEFAULT_SCENARIOS), choices=sorted(SCENARIOS))
+    parser.add_argument('--solver-mode', default='greedy', choices=('greedy', 'flow'))
+    parser.add_argument('--seed', type=int, default=0, help="乱数シード")
+    parser.add_argument('--repeat', type=int, default=1, help="各シナリオの実行回数（中央値で集計）")
+    parser.add_argument('--output', type=Path, default=DEFAULT_OUTPUT_PATH, help="結果JSONの出力先")
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE_PATH, help="比較するベースラインJSON")
+    parser.add_argument('--save-baseline', action='store_true', help="結果をベースラインとして保存（比較は行わない）")
+    parser.add_argument('--threshold', type=float, default=0.2, help="回帰とみなす増加率（0.2 = 20%%）")
+    parser.add_argument('--min-seconds', type=float, default=0.5, help="回帰とみなす最小の増加時間（秒）")
+    args = parser.parse_args()
+
+    report: Dict[str, Any] = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'seed': args.seed,
+        'environment': _environment(),
+        'scenarios': {},
+    }
+    for name in args.scenarios:
+        report['scenarios'][name] = run_scenario(SCENARIOS[name], args.solver_mode, args.seed, args.repeat)
+    print_report(report)
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+    print(f"結果を出力しました: {args.output}")
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+        print(f"ベースラインを保存しました: {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"ベースラインがないため比較を省略しました: {args.baseline}（--save-baseline で作成）")
+        return 0
+    baseline: Optional[Dict[str, Any]] = json.loads(args.baseline.read_text(encoding='utf-8'))
+    regressions = find_regressions(report, baseline or {}, args.threshold, args.min_seconds)
+    if regressions:
+        print(f"回帰を検出しました（しきい値 +{args.threshold * 100:.0f}%、{args.min_seconds:.1f}s 以上）:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print("回帰はありません")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""
+複数人ロットの検査員選択（スキル組み合わせ）のマイクロベンチマーク
+候補数の多いロット（30人以上）を想定し、select_two_inspectors_with_skill_combination /
+select_three_inspectors_with_skill_combination の1回あたりの実行時間を計測する。
+検査員の勤務状況（累計時間・当日時間・割当回数・直近割当・固定検査員）はシード固定で合成する。
+選択結果のダイジェストも出力するため、実装変更の前後で選択が変わっていないことを確認できる。
+
+使い方:
+    python benchmarks/bench_skill_combination.py
+    python benchmarks/bench_skill_combination.py --candidates 30 60 120 --repeat 500
+"""
+
+import argparse
+import copy
+import hashlib
+import random
+import sys
+from datetime import date
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Dict, List, Tuple
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from app.assignment.inspector_assignment_service import InspectorAssignmentManager  # noqa: E402
+from bench_solver_modes import make_synthetic_inputs  # noqa: E402
+
+SKILL_LEVELS = (1, 2, 3)
+DEFAULT_CANDIDATES = (30, 60, 120)
+# 1ケースあたりのロット状況（候補集合・勤務状況）の数
+CASES_PER_SIZE = 20
+
+
+def make_case(
+    candidate_count: int,
+    seed: int,
+) -> Tuple[InspectorAssignmentManager, Dict[Any, List[Dict[str, Any]]], pd.DataFrame, date]:
+    """候補数 candidate_count のロット1件分の選択状況（マネージャー・スキル別候補・検査員マスタ・対象日）を合成する"""
+    rng = random.Random(seed)
+    _, inspector_master_df, _ = make_synthetic_inputs(1, candidate_count, 1, seed=seed)
+    work_date = date(2026, 1, 5)
+
+    def discard(message: Any, level: str = 'info', channel: Any = None) -> None:
+        return None
+
+    manager = InspectorAssignmentManager(log_callback=discard)
+    manager.log_batch_enabled = False
+    # 実行時と同様に検査員インデックス（状態ストアの行・最大勤務時間キャッシュ）を構築する
+    manager._build_inspector_index(inspector_master_df)
+    skill_groups: Dict[Any, List[Dict[str, Any]]] = {1: [], 2: [], 3: [], 'new': []}
+    for code, name in zip(inspector_master_df['#ID'].astype(str), inspector_master_df['#氏名'].astype(str)):
+        assignment_count = rng.randint(0, 6)
+        manager.inspector_assignment_count[code] = assignment_count
+        manager.inspector_work_hours[code] = round(rng.uniform(0.0, 7.0), 1)
+        manager.inspector_daily_assignments[code] = {work_date: round(rng.uniform(0.0, 7.0), 1)}
+        if assignment_count:
+            manager.inspector_last_assignment[code] = pd.Timestamp('2026-01-05 08:00') + pd.Timedelta(
+                minutes=rng.randint(0, 600)
+            )
+        inspector = {
+            '氏名': name,
+            'スキル': rng.choice(SKILL_LEVELS),
+            'コード': code,
+            'is_new_team': rng.random() < 0.1,
+            '__is_fixed': rng.random() < 0.05,
+            '__product_assignment_count': rng.randint(0, 2),
+            '__projected_product_hours': round(rng.uniform(0.0, 4.5), 1),
+            'over_product_limit': rng.random() < 0.05,
+        }
+        skill_groups['new' if inspector['is_new_team'] else inspector['スキル']].append(inspector)
+    return manager, skill_groups, inspector_master_df, work_date
+
+
+def run_size(candidate_count: int, repeat: int, seed: int) -> Dict[str, Any]:
+    """候補数ごとに2人選択・3人選択の1回あたり時間（マイクロ秒）と選択結果のダイジェストを返す"""
+    cases = [make_case(candidate_count, seed + index) for index in range(CASES_PER_SIZE)]
+    result: Dict[str, Any] = {'candidates': candidate_count}
+    for label, required in (('two', 2), ('three', 3)):
+        digest = hashlib.md5()
+        elapsed = 0.0
+        calls = 0
+        for manager, skill_groups, inspector_master_df, work_date in cases:
+            select = (
+                manager.select_two_inspectors_with_skill_combination
+                if required == 2
+                else manager.select_three_inspectors_with_skill_combination
+            )
+            base_assignments = copy.deepcopy(manager.inspector_daily_assignments)
+            for _ in range(repeat):
+                temp_assignments = copy.deepcopy(base_assignments)
+                started = perf_counter()
+                selected = select(
+                    skill_groups,
+                    product_number='P0001',
+                    divided_time=1.5,
+                    current_date=work_date,
+                    inspector_master_df=inspector_master_df,
+                    temp_daily_assignments=temp_assignments,
+                )
+                elapsed += perf_counter() - started
+                calls += 1
+            digest.update(','.join(insp['コード'] for insp in selected).encode('utf-8'))
+            digest.update(b';')
+        result[label] = {'us_per_call': elapsed / max(1, calls) * 1e6, 'digest': digest.hexdigest()[:12]}
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="複数人ロットの検査員選択（スキル組み合わせ）のマイクロベンチマーク")
+    parser.add_argument('--candidates', type=int, nargs='+', default=list(DEFAULT_CANDIDATES), help="候補数")
+    parser.add_argument('--repeat', type=int, default=200, help="ロット状況ごとの実行回数")
+    parser.add_argument('--seed', type=int, default=0, help="乱数シード")
+    args = parser.parse_args()
+
+    for candidate_count in args.candidates:
+        result = run_size(candidate_count, args.repeat, args.seed)
+        print(
+            f"候補 {candidate_count:>4}人: "
+            f"2人選択 {result['two']['us_per_call']:>8.1f}us (選択 {result['two']['digest']}) / "
+            f"3人選択 {result['three']['us_per_call']:>8.1f}us (選択 {result['three']['digest']})"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,222 @@
+"""
+ソルバーモード比較ベンチマーク
+合成データ（ロット・検査員マスタ・スキルマスタ）で貪欲法＋是正フェーズ（greedy）と最小費用流（flow）を実行し、
+実行時間と KPI（print_detailed_kpi_statistics の出力、および結果DataFrameから算出した集計値）を比較する。
+
+使い方:
+    python benchmarks/bench_solver_modes.py --lots 200 --inspectors 30
+    python benchmarks/bench_solver_modes.py --lots 400 --inspectors 20 --repeat 3   # 過密日（人手不足）
+"""
+
+import argparse
+import random
+import sys
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.assignment.inspector_assignment_service import (  # noqa: E402
+    MAX_INSPECTORS_PER_LOT,
+    InspectorAssignmentManager,
+)
+
+SOLVER_MODES = ('greedy', 'flow')
+
+
+def make_synthetic_inputs(
+    lot_count: int,
+    inspector_count: int,
+    product_count: int,
+    seed: int = 0,
+) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """合成データ（ロット, 検査員マスタ, スキルマスタ）を生成する"""
+    rng = random.Random(seed)
+    codes = [f"V{i:03d}" for i in range(1, inspector_count + 1)]
+    inspector_master_df = pd.DataFrame({
+        '#ID': codes,
+        '#氏名': [f"検査員{i:03d}" for i in range(1, inspector_count + 1)],
+        '#コード': [str(i) for i in range(1, inspector_count + 1)],
+        '開始時刻': ['08:00'] * inspector_count,
+        '終了時刻': [rng.choice(['17:00', '15:00', '12:00']) for _ in codes],
+        '所属': ['A'] * inspector_count,
+        '休暇予定表の別名': [''] * inspector_count,
+        '新製品チーム': ['★' if i % 7 == 0 else '' for i in range(inspector_count)],
+    })
+
+    products = [f"P{i:04d}-00" for i in range(product_count)]
+    skill_rows = []
+    for product_number in products:
+        row: Dict[str, Any] = {'品番': product_number, '工程': ''}
+        for code in codes:
+            row[code] = rng.choice(['1', '2', '3', '', '', '', ''])
+        skill_rows.append(row)
+    skill_master_df = pd.DataFrame(skill_rows)
+
+    today = pd.Timestamp.now().normalize()
+    lots = []
+    for i in range(lot_count):
+        product_number = rng.choice(products)
+        k = rng.random()
+        if k < 0.05:
+            shipping_date: Any = '当日洗浄上がり品'
+        elif k < 0.08:
+            shipping_date = '先行検査'
+        else:
+            shipping_date = today + pd.Timedelta(days=rng.randint(0, 10))
+        lots.append({
+            '出荷予定日': shipping_date,
+            '品番': product_number,
+            '品名': 'N' + product_number[:3],
+            '客先': 'C',
+            '生産ロットID': f'L{i:05d}',
+            'ロット数量': rng.randint(100, 3000),
+            '指示日': today - pd.Timedelta(days=rng.randint(0, 20)),
+            '号機': '',
+            '現在工程名': '外観',
+            '現在工程番号': '',
+            '秒/個': 5.0,
+            '検査時間': round(rng.uniform(0.3, 5.0), 1),
+        })
+    return pd.DataFrame(lots), inspector_master_df, skill_master_df
+
+
+def summarize_result(
+    manager: InspectorAssignmentManager,
+    result_df: pd.DataFrame,
+    inspector_master_df: pd.DataFrame,
+) -> Dict[str, float]:
+    """結果DataFrameから比較用の集計値を算出する"""
+    counts = pd.to_numeric(result_df['検査員人数'], errors='coerce').fillna(0)
+    inspection_time = pd.to_numeric(result_df['検査時間'], errors='coerce').fillna(0.0)
+    divided_time = pd.to_numeric(result_df['分割検査時間'], errors='coerce').fillna(0.0)
+    assigned_mask = counts > 0
+
+    name_to_code = {
+        str(name).strip(): str(code).strip()
+        for code, name in zip(inspector_master_df['#ID'], inspector_master_df['#氏名'])
+    }
+    work_hours: Dict[str, float] = {code: 0.0 for code in name_to_code.values()}
+    product_hours: Dict[Tuple[str, str], float] = {}
+    for pos in np.flatnonzero(assigned_mask.to_numpy()):
+        product_number = str(result_df['品番'].iat[pos])
+        for i in range(1, MAX_INSPECTORS_PER_LOT + 1):
+            value = result_df[f'検査員{i}'].iat[pos]
+            if value is None or pd.isna(value) or str(value).strip() == '':
+                continue
+            code = name_to_code.get(str(value).split('(')[0].strip())
+            if code is None:
+                continue
+            work_hours[code] += float(divided_time.iat[pos])
+            key = (code, product_number)
+            product_hours[key] = product_hours.get(key, 0.0) + float(divided_time.iat[pos])
+
+    hours = np.array(list(work_hours.values()), dtype=np.float64)
+    overruns = 0
+    for code, worked in work_hours.items():
+        max_hours = manager.get_inspector_max_hours(code, inspector_master_df)
+        if worked > manager._apply_work_hours_overrun(max_hours) + 1e-6:
+            overruns += 1
+    mean_hours = float(hours.mean()) if hours.size else 0.0
+    return {
+        'assigned_lots': int(assigned_mask.sum()),
+        'total_lots': int(len(result_df)),
+        'assigned_hours': float(inspection_time[assigned_mask].sum()),
+        'demand_hours': float(inspection_time.sum()),
+        'mean_work_hours': mean_hours,
+        'work_hours_cv': float(hours.std() / mean_hours) if mean_hours > 0 else 0.0,
+        'work_hours_overruns': overruns,
+        'product_limit_violations': sum(
+            1 for value in product_hours.values() if value > manager.product_limit_hard_threshold + 1e-6
+        ),
+    }
+
+
+def run_mode(
+    solver_mode: str,
+    lots_df: pd.DataFrame,
+    inspector_master_df: pd.DataFrame,
+    skill_master_df: pd.DataFrame,
+) -> Dict[str, Any]:
+    """指定モードで割当を1回実行し、実行時間・集計値・KPIログを返す"""
+    messages: List[str] = []
+
+    def collect(message: Any, level: str = 'info', channel: Any = None) -> None:
+        messages.extend(str(message).splitlines())
+
+    manager = InspectorAssignmentManager(log_callback=collect)
+    manager.log_batch_enabled = False
+    manager.solver_mode = solver_mode
+    started = perf_counter()
+    result_df = manager.assign_inspectors(
+        lots_df.copy(), inspector_master_df, skill_master_df, show_skill_values=True
+    )
+    elapsed = perf_counter() - started
+
+    # KPIログは結果確定後に改めて出力させて取得する
+    messages.clear()
+    manager.print_detailed_kpi_statistics(result_df, inspector_master_df, skill_master_df)
+    kpi_lines = [line for line in messages if line.strip()]
+    return {
+        'elapsed': elapsed,
+        'summary': summarize_result(manager, result_df, inspector_master_df),
+        'kpi_lines': kpi_lines,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ソルバーモード（greedy / flow）の実行時間と KPI を比較する")
+    parser.add_argument('--lots', type=int, default=200, help="ロット数")
+    parser.add_argument('--inspectors', type=int, default=30, help="検査員数")
+    parser.add_argument('--products', type=int, default=30, help="品番数")
+    parser.add_argument('--seed', type=int, default=0, help="乱数シード")
+    parser.add_argument('--repeat', type=int, default=1, help="各モードの実行回数（実行時間は最小・最大を表示）")
+    parser.add_argument('--modes', nargs='+', default=list(SOLVER_MODES), choices=SOLVER_MODES)
+    parser.add_argument('--show-kpi-log', action='store_true', help="print_detailed_kpi_statistics の出力を表示")
+    args = parser.parse_args()
+
+    lots_df, inspector_master_df, skill_master_df = make_synthetic_inputs(
+        args.lots, args.inspectors, args.products, seed=args.seed
+    )
+    print(
+        f"ロット {args.lots}件 / 検査員 {args.inspectors}名 / 品番 {args.products}件 / "
+        f"検査時間合計 {lots_df['検査時間'].sum():.1f}h"
+    )
+
+    results: Dict[str, List[Dict[str, Any]]] = {}
+    for solver_mode in args.modes:
+        results[solver_mode] = [
+            run_mode(solver_mode, lots_df, inspector_master_df, skill_master_df)
+            for _ in range(max(1, args.repeat))
+        ]
+
+    header = (
+        f"{'mode':<8}{'time min(s)':>12}{'time max(s)':>12}{'lots':>10}{'hours':>14}"
+        f"{'mean h':>9}{'CV':>7}{'overrun':>9}{'>4h':>6}"
+    )
+    print(header)
+    print('-' * len(header))
+    for solver_mode, runs in results.items():
+        elapsed = [run['elapsed'] for run in runs]
+        summary = runs[-1]['summary']
+        print(
+            f"{solver_mode:<8}{min(elapsed):>12.2f}{max(elapsed):>12.2f}"
+            f"{summary['assigned_lots']:>5}/{summary['total_lots']:<4}"
+            f"{summary['assigned_hours']:>7.1f}/{summary['demand_hours']:<6.1f}"
+            f"{summary['mean_work_hours']:>9.2f}{summary['work_hours_cv']:>7.2f}"
+            f"{summary['work_hours_overruns']:>9}{summary['product_limit_violations']:>6}"
+        )
+
+    if args.show_kpi_log:
+        for solver_mode, runs in results.items():
+            print(f"\n[{solver_mode}] print_detailed_kpi_statistics")
+            for line in runs[-1]['kpi_lines']:
+                print(f"  {line}")
+
+
+if __name__ == '__main__':
+    main()
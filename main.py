@@ -7,6 +7,12 @@ from tkinter import messagebox
 from pathlib import Path
 from loguru import logger
 
+from app.assignment.multi_start import MULTI_START_WORKER_FLAG, worker_main as multi_start_worker_main
+
+# マルチスタートのワーカープロセス（exe化後は自身をワーカーとして起動する）: UIを読み込まずに1スタート分を実行して終了
+if __name__ == "__main__" and len(sys.argv) > 1 and sys.argv[1] == MULTI_START_WORKER_FLAG:
+    sys.exit(multi_start_worker_main(sys.argv[2:]))
+
 # ログ設定（起動時のエラーも記録）
 try:
     from app.ui.ui_handlers import ModernDataExtractorUI
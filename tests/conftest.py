@@ -0,0 +1,56 @@
+"""
+テスト共通のフィクスチャ
+割当エンジンのテストは benchmarks/bench_solver_modes.py の合成データ（ロット・検査員マスタ・スキルマスタ）を使用する。
+"""
+
+from typing import Callable, Tuple
+
+import pandas as pd
+import pytest
+
+from app.assignment.inspector_assignment_service import InspectorAssignmentManager
+from benchmarks.bench_solver_modes import make_synthetic_inputs
+
+
+@pytest.fixture(scope="session")
+def synthetic_inputs() -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """合成データ（ロット60件 / 検査員12名 / 品番15種）"""
+    return make_synthetic_inputs(60, 12, 15, seed=2)
+
+
+@pytest.fixture
+def make_manager() -> Callable[..., InspectorAssignmentManager]:
+    """ログを出力しない割当マネージャーを作成する"""
+
+    def factory(**attrs) -> InspectorAssignmentManager:
+        manager = InspectorAssignmentManager(log_callback=lambda *args, **kwargs: None)
+        for name, value in attrs.items():
+            setattr(manager, name, value)
+        return manager
+
+    return factory
+
+
+@pytest.fixture
+def history_snapshot() -> Callable[[InspectorAssignmentManager], tuple]:
+    """割当履歴（勤務時間・品番時間・担当件数・当日洗浄の担当者）を比較用に正規化する（0・空の項目は除く）"""
+
+    def _nested(histories: dict) -> dict:
+        return {
+            key: {inner: round(value, 6) for inner, value in values.items() if abs(value) > 1e-9}
+            for key, values in histories.items()
+            if any(abs(value) > 1e-9 for value in values.values())
+        }
+
+    def snapshot(manager: InspectorAssignmentManager) -> tuple:
+        return (
+            _nested(manager.inspector_daily_assignments),
+            {code: round(hours, 6) for code, hours in manager.inspector_work_hours.items() if abs(hours) > 1e-9},
+            _nested(manager.inspector_product_hours),
+            {code: count for code, count in manager.inspector_assignment_count.items() if count},
+            _nested(manager.inspector_product_assignment_counts),
+            {key: codes for key, codes in manager.same_day_cleaning_inspectors.items() if codes},
+            {key: codes for key, codes in manager.same_day_cleaning_inspectors_by_product_name.items() if codes},
+        )
+
+    return snapshot
@@ -0,0 +1,132 @@
+"""割当台帳（ledger_assign / ledger_unassign / ledger_move による履歴の差分更新）のテスト"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.assignment.inspector_state_store import InspectorStateStore
+
+
+@pytest.fixture
+def assigned(synthetic_inputs, make_manager):
+    lots, inspector_master_df, skill_master_df = synthetic_inputs
+    manager = make_manager()
+    result_df = manager.assign_inspectors(lots.copy(), inspector_master_df, skill_master_df, show_skill_values=True)
+    manager._rebuild_assignment_histories(result_df, inspector_master_df)
+    return manager, result_df, inspector_master_df
+
+
+def _assert_matches_rebuild(manager, result_df, inspector_master_df, history_snapshot):
+    incremental = history_snapshot(manager)
+    manager._rebuild_assignment_histories(result_df, inspector_master_df)
+    assert incremental == history_snapshot(manager)
+
+
+def _assert_store_matches_histories(manager):
+    """差分反映された状態ストアが、履歴辞書から作り直したストアと一致する"""
+    store = manager.state_store
+    rebuilt = InspectorStateStore()
+    rebuilt.set_conflict_classes(store.product_conflict_classes, store.class_hours.shape[1])
+    rebuilt.load_histories(
+        manager.inspector_product_hours.plain_rows(),
+        manager.inspector_product_assignment_counts.plain_rows(),
+        manager.inspector_daily_assignments.plain_rows(),
+    )
+    codes = sorted(set(store.codes) | set(rebuilt.codes))
+    indices, rebuilt_indices = store.indices_of(codes), rebuilt.indices_of(codes)
+    for product_number in set(store.products) | set(rebuilt.products):
+        np.testing.assert_allclose(
+            store.product_column(product_number, indices), rebuilt.product_column(product_number, rebuilt_indices)
+        )
+        np.testing.assert_array_equal(
+            store.count_column(product_number, indices), rebuilt.count_column(product_number, rebuilt_indices)
+        )
+    for work_date in set(store.dates) | set(rebuilt.dates):
+        np.testing.assert_allclose(
+            store.daily_column(work_date, indices), rebuilt.daily_column(work_date, rebuilt_indices)
+        )
+    np.testing.assert_allclose(store.class_hours[indices], rebuilt.class_hours[rebuilt_indices], atol=1e-9)
+
+
+def _first(result_df: pd.DataFrame, mask: pd.Series):
+    matches = result_df.index[mask]
+    if len(matches) == 0:
+        pytest.skip("条件に合うロットがありません")
+    return matches[0]
+
+
+def test_ledger_operations_match_full_rebuild(assigned, history_snapshot):
+    manager, result_df, inspector_master_df = assigned
+    counts = pd.to_numeric(result_df['検査員人数'], errors='coerce').fillna(0)
+    names = inspector_master_df['#氏名'].astype(str).tolist()
+    codes = inspector_master_df['#ID'].astype(str).tolist()
+
+    # 未割当ロットに2人を割り当てる
+    unassigned = _first(result_df, counts == 0)
+    manager.ledger_assign(result_df, unassigned, names[:2], inspector_master_df, inspector_codes=codes[:2])
+    assert int(result_df.at[unassigned, '検査員人数']) == 2
+    _assert_matches_rebuild(manager, result_df, inspector_master_df, history_snapshot)
+
+    # 1枠だけ解除すると残りの検査員の分割検査時間が増える
+    manager.ledger_unassign(result_df, unassigned, '検査員1', inspector_master_df)
+    assert int(result_df.at[unassigned, '検査員人数']) == 1
+    _assert_matches_rebuild(manager, result_df, inspector_master_df, history_snapshot)
+
+    # 別の検査員に差し替える
+    single = _first(result_df, (counts == 1) & (result_df.index != unassigned))
+    current = str(result_df.at[single, '検査員1']).split('(')[0].strip()
+    replacement = next(name for name in names if name != current)
+    manager.ledger_move(result_df, single, '検査員1', replacement, inspector_master_df, recount=True)
+    assert result_df.at[single, '検査員1'] == replacement
+    _assert_matches_rebuild(manager, result_df, inspector_master_df, history_snapshot)
+
+    # ロット全体を未割当にする
+    manager.ledger_unassign(result_df, single, None, inspector_master_df, unassigned_reason='未割当(テスト)')
+    assert int(result_df.at[single, '検査員人数']) == 0
+    assert result_df.at[single, 'チーム情報'] == '未割当(テスト)'
+    _assert_matches_rebuild(manager, result_df, inspector_master_df, history_snapshot)
+
+
+def test_same_day_lot_tracking_follows_ledger(assigned, history_snapshot):
+    manager, result_df, inspector_master_df = assigned
+    counts = pd.to_numeric(result_df['検査員人数'], errors='coerce').fillna(0)
+    same_day = result_df['出荷予定日'].astype(str).str.contains('当日洗浄')
+    index = _first(result_df, same_day & (counts > 0))
+    product_number = result_df.at[index, '品番']
+    lot_codes = {
+        manager._get_inspector_id_by_name(result_df.at[index, f'検査員{i}'], inspector_master_df)
+        for i in range(1, int(counts[index]) + 1)
+    }
+    assert lot_codes <= manager.same_day_cleaning_inspectors.get(product_number, set())
+
+    manager.ledger_unassign(result_df, index, None, inspector_master_df)
+    _assert_matches_rebuild(manager, result_df, inspector_master_df, history_snapshot)
+
+    names = inspector_master_df['#氏名'].astype(str).tolist()
+    manager.ledger_assign(result_df, index, names[-1:], inspector_master_df)
+    new_code = manager._get_inspector_id_by_name(names[-1], inspector_master_df)
+    assert new_code in manager.same_day_cleaning_inspectors[product_number]
+    _assert_matches_rebuild(manager, result_df, inspector_master_df, history_snapshot)
+
+
+def test_state_store_follows_history_writes(synthetic_inputs, make_manager):
+    lots, inspector_master_df, skill_master_df = synthetic_inputs
+    manager = make_manager()
+    result_df = manager.assign_inspectors(lots.copy(), inspector_master_df, skill_master_df, show_skill_values=True)
+    # 実行中の書き込み（フェーズ間の退避・復元や行の差し替えを含む）が配列へ反映されている
+    _assert_store_matches_histories(manager)
+
+    counts = pd.to_numeric(result_df['検査員人数'], errors='coerce').fillna(0)
+    names = inspector_master_df['#氏名'].astype(str).tolist()
+    single = _first(result_df, counts == 1)
+    current = str(result_df.at[single, '検査員1']).split('(')[0].strip()
+    manager.ledger_move(
+        result_df, single, '検査員1', next(name for name in names if name != current), inspector_master_df, recount=True
+    )
+    _assert_store_matches_histories(manager)
+    manager.ledger_unassign(result_df, single, None, inspector_master_df)
+    _assert_store_matches_histories(manager)
+
+    manager.reset_assignment_history()
+    assert not manager.state_store.product_hours.any()
+    assert not manager.state_store.class_hours.any()
@@ -0,0 +1,55 @@
+"""割当行列（AssignmentMatrix）のテスト"""
+
+from datetime import date
+
+import pandas as pd
+
+from app.assignment.assignment_matrix import AssignmentMatrix
+
+
+def _frame() -> pd.DataFrame:
+    return pd.DataFrame({
+        '品番': ['P1', 'P2', 'P3'],
+        '出荷予定日': ['2026-10-20', '2026-10-21', '当日洗浄上がり品'],
+        '検査時間': [2.0, 3.0, 1.0],
+        '検査員人数': [1, 0, 0],
+        '分割検査時間': [2.0, 0.0, 0.0],
+        '検査員1': ['山田(3)', '', ''],
+        '検査員2': ['', '', ''],
+    }, index=[10, 11, 12])
+
+
+def _lot_date(value) -> date:
+    return pd.Timestamp(value).date() if value != '当日洗浄上がり品' else date(2026, 10, 17)
+
+
+def test_materialize_writes_only_changed_lots():
+    result_df = _frame()
+    matrix = AssignmentMatrix.from_frame(result_df, 2, _lot_date, resolve_code={'山田': 'V001'}.get)
+    assert matrix.positions_with_inspector('V001').tolist() == [0]
+    assert matrix.lot_date(2) == date(2026, 10, 17)
+
+    matrix.set_slot(1, 0, 'V002', '佐藤(2)')
+    matrix.set_slot(1, 1, 'V001', '山田(3)')
+    matrix.set_inspector_count(1, 2)
+    matrix.set_divided_time(1, 1.5)
+    # 未反映の間は結果DataFrameを書き換えない
+    assert result_df.at[11, '検査員1'] == ''
+
+    matrix.materialize(result_df)
+
+    assert result_df.loc[11, ['検査員1', '検査員2']].tolist() == ['佐藤(2)', '山田(3)']
+    assert result_df.at[11, '検査員人数'] == 2
+    assert result_df.at[11, '分割検査時間'] == 1.5
+    assert result_df.loc[10, ['検査員1', '検査員人数']].tolist() == ['山田(3)', 1]
+    assert matrix.positions_with_inspector('V001').tolist() == [0, 1]
+
+
+def test_clear_empties_lot():
+    result_df = _frame()
+    matrix = AssignmentMatrix.from_frame(result_df, 2, _lot_date, resolve_code={'山田': 'V001'}.get)
+    matrix.clear(0)
+    matrix.materialize(result_df)
+    assert result_df.at[10, '検査員1'] == ''
+    assert result_df.at[10, '検査員人数'] == 0
+    assert matrix.positions_with_inspector('V001').tolist() == []
@@ -0,0 +1,46 @@
+"""割当エンジンの設定（AssignmentSettings）のテスト"""
+
+from app.assignment.assignment_settings import AssignmentSettings
+
+
+def test_defaults_when_unset():
+    assert AssignmentSettings.from_env({}) == AssignmentSettings()
+
+
+def test_values_are_parsed_and_clamped():
+    settings = AssignmentSettings.from_env({
+        'HOLIDAY_CALENDAR_PATH': ' holidays.csv ',
+        'MIX_PREVENTION_GROUPS_PATH': 'mix.csv',
+        'INSPECTOR_ASSIGNMENT_SOLVER_MODE': 'FLOW',
+        'INSPECTOR_ASSIGNMENT_MULTI_START': '99',
+        'INSPECTOR_ASSIGNMENT_MULTI_START_BUDGET_SEC': '0',
+        'INSPECTOR_ASSIGNMENT_MULTI_START_SEED': '-3',
+        'INSPECTOR_ASSIGNMENT_WARM_START': 'on',
+        'INSPECTOR_ASSIGNMENT_TIME_BUDGET_SEC': 'abc',
+        'INSPECTOR_ASSIGNMENT_METRICS_HISTORY_SIZE': '5',
+        'INSPECTOR_ASSIGNMENT_PROFILE_REPORT': 'off',
+    })
+    assert settings.holiday_calendar_path == 'holidays.csv'
+    assert settings.mix_prevention_groups_path == 'mix.csv'
+    assert settings.solver_mode == 'flow'
+    assert settings.multi_start == 16
+    assert settings.multi_start_budget_sec == 1.0
+    assert settings.multi_start_seed == -3
+    assert settings.warm_start is True
+    assert settings.time_budget_sec == 0.0
+    assert settings.metrics_history_size == 10
+    assert settings.profile_report is False
+
+
+def test_unknown_solver_mode_falls_back_to_greedy():
+    assert AssignmentSettings.from_env({'INSPECTOR_ASSIGNMENT_SOLVER_MODE': 'lp'}).solver_mode == 'greedy'
+
+
+def test_manager_reads_settings_at_construction(monkeypatch, make_manager):
+    # config.env はモジュールの読み込み後に環境変数へ展開されるため、生成時の値が反映されること
+    monkeypatch.setenv('INSPECTOR_ASSIGNMENT_SOLVER_MODE', 'flow')
+    monkeypatch.setenv('INSPECTOR_ASSIGNMENT_MULTI_START', '3')
+    manager = make_manager()
+    assert manager.settings.solver_mode == 'flow'
+    assert manager.solver_mode == 'flow'
+    assert manager.multi_start_count == 3
@@ -0,0 +1,81 @@
+"""候補検査員キャッシュ（CandidateCache と get_available_inspectors の静的候補）のテスト"""
+
+from datetime import date
+
+from app.assignment.candidate_cache import (
+    STATIC_CANDIDATES_OK,
+    CandidateCache,
+    StaticCandidates,
+    make_cache_key,
+)
+
+
+def _builder(calls: list, value: str):
+    def build() -> StaticCandidates:
+        calls.append(value)
+        return StaticCandidates(STATIC_CANDIDATES_OK, ({'コード': value},))
+
+    return build
+
+
+def test_cache_hits_until_version_changes():
+    cache = CandidateCache()
+    calls = []
+    key = make_cache_key('P1', '10', '', 'normal')
+    first = cache.get_or_build(key, 1, _builder(calls, 'A'))
+    assert cache.get_or_build(key, 1, _builder(calls, 'B')) is first
+    assert (cache.hits, cache.misses, calls) == (1, 1, ['A'])
+
+    # 状態バージョンが変わったら全件破棄して作り直す
+    rebuilt = cache.get_or_build(key, 2, _builder(calls, 'B'))
+    assert rebuilt.candidates[0]['コード'] == 'B'
+    assert len(cache) == 1
+
+
+def test_unhashable_key_is_not_cached():
+    cache = CandidateCache()
+    calls = []
+    key = make_cache_key('P1', ['unhashable'])
+    assert key is None
+    cache.get_or_build(key, 1, _builder(calls, 'A'))
+    cache.get_or_build(key, 1, _builder(calls, 'A'))
+    assert calls == ['A', 'A']
+    assert len(cache) == 0
+
+
+def _candidate_codes(manager, lots, skill_master_df, inspector_master_df) -> list:
+    return [
+        [
+            candidate['コード']
+            for candidate in manager.get_available_inspectors(
+                row['品番'], row['現在工程番号'], skill_master_df, inspector_master_df,
+                shipping_date=row['出荷予定日'], process_name_context=row.get('現在工程名', ''),
+            )
+        ]
+        for _, row in lots.head(20).iterrows()
+    ]
+
+
+def test_cached_candidates_match_uncached_and_follow_vacations(synthetic_inputs, make_manager):
+    lots, inspector_master_df, skill_master_df = synthetic_inputs
+    manager = make_manager()
+    manager.assign_inspectors(lots.copy(), inspector_master_df, skill_master_df, show_skill_values=True)
+
+    cached = _candidate_codes(manager, lots, skill_master_df, inspector_master_df)
+    hits_before = manager._candidate_cache.hits
+    assert _candidate_codes(manager, lots, skill_master_df, inspector_master_df) == cached
+    assert manager._candidate_cache.hits > hits_before
+    manager.invalidate_candidate_cache()
+    assert _candidate_codes(manager, lots, skill_master_df, inspector_master_df) == cached
+
+    # 休暇情報を設定するとキャッシュが破棄され、終日休暇の検査員は候補から外れる
+    code = next(code for codes in cached for code in codes)
+    name = manager.inspector_id_to_row[code]['#氏名']
+    manager.set_vacation_data(
+        {name: {'code': '休', 'work_status': '休み', 'interpretation': '終日'}},
+        date.today(),
+        inspector_master_df,
+    )
+    after_vacation = _candidate_codes(manager, lots, skill_master_df, inspector_master_df)
+    assert all(code not in codes for codes in after_vacation)
+    assert [[c for c in codes if c != code] for codes in cached] == after_vacation
@@ -0,0 +1,72 @@
+"""固定検査員インデックス（FixedInspectorIndex）のテスト"""
+
+from app.assignment.fixed_inspector_index import (
+    FixedInspectorIndex,
+    normalize_person_name,
+    split_process_keywords,
+)
+
+
+FIXED = {
+    'P1': [
+        {'process': '', 'inspectors': ['山田 太郎', '佐藤']},
+        {'process': '外観／寸法', 'inspectors': ['鈴木', '佐藤']},
+    ],
+    ' P2 ': [{'process': '最終', 'inspectors': ['', '田中']}],
+    'P3': [{'process': '', 'inspectors': []}],
+}
+HEADCOUNTS = {
+    'P1': [
+        {'process': '', 'headcount': '2'},
+        {'process': '洗浄', 'headcount': '3'},
+        {'process': '外観', 'headcount': '0'},
+    ],
+    'P4': [{'process': '洗浄', 'headcount': 'x'}],
+}
+
+
+def test_split_and_normalize():
+    assert split_process_keywords('外観／寸法/ 最終 ') == ('外観', '寸法', '最終')
+    assert split_process_keywords(None) == ()
+    assert normalize_person_name('山田　太郎(3)') == '山田太郎'
+    assert normalize_person_name(float('nan')) == ''
+
+
+def test_lookup_merges_matching_rules_in_registration_order():
+    index = FixedInspectorIndex.build(FIXED, HEADCOUNTS)
+    assert index.fixed_names('P1', '') == ('山田 太郎', '佐藤')
+    assert index.fixed_names('P1', '寸法検査') == ('山田 太郎', '佐藤', '鈴木')
+    # 品番の前後の空白は無視し、工程名フィルターは部分一致
+    assert index.fixed_names('P2', '最終検査') == ('田中',)
+    assert index.fixed_names('P2', '外観') == ()
+    assert not index.has_fixed_product('P3')
+    assert index.fixed_names('P9', '外観') == ()
+
+
+def test_is_fixed_and_mask_use_normalized_names():
+    index = FixedInspectorIndex.build(FIXED, HEADCOUNTS)
+    assert index.is_fixed('P1', '外観', '山田太郎(2)')
+    assert index.is_fixed('P1', '外観', '鈴木')
+    assert not index.is_fixed('P1', '', '鈴木')
+    assert index.fixed_mask('P1', '外観', ['佐藤', '田中', '山田　太郎']).tolist() == [True, False, True]
+    assert index.fixed_mask('P9', '外観', ['佐藤']).tolist() == [False]
+
+
+def test_preinspection_target_prefers_matching_process_filter():
+    index = FixedInspectorIndex.build(FIXED, HEADCOUNTS)
+    assert index.preinspection_target('P1', '洗浄後') == (3, '洗浄')
+    assert index.preinspection_target('P1', '外観') == (2, '')
+    assert index.preinspection_target('P4', '洗浄') is None
+    assert index.preinspection_target('P9', '') is None
+
+
+def test_is_built_from_tracks_source_dicts():
+    index = FixedInspectorIndex.build(FIXED, HEADCOUNTS)
+    assert index.is_built_from(FIXED, HEADCOUNTS)
+    assert not index.is_built_from(dict(FIXED), HEADCOUNTS)
+
+
+def test_manager_rebuilds_index_when_settings_are_replaced(make_manager):
+    manager = make_manager()
+    manager.fixed_inspectors_by_product = {'P1': [{'process': '', 'inspectors': ['鈴木']}]}
+    assert manager._get_fixed_inspector_index().fixed_names('P1', '') == ('鈴木',)
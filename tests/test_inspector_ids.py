@@ -0,0 +1,43 @@
+"""検査員ID（InspectorIdTable）と結果DataFrameの内部列のテスト"""
+
+from app.assignment.inspector_ids import EMPTY_INSPECTOR_ID, InspectorIdTable, label_matches_name
+
+
+def test_intern_is_stable_and_keeps_first_code():
+    table = InspectorIdTable()
+    first = table.intern('V001', '検査員A')
+    assert table.intern(' V001 ') == first
+    assert table.intern('V002', '検査員B') == first + 1
+    assert table.codes[first] == 'V001'
+    assert table.intern(None) == EMPTY_INSPECTOR_ID
+    assert table.intern('') == EMPTY_INSPECTOR_ID
+
+
+def test_resolve_requires_matching_label():
+    table = InspectorIdTable()
+    inspector_id = table.intern('V001', '検査員A')
+    assert table.resolve(inspector_id, '検査員A') == inspector_id
+    assert table.resolve(inspector_id, '検査員A(2)') == inspector_id
+    assert table.resolve(float(inspector_id), '検査員A (新)') == inspector_id
+    # UIで表示名だけ書き換えた場合はIDを信用しない
+    assert table.resolve(inspector_id, '検査員B') is None
+    assert table.resolve(EMPTY_INSPECTOR_ID, '検査員A') is None
+    assert table.resolve(99, '検査員A') is None
+    assert table.resolve(float('nan'), '検査員A') is None
+
+
+def test_label_matches_name_rejects_prefix_collisions():
+    assert label_matches_name('山田(3)', '山田')
+    assert not label_matches_name('山田太郎', '山田')
+
+
+def test_assign_inspectors_returns_no_internal_columns(synthetic_inputs, make_manager):
+    lots, inspector_master_df, skill_master_df = synthetic_inputs
+    result_df = make_manager().assign_inspectors(
+        lots.copy(), inspector_master_df, skill_master_df, show_skill_values=True
+    )
+    internal = [col for col in result_df.columns if col.startswith('inspector_id_')]
+    assert internal == []
+    assert '_lot_kind' not in result_df.columns
+    assert '_shipping_date_parsed' not in result_df.columns
+    assert '検査員1' in result_df.columns
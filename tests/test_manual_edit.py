@@ -0,0 +1,118 @@
+"""手動修正（割当台帳による差分反映と再検証）のテスト"""
+
+import pandas as pd
+import pytest
+
+from app.assignment.inspector_assignment_service import MAX_INSPECTORS_PER_LOT
+
+
+def _lot_with_team(result_df: pd.DataFrame, size: int, manager=None):
+    counts = pd.to_numeric(result_df['検査員人数'], errors='coerce').fillna(0)
+    mask = counts == size
+    if manager is not None:
+        # 当日洗浄品は他ロットの担当者が候補から外れるため、差し替え候補の検証には通常ロットを使う
+        mask &= ~result_df['出荷予定日'].map(manager._is_same_day_cleaning_label).astype(bool)
+    matches = result_df.index[mask]
+    if len(matches) == 0:
+        pytest.skip(f"検査員{size}人のロットがありません")
+    return matches[0]
+
+
+@pytest.fixture
+def assigned(synthetic_inputs, make_manager):
+    lots, inspector_master_df, skill_master_df = synthetic_inputs
+    manager = make_manager()
+    result_df = manager.assign_inspectors(lots.copy(), inspector_master_df, skill_master_df, show_skill_values=True)
+    # 割当後の履歴は台帳の比較基準として result_df から作り直す
+    manager._rebuild_assignment_histories(result_df, inspector_master_df)
+    return manager, result_df, inspector_master_df, skill_master_df
+
+
+def test_removing_inspector_matches_full_rebuild(assigned, history_snapshot):
+    manager, result_df, inspector_master_df, skill_master_df = assigned
+    index = _lot_with_team(result_df, 2)
+
+    manager.apply_manual_edit(result_df, index, '検査員2', None, inspector_master_df, skill_master_df, show_skill_values=True)
+
+    assert int(result_df.at[index, '検査員人数']) == 1
+    assert str(result_df.at[index, '検査員2']).strip() == ''
+    # 残りの検査員は検査時間を1人で受け持つ
+    assert float(result_df.at[index, '分割検査時間']) == pytest.approx(float(result_df.at[index, '検査時間']))
+    after_edit = history_snapshot(manager)
+    manager._rebuild_assignment_histories(result_df, inspector_master_df)
+    assert after_edit == history_snapshot(manager)
+
+
+def test_team_edit_matches_full_rebuild(assigned, history_snapshot):
+    manager, result_df, inspector_master_df, skill_master_df = assigned
+    index = _lot_with_team(result_df, 1)
+    names = inspector_master_df['#氏名'].astype(str).tolist()[:3]
+    codes = inspector_master_df['#ID'].astype(str).tolist()[:3]
+
+    manager.apply_manual_team_edit(
+        result_df, index, names, inspector_master_df, skill_master_df, show_skill_values=True, inspector_codes=codes
+    )
+
+    assert int(result_df.at[index, '検査員人数']) == 3
+    assert [result_df.at[index, f'検査員{i}'] for i in range(1, 4)] == names
+    assert all(str(result_df.at[index, f'検査員{i}']).strip() == '' for i in range(4, MAX_INSPECTORS_PER_LOT + 1))
+    after_edit = history_snapshot(manager)
+    manager._rebuild_assignment_histories(result_df, inspector_master_df)
+    assert after_edit == history_snapshot(manager)
+
+
+def test_removed_inspector_is_not_suggested(assigned):
+    manager, result_df, inspector_master_df, _ = assigned
+    index = _lot_with_team(result_df, 2, manager)
+    removed_code = manager._get_inspector_id_by_name(result_df.at[index, '検査員2'], inspector_master_df)
+    remaining_code = manager._get_inspector_id_by_name(result_df.at[index, '検査員1'], inspector_master_df)
+    (lot_date,) = [
+        day for day in manager.inspector_daily_assignments[remaining_code]
+        if day in manager.inspector_daily_assignments[removed_code]
+    ][:1]
+    # 外した検査員が最も余裕のある候補になるようにし、残りの検査員は勤務時間超過にして差し替え候補を出させる
+    for code in manager.inspector_id_to_row:
+        if code not in (removed_code, remaining_code):
+            daily = manager.inspector_daily_assignments.setdefault(code, {})
+            daily[lot_date] = daily.get(lot_date, 0.0) + 0.5
+    manager.inspector_daily_assignments[removed_code] = {lot_date: float(result_df.at[index, '分割検査時間'])}
+    manager.inspector_product_hours[removed_code] = {}
+    manager.inspector_daily_assignments[remaining_code][lot_date] += 24.0
+
+    edit_result = manager.apply_manual_edit(result_df, index, '検査員2', None, inspector_master_df, show_skill_values=True)
+
+    assert any(violation.code == remaining_code for violation in edit_result.violations)
+    assert edit_result.suggestions
+    assert removed_code not in {suggestion.in_code for suggestion in edit_result.suggestions}
+
+
+@pytest.mark.parametrize('mix_group', [False, True])
+def test_suggestions_follow_engine_candidate_filter(assigned, mix_group):
+    manager, result_df, inspector_master_df, _ = assigned
+    index = _lot_with_team(result_df, 2, manager)
+    product_number = str(result_df.at[index, '品番']).strip()
+    removed_code = manager._get_inspector_id_by_name(result_df.at[index, '検査員2'], inspector_master_df)
+    remaining_code = manager._get_inspector_id_by_name(result_df.at[index, '検査員1'], inspector_master_df)
+    (lot_date,) = [
+        day for day in manager.inspector_daily_assignments[remaining_code]
+        if day in manager.inspector_daily_assignments[removed_code]
+    ][:1]
+    # 勤務時間・品番時間で入れられるのは1名だけ（他の検査員は勤務時間超過）で、その検査員は類似品番を担当済み
+    spare_code = next(code for code in manager.inspector_id_to_row if code not in (removed_code, remaining_code))
+    for code in manager.inspector_id_to_row:
+        if code not in (removed_code, remaining_code, spare_code):
+            manager.inspector_daily_assignments.setdefault(code, {})[lot_date] = 24.0
+    manager.inspector_daily_assignments[spare_code] = {}
+    manager.inspector_product_hours[spare_code] = {'MIX-TEST-01': 1.0}
+    manager.inspector_daily_assignments[remaining_code][lot_date] += 24.0
+    manager.set_mix_prevention_groups([(product_number, 'MIX-TEST-01')] if mix_group else [])
+
+    edit_result = manager.apply_manual_edit(result_df, index, '検査員2', None, inspector_master_df, show_skill_values=True)
+
+    assert any(violation.code == remaining_code for violation in edit_result.violations)
+    suggested = {suggestion.in_code for suggestion in edit_result.suggestions}
+    if mix_group:
+        # 混入防止ルールに反する差し替えは提案しない
+        assert suggested == set()
+    else:
+        assert suggested == {spare_code}
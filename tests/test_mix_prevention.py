@@ -0,0 +1,66 @@
+"""類似製品の混入防止（MixPreventionIndex と設定ファイルの読み込み）のテスト"""
+
+import pytest
+
+from app.assignment.mix_prevention import MixPreventionIndex, load_mix_prevention_groups
+
+
+def test_load_groups_skips_comments_blanks_and_single_products(tmp_path):
+    path = tmp_path / 'mix_prevention_groups.csv'
+    path.write_text(
+        '﻿# 品番1,品番2\n'
+        'A-01, A-02 ,A-01\n'
+        '\n'
+        'B-01,,\n'
+        ' ,C-01,C-02,C-03\n',
+        encoding='utf-8',
+    )
+    assert load_mix_prevention_groups(path) == [('A-01', 'A-02'), ('C-01', 'C-02', 'C-03')]
+    assert load_mix_prevention_groups('') == []
+    with pytest.raises(OSError):
+        load_mix_prevention_groups(tmp_path / 'missing.csv')
+
+
+def test_build_merges_duplicate_groups_and_maps_products_to_classes():
+    index = MixPreventionIndex.build([
+        ('A-01', 'A-02'),
+        (' A-02 ', 'A-01'),
+        ('A-02', 'A-03'),
+        ('B-01',),
+        ('B-01', ''),
+    ])
+    assert index.groups == [('A-01', 'A-02'), ('A-02', 'A-03')]
+    assert index.classes_of('A-01') == (0,)
+    assert index.classes_of('A-02') == (0, 1)
+    assert index.classes_of('B-01') == ()
+    assert index.counterparts('A-02') == ('A-01', 'A-03')
+    assert index.counterparts('Z-99') == ()
+
+
+def test_inspectors_never_cover_two_products_of_one_group(synthetic_inputs, make_manager):
+    lots, inspector_master_df, skill_master_df = synthetic_inputs
+    group = tuple(lots['品番'].astype(str).value_counts().index[:2])
+    manager = make_manager()
+    manager.set_mix_prevention_groups([group])
+    manager.assign_inspectors(lots.copy(), inspector_master_df, skill_master_df, show_skill_values=True)
+
+    covered = {
+        code: {product for product in group if hours.get(product, 0.0) > 0}
+        for code, hours in manager.inspector_product_hours.items()
+    }
+    assert any(covered.values())
+    assert all(len(products) < 2 for products in covered.values())
+
+
+def test_conflict_filter_uses_incremental_class_hours(make_manager, monkeypatch):
+    manager = make_manager()
+    manager.set_mix_prevention_groups([('A-01', 'A-02')])
+    manager.inspector_product_hours.setdefault('I001', {})['A-01'] = 1.5
+    manager.inspector_product_hours.setdefault('I002', {})['A-02'] = 0.5
+    # 候補判定のたびに履歴から配列を作り直さない
+    monkeypatch.setattr(manager.state_store, 'load_histories', lambda *args: pytest.fail("load_histories"))
+    candidates = [{'コード': 'I001', '氏名': '検査員1'}, {'コード': 'I002', '氏名': '検査員2'}]
+
+    assert [c['コード'] for c in manager._exclude_mix_prevention_conflicts(candidates, 'A-02')] == ['I002']
+    manager.inspector_product_hours['I001'].pop('A-01')
+    assert [c['コード'] for c in manager._exclude_mix_prevention_conflicts(candidates, 'A-02')] == ['I001', 'I002']
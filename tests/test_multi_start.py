@@ -0,0 +1,78 @@
+"""マルチスタート（ワーカープロセスでの並列実行）のテスト"""
+
+import os
+from time import perf_counter
+
+import pandas as pd
+
+from app.assignment.multi_start import derive_tie_break_seed, run_multi_start, tie_break_rank
+
+
+def test_tie_break_seed_is_stable():
+    assert derive_tie_break_seed(0, 0) is None
+    assert derive_tie_break_seed(7, 1) == derive_tie_break_seed(7, 1)
+    assert derive_tie_break_seed(7, 1) != derive_tie_break_seed(7, 2)
+    assert tie_break_rank(1, 'V001') == tie_break_rank(1, 'V001')
+
+
+def test_all_starts_run_in_workers_with_fixed_hash_seed(synthetic_inputs, make_manager):
+    lots, inspector_master_df, skill_master_df = synthetic_inputs
+    hash_seed_before = os.environ.get('PYTHONHASHSEED')
+    outcomes = []
+    for _ in range(2):
+        messages = []
+        manager = make_manager(
+            multi_start_count=2,
+            multi_start_time_budget=600,
+            multi_start_seed=5,
+            log_batch_enabled=False,
+            log_callback=lambda message, **kwargs: messages.append(str(message)),
+        )
+        result_df = manager.assign_inspectors(lots.copy(), inspector_master_df, skill_master_df, show_skill_values=True)
+        outcomes.append((manager, result_df, messages))
+
+    assert os.environ.get('PYTHONHASHSEED') == hash_seed_before
+    for _, _, messages in outcomes:
+        # スタート0・1ともワーカーで完了し、呼び出し元での実行（フォールバック）は無い
+        assert any(message.strip().startswith('スタート0:') for message in messages)
+        assert any(message.strip().startswith('スタート1:') for message in messages)
+        assert not any('このプロセスで実行' in message or '失敗' in message for message in messages)
+    (first_manager, first_df, _), (second_manager, second_df, _) = outcomes
+    pd.testing.assert_frame_equal(first_df, second_df)
+    # 呼び出し元の履歴は採用結果から再構築される
+    assert first_manager.inspector_daily_assignments == second_manager.inspector_daily_assignments
+    assert first_manager.inspector_daily_assignments
+
+
+def test_time_budget_also_stops_start_zero(synthetic_inputs, make_manager):
+    lots, inspector_master_df, skill_master_df = synthetic_inputs
+    messages = []
+    manager = make_manager(
+        log_batch_enabled=False,
+        log_callback=lambda message, **kwargs: messages.append(str(message)),
+    )
+    manager._multi_start_active = True
+    time_budget = 0.2
+    started = perf_counter()
+    best_df, results, histories_current = run_multi_start(
+        manager,
+        lots.copy(),
+        inspector_master_df,
+        skill_master_df,
+        True,
+        None,
+        None,
+        starts=3,
+        time_budget_seconds=time_budget,
+        base_seed=0,
+    )
+    elapsed = perf_counter() - started
+
+    # スタート0のワーカーも上限で打ち切られ、摂動なしの割当を呼び出し元で1回だけ実行する
+    assert any('打ち切りました' in message for message in messages)
+    assert any('このプロセスで実行' in message for message in messages)
+    assert [result.start for result in results] == [0]
+    assert histories_current
+    assert not best_df.empty
+    # ワーカーの待ち時間（全体 − 呼び出し元での実行時間）は上限＋終了処理の範囲に収まる
+    assert elapsed - results[0].elapsed < time_budget + 2.0
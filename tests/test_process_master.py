@@ -0,0 +1,120 @@
+"""工程マスタの参照表（ProcessMaster）とキャッシュの無効化のテスト"""
+
+import os
+import pickle
+
+import pandas as pd
+import pytest
+
+from app.assignment import process_master
+from app.assignment.process_master import ProcessEntry, ProcessMaster, load_process_master
+
+
+@pytest.fixture(autouse=True)
+def fresh_memo(monkeypatch):
+    """プロセス内キャッシュをテストごとに空にする"""
+    monkeypatch.setattr(process_master, '_loaded', {})
+
+
+def _write_master(path, rows, mtime):
+    pd.DataFrame(rows).to_excel(path, header=False, index=False)
+    os.utime(path, (mtime, mtime))
+
+
+def _forget_memo():
+    process_master._loaded.clear()
+
+
+def _forbid_xlsx(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError('xlsxを読み込みました')
+
+    monkeypatch.setattr(process_master.pd, 'read_excel', fail)
+
+
+MASTER_ROWS = [
+    ['品番', '10', '20', '20'],
+    ['P1', '洗浄', '外観検査', None],
+    ['P2', None, '寸法', '外観検査'],
+    ['P1', '重複行', '', ''],
+]
+
+
+def test_lookups_follow_column_order():
+    master = ProcessMaster([tuple(row) for row in MASTER_ROWS])
+    assert master.processes('P1') == (
+        ProcessEntry(1, '10', '洗浄'),
+        ProcessEntry(2, '20', '外観検査'),
+        ProcessEntry(3, '20.1', ''),  # 重複した見出しは read_excel と同じく .1 を付ける
+    )
+    assert master.process_name(' P2 ', 20) == '寸法'
+    assert master.process_name('P2', '') is None
+    assert master.match_keywords('P2', ['外観', '寸法']).process_name == '寸法'
+    assert master.match_keywords('P1', ['梱包']) is None
+    assert list(master.frame.columns) == ['品番', '10', '20', '20.1']
+
+
+def test_disk_cache_is_reused_across_processes(tmp_path, monkeypatch):
+    path = tmp_path / '工程マスタ.xlsx'
+    cache_dir = tmp_path / 'cache'
+    _write_master(path, MASTER_ROWS, 1_700_000_000)
+
+    first = load_process_master(str(path), cache_dir=cache_dir)
+    assert len(list(cache_dir.glob('*.pkl'))) == 1
+    # 変更がなければプロセス内キャッシュの同じ参照表を返す
+    assert load_process_master(str(path), cache_dir=cache_dir) is first
+
+    # 再起動相当: プロセス内キャッシュを捨てても xlsx は開かずにディスクキャッシュから復元する
+    _forget_memo()
+    _forbid_xlsx(monkeypatch)
+    restored = load_process_master(str(path), cache_dir=cache_dir)
+    assert restored is not first
+    assert restored.cells_by_product == first.cells_by_product
+
+
+def test_changed_file_is_reloaded_and_old_cache_removed(tmp_path):
+    path = tmp_path / '工程マスタ.xlsx'
+    cache_dir = tmp_path / 'cache'
+    _write_master(path, MASTER_ROWS, 1_700_000_000)
+    assert load_process_master(str(path), cache_dir=cache_dir).process_name('P1', '10') == '洗浄'
+    old_cache = next(cache_dir.glob('*.pkl'))
+
+    # 更新時刻だけが変わった場合も読み直す
+    os.utime(path, (1_700_000_100, 1_700_000_100))
+    assert load_process_master(str(path), cache_dir=cache_dir).process_name('P1', '10') == '洗浄'
+    assert not old_cache.exists()
+
+    changed_rows = [row[:] for row in MASTER_ROWS]
+    changed_rows[1][1] = '前洗浄'
+    _write_master(path, changed_rows, 1_700_000_200)
+    assert load_process_master(str(path), cache_dir=cache_dir).process_name('P1', '10') == '前洗浄'
+    assert len(list(cache_dir.glob('*.pkl'))) == 1
+
+
+def test_cache_with_other_version_is_ignored(tmp_path):
+    path = tmp_path / '工程マスタ.xlsx'
+    cache_dir = tmp_path / 'cache'
+    _write_master(path, MASTER_ROWS, 1_700_000_000)
+    load_process_master(str(path), cache_dir=cache_dir)
+    cache_path = next(cache_dir.glob('*.pkl'))
+    stale_rows = [('品番', '10'), ('P1', '古い工程')]
+    with cache_path.open('wb') as f:
+        pickle.dump({'version': process_master.PROCESS_MASTER_CACHE_VERSION - 1, 'rows': stale_rows}, f)
+
+    _forget_memo()
+    assert load_process_master(str(path), cache_dir=cache_dir).process_name('P1', '10') == '洗浄'
+
+
+def test_missing_file_returns_none(tmp_path):
+    assert load_process_master(str(tmp_path / 'missing.xlsx'), cache_dir=tmp_path) is None
+    assert load_process_master('') is None
+
+
+def test_default_cache_dir_prefers_localappdata(tmp_path, monkeypatch):
+    monkeypatch.setenv('LOCALAPPDATA', str(tmp_path / 'local'))
+    monkeypatch.setenv('TEMP', str(tmp_path / 'temp'))
+    assert process_master.default_cache_dir() == tmp_path / 'local' / 'appearance_sorting_system' / 'process_master_cache'
+    monkeypatch.setenv('LOCALAPPDATA', '')
+    assert process_master.default_cache_dir().parent.parent == tmp_path / 'temp'
+    monkeypatch.delenv('TEMP')
+    assert process_master.default_cache_dir() is None
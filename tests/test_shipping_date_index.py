@@ -0,0 +1,45 @@
+"""出荷予定日の分類（ShippingDateIndex）と割当実行での共有のテスト"""
+
+from datetime import date
+
+import pandas as pd
+
+import app.assignment.shipping_date_index as shipping_date_index
+from app.assignment.shipping_date_index import (
+    LOT_KIND_DATE,
+    LOT_KIND_MISSING,
+    LOT_KIND_PREINSPECTION,
+    LOT_KIND_SAME_DAY_CLEANING,
+    ShippingDateIndex,
+)
+
+
+def test_classifies_labels_and_dates_once_per_value():
+    index = ShippingDateIndex()
+    assert index.info('当日洗浄上がり品').kind == LOT_KIND_SAME_DAY_CLEANING
+    assert index.info('当日洗浄上がり品').is_same_day_label
+    assert index.info('当日先行検査').kind == LOT_KIND_PREINSPECTION
+    assert index.info('当日先行検査').is_same_day_label
+    assert index.info('2026-03-02').kind == LOT_KIND_DATE
+    assert index.info('2026-03-02').parsed_date == date(2026, 3, 2)
+    assert index.info(pd.Timestamp('2026-03-02')).parsed_date == date(2026, 3, 2)
+    assert index.info(None).kind == LOT_KIND_MISSING
+    assert index.info(None).parsed_date is None
+    assert len(index) == 5
+
+
+def test_assignment_run_parses_each_shipping_date_value_once(synthetic_inputs, make_manager, monkeypatch):
+    lots, inspector_master_df, skill_master_df = synthetic_inputs
+    parsed_values = []
+    classify = shipping_date_index.classify_shipping_date
+
+    def counting_classify(value):
+        parsed_values.append(value)
+        return classify(value)
+
+    monkeypatch.setattr(shipping_date_index, 'classify_shipping_date', counting_classify)
+    manager = make_manager()
+    manager.assign_inspectors(lots.copy(), inspector_master_df, skill_master_df, show_skill_values=True)
+
+    # 候補抽出・違反是正の各フェーズは実行ごとのキャッシュを参照し、同じ値を解析し直さない
+    assert len(parsed_values) == len(set(map(repr, parsed_values)))
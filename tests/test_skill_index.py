@@ -0,0 +1,68 @@
+"""スキルインデックス（SkillIndex）のテスト"""
+
+import pandas as pd
+
+from app.assignment.skill_index import SkillIndex
+
+
+def _skill_master() -> pd.DataFrame:
+    # 列: 品番, 工程番号, 検査員コード...（スキル値 1〜3 以外は保有なし）
+    return pd.DataFrame(
+        [
+            ['P1', '', '1', '', '3'],
+            ['P1', '20', '', '2', ''],
+            ['P1', '10', '2', '', '1'],
+            ['P2', '30', 'x', '3', ' 2 '],
+            ['P2', 'A', '1', '', ''],
+            [None, '10', '1', '1', '1'],
+        ],
+        columns=['品番', '工程', 'V001', 'V002', 'V003'],
+    )
+
+
+def test_build_compiles_levels_per_row():
+    index = SkillIndex.build(_skill_master())
+    assert index.codes == ['V001', 'V002', 'V003']
+    assert index.has_product('P1')
+    assert not index.has_product('P9')
+    assert not index.has_product(['unhashable'])
+    rows = index.product_rows('P2')
+    assert [row.process_number for row in rows] == ['30', 'A']
+    # 'x' はスキル値として扱わず、前後の空白は除く
+    assert list(index.iter_skilled(rows[:1])) == [('V002', 3), ('V003', 2)]
+    assert rows[1].numeric_process is None
+
+
+def test_rows_for_process_includes_blank_process_rows():
+    index = SkillIndex.build(_skill_master())
+    rows = index.rows_for_process('P1', 10)
+    assert [row.process_number for row in rows] == ['', '10']
+
+
+def test_default_rows_prefers_blank_then_lowest_numeric():
+    index = SkillIndex.build(_skill_master())
+    kind, rows = index.default_rows('P1')
+    assert kind == 'blank'
+    assert [row.process_number for row in rows] == ['']
+
+    master = _skill_master()
+    master = master[master['工程'] != '']
+    kind, rows = SkillIndex.build(master).default_rows('P1')
+    assert kind == 'numeric'
+    assert [row.numeric_process for row in rows] == [10, 20]
+
+    kind, rows = SkillIndex.build(_skill_master().iloc[[4]]).default_rows('P2')
+    assert kind == 'other'
+
+
+def test_unique_skilled_keeps_first_level():
+    index = SkillIndex.build(_skill_master())
+    # V001 は空欄工程の行（スキル1）が先に現れる
+    assert index.unique_skilled(index.product_rows('P1')) == [('V001', 1), ('V003', 3), ('V002', 2)]
+
+
+def test_is_built_from_tracks_source_frame():
+    master = _skill_master()
+    index = SkillIndex.build(master)
+    assert index.is_built_from(master)
+    assert not index.is_built_from(master.copy())
@@ -0,0 +1,46 @@
+"""違反是正（fix_single_violation）のテスト"""
+
+import pandas as pd
+import pytest
+
+
+def test_single_inspector_lot_is_reinforced(synthetic_inputs, make_manager):
+    lots, inspector_master_df, skill_master_df = synthetic_inputs
+    manager = make_manager()
+    result_df = manager.assign_inspectors(lots.copy(), inspector_master_df, skill_master_df, show_skill_values=True)
+    counts = pd.to_numeric(result_df['検査員人数'], errors='coerce').fillna(0)
+    singles = result_df.index[counts == 1]
+    if len(singles) == 0:
+        pytest.skip("検査員1人のロットがありません")
+    index = singles[0]
+    # 増員の対象（検査時間が必要人数の閾値以上）にして履歴を作り直す
+    inspection_time = float(manager.required_inspectors_threshold) + 1.0
+    result_df.at[index, '検査時間'] = inspection_time
+    result_df.at[index, '分割検査時間'] = inspection_time
+    manager._rebuild_assignment_histories(result_df, inspector_master_df)
+    inspector_name = str(result_df.at[index, '検査員1']).split('(')[0].strip()
+    inspector_code = manager._get_inspector_id_by_name(inspector_name, inspector_master_df)
+    # 増員候補が勤務時間・同一品番の上限に掛からないよう、他の検査員の割当を空ける
+    for histories in (manager.inspector_daily_assignments, manager.inspector_product_hours):
+        for code in list(histories):
+            if code != inspector_code:
+                histories[code] = {}
+    max_hours = {
+        str(code).strip(): manager.get_inspector_max_hours(str(code).strip(), inspector_master_df)
+        for code in inspector_master_df['#ID']
+    }
+    position = result_df.index.get_loc(index)
+    messages = []
+    manager.log_callback = lambda message, **kwargs: messages.append(str(message))
+    manager.log_batch_enabled = False
+
+    fixed = manager.fix_single_violation(
+        position, inspector_code, inspector_name, inspection_time, str(result_df.at[index, '品番']),
+        inspection_time, 1, result_df, inspector_master_df, skill_master_df, max_hours,
+        pd.Timestamp.now().date(), True,
+    )
+
+    assert not any('エラーが発生しました' in message for message in messages)
+    assert fixed
+    assert int(result_df.at[index, '検査員人数']) == 2
+    assert float(result_df.at[index, '分割検査時間']) == pytest.approx(round(inspection_time / 2, 1))
@@ -0,0 +1,153 @@
+"""ウォームスタート（前回割当の引き継ぎ）のテスト"""
+
+from datetime import date
+
+import pandas as pd
+
+from app.assignment.warm_start import (
+    WARM_START_CLAIM,
+    WARM_START_REUSE,
+    WarmStartEntry,
+    load_warm_start,
+    lot_signature,
+    save_warm_start,
+)
+
+
+def _assigned_lot_count(result_df: pd.DataFrame) -> int:
+    return int((pd.to_numeric(result_df['検査員人数'], errors='coerce').fillna(0) > 0).sum())
+
+
+def _lot_inspector_names(result_df: pd.DataFrame, lot_id: str) -> tuple:
+    """ロットの検査員名（表示用のスキル値などを除く）"""
+    row = result_df.loc[result_df['生産ロットID'] == lot_id].iloc[0]
+    names = []
+    for slot in range(1, 11):
+        value = row.get(f'検査員{slot}')
+        if pd.notna(value) and str(value).strip():
+            names.append(str(value).split('(')[0].strip())
+    return tuple(names)
+
+
+def _record_decisions(manager) -> list:
+    """_warm_start_decision の判定結果を記録する"""
+    decisions = []
+    decide = manager._warm_start_decision
+
+    def recording(*args, **kwargs):
+        decision = decide(*args, **kwargs)
+        decisions.append(decision)
+        return decision
+
+    manager._warm_start_decision = recording
+    return decisions
+
+
+def test_save_and_load_round_trip_keeps_unassigned_lots(tmp_path):
+    path = tmp_path / 'last_assignment.json'
+    signature = lot_signature('P0001-00', '', 100, 1.5, '2026-10-20')
+    entries = {
+        'L1': WarmStartEntry(signature, ('V001', 'V002')),
+        'L2': WarmStartEntry(signature, ()),
+    }
+    save_warm_start(path, date(2026, 10, 17), entries)
+
+    assert load_warm_start(path, date(2026, 10, 17)) == entries
+    # 別の日の保存内容は引き継がない
+    assert load_warm_start(path, date(2026, 10, 18)) == {}
+
+
+def test_signature_ignores_float_formatting():
+    assert lot_signature('P1', '10', 100, 1.5, 'x') == lot_signature('P1', '10', 100, '1.5', 'x')
+    assert lot_signature('P1', '10', 100, 1.5, 'x') != lot_signature('P1', '10', 100, 1.6, 'x')
+
+
+def test_identical_rerun_reuses_every_valid_lot(tmp_path, synthetic_inputs, make_manager):
+    lots, inspector_master_df, skill_master_df = synthetic_inputs
+    path = tmp_path / 'last_assignment.json'
+
+    cold_manager = make_manager(warm_start_enabled=False)
+    cold_df = cold_manager.assign_inspectors(lots.copy(), inspector_master_df, skill_master_df, show_skill_values=True)
+
+    manager = make_manager(warm_start_enabled=True, warm_start_path=path)
+    first_df = manager.assign_inspectors(lots.copy(), inspector_master_df, skill_master_df, show_skill_values=True)
+    assert manager.warm_start_reused_lots == 0
+    first_run_path = tmp_path / 'first_run.json'
+    first_run_path.write_bytes(path.read_bytes())
+
+    # 同じマネージャーで再実行（UIの運用）: 前回の履歴が残っていても引き継ぎの判定に影響しない
+    decisions = _record_decisions(manager)
+    rerun_df = manager.assign_inspectors(lots.copy(), inspector_master_df, skill_master_df, show_skill_values=True)
+
+    assert WARM_START_CLAIM not in decisions
+    assert manager.warm_start_reused_lots == decisions.count(WARM_START_REUSE)
+    assert manager.warm_start_reused_lots >= _assigned_lot_count(first_df) // 2
+    assert _assigned_lot_count(rerun_df) >= _assigned_lot_count(cold_df)
+
+    # 新しいマネージャーでも同じロットを引き継ぐ
+    fresh_manager = make_manager(warm_start_enabled=True, warm_start_path=first_run_path)
+    fresh_df = fresh_manager.assign_inspectors(lots.copy(), inspector_master_df, skill_master_df, show_skill_values=True)
+    assert fresh_manager.warm_start_reused_lots == manager.warm_start_reused_lots
+    assert _assigned_lot_count(fresh_df) >= _assigned_lot_count(cold_df)
+
+
+def test_reused_lots_keep_previous_inspectors(tmp_path, synthetic_inputs, make_manager):
+    lots, inspector_master_df, skill_master_df = synthetic_inputs
+    manager = make_manager(warm_start_enabled=True, warm_start_path=tmp_path / 'last_assignment.json')
+    manager.assign_inspectors(lots.copy(), inspector_master_df, skill_master_df, show_skill_values=True)
+    previous = load_warm_start(manager.warm_start_path, pd.Timestamp.now().date())
+
+    reused_lot_ids = []
+    reuse = manager._reuse_warm_start_lot
+
+    def recording(result_df, assignment_matrix, row_idx, codes, show_skill_values):
+        reused_lot_ids.append((result_df['生産ロットID'].iat[row_idx], tuple(codes)))
+        return reuse(result_df, assignment_matrix, row_idx, codes, show_skill_values)
+
+    manager._reuse_warm_start_lot = recording
+    rerun_df = manager.assign_inspectors(lots.copy(), inspector_master_df, skill_master_df, show_skill_values=True)
+
+    assert reused_lot_ids
+    names_by_code = dict(zip(inspector_master_df['#ID'], inspector_master_df['#氏名']))
+    for lot_id, codes in reused_lot_ids:
+        assert previous[lot_id].codes == codes
+        # 引き継いだロットは最適化フェーズでも動かさない
+        assert _lot_inspector_names(rerun_df, lot_id) == tuple(names_by_code[code] for code in codes)
+
+
+def test_changed_lot_only_reassigns_conflicting_lots(tmp_path, synthetic_inputs, make_manager):
+    lots, inspector_master_df, skill_master_df = synthetic_inputs
+    manager = make_manager(warm_start_enabled=True, warm_start_path=tmp_path / 'last_assignment.json')
+    manager.assign_inspectors(lots.copy(), inspector_master_df, skill_master_df, show_skill_values=True)
+    previous = load_warm_start(manager.warm_start_path, pd.Timestamp.now().date())
+
+    # 当日洗浄上がり品1件の検査時間を変えると、そのロットの候補の検査員を前回割当に含む以降のロットだけ割り当て直す
+    changed = lots.copy()
+    same_day = changed.index[changed['出荷予定日'].astype(str) == '当日洗浄上がり品']
+    assert len(same_day) > 0
+    changed_lot_id = changed.at[same_day[0], '生産ロットID']
+    changed.loc[same_day[:1], '検査時間'] = changed.loc[same_day[:1], '検査時間'] + 0.1
+
+    claims = []
+    claim = manager._warm_start_claimed_codes
+
+    def recording_claim(result_df, row_idx):
+        codes = claim(result_df, row_idx)
+        claims.append((result_df['生産ロットID'].iat[row_idx], codes))
+        return codes
+
+    manager._warm_start_claimed_codes = recording_claim
+    manager.assign_inspectors(changed, inspector_master_df, skill_master_df, show_skill_values=True)
+
+    # 優先順（引き継ぎの判定順）
+    lot_order = list(manager._warm_start_signatures)
+    locked = manager._warm_start_locked_lot_ids
+    assert changed_lot_id in {lot_id for lot_id, _ in claims}
+    assert changed_lot_id not in locked
+    assert manager.warm_start_reused_lots == len(locked) > 0
+    for claim_lot_id, codes in claims:
+        for lot_id in locked:
+            if lot_order.index(lot_id) > lot_order.index(claim_lot_id):
+                assert not codes.intersection(previous[lot_id].codes)
+    # 確保した検査員と重ならないロットは、変更したロットより後でも引き継ぐ
+    assert any(lot_order.index(lot_id) > lot_order.index(changed_lot_id) for lot_id in locked)